@@ -1,29 +1,54 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from collections import defaultdict
+from typing import Optional
+from uuid import UUID
 import io
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from sqlalchemy import func, cast, Date
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import (
+    func,
+    cast,
+    DateTime,
+    Float,
+    and_,
+    literal,
+    literal_column,
+    or_,
+    select,
+    true,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array
 
 from database.config import get_db
+from database.funciones import segundos_entre, solo_fecha
 from entities.paquete import Paquete
 from entities.detalle_entrega import DetalleEntrega
 from entities.sede import Sede
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+from observabilidad.trazas import span
+from services import reportes
 
 router = APIRouter(prefix="/analytics", tags=["Analitica"]) 
 
 
+def _requiere_postgresql(db: Session, reporte: str) -> None:
+    """Los reportes que usan funciones propias de PostgreSQL no corren en SQLite."""
+    if db.get_bind().dialect.name != "postgresql":
+        raise HTTPException(
+            status_code=501,
+            detail=f"El reporte {reporte} solo está disponible en PostgreSQL",
+        )
+
+
 @router.get("/paquetes-ultimos-30-dias")
 def paquetes_ultimos_30_dias(days: int = 30, db: Session = Depends(get_db)):
     days = max(1, min(365, int(days)))
     start_date = datetime.now() - timedelta(days=days - 1)
     q = (
         db.query(
-            cast(Paquete.fecha_creacion, Date).label("d"),
+            solo_fecha(Paquete.fecha_creacion).label("d"),
             func.count(Paquete.id_paquete),
         )
         .filter(Paquete.fecha_creacion >= start_date)
@@ -105,11 +130,7 @@ def tiempo_promedio_entrega(days: int = 180, db: Session = Depends(get_db)):
     days = max(1, min(365, int(days)))
     start_date = datetime.now() - timedelta(days=days - 1)
     avg_seconds = db.query(
-        func.avg(
-            func.extract(
-                "epoch", DetalleEntrega.fecha_entrega - DetalleEntrega.fecha_envio
-            )
-        )
+        func.avg(segundos_entre(DetalleEntrega.fecha_entrega, DetalleEntrega.fecha_envio))
     ).filter(DetalleEntrega.fecha_entrega.isnot(None), DetalleEntrega.fecha_envio >= start_date).scalar()
     if avg_seconds is None:
         return {"avg_hours": 0.0, "avg_days": 0.0}
@@ -118,6 +139,533 @@ def tiempo_promedio_entrega(days: int = 180, db: Session = Depends(get_db)):
     return {"avg_hours": round(avg_hours, 2), "avg_days": round(avg_days, 2)}
 
 
+TIEMPOS_ENTREGA_AGRUPACIONES = ("ruta", "tipo", "mes")
+
+
+@router.get("/tiempos-entrega")
+def tiempos_entrega(
+    group_by: str = "ruta",
+    days: int = 180,
+    bucket_hours: int = 12,
+    buckets: int = 14,
+    limit: int = 50,
+    db: Session = Depends(get_db),
+):
+    """
+    Percentiles (p50/p90/p99) e histograma del tiempo de entrega por ruta,
+    tipo de envío o mes. Todo se calcula en una sola consulta: la base
+    de entregas va en un CTE, los percentiles con percentile_cont y el
+    histograma con width_bucket; solo viaja una fila por grupo.
+    """
+    if group_by not in TIEMPOS_ENTREGA_AGRUPACIONES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"group_by debe ser uno de: {', '.join(TIEMPOS_ENTREGA_AGRUPACIONES)}",
+        )
+    _requiere_postgresql(db, "de tiempos de entrega")
+    days = max(1, min(365, int(days)))
+    bucket_hours = max(1, min(24 * 30, int(bucket_hours)))
+    buckets = max(1, min(100, int(buckets)))
+    limit = max(1, min(500, int(limit)))
+    start_date = datetime.now() - timedelta(days=days - 1)
+
+    if group_by == "ruta":
+        keys = [DetalleEntrega.id_sede_remitente, DetalleEntrega.id_sede_receptora]
+    elif group_by == "tipo":
+        keys = [func.lower(Paquete.tipo)]
+    else:
+        keys = [func.date_trunc("month", DetalleEntrega.fecha_envio)]
+
+    hours = cast(
+        func.extract("epoch", DetalleEntrega.fecha_entrega - DetalleEntrega.fecha_envio),
+        Float,
+    ) / 3600.0
+    base = (
+        select(*[k.label(f"k{i}") for i, k in enumerate(keys)], hours.label("hours"))
+        .select_from(DetalleEntrega)
+        .join(Paquete, Paquete.id_paquete == DetalleEntrega.id_paquete)
+        .where(
+            DetalleEntrega.fecha_entrega.isnot(None),
+            DetalleEntrega.fecha_entrega >= DetalleEntrega.fecha_envio,
+            DetalleEntrega.fecha_envio >= start_date,
+        )
+        .cte("base")
+    )
+    base_keys = [base.c[f"k{i}"] for i in range(len(keys))]
+
+    stats = (
+        select(
+            *base_keys,
+            func.count().label("count"),
+            func.avg(base.c.hours).label("avg_hours"),
+            func.percentile_cont(array([0.5, 0.9, 0.99]))
+            .within_group(base.c.hours)
+            .label("percentiles"),
+        )
+        .group_by(*base_keys)
+        .cte("stats")
+    )
+
+    bucket = func.width_bucket(base.c.hours, 0, bucket_hours * buckets, buckets)
+    bucket_counts = (
+        select(*base_keys, bucket.label("bucket"), func.count().label("n"))
+        .group_by(*base_keys, bucket)
+        .cte("bucket_counts")
+    )
+    bc_keys = [bucket_counts.c[f"k{i}"] for i in range(len(keys))]
+    histograms = (
+        select(
+            *bc_keys,
+            func.array_agg(
+                aggregate_order_by(bucket_counts.c.bucket, bucket_counts.c.bucket)
+            ).label("buckets"),
+            func.array_agg(
+                aggregate_order_by(bucket_counts.c.n, bucket_counts.c.bucket)
+            ).label("counts"),
+        )
+        .group_by(*bc_keys)
+        .cte("histograms")
+    )
+
+    stats_keys = [stats.c[f"k{i}"] for i in range(len(keys))]
+    columns = [
+        *stats_keys,
+        stats.c.count,
+        stats.c.avg_hours,
+        stats.c.percentiles,
+        histograms.c.buckets,
+        histograms.c.counts,
+    ]
+    query = select(*columns).join(
+        histograms,
+        and_(*[histograms.c[f"k{i}"] == stats_keys[i] for i in range(len(keys))]),
+    )
+    if group_by == "ruta":
+        origin = aliased(Sede)
+        destination = aliased(Sede)
+        query = (
+            query.add_columns(origin.nombre, destination.nombre)
+            .outerjoin(origin, origin.id_sede == stats_keys[0])
+            .outerjoin(destination, destination.id_sede == stats_keys[1])
+        )
+    rows = db.execute(query.order_by(stats.c.count.desc()).limit(limit)).all()
+
+    groups = []
+    for row in rows:
+        histogram = [0] * (buckets + 1)
+        for b, n in zip(row.buckets, row.counts):
+            histogram[min(max(b, 1), buckets + 1) - 1] += int(n)
+        p50, p90, p99 = row.percentiles
+        item = {
+            "count": int(row.count),
+            "avg_hours": round(float(row.avg_hours), 2),
+            "p50_hours": round(float(p50), 2),
+            "p90_hours": round(float(p90), 2),
+            "p99_hours": round(float(p99), 2),
+            "histogram": histogram,
+        }
+        if group_by == "ruta":
+            item["id_sede_origen"] = str(row[0])
+            item["id_sede_destino"] = str(row[1])
+            item["label"] = f"{row[-2] or row[0]} -> {row[-1] or row[1]}"
+        elif group_by == "tipo":
+            item["label"] = row[0]
+        else:
+            item["label"] = row[0].strftime("%Y-%m")
+        groups.append(item)
+
+    return {
+        "group_by": group_by,
+        "days": days,
+        "bucket_edges": [i * bucket_hours for i in range(buckets + 1)],
+        "groups": groups,
+    }
+
+
+SERIE_GRANULARIDADES = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=28),
+}
+SERIE_METRICAS = ("created", "delivered", "pending")
+SERIE_AGRUPACIONES = ("sede", "estado")
+SERIE_MAX_PUNTOS = 10000
+
+
+@router.get("/serie")
+def serie(
+    metric: str = "created",
+    granularity: str = "day",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    group_by: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Serie de tiempo densa de paquetes creados, entregas completadas o envíos
+    pendientes, por hora, día, semana o mes y opcionalmente por sede o estado.
+    La base de datos arma los intervalos con generate_series y los cruza con
+    los conteos por date_trunc, así los intervalos sin datos llegan en cero y
+    la serie sale completa en una sola consulta para cualquier rango.
+    Pendientes es el acumulado de envíos menos entregas al cierre de cada intervalo.
+    """
+    if metric not in SERIE_METRICAS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"metric debe ser uno de: {', '.join(SERIE_METRICAS)}",
+        )
+    if granularity not in SERIE_GRANULARIDADES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"granularity debe ser uno de: {', '.join(SERIE_GRANULARIDADES)}",
+        )
+    if group_by is not None and group_by not in SERIE_AGRUPACIONES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"group_by debe ser uno de: {', '.join(SERIE_AGRUPACIONES)}",
+        )
+    if metric == "pending" and group_by == "estado":
+        raise HTTPException(
+            status_code=400, detail="pending solo se puede agrupar por sede"
+        )
+    end = end or datetime.now()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start debe ser anterior a end")
+    if (end - start) / SERIE_GRANULARIDADES[granularity] > SERIE_MAX_PUNTOS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"El rango supera {SERIE_MAX_PUNTOS} intervalos; use una granularidad mayor",
+        )
+    _requiere_postgresql(db, "de series de tiempo")
+
+    """ granularity ya está validada contra la lista, se puede escribir en el SQL """
+    step = literal_column(f"interval '1 {granularity}'")
+    first = func.date_trunc(granularity, literal(start, DateTime))
+    last = func.date_trunc(granularity, literal(end, DateTime))
+    buckets = select(
+        func.generate_series(first, last, step).label("bucket")
+    ).cte("serie_buckets")
+
+    if metric == "pending":
+        key = DetalleEntrega.id_sede_remitente if group_by else literal(None)
+        """ Lo enviado o entregado antes del primer intervalo cuenta en el primero """
+        sent = select(
+            func.greatest(
+                func.date_trunc(granularity, DetalleEntrega.fecha_envio), first
+            ).label("bucket"),
+            key.label("key"),
+            literal(1).label("delta"),
+        ).where(
+            DetalleEntrega.fecha_envio < last + step,
+            or_(
+                DetalleEntrega.fecha_entrega.is_(None),
+                DetalleEntrega.fecha_entrega >= first,
+            ),
+        )
+        delivered = select(
+            func.greatest(
+                func.date_trunc(granularity, DetalleEntrega.fecha_entrega), first
+            ).label("bucket"),
+            key.label("key"),
+            literal(-1).label("delta"),
+        ).where(
+            DetalleEntrega.fecha_envio < last + step,
+            DetalleEntrega.fecha_entrega >= first,
+            DetalleEntrega.fecha_entrega < last + step,
+        )
+        events = union_all(sent, delivered).subquery("serie_events")
+        counts = (
+            select(events.c.bucket, events.c.key, func.sum(events.c.delta).label("n"))
+            .group_by(events.c.bucket, events.c.key)
+            .cte("serie_counts")
+        )
+    else:
+        if metric == "created":
+            ts = Paquete.fecha_creacion
+            keys_by_group = {
+                "estado": Paquete.estado,
+                "sede": DetalleEntrega.id_sede_remitente,
+            }
+            source = select().select_from(Paquete)
+            if group_by == "sede":
+                source = source.outerjoin(
+                    DetalleEntrega, DetalleEntrega.id_paquete == Paquete.id_paquete
+                )
+        else:
+            ts = DetalleEntrega.fecha_entrega
+            keys_by_group = {
+                "estado": DetalleEntrega.estado_envio,
+                "sede": DetalleEntrega.id_sede_receptora,
+            }
+            source = select().select_from(DetalleEntrega)
+        key = keys_by_group[group_by] if group_by else literal(None)
+        bucket = func.date_trunc(granularity, ts)
+        counts = (
+            source.add_columns(
+                bucket.label("bucket"), key.label("key"), func.count().label("n")
+            )
+            .where(ts >= first, ts < last + step)
+            .group_by(bucket, *([key] if group_by else []))
+            .cte("serie_counts")
+        )
+
+    if group_by:
+        keys = select(counts.c.key).distinct().cte("serie_keys")
+    else:
+        keys = select(literal(None).label("key")).cte("serie_keys")
+
+    value = func.coalesce(counts.c.n, 0)
+    if metric == "pending":
+        value = func.sum(value).over(partition_by=keys.c.key, order_by=buckets.c.bucket)
+    query = (
+        select(buckets.c.bucket, keys.c.key, value.label("value"))
+        .select_from(buckets)
+        .join(keys, true())
+        .outerjoin(
+            counts,
+            and_(
+                counts.c.bucket == buckets.c.bucket,
+                counts.c.key.is_not_distinct_from(keys.c.key),
+            ),
+        )
+    )
+    if group_by == "sede":
+        query = query.add_columns(Sede.nombre).outerjoin(
+            Sede, Sede.id_sede == keys.c.key
+        )
+    rows = db.execute(query.order_by(keys.c.key, buckets.c.bucket)).all()
+
+    labels = []
+    series = {}
+    for row in rows:
+        if row.key not in series:
+            if group_by == "sede":
+                label = row.nombre or ("Sin sede" if row.key is None else str(row.key))
+            else:
+                label = "total" if not group_by else (row.key or "Sin estado")
+            series[row.key] = {
+                "key": None if row.key is None else str(row.key),
+                "label": label,
+                "data": [],
+            }
+        if len(series) == 1:
+            labels.append(row.bucket.isoformat())
+        series[row.key]["data"].append(int(row.value))
+
+    return {
+        "metric": metric,
+        "granularity": granularity,
+        "group_by": group_by,
+        "labels": labels,
+        "series": list(series.values()),
+    }
+
+
+FLUJOS_FORMATOS = ("coo", "pairs")
+
+
+@router.get("/flujos")
+def flujos(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    min_count: int = 1,
+    format: str = "coo",
+    db: Session = Depends(get_db),
+):
+    """
+    Matriz origen-destino dispersa entre sedes: envíos, peso total y valor
+    declarado por par (sede remitente, sede receptora), por fecha de envío.
+    Se calcula con un solo GROUP BY sobre el par y solo trae los pares con envíos.
+    Con format=coo la matriz va como arreglos paralelos de índices y valores
+    sobre la lista `sedes`, que pesa mucho menos que un objeto por par en
+    redes grandes; format=pairs devuelve un objeto por par con los nombres.
+    """
+    if format not in FLUJOS_FORMATOS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"format debe ser uno de: {', '.join(FLUJOS_FORMATOS)}",
+        )
+    end = end or datetime.now()
+    start = start or end - timedelta(days=90)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start debe ser anterior a end")
+    min_count = max(1, int(min_count))
+
+    count = func.count(DetalleEntrega.id_detalle)
+    rows = (
+        db.query(
+            DetalleEntrega.id_sede_remitente,
+            DetalleEntrega.id_sede_receptora,
+            count,
+            func.coalesce(func.sum(Paquete.peso), 0.0),
+            func.coalesce(func.sum(Paquete.valor_declarado), 0.0),
+        )
+        .join(Paquete, Paquete.id_paquete == DetalleEntrega.id_paquete)
+        .filter(
+            DetalleEntrega.fecha_envio >= start,
+            DetalleEntrega.fecha_envio < end,
+            DetalleEntrega.activo == True,
+        )
+        .group_by(DetalleEntrega.id_sede_remitente, DetalleEntrega.id_sede_receptora)
+        .having(count >= min_count)
+        .order_by(count.desc())
+        .all()
+    )
+
+    ids = {sid for row in rows for sid in row[:2]}
+    name_map = dict(
+        db.query(Sede.id_sede, Sede.nombre).filter(Sede.id_sede.in_(ids)).all()
+        if ids
+        else []
+    )
+    totals = {
+        "pairs": len(rows),
+        "count": sum(int(r[2]) for r in rows),
+        "weight_kg": round(sum(float(r[3]) for r in rows), 2),
+        "declared_value": round(sum(float(r[4]) for r in rows), 2),
+    }
+    result = {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "format": format,
+        "totals": totals,
+    }
+
+    if format == "pairs":
+        result["flows"] = [
+            {
+                "origin_id": str(origen),
+                "origin": name_map.get(origen, str(origen)),
+                "destination_id": str(destino),
+                "destination": name_map.get(destino, str(destino)),
+                "count": int(n),
+                "weight_kg": round(float(peso), 2),
+                "declared_value": round(float(valor), 2),
+            }
+            for origen, destino, n, peso, valor in rows
+        ]
+        return result
+
+    """ Cada sede aparece una vez; los pares la referencian por su posición """
+    sedes = sorted(ids, key=lambda sid: (name_map.get(sid, ""), str(sid)))
+    index = {sid: i for i, sid in enumerate(sedes)}
+    result["sedes"] = [
+        {"id": str(sid), "label": name_map.get(sid, str(sid))} for sid in sedes
+    ]
+    result["origin"] = [index[r[0]] for r in rows]
+    result["destination"] = [index[r[1]] for r in rows]
+    result["count"] = [int(r[2]) for r in rows]
+    result["weight_kg"] = [round(float(r[3]), 2) for r in rows]
+    result["declared_value"] = [round(float(r[4]), 2) for r in rows]
+    return result
+
+
+@router.get("/clientes-frecuentes")
+def clientes_frecuentes(
+    days: int = 365,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Ranking de clientes por envíos enviados y recibidos, valor declarado y
+    último envío. Para la página siguiente se envía el `next_cursor` recibido.
+    """
+    days = max(1, min(1825, int(days)))
+    limit = max(1, min(500, int(limit)))
+    try:
+        page = reportes.clientes_frecuentes(db, dias=days, limite=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "days": days,
+        "total_clients": page["total_clientes"],
+        "next_cursor": page["siguiente_cursor"],
+        "clients": [
+            {
+                "rank": c["puesto"],
+                "id": str(c["id_cliente"]),
+                "label": c["nombre"],
+                "document": c["numero_documento"],
+                "sent": c["enviados"],
+                "received": c["recibidos"],
+                "total": c["total"],
+                "declared_value": c["valor_declarado"],
+                "last_shipment": c["ultimo_envio"].isoformat(),
+            }
+            for c in page["clientes"]
+        ],
+    }
+
+
+@router.get("/flota")
+def flota(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    sede: Optional[UUID] = None,
+    refresh: bool = False,
+    db: Session = Depends(get_db),
+):
+    """
+    Utilización de capacidad, horas por estado y envíos despachados por
+    vehículo y por sede entre `start` y `end` (días incluidos, por defecto
+    los últimos 30). El cálculo de cada período se reutiliza unos minutos;
+    refresh=true lo vuelve a calcular.
+    """
+    end = end or date.today()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start debe ser anterior a end")
+    if (end - start).days > 366:
+        raise HTTPException(status_code=400, detail="El período no puede superar un año")
+    _requiere_postgresql(db, "de flota")
+
+    report = reportes.eficiencia_flota(
+        db, start, end, id_sede=sede, usar_cache=not refresh
+    )
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "period_hours": report["horas_periodo"],
+        "computed_at": report["calculado_en"].isoformat(timespec="seconds"),
+        "cached": report["desde_cache"],
+        "vehicles": [
+            {
+                "id": str(v["id_transporte"]),
+                "label": v["placa"],
+                "type": v["tipo_vehiculo"],
+                "sede_id": str(v["id_sede"]),
+                "sede": v["sede"],
+                "status": v["estado"],
+                "capacity_kg": v["capacidad_carga"],
+                "shipments": v["envios"],
+                "load_kg": v["carga_kg"],
+                "dispatch_days": v["dias_con_despachos"],
+                "avg_utilization": v["utilizacion_promedio"],
+                "max_utilization": v["utilizacion_maxima"],
+                "hours_by_status": v["horas_por_estado"],
+            }
+            for v in report["vehiculos"]
+        ],
+        "sedes": [
+            {
+                "id": str(s["id_sede"]),
+                "label": s["sede"],
+                "vehicles": s["vehiculos"],
+                "capacity_kg": s["capacidad_total"],
+                "shipments": s["envios"],
+                "load_kg": s["carga_kg"],
+                "utilization": s["utilizacion"],
+                "in_use_pct": s["porcentaje_en_uso"],
+                "hours_by_status": s["horas_por_estado"],
+            }
+            for s in report["sedes"]
+        ],
+    }
+
+
 @router.get("/resumen")
 def resumen(db: Session = Depends(get_db)):
     total_paquetes = db.query(func.count(Paquete.id_paquete)).scalar() or 0
@@ -156,71 +704,79 @@ def export_resumen(
     days_top = max(1, min(365, int(days_top)))
     top_limit = max(1, min(50, int(top_limit)))
 
-    resumen_data = resumen(db)
-    ultimos30 = paquetes_ultimos_30_dias(days_line, db)
-    sedes_top = sedes_mas_activas(top_limit, days_top, db)
-    estados = estados_paquetes(days_states, db)
+    """ ReportLab tarda en importarse; solo se carga cuando se pide un PDF """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
 
-    buffer = io.BytesIO()
-    pdf = canvas.Canvas(buffer, pagesize=letter)
-    width, height = letter
-    y = height - 50
-
-    pdf.setFont("Helvetica-Bold", 16)
-    pdf.drawString(50, y, "Reporte de analítica SwiftPost")
-    y -= 30
-
-    pdf.setFont("Helvetica", 12)
-    pdf.drawString(
-        50, y, f"Fecha de generación: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-    )
-    y -= 30
-
-    pdf.setFont("Helvetica-Bold", 14)
-    pdf.drawString(50, y, "Resumen")
-    y -= 20
-    pdf.setFont("Helvetica", 12)
-    pdf.drawString(60, y, f"Total de paquetes: {resumen_data['total_paquetes']}")
-    y -= 16
-    pdf.drawString(60, y, f"Paquetes este mes: {resumen_data['paquetes_mes']}")
-    y -= 16
-    pdf.drawString(60, y, f"Sedes activas: {resumen_data['sedes_activas']}")
-    y -= 16
-    pdf.drawString(
-        60, y, f"Entregas pendientes: {resumen_data['entregas_pendientes']}"
-    )
-    y -= 30
-
-    pdf.setFont("Helvetica-Bold", 14)
-    pdf.drawString(50, y, "Sedes más activas")
-    y -= 20
-    pdf.setFont("Helvetica", 12)
-    for label, value in zip(sedes_top["labels"], sedes_top["data"]):
-        pdf.drawString(60, y, f"{label}: {int(value)} envíos")
-        y -= 16
-        if y < 80:
-            pdf.showPage()
-            y = height - 50
-            pdf.setFont("Helvetica", 12)
+    with span("export_resumen.datos"):
+        resumen_data = resumen(db)
+        ultimos30 = paquetes_ultimos_30_dias(days_line, db)
+        sedes_top = sedes_mas_activas(top_limit, days_top, db)
+        estados = estados_paquetes(days_states, db)
 
-    if y < 140:
-        pdf.showPage()
+    buffer = io.BytesIO()
+    with span("export_resumen.reportlab") as traza_pdf:
+        pdf = canvas.Canvas(buffer, pagesize=letter)
+        width, height = letter
         y = height - 50
 
-    pdf.setFont("Helvetica-Bold", 14)
-    pdf.drawString(50, y, "Estados de paquetes")
-    y -= 20
-    pdf.setFont("Helvetica", 12)
-    for label, value in zip(estados["labels"], estados["data"]):
-        pdf.drawString(60, y, f"{label}: {int(value)}")
+        pdf.setFont("Helvetica-Bold", 16)
+        pdf.drawString(50, y, "Reporte de analítica SwiftPost")
+        y -= 30
+
+        pdf.setFont("Helvetica", 12)
+        pdf.drawString(
+            50, y, f"Fecha de generación: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+        )
+        y -= 30
+
+        pdf.setFont("Helvetica-Bold", 14)
+        pdf.drawString(50, y, "Resumen")
+        y -= 20
+        pdf.setFont("Helvetica", 12)
+        pdf.drawString(60, y, f"Total de paquetes: {resumen_data['total_paquetes']}")
+        y -= 16
+        pdf.drawString(60, y, f"Paquetes este mes: {resumen_data['paquetes_mes']}")
         y -= 16
-        if y < 80:
+        pdf.drawString(60, y, f"Sedes activas: {resumen_data['sedes_activas']}")
+        y -= 16
+        pdf.drawString(
+            60, y, f"Entregas pendientes: {resumen_data['entregas_pendientes']}"
+        )
+        y -= 30
+
+        pdf.setFont("Helvetica-Bold", 14)
+        pdf.drawString(50, y, "Sedes más activas")
+        y -= 20
+        pdf.setFont("Helvetica", 12)
+        for label, value in zip(sedes_top["labels"], sedes_top["data"]):
+            pdf.drawString(60, y, f"{label}: {int(value)} envíos")
+            y -= 16
+            if y < 80:
+                pdf.showPage()
+                y = height - 50
+                pdf.setFont("Helvetica", 12)
+
+        if y < 140:
             pdf.showPage()
             y = height - 50
-            pdf.setFont("Helvetica", 12)
 
-    pdf.showPage()
-    pdf.save()
+        pdf.setFont("Helvetica-Bold", 14)
+        pdf.drawString(50, y, "Estados de paquetes")
+        y -= 20
+        pdf.setFont("Helvetica", 12)
+        for label, value in zip(estados["labels"], estados["data"]):
+            pdf.drawString(60, y, f"{label}: {int(value)}")
+            y -= 16
+            if y < 80:
+                pdf.showPage()
+                y = height - 50
+                pdf.setFont("Helvetica", 12)
+
+        pdf.showPage()
+        pdf.save()
+        if traza_pdf is not None:
+            traza_pdf.atributos["pages"] = pdf.getPageNumber() - 1
     buffer.seek(0)
 
     filename = f"reporte_analytics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
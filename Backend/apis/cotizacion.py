@@ -0,0 +1,101 @@
+"""
+API de cotizaciones - Cotizaciones guardadas con vigencia
+"""
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from database.config import get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
+from sqlalchemy.orm import Session
+from auth.security import obtener_id_usuario_solicitante
+from cruds.cotizacion_crud import CotizacionCRUD
+from schemas.cotizacion_schema import (
+    CotizacionCreate,
+    CotizacionResponse,
+    PurgaCotizacionesResponse,
+)
+
+router = APIRouter(prefix="/cotizaciones", tags=["Cotizaciones"])
+
+
+@router.post(
+    "/", response_model=CotizacionResponse, status_code=status.HTTP_201_CREATED
+)
+async def crear_cotizacion(
+    cotizacion_data: CotizacionCreate,
+    db: Session = Depends(get_db),
+    creado_por: Optional[UUID] = Query(None, description="UUID del usuario que cotiza"),
+    x_user_id: Optional[str] = Header(None, alias="X-User-ID"),
+):
+    """
+    Cotizar un envío y guardar la cotización.
+    El id devuelto se puede enviar como id_cotizacion al crear el paquete para
+    registrarlo con este precio mientras la cotización esté vigente.
+    """
+    id_usuario = obtener_id_usuario_solicitante(db, creado_por, x_user_id)
+    try:
+        cotizacion_crud = CotizacionCRUD(db)
+        cotizacion = cotizacion_crud.cotizar(cotizacion_data)
+        if cotizacion is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Sede no encontrada",
+            )
+        return cotizacion_crud.guardar(
+            cotizacion=cotizacion,
+            id_sede_origen=cotizacion_data.id_sede_origen,
+            id_sede_destino=cotizacion_data.id_sede_destino,
+            creado_por=id_usuario,
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al crear la cotización: {str(e)}",
+        )
+
+
+@router.delete("/expiradas", response_model=PurgaCotizacionesResponse)
+async def purgar_cotizaciones_expiradas(
+    antes_de: Optional[datetime] = Query(
+        None, description="Eliminar las que expiraron antes de esta fecha; por defecto ahora"
+    ),
+    db: Session = Depends(get_db),
+):
+    """Eliminar las cotizaciones expiradas que no se usaron para un paquete."""
+    try:
+        antes_de = antes_de or datetime.now()
+        eliminadas = CotizacionCRUD(db).purgar_expiradas(antes_de)
+        return PurgaCotizacionesResponse(eliminadas=eliminadas, antes_de=antes_de)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al purgar cotizaciones: {str(e)}",
+        )
+
+
+@router.get("/{id_cotizacion}", response_model=CotizacionResponse)
+async def obtener_cotizacion(id_cotizacion: UUID, db: Session = Depends(get_db)):
+    """Obtener una cotización guardada."""
+    try:
+        cotizacion = CotizacionCRUD(db).obtener_por_id(id_cotizacion)
+        if not cotizacion:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Cotización no encontrada",
+            )
+        return cotizacion
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al obtener la cotización: {str(e)}",
+        )
@@ -0,0 +1,114 @@
+"""
+API de depuración - Perfiles, planes de consultas y trazas para administradores
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from observabilidad.perfilador import TOKEN_ADMIN, a_folded, perfilador, token_valido
+from observabilidad.planes import registro_planes
+from observabilidad.trazas import exportador
+
+
+def verificar_token_admin(
+    x_admin_token: Optional[str] = Header(None, alias="X-Admin-Token"),
+):
+    """Exige el token de administración de OBSERVABILIDAD_TOKEN."""
+    if not TOKEN_ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Las herramientas de depuración no están habilitadas",
+        )
+    if not token_valido(x_admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Token de administración no válido",
+        )
+
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["Depuración"],
+    dependencies=[Depends(verificar_token_admin)],
+)
+
+
+@router.get("/perfiles")
+def listar_perfiles():
+    """Perfiles de requests guardados, del más reciente al más antiguo."""
+    return {"profiles": perfilador.perfiles()}
+
+
+@router.get("/perfiles/fondo", response_class=PlainTextResponse)
+def perfil_fondo(reset: bool = False):
+    """
+    Pilas acumuladas por el muestreo de fondo en formato folded.
+    Con `reset=true` se empieza a acumular de nuevo.
+    """
+    muestras = perfilador.muestras_fondo
+    desde = perfilador.fondo_desde
+    pilas = perfilador.pilas_fondo(reiniciar=reset)
+    return PlainTextResponse(
+        a_folded(pilas),
+        headers={
+            "X-Muestras": str(muestras),
+            "X-Desde": desde.isoformat() if desde else "",
+        },
+    )
+
+
+@router.get("/perfiles/{id_perfil}", response_class=PlainTextResponse)
+def obtener_perfil(id_perfil: str):
+    """Pilas de un request perfilado en formato folded (flamegraph.pl, speedscope)."""
+    perfil = perfilador.perfil(id_perfil)
+    if perfil is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Perfil no encontrado"
+        )
+    return PlainTextResponse(
+        a_folded(perfil.pilas),
+        headers={"X-Muestras": str(perfil.muestras)},
+    )
+
+
+@router.get("/planes")
+def listar_planes():
+    """Sentencias lentas con plan capturado, con su último resumen de escaneos."""
+    return {"statements": registro_planes.resumen()}
+
+
+@router.get("/planes/regresiones")
+def regresiones_planes():
+    """Sentencias cuyo plan pasó de leer una tabla por índice a un Seq Scan."""
+    return {"regressions": registro_planes.regresiones()}
+
+
+@router.get("/planes/{huella}")
+def obtener_planes(huella: str):
+    """Planes guardados de una sentencia, del más antiguo al más reciente."""
+    planes = registro_planes.planes(huella)
+    if planes is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Sentencia no encontrada"
+        )
+    return planes
+
+
+@router.get("/trazas")
+def listar_trazas(limit: int = 50, min_ms: float = 0.0):
+    """Trazas más recientes de la API, sin sus spans."""
+    limit = max(1, min(200, int(limit)))
+    return {"traces": exportador.recientes(limite=limit, minimo_ms=max(0.0, min_ms))}
+
+
+@router.get("/trazas/{id_traza}")
+def obtener_traza(id_traza: str):
+    """Traza completa con todos sus spans."""
+    traza = exportador.traza(id_traza)
+    if traza is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Traza no encontrada"
+        )
+    return traza
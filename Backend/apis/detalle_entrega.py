@@ -14,6 +14,8 @@ from schemas.detalle_entrega_schema import (
     DetalleEntregaUpdate,
     DetalleEntregaResponse,
     DetalleEntregaListResponse,
+    ReclamoEntregaCreate,
+    LiberarEntregaRequest,
 )
 from schemas.auth_schema import RespuestaAPI
 
@@ -220,6 +222,57 @@ async def crear_detalle_entrega(
         )
 
 
+@router.post("/reclamar", response_model=List[DetalleEntregaResponse])
+async def reclamar_entregas(
+    reclamo: ReclamoEntregaCreate, db: Session = Depends(get_db)
+):
+    """Reclamar entregas pendientes de la sede del mensajero."""
+    try:
+        detalle_crud = DetalleEntregaCRUD(db)
+        return detalle_crud.reclamar_pendientes(
+            id_mensajero=reclamo.id_mensajero,
+            cantidad=reclamo.cantidad,
+            duracion_minutos=reclamo.duracion_minutos,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al reclamar entregas: {str(e)}",
+        )
+
+
+@router.post("/{id_detalle}/liberar", response_model=RespuestaAPI)
+async def liberar_entrega(
+    id_detalle: UUID,
+    datos: LiberarEntregaRequest,
+    db: Session = Depends(get_db),
+):
+    """Liberar una entrega reclamada por un mensajero."""
+    try:
+        detalle_crud = DetalleEntregaCRUD(db)
+        liberado = detalle_crud.liberar(
+            id_detalle=id_detalle, id_mensajero=datos.id_mensajero
+        )
+        if not liberado:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="La entrega no está reclamada por este mensajero",
+            )
+        return RespuestaAPI(mensaje="Entrega liberada exitosamente", exito=True)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al liberar entrega: {str(e)}",
+        )
+
+
 @router.put("/{id_detalle}", response_model=DetalleEntregaResponse)
 async def actualizar_detalle_entrega(
     id_detalle: UUID,
@@ -0,0 +1,83 @@
+"""
+API de escaneos - Ingesta de lecturas de los escáneres de las sedes
+"""
+
+from typing import List
+from uuid import UUID
+from datetime import datetime
+from database.config import get_db
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from cruds.escaneo_crud import EscaneoCRUD
+from schemas.escaneo_schema import (
+    EscaneoCreate,
+    EscaneoLoteCreate,
+    EscaneoAceptadoResponse,
+    EscaneoResponse,
+)
+from services.buffer_escaneos import buffer_escaneos, BufferLlenoError
+
+router = APIRouter(prefix="/escaneos", tags=["Escaneos"])
+
+
+def _encolar(escaneos: List[EscaneoCreate]) -> EscaneoAceptadoResponse:
+    """Encola los escaneos en el buffer; la escritura se hace en micro-lotes."""
+    recibido = datetime.now()
+    filas = [
+        {
+            "id_paquete": escaneo.id_paquete,
+            "id_sede": escaneo.id_sede,
+            "estado": escaneo.estado,
+            "fecha_escaneo": escaneo.fecha_escaneo or recibido,
+        }
+        for escaneo in escaneos
+    ]
+    try:
+        pendientes = buffer_escaneos.agregar(filas)
+    except BufferLlenoError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        )
+    return EscaneoAceptadoResponse(aceptados=len(filas), pendientes_en_buffer=pendientes)
+
+
+@router.post(
+    "/",
+    response_model=EscaneoAceptadoResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def registrar_escaneo(escaneo: EscaneoCreate):
+    """Registrar un escaneo. Se confirma de inmediato y se escribe en el siguiente lote."""
+    return _encolar([escaneo])
+
+
+@router.post(
+    "/lote",
+    response_model=EscaneoAceptadoResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def registrar_escaneos_lote(datos: EscaneoLoteCreate):
+    """Registrar varios escaneos en una sola petición."""
+    return _encolar(datos.escaneos)
+
+
+@router.get("/estado-buffer")
+async def obtener_estado_buffer():
+    """Obtener los contadores del buffer de escaneos."""
+    return buffer_escaneos.estadisticas()
+
+
+@router.get("/paquete/{id_paquete}", response_model=List[EscaneoResponse])
+async def obtener_escaneos_por_paquete(
+    id_paquete: UUID, skip: int = 0, limit: int = 50, db: Session = Depends(get_db)
+):
+    """Obtener el historial de escaneos de un paquete."""
+    try:
+        escaneo_crud = EscaneoCRUD(db)
+        return escaneo_crud.obtener_por_paquete(id_paquete, skip=skip, limit=limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al obtener escaneos del paquete: {str(e)}",
+        )
@@ -0,0 +1,274 @@
+"""
+API de rutas - Tramos entre sedes y cálculo de caminos por la red
+"""
+
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from database.config import get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
+from sqlalchemy.orm import Session
+from auth.security import obtener_id_usuario_solicitante
+from cruds.cotizacion_crud import CotizacionCRUD
+from cruds.ruta_crud import RutaSedeCRUD
+from schemas.ruta_schema import (
+    RutaSedeCreate,
+    RutaSedeUpdate,
+    RutaSedeResponse,
+    CaminoResponse,
+    TiempoRutaResponse,
+    TiemposRutaPublicadosResponse,
+)
+from schemas.cotizacion_schema import CotizacionCreate
+from schemas.auth_schema import RespuestaAPI
+from services.enrutador_sedes import enrutador_sedes
+from services.servicio_mensajeria import TipoEnvio, TamañoPaquete
+from services.tiempos_ruta import (
+    MINIMO_ENVIOS,
+    calcular_tiempos_ruta,
+    cargar_tiempos_ruta,
+)
+
+router = APIRouter(prefix="/rutas", tags=["Rutas"])
+
+
+@router.get("/", response_model=List[RutaSedeResponse])
+async def obtener_rutas(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    """Obtener los tramos activos con paginación."""
+    try:
+        ruta_crud = RutaSedeCRUD(db)
+        return ruta_crud.obtener_activas(skip=skip, limit=limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al obtener rutas: {str(e)}",
+        )
+
+
+@router.get("/camino", response_model=CaminoResponse)
+async def obtener_camino(
+    id_sede_origen: UUID = Query(..., description="ID de la sede de origen"),
+    id_sede_destino: UUID = Query(..., description="ID de la sede de destino"),
+):
+    """Obtener el camino más corto entre dos sedes por la red de tramos."""
+    try:
+        ruta = enrutador_sedes.ruta(id_sede_origen, id_sede_destino)
+        if not ruta:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No hay un camino entre estas sedes",
+            )
+        return CaminoResponse(
+            id_sede_origen=id_sede_origen,
+            id_sede_destino=id_sede_destino,
+            sedes=list(ruta.sedes),
+            distancia_km=round(ruta.distancia_km, 2),
+            transbordos=ruta.transbordos,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al calcular el camino: {str(e)}",
+        )
+
+
+@router.get("/cotizar", response_model=Dict[str, Any])
+async def cotizar_por_ruta(
+    id_sede_origen: UUID = Query(..., description="ID de la sede de origen"),
+    id_sede_destino: UUID = Query(..., description="ID de la sede de destino"),
+    peso_kg: float = Query(..., gt=0, le=100, description="Peso del paquete en kg"),
+    tamaño: TamañoPaquete = Query(TamañoPaquete.MEDIANO, description="Tamaño del paquete"),
+    tipo_envio: TipoEnvio = Query(TipoEnvio.NORMAL, description="Tipo de envío"),
+    es_fragil: bool = Query(False, description="Si el paquete es frágil"),
+    valor_declarado: float = Query(0.0, ge=0, description="Valor declarado"),
+    db: Session = Depends(get_db),
+):
+    """Cotizar un envío usando el camino por la red de sedes, sin guardarlo."""
+    try:
+        cotizacion = CotizacionCRUD(db).cotizar(
+            CotizacionCreate(
+                id_sede_origen=id_sede_origen,
+                id_sede_destino=id_sede_destino,
+                peso_kg=peso_kg,
+                tamaño=tamaño,
+                tipo_envio=tipo_envio,
+                es_fragil=es_fragil,
+                valor_declarado=valor_declarado,
+            )
+        )
+        if cotizacion is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Sede no encontrada",
+            )
+        return cotizacion
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al cotizar el envío: {str(e)}",
+        )
+
+
+@router.get("/tiempos", response_model=List[TiempoRutaResponse])
+async def obtener_tiempos_ruta(
+    id_sede_origen: Optional[UUID] = Query(None, description="Filtrar por sede de origen"),
+    id_sede_destino: Optional[UUID] = Query(None, description="Filtrar por sede de destino"),
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+):
+    """Obtener los tiempos de entrega históricos (p10/p50/p90) por ruta y tipo."""
+    try:
+        ruta_crud = RutaSedeCRUD(db)
+        return ruta_crud.obtener_tiempos(
+            id_sede_origen=id_sede_origen,
+            id_sede_destino=id_sede_destino,
+            skip=skip,
+            limit=limit,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al obtener tiempos por ruta: {str(e)}",
+        )
+
+
+@router.post("/tiempos/recalcular", response_model=TiemposRutaPublicadosResponse)
+def recalcular_tiempos_ruta(
+    dias: int = Query(365, ge=1, le=1825, description="Días de entregas a considerar"),
+    minimo_envios: int = Query(
+        MINIMO_ENVIOS, ge=1, description="Entregas mínimas para guardar una ruta"
+    ),
+    db: Session = Depends(get_db),
+):
+    """Recalcular los tiempos por ruta con las entregas completadas y publicarlos."""
+    try:
+        calculadas = calcular_tiempos_ruta(db, dias=dias, minimo_envios=minimo_envios)
+        return TiemposRutaPublicadosResponse(
+            rutas_calculadas=calculadas, rutas_publicadas=cargar_tiempos_ruta()
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al recalcular tiempos por ruta: {str(e)}",
+        )
+
+
+@router.post("/tiempos/recargar", response_model=TiemposRutaPublicadosResponse)
+def recargar_tiempos_ruta():
+    """Volver a leer la tabla de tiempos por ruta, p. ej. después de ejecutar el script."""
+    try:
+        return TiemposRutaPublicadosResponse(rutas_publicadas=cargar_tiempos_ruta())
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al recargar tiempos por ruta: {str(e)}",
+        )
+
+
+@router.post("/", response_model=RutaSedeResponse, status_code=status.HTTP_201_CREATED)
+async def crear_ruta(
+    ruta_data: RutaSedeCreate,
+    db: Session = Depends(get_db),
+    creado_por: Optional[UUID] = Query(None, description="UUID del usuario que crea el registro"),
+    x_user_id: Optional[str] = Header(None, alias="X-User-ID"),
+):
+    """Crear un tramo entre dos sedes."""
+    id_usuario = obtener_id_usuario_solicitante(db, creado_por, x_user_id)
+    try:
+        ruta_crud = RutaSedeCRUD(db)
+        return ruta_crud.crear_ruta(
+            datos_entrada=ruta_data,
+            creado_por=id_usuario,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al crear ruta: {str(e)}",
+        )
+
+
+@router.put("/{id_ruta}", response_model=RutaSedeResponse)
+async def actualizar_ruta(
+    id_ruta: UUID,
+    ruta_data: RutaSedeUpdate,
+    db: Session = Depends(get_db),
+    actualizado_por: Optional[UUID] = Query(None, description="UUID del usuario que realiza la actualización"),
+    x_user_id: Optional[str] = Header(None, alias="X-User-ID"),
+):
+    """Actualizar un tramo existente."""
+    id_usuario = obtener_id_usuario_solicitante(db, actualizado_por, x_user_id)
+    try:
+        ruta_crud = RutaSedeCRUD(db)
+        ruta = ruta_crud.obtener_por_id(id_ruta)
+        if not ruta:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Ruta no encontrada"
+            )
+
+        ruta_actualizada = ruta_crud.actualizar_ruta(
+            objeto_db=ruta,
+            datos_entrada=ruta_data,
+            actualizado_por=id_usuario,
+        )
+        if not ruta_actualizada:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No se pudo actualizar la ruta",
+            )
+        return ruta_actualizada
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al actualizar la ruta: {str(e)}",
+        )
+
+
+@router.delete("/{id_ruta}", response_model=RespuestaAPI)
+async def eliminar_ruta(
+    id_ruta: UUID,
+    actualizado_por: Optional[UUID] = Query(None, description="UUID del usuario que realiza la eliminación"),
+    db: Session = Depends(get_db),
+    x_user_id: Optional[str] = Header(None, alias="X-User-ID"),
+):
+    """Eliminar un tramo. Soft delete."""
+    id_usuario = obtener_id_usuario_solicitante(db, actualizado_por, x_user_id)
+    try:
+        ruta_crud = RutaSedeCRUD(db)
+        eliminado = ruta_crud.desactivar_ruta(
+            id_ruta=id_ruta,
+            actualizado_por=id_usuario,
+        )
+        if not eliminado:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Ruta no encontrada o ya inactiva",
+            )
+        return RespuestaAPI(mensaje="Ruta desactivada exitosamente", exito=True)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al desactivar la ruta: {str(e)}",
+        )
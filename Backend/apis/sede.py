@@ -2,18 +2,26 @@
 API de sedes - Endpoints para gestión de sedes
 """
 
+import time
 from typing import List, Optional
 from uuid import UUID
 from database.config import get_db
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
 from sqlalchemy.orm import Session
+from auth.security import obtener_id_usuario_solicitante
 from cruds.sede_crud import SedeCRUD
+from cruds.paquete_crud import PaqueteCRUD
+from cruds.transporte_crud import TransporteCRUD
 from schemas.sede_schema import (
     SedeCreate,
     SedeUpdate,
     SedeResponse,
+    SedeCercanaResponse,
 )
 from schemas.auth_schema import RespuestaAPI
+from schemas.despacho_schema import PlanDespachoResponse
+from services.planificador_despacho import planificar_first_fit_decreasing
+from services.indice_sedes import indice_sedes
 from schemas.sede_schema import SedeResponse
 
 router = APIRouter(prefix="/sedes", tags=["Sedes"])
@@ -49,6 +57,33 @@ async def obtener_sedes_activos(
         )
 
 
+@router.get("/cercanas", response_model=List[SedeCercanaResponse])
+async def obtener_sedes_cercanas(
+    lat: float = Query(..., ge=-90, le=90, description="Latitud del punto de referencia"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitud del punto de referencia"),
+    k: int = Query(5, ge=1, le=50, description="Número de sedes a devolver"),
+):
+    """Obtener las sedes activas más cercanas a un punto."""
+    try:
+        return [
+            SedeCercanaResponse(
+                id_sede=sede.id_sede,
+                nombre=sede.nombre,
+                ciudad=sede.ciudad,
+                direccion=sede.direccion,
+                latitud=sede.latitud,
+                longitud=sede.longitud,
+                distancia_km=round(distancia, 3),
+            )
+            for sede, distancia in indice_sedes.cercanas(lat, lon, k)
+        ]
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al buscar sedes cercanas: {str(e)}",
+        )
+
+
 @router.get("/{id_sede}", response_model=SedeResponse)
 async def obtener_sede_por_id(id_sede: UUID, db: Session = Depends(get_db)):
     """Obtener una sede por su ID."""
@@ -103,6 +138,66 @@ async def obtener_sede_por_nombre(nombre_sede: str, db: Session = Depends(get_db
         )
 
 
+@router.post("/{id_sede}/plan-despacho", response_model=PlanDespachoResponse)
+async def planificar_despacho(
+    id_sede: UUID,
+    max_paquetes: int = Query(
+        10000, ge=1, le=50000, description="Número máximo de paquetes a planificar"
+    ),
+    confirmar: bool = Query(
+        False, description="Guardar el plan: despachar los envíos en sus vehículos"
+    ),
+    db: Session = Depends(get_db),
+    actualizado_por: Optional[UUID] = Query(None, description="UUID del usuario que confirma el despacho"),
+    x_user_id: Optional[str] = Header(None, alias="X-User-ID"),
+):
+    """
+    Asignar los paquetes pendientes de una sede a sus vehículos disponibles.
+    Con confirmar=true el plan se guarda y los envíos quedan en tránsito.
+    """
+    usuario_id = (
+        obtener_id_usuario_solicitante(db, actualizado_por, x_user_id)
+        if confirmar
+        else None
+    )
+    try:
+        sede = SedeCRUD(db).obtener_por_id(id_sede)
+        if not sede:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Sede no encontrada",
+            )
+
+        paquetes = PaqueteCRUD(db).obtener_pendientes_despacho(
+            id_sede, limit=max_paquetes
+        )
+        vehiculos = [
+            (t.id_transporte, t.placa, t.capacidad_carga)
+            for t in TransporteCRUD(db).obtener_disponibles_por_sede(id_sede)
+        ]
+
+        inicio = time.perf_counter()
+        plan = planificar_first_fit_decreasing(paquetes, vehiculos)
+        plan["tiempo_planificacion_ms"] = round(
+            (time.perf_counter() - inicio) * 1000, 3
+        )
+        plan["id_sede"] = id_sede
+
+        if confirmar:
+            plan["envios_despachados"] = TransporteCRUD(db).confirmar_despacho(
+                asignaciones=plan["asignaciones"], actualizado_por=usuario_id
+            )
+            plan["confirmado"] = True
+        return plan
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al planificar el despacho: {str(e)}",
+        )
+
+
 @router.post("/", response_model=SedeResponse, status_code=status.HTTP_201_CREATED)
 async def crear_sede(
     sede_data: SedeCreate,
@@ -0,0 +1,52 @@
+"""
+API de simulaciones - Efecto de cambios de tarifas sobre los envíos históricos
+"""
+
+from datetime import datetime, timedelta
+from database.config import get_db
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from schemas.simulacion_schema import (
+    SimulacionTarifasRequest,
+    SimulacionTarifasResponse,
+)
+
+router = APIRouter(prefix="/simulaciones", tags=["Simulaciones"])
+
+
+@router.post("/tarifas", response_model=SimulacionTarifasResponse)
+async def simular_cambio_tarifas(
+    simulacion_data: SimulacionTarifasRequest, db: Session = Depends(get_db)
+):
+    """
+    Volver a cotizar los envíos de un período con tarifas candidatas.
+    Compara los ingresos con la tabla vigente, por sede de origen y tipo de
+    envío, sin guardar ni publicar las tarifas.
+    """
+    """ El simulador usa NumPy; se importa en la primera simulación y no al arrancar """
+    from services.simulador_tarifas import simular_tarifas
+
+    try:
+        fecha_fin = simulacion_data.fecha_fin or datetime.now()
+        fecha_inicio = simulacion_data.fecha_inicio or fecha_fin - timedelta(days=365)
+        if fecha_inicio >= fecha_fin:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="La fecha de fin debe ser posterior a la de inicio",
+            )
+        return simular_tarifas(
+            db,
+            [
+                (tarifa.concepto, tarifa.clave, tarifa.valor)
+                for tarifa in simulacion_data.tarifas
+            ],
+            fecha_inicio,
+            fecha_fin,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al simular tarifas: {str(e)}",
+        )
@@ -0,0 +1,106 @@
+"""
+API de tarifas - Tarifas con vigencia usadas por las cotizaciones
+"""
+
+from typing import List, Optional
+from uuid import UUID
+from database.config import get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
+from sqlalchemy.orm import Session
+from auth.security import obtener_id_usuario_solicitante
+from cruds.tarifa_crud import TarifaCRUD
+from schemas.tarifa_schema import TarifaCreate, TarifaResponse, TablaTarifasResponse
+from schemas.auth_schema import RespuestaAPI
+from services.servicio_mensajeria import ServicioMensajeria, TablaTarifas
+from services.tarifas import gestor_tarifas, tabla_a_dict
+
+router = APIRouter(prefix="/tarifas", tags=["Tarifas"])
+
+
+def _respuesta_tabla(tabla: TablaTarifas) -> TablaTarifasResponse:
+    return TablaTarifasResponse(
+        tarifas=tabla_a_dict(tabla),
+        vigente_desde=tabla.vigente_desde,
+        siguiente_vigencia=tabla.siguiente_vigencia,
+    )
+
+
+@router.get("/vigentes", response_model=TablaTarifasResponse)
+async def obtener_tarifas_vigentes():
+    """Obtener la tabla de tarifas que usan las cotizaciones."""
+    return _respuesta_tabla(ServicioMensajeria.tabla_vigente())
+
+
+@router.post("/recargar", response_model=TablaTarifasResponse)
+async def recargar_tarifas():
+    """Volver a leer las tarifas de la base de datos y publicarlas."""
+    try:
+        return _respuesta_tabla(gestor_tarifas.recargar())
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al recargar tarifas: {str(e)}",
+        )
+
+
+@router.get("/", response_model=List[TarifaResponse])
+async def obtener_tarifas(
+    concepto: Optional[str] = Query(None, description="Filtrar por concepto"),
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+):
+    """Obtener el historial de tarifas activas."""
+    try:
+        tarifa_crud = TarifaCRUD(db)
+        return tarifa_crud.obtener_historial(concepto=concepto, skip=skip, limit=limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al obtener tarifas: {str(e)}",
+        )
+
+
+@router.post("/", response_model=TarifaResponse, status_code=status.HTTP_201_CREATED)
+async def crear_tarifa(
+    tarifa_data: TarifaCreate,
+    db: Session = Depends(get_db),
+    creado_por: Optional[UUID] = Query(None, description="UUID del usuario que crea el registro"),
+    x_user_id: Optional[str] = Header(None, alias="X-User-ID"),
+):
+    """Registrar una tarifa; aplica desde su fecha de vigencia."""
+    usuario_id = obtener_id_usuario_solicitante(db, creado_por, x_user_id)
+    try:
+        tarifa_crud = TarifaCRUD(db)
+        return tarifa_crud.crear_tarifa(datos_entrada=tarifa_data, creado_por=usuario_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al crear tarifa: {str(e)}",
+        )
+
+
+@router.delete("/{id_tarifa}", response_model=RespuestaAPI)
+async def eliminar_tarifa(
+    id_tarifa: UUID,
+    actualizado_por: Optional[UUID] = Query(None, description="UUID del usuario que realiza la eliminación"),
+    db: Session = Depends(get_db),
+    x_user_id: Optional[str] = Header(None, alias="X-User-ID"),
+):
+    """Desactivar una tarifa. Soft delete."""
+    usuario_id = obtener_id_usuario_solicitante(db, actualizado_por, x_user_id)
+    try:
+        tarifa_crud = TarifaCRUD(db)
+        if not tarifa_crud.desactivar_tarifa(id_tarifa=id_tarifa, actualizado_por=usuario_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tarifa no encontrada o ya inactiva",
+            )
+        return RespuestaAPI(mensaje="Tarifa desactivada exitosamente", exito=True)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al desactivar la tarifa: {str(e)}",
+        )
@@ -8,14 +8,24 @@ from datetime import datetime
 from database.config import get_db
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from cruds.transporte_crud import TransporteCRUD
+from cruds.posicion_transporte_crud import PosicionTransporteCRUD
+from cruds.sede_crud import SedeCRUD
 from schemas.transporte_schema import (
     TransporteCreate,
     TransporteUpdate,
     TransporteResponse,
     TransporteListResponse,
 )
+from schemas.telemetria_schema import (
+    TelemetriaLoteCreate,
+    TelemetriaAceptadaResponse,
+    PosicionResponse,
+    ReduccionTelemetriaResponse,
+)
 from schemas.auth_schema import RespuestaAPI
+from services.indice_posiciones import indice_posiciones, PosicionActual
 
 router = APIRouter(prefix="/transportes", tags=["Transportes"])
 
@@ -67,6 +77,121 @@ async def obtener_transportes_activos(
         )
 
 
+@router.post(
+    "/telemetria",
+    response_model=TelemetriaAceptadaResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def registrar_telemetria(
+    telemetria: TelemetriaLoteCreate, db: Session = Depends(get_db)
+):
+    """Registrar un lote de pings GPS de un vehículo."""
+    try:
+        posicion_crud = PosicionTransporteCRUD(db)
+        aceptados = posicion_crud.registrar_lote(
+            telemetria.id_transporte, telemetria.puntos
+        )
+
+        ultimo = max(telemetria.puntos, key=lambda punto: punto.fecha_registro)
+        indice_posiciones.actualizar(
+            PosicionActual(
+                id_transporte=telemetria.id_transporte,
+                latitud=ultimo.latitud,
+                longitud=ultimo.longitud,
+                fecha_registro=ultimo.fecha_registro,
+                velocidad_kmh=ultimo.velocidad_kmh,
+            )
+        )
+        return TelemetriaAceptadaResponse(
+            id_transporte=telemetria.id_transporte,
+            recibidos=len(telemetria.puntos),
+            aceptados=aceptados,
+        )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Vehículo no encontrado",
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al registrar telemetría: {str(e)}",
+        )
+
+
+@router.post("/telemetria/reducir", response_model=ReduccionTelemetriaResponse)
+def reducir_telemetria(
+    antiguedad_dias: int = Query(30, ge=1, description="Reducir pings con más de N días"),
+    intervalo_minutos: int = Query(
+        10, ge=1, le=1440, description="Conservar un ping por intervalo"
+    ),
+    db: Session = Depends(get_db),
+):
+    """Reducir la resolución de la telemetría antigua."""
+    try:
+        posicion_crud = PosicionTransporteCRUD(db)
+        eliminados = posicion_crud.reducir_resolucion(
+            antiguedad_dias=antiguedad_dias, intervalo_minutos=intervalo_minutos
+        )
+        return ReduccionTelemetriaResponse(
+            eliminados=eliminados,
+            antiguedad_dias=antiguedad_dias,
+            intervalo_minutos=intervalo_minutos,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al reducir telemetría: {str(e)}",
+        )
+
+
+@router.get("/posiciones", response_model=List[PosicionResponse])
+async def obtener_posiciones():
+    """Obtener la última posición conocida de cada vehículo."""
+    return indice_posiciones.obtener_todas()
+
+
+@router.get("/posiciones/cercanos/{id_sede}", response_model=List[PosicionResponse])
+def obtener_transportes_cercanos(
+    id_sede: UUID,
+    radio_km: float = Query(10.0, gt=0, le=2000, description="Radio de búsqueda"),
+    limite: int = Query(50, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    """Obtener los vehículos cercanos a una sede según su última posición."""
+    sede = SedeCRUD(db).obtener_por_id(id_sede)
+    if not sede:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sede no encontrada",
+        )
+    if sede.latitud is None or sede.longitud is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="La sede no tiene coordenadas configuradas",
+        )
+
+    cercanos = indice_posiciones.cercanos(
+        sede.latitud, sede.longitud, radio_km, limite=limite
+    )
+    return [
+        PosicionResponse(
+            id_transporte=posicion.id_transporte,
+            latitud=posicion.latitud,
+            longitud=posicion.longitud,
+            fecha_registro=posicion.fecha_registro,
+            velocidad_kmh=posicion.velocidad_kmh,
+            distancia_km=round(distancia, 3),
+        )
+        for posicion, distancia in cercanos
+    ]
+
+
 @router.get("/{id_transporte}", response_model=TransporteResponse)
 async def obtener_transporte_por_id(id_transporte: UUID, db: Session = Depends(get_db)):
     """Obtener un vehículo por su ID."""
@@ -12,7 +12,8 @@ from .security import (
     obtener_roles as get_roles,
     obtener_id_rol as get_role_id,
     obtener_nombre_rol as get_role_name,
-    limpiar_cache_roles as clear_roles_cache
+    limpiar_cache_roles as clear_roles_cache,
+    obtener_id_usuario_solicitante as get_requesting_user_id
 )
 
 __all__ = [
@@ -27,5 +28,6 @@ __all__ = [
     'get_roles',
     'get_role_id',
     'get_role_name',
-    'clear_roles_cache'
+    'clear_roles_cache',
+    'get_requesting_user_id'
 ]
@@ -1,8 +1,11 @@
 from typing import Optional, Dict, Any
+from uuid import UUID
+from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from database.config import get_db
 from cruds.usuario_crud import UsuarioCRUD
 from cruds.rol_crud import RolCRUD
+from observabilidad.metricas import registrar_cache
 
 _cache_roles = {}
 
@@ -14,6 +17,7 @@ def obtener_roles(db: Session) -> Dict[str, str]:
     """
     global _cache_roles
 
+    registrar_cache("roles", bool(_cache_roles))
     if _cache_roles:
         return _cache_roles
 
@@ -171,3 +175,45 @@ def requiere_rol(datos_usuario: Dict[str, Any], rol_requerido: str) -> bool:
 
     verificador = verificadores_rol.get(rol_requerido.lower())
     return verificador(datos_usuario) if verificador else False
+
+
+def obtener_id_usuario_solicitante(
+    db: Session, usuario: Optional[UUID], x_user_id: Optional[str]
+) -> UUID:
+    """
+    Obtiene el ID del usuario que hace la petición, desde el query param o el
+    header X-User-ID, y verifica que exista y esté activo.
+
+    Args:
+        db: Sesión de base de datos
+        usuario: UUID recibido como parámetro de consulta
+        x_user_id: Valor del header X-User-ID
+
+    Returns:
+        UUID: ID del usuario solicitante
+
+    Raises:
+        HTTPException: 400 si el header no es un UUID, 401 si no se indica
+            usuario o no existe un usuario activo con ese ID
+    """
+    if usuario is None and x_user_id:
+        try:
+            usuario = UUID(x_user_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="El header X-User-ID debe ser un UUID válido",
+            )
+    if usuario is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Se requiere el usuario (parámetro de consulta o header X-User-ID)",
+        )
+
+    registro = UsuarioCRUD(db).obtener_por_id(usuario)
+    if not registro or not registro.activo:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Usuario no encontrado o inactivo",
+        )
+    return usuario
@@ -0,0 +1,12 @@
+"""
+Benchmarks de los caminos más usados de la API.
+
+Miden contra una base PostgreSQL local los listados de paquetes con cada
+filtro, la creación de detalles de entrega, todos los endpoints de
+`/analytics`, la cotización completa y el login. Los resultados se guardan en
+JSON para comparar corridas y marcar regresiones contra una línea base.
+
+Uso:
+    python -m benchmarks.ejecutar --escalas 10000,100000,1000000
+    python -m benchmarks.comparar resultados/actual.json resultados/base.json
+"""
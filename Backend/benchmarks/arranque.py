@@ -0,0 +1,210 @@
+"""
+Mide cuánto tarda la API en importarse y en quedar lista.
+
+Cada repetición corre en un proceso nuevo, como un worker recién lanzado:
+
+- import: `import main` en un intérprete ya iniciado.
+- startup: los eventos de arranque de la app (tareas de fondo y cachés).
+- listo: desde que se lanza `uvicorn main:app` hasta que GET /salud/listo
+  responde 200; incluye el intérprete, la importación, el startup y la
+  primera conexión a la base de datos.
+
+Con `--modulos` se listan además los módulos que más tardan en importarse
+(`python -X importtime`). La base de datos debe tener el esquema aplicado
+(scripts/migrar.py).
+
+Uso:
+    python -m benchmarks.arranque --repeticiones 5
+    python -m benchmarks.arranque --limite-ms 4000 --salida resultados/arranque.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+RAIZ_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+""" Se ejecuta en un proceso nuevo; la última línea de su salida es el resultado """
+CODIGO_IMPORTACION = """
+import asyncio, json, time
+inicio = time.perf_counter()
+import main
+importado = time.perf_counter()
+asyncio.run(main.app.router.startup())
+listo = time.perf_counter()
+asyncio.run(main.app.router.shutdown())
+print(json.dumps({"import_ms": (importado - inicio) * 1000, "startup_ms": (listo - importado) * 1000}))
+"""
+
+
+def _estadisticas(valores: List[float]) -> Dict[str, float]:
+    return {
+        "min_ms": round(min(valores), 1),
+        "p50_ms": round(statistics.median(valores), 1),
+        "max_ms": round(max(valores), 1),
+    }
+
+
+def medir_importacion() -> Tuple[float, float]:
+    """Importa main y ejecuta el startup en un proceso nuevo."""
+    salida = subprocess.run(
+        [sys.executable, "-c", CODIGO_IMPORTACION],
+        cwd=RAIZ_BACKEND,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    resultado = json.loads(salida.strip().splitlines()[-1])
+    return resultado["import_ms"], resultado["startup_ms"]
+
+
+def _puerto_libre() -> int:
+    with socket.socket() as conexion:
+        conexion.bind(("127.0.0.1", 0))
+        return conexion.getsockname()[1]
+
+
+def medir_listo(timeout: float) -> float:
+    """Lanza uvicorn y espera a que /salud/listo responda 200."""
+    puerto = _puerto_libre()
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(puerto),
+            "--log-level",
+            "warning",
+        ],
+        cwd=RAIZ_BACKEND,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(timeout=1.0) as cliente:
+            while time.perf_counter() - inicio < timeout:
+                if proceso.poll() is not None:
+                    raise RuntimeError(f"uvicorn terminó con código {proceso.returncode}")
+                try:
+                    respuesta = cliente.get(f"http://127.0.0.1:{puerto}/salud/listo")
+                    if respuesta.status_code == 200:
+                        return (time.perf_counter() - inicio) * 1000
+                except httpx.HTTPError:
+                    pass
+                time.sleep(0.01)
+        raise RuntimeError(f"La API no quedó lista en {timeout:g}s")
+    finally:
+        proceso.terminate()
+        proceso.wait()
+
+
+def modulos_lentos(cantidad: int) -> List[Dict[str, Any]]:
+    """Módulos con más tiempo propio de importación según `python -X importtime`."""
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=RAIZ_BACKEND,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    modulos = []
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|")
+        if not propio.strip().isdigit():
+            continue
+        modulos.append(
+            {
+                "module": nombre.strip(),
+                "self_ms": round(int(propio) / 1000, 1),
+                "cumulative_ms": round(int(acumulado) / 1000, 1),
+            }
+        )
+    modulos.sort(key=lambda modulo: modulo["self_ms"], reverse=True)
+    return modulos[:cantidad]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=5, help="Procesos medidos")
+    parser.add_argument(
+        "--timeout", type=float, default=60.0, help="Segundos máximos para quedar lista"
+    )
+    parser.add_argument(
+        "--modulos", type=int, default=0, help="Listar los N módulos más lentos de importar"
+    )
+    parser.add_argument(
+        "--limite-ms",
+        type=float,
+        default=None,
+        help="Sale con código 1 si la mediana de 'listo' supera este valor",
+    )
+    parser.add_argument("--salida", default=None, help="Archivo JSON donde guardar el reporte")
+    args = parser.parse_args()
+
+    importaciones, arranques, listos = [], [], []
+    for repeticion in range(args.repeticiones):
+        importacion, arranque = medir_importacion()
+        listo = medir_listo(args.timeout)
+        importaciones.append(importacion)
+        arranques.append(arranque)
+        listos.append(listo)
+        print(
+            f"  {repeticion + 1}: import {importacion:7.1f} ms  startup {arranque:7.1f} ms  "
+            f"listo {listo:7.1f} ms"
+        )
+
+    resultado = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repetitions": args.repeticiones,
+        "import": _estadisticas(importaciones),
+        "startup": _estadisticas(arranques),
+        "ready": _estadisticas(listos),
+    }
+    print(
+        f"\nMedianas: import {resultado['import']['p50_ms']:.1f} ms, "
+        f"startup {resultado['startup']['p50_ms']:.1f} ms, "
+        f"listo {resultado['ready']['p50_ms']:.1f} ms"
+    )
+
+    if args.modulos:
+        resultado["modules"] = modulos_lentos(args.modulos)
+        print(f"\n{'módulo':<50} {'propio ms':>10} {'acumulado ms':>13}")
+        for modulo in resultado["modules"]:
+            print(
+                f"{modulo['module']:<50} {modulo['self_ms']:>10.1f} "
+                f"{modulo['cumulative_ms']:>13.1f}"
+            )
+
+    if args.salida:
+        directorio = os.path.dirname(args.salida)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultado, archivo, indent=2, ensure_ascii=False)
+        print(f"\nReporte guardado en {args.salida}")
+
+    if args.limite_ms is not None and resultado["ready"]["p50_ms"] > args.limite_ms:
+        print(f"\nLa mediana de 'listo' supera el límite de {args.limite_ms:g} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
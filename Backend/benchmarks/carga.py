@@ -0,0 +1,230 @@
+"""
+Generador de carga HTTP con el tráfico del frontend.
+
+Lanza `--usuarios` usuarios virtuales contra una API en ejecución. Arrancan
+de forma escalonada durante `--rampa` segundos; cada uno inicia sesión y
+luego abre pantallas (ver `benchmarks.escenarios`) según la mezcla pedida,
+con una pausa aleatoria entre una y otra como la de una persona (`--pausa`
+segundos en promedio; 0 las encadena sin pausa). Al terminar imprime por
+endpoint las peticiones, los errores, el throughput y los percentiles 50,
+95 y 99, y el throughput total una vez terminada la rampa, que es el que
+sirve para comparar cantidades de workers de uvicorn.
+
+Uso:
+    uvicorn main:app --workers 4
+    python -m benchmarks.carga --url http://localhost:8000 --usuarios 50 --rampa 20 --duracion 120
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+import httpx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.escenarios import ESCENARIOS, MEZCLA_POR_DEFECTO, Registro, Sesion, login
+
+
+def _mezcla(texto: str) -> Dict[str, float]:
+    """Convierte "dashboard=3,paquetes=4" en pesos por escenario."""
+    if not texto:
+        return dict(MEZCLA_POR_DEFECTO)
+    mezcla = {}
+    for parte in texto.split(","):
+        nombre, _, peso = parte.partition("=")
+        nombre = nombre.strip()
+        if nombre not in ESCENARIOS:
+            raise ValueError(
+                f"Escenario desconocido: {nombre}. Disponibles: {', '.join(ESCENARIOS)}"
+            )
+        mezcla[nombre] = float(peso or 1)
+    return mezcla
+
+
+def _percentiles(valores: List[float]) -> Dict[str, float]:
+    if len(valores) < 2:
+        valor = round(valores[0], 2) if valores else 0.0
+        return {"p50_ms": valor, "p95_ms": valor, "p99_ms": valor}
+    cortes = statistics.quantiles(valores, n=100, method="inclusive")
+    return {
+        "p50_ms": round(cortes[49], 2),
+        "p95_ms": round(cortes[94], 2),
+        "p99_ms": round(cortes[98], 2),
+    }
+
+
+async def usuario_virtual(
+    numero: int,
+    cliente: httpx.AsyncClient,
+    registro: Registro,
+    paginas: Dict[str, List[float]],
+    args,
+    mezcla: Dict[str, float],
+    fin: float,
+) -> None:
+    """Inicia sesión y abre pantallas hasta que termina la prueba."""
+    await asyncio.sleep(args.rampa * numero / max(1, args.usuarios))
+    sesion = Sesion(cliente, registro, args.semilla + numero, args.usuario, args.clave)
+    if not await login(sesion):
+        print(f"El usuario virtual {numero} no pudo iniciar sesión; sigue sin encabezados")
+
+    nombres = list(mezcla)
+    pesos = [mezcla[nombre] for nombre in nombres]
+    while time.perf_counter() < fin:
+        nombre = sesion.azar.choices(nombres, weights=pesos)[0]
+        inicio = time.perf_counter()
+        await ESCENARIOS[nombre](sesion)
+        paginas.setdefault(nombre, []).append((time.perf_counter() - inicio) * 1000)
+        if args.pausa > 0:
+            await asyncio.sleep(sesion.azar.expovariate(1 / args.pausa))
+
+
+async def ejecutar(args) -> Dict[str, Any]:
+    mezcla = _mezcla(args.mezcla)
+    registro = Registro()
+    paginas: Dict[str, List[float]] = {}
+    """ Un navegador abre hasta 6 conexiones por servidor """
+    limites = httpx.Limits(
+        max_connections=args.usuarios * 6, max_keepalive_connections=args.usuarios * 6
+    )
+    async with httpx.AsyncClient(
+        base_url=args.url,
+        timeout=args.timeout,
+        limits=limites,
+        follow_redirects=True,
+    ) as cliente:
+        inicio = time.perf_counter()
+        fin = inicio + args.rampa + args.duracion
+        await asyncio.gather(
+            *(
+                usuario_virtual(numero, cliente, registro, paginas, args, mezcla, fin)
+                for numero in range(args.usuarios)
+            )
+        )
+        total_segundos = time.perf_counter() - inicio
+
+    """ Throughput estable: solo las peticiones que empezaron después de la rampa """
+    desde = inicio + args.rampa
+    segundos_estables = max(1e-9, total_segundos - args.rampa)
+    endpoints = {}
+    for nombre in sorted(set(registro.latencias) | set(registro.errores)):
+        latencias = registro.latencias.get(nombre, [])
+        errores = registro.errores.get(nombre, {})
+        estables = sum(1 for marca in registro.marcas.get(nombre, []) if marca >= desde)
+        endpoints[nombre] = {
+            "requests": len(latencias) + sum(errores.values()),
+            "errors": errores,
+            "rps": round(estables / segundos_estables, 2),
+            **_percentiles(latencias),
+            "max_ms": round(max(latencias), 2) if latencias else 0.0,
+        }
+
+    exitosas = sum(len(v) for v in registro.latencias.values())
+    estables = sum(
+        1 for marcas in registro.marcas.values() for marca in marcas if marca >= desde
+    )
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "url": args.url,
+        "settings": {
+            "users": args.usuarios,
+            "ramp_seconds": args.rampa,
+            "duration_seconds": args.duracion,
+            "think_seconds": args.pausa,
+            "mix": mezcla,
+        },
+        "total_seconds": round(total_segundos, 2),
+        "requests": exitosas + sum(sum(e.values()) for e in registro.errores.values()),
+        "errors": sum(sum(e.values()) for e in registro.errores.values()),
+        "steady_rps": round(estables / segundos_estables, 2),
+        "endpoints": endpoints,
+        "pages": {
+            nombre: {"loads": len(duraciones), **_percentiles(duraciones)}
+            for nombre, duraciones in sorted(paginas.items())
+        },
+    }
+
+
+def imprimir(resultado: Dict[str, Any]) -> None:
+    print(
+        f"\n{resultado['requests']:,} peticiones en {resultado['total_seconds']:.1f}s, "
+        f"{resultado['errors']:,} con error, "
+        f"{resultado['steady_rps']:.1f} req/s después de la rampa\n"
+    )
+    print(
+        f"{'endpoint':<45} {'req':>7} {'err':>5} {'req/s':>8} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    )
+    for nombre, datos in resultado["endpoints"].items():
+        print(
+            f"{nombre:<45} {datos['requests']:>7,} {sum(datos['errors'].values()):>5} "
+            f"{datos['rps']:>8.1f} {datos['p50_ms']:>9.1f} {datos['p95_ms']:>9.1f} "
+            f"{datos['p99_ms']:>9.1f}"
+        )
+    print(f"\n{'pantalla':<45} {'cargas':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for nombre, datos in resultado["pages"].items():
+        print(
+            f"{nombre:<45} {datos['loads']:>7,} {datos['p50_ms']:>9.1f} "
+            f"{datos['p95_ms']:>9.1f} {datos['p99_ms']:>9.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000", help="URL base de la API")
+    parser.add_argument("--usuarios", type=int, default=20, help="Usuarios virtuales concurrentes")
+    parser.add_argument(
+        "--rampa", type=float, default=10.0, help="Segundos en que arrancan todos los usuarios"
+    )
+    parser.add_argument(
+        "--duracion", type=float, default=60.0, help="Segundos de carga después de la rampa"
+    )
+    parser.add_argument(
+        "--pausa",
+        type=float,
+        default=1.0,
+        help="Pausa promedio en segundos entre pantallas de un mismo usuario",
+    )
+    parser.add_argument(
+        "--mezcla",
+        default="",
+        help="Pesos de los escenarios, p. ej. dashboard=3,paquetes=4,entregas=3,login=1",
+    )
+    parser.add_argument("--usuario", default="admin", help="Usuario con que inician sesión")
+    parser.add_argument("--clave", default="admin123", help="Contraseña del usuario")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Timeout por petición")
+    parser.add_argument("--semilla", type=int, default=None, help="Semilla de los filtros al azar")
+    parser.add_argument("--salida", default=None, help="Archivo JSON donde guardar el reporte")
+    args = parser.parse_args()
+    if args.semilla is None:
+        args.semilla = random.randrange(1_000_000)
+    try:
+        _mezcla(args.mezcla)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(
+        f"{args.usuarios} usuarios contra {args.url}: rampa de {args.rampa:g}s "
+        f"y {args.duracion:g}s de carga..."
+    )
+    resultado = asyncio.run(ejecutar(args))
+    imprimir(resultado)
+    if args.salida:
+        directorio = os.path.dirname(args.salida)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultado, archivo, indent=2, ensure_ascii=False)
+        print(f"\nReporte guardado en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Casos de la suite de benchmarks.
+
+Cada caso es una función sin argumentos que ejecuta una vez la operación
+medida, con datos tomados de la base (el cliente con más envíos, dos sedes
+con coordenadas, un paquete existente), así mide lo mismo que un request
+real a esa escala. Los casos que escriben guardan lo que crean y lo borran
+al terminar.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import func
+
+from cruds.detalle_entrega_crud import DetalleEntregaCRUD
+from cruds.paquete_crud import PaqueteCRUD
+from database.config import SessionLocal
+from entities.cliente import Cliente
+from entities.detalle_entrega import DetalleEntrega
+from entities.paquete import Paquete
+from entities.sede import Sede
+from entities.usuario import Usuario
+from schemas.detalle_entrega_schema import DetalleEntregaCreate
+from services.servicio_mensajeria import (
+    Coordenada,
+    ParametrosEnvio,
+    ServicioMensajeria,
+    TamañoPaquete,
+    TipoEnvio,
+)
+
+USUARIO_LOGIN = "admin"
+CONTRASEÑA_LOGIN = "admin123"
+""" Registros a saltar en el caso de paginación profunda """
+SALTO_PAGINA_PROFUNDA = 10_000
+""" Parámetros de los endpoints de analíticas que no se miden con sus valores por defecto """
+PARAMETROS_ANALITICAS: Dict[str, Dict[str, Any]] = {
+    "/analytics/flota": {"refresh": "true"},
+}
+
+
+@dataclass
+class Caso:
+    """Operación medida por la suite."""
+
+    nombre: str
+    funcion: Callable[[], Any]
+    limpiar: Optional[Callable[[], None]] = None
+
+
+@dataclass
+class Contexto:
+    """Datos reales de la base con que se arman los casos."""
+
+    id_administrador: UUID
+    id_cliente_frecuente: UUID
+    id_cliente_receptor: UUID
+    id_paquete: UUID
+    sede_origen: Sede
+    sede_destino: Sede
+    creados: List[UUID] = field(default_factory=list)
+
+
+def preparar_contexto() -> Contexto:
+    """
+    Busca en la base los registros que usan los casos.
+
+    Raises:
+        RuntimeError: Si la base no tiene datos suficientes
+    """
+    db = SessionLocal()
+    try:
+        administrador = (
+            db.query(Usuario).filter(Usuario.nombre_usuario == USUARIO_LOGIN).first()
+        )
+        frecuente = (
+            db.query(Paquete.id_cliente)
+            .group_by(Paquete.id_cliente)
+            .order_by(func.count().desc())
+            .first()
+        )
+        receptor = (
+            db.query(Cliente.id_cliente)
+            .filter(Cliente.activo == True)
+            .order_by(Cliente.fecha_creacion.desc())
+            .first()
+        )
+        paquete = db.query(Paquete.id_paquete).filter(Paquete.activo == True).first()
+        sedes = (
+            db.query(Sede)
+            .filter(
+                Sede.activo == True,
+                Sede.latitud.isnot(None),
+                Sede.longitud.isnot(None),
+            )
+            .limit(2)
+            .all()
+        )
+        if administrador is None or frecuente is None or receptor is None:
+            raise RuntimeError("La base no tiene el administrador, clientes o paquetes")
+        if paquete is None or len(sedes) < 2:
+            raise RuntimeError("La base necesita paquetes y al menos 2 sedes con coordenadas")
+        db.expunge_all()
+        return Contexto(
+            id_administrador=administrador.id_usuario,
+            id_cliente_frecuente=frecuente[0],
+            id_cliente_receptor=receptor[0],
+            id_paquete=paquete[0],
+            sede_origen=sedes[0],
+            sede_destino=sedes[1],
+        )
+    finally:
+        db.close()
+
+
+def _listar_paquetes(**filtros) -> Callable[[], int]:
+    def listar() -> int:
+        db = SessionLocal()
+        try:
+            return len(PaqueteCRUD(db).obtener_todos(**filtros))
+        finally:
+            db.close()
+
+    return listar
+
+
+def casos_paquetes(contexto: Contexto) -> List[Caso]:
+    """`PaqueteCRUD.obtener_todos` sin filtros, con cada filtro y con un salto grande."""
+    filtros = {
+        "sin_filtros": {},
+        "estado": {"estado": "entregado"},
+        "tipo": {"tipo": "express"},
+        "fragilidad": {"fragilidad": "alta"},
+        "search": {"search": "Electr"},
+        "id_remitente": {"id_remitente": contexto.id_cliente_frecuente},
+        "id_destinatario": {"id_destinatario": contexto.id_cliente_receptor},
+        "inactivos": {"activos": False},
+        "pagina_profunda": {"skip": SALTO_PAGINA_PROFUNDA},
+    }
+    return [
+        Caso(f"paquetes.obtener_todos[{nombre}]", _listar_paquetes(**valores))
+        for nombre, valores in filtros.items()
+    ]
+
+
+def casos_detalles(contexto: Contexto) -> List[Caso]:
+    """`DetalleEntregaCRUD.crear` con las validaciones de sedes, clientes y paquete."""
+
+    def crear() -> None:
+        datos = DetalleEntregaCreate(
+            id_sede_remitente=contexto.sede_origen.id_sede,
+            id_sede_receptora=contexto.sede_destino.id_sede,
+            id_paquete=contexto.id_paquete,
+            id_cliente_remitente=contexto.id_cliente_frecuente,
+            id_cliente_receptor=contexto.id_cliente_receptor,
+            fecha_envio=datetime.now(),
+        )
+        db = SessionLocal()
+        try:
+            detalle = DetalleEntregaCRUD(db).crear(
+                datos_entrada=datos, creado_por=contexto.id_administrador
+            )
+            contexto.creados.append(detalle.id_detalle)
+        finally:
+            db.close()
+
+    def limpiar() -> None:
+        if not contexto.creados:
+            return
+        db = SessionLocal()
+        try:
+            db.query(DetalleEntrega).filter(
+                DetalleEntrega.id_detalle.in_(contexto.creados)
+            ).delete(synchronize_session=False)
+            db.commit()
+            contexto.creados.clear()
+        finally:
+            db.close()
+
+    return [Caso("detalles_entrega.crear", crear, limpiar)]
+
+
+def casos_analiticas(cliente) -> List[Caso]:
+    """Un caso por cada endpoint GET de `/analytics`, por HTTP contra la app."""
+    from fastapi.routing import APIRoute
+
+    def pedir(ruta: str, parametros: Dict[str, Any]) -> Callable[[], int]:
+        def ejecutar() -> int:
+            respuesta = cliente.get(ruta, params=parametros)
+            if respuesta.status_code != 200:
+                raise RuntimeError(f"{respuesta.status_code}: {respuesta.text[:200]}")
+            return len(respuesta.content)
+
+        return ejecutar
+
+    rutas = sorted(
+        ruta.path
+        for ruta in cliente.app.routes
+        if isinstance(ruta, APIRoute)
+        and ruta.path.startswith("/analytics/")
+        and "GET" in ruta.methods
+        and "{" not in ruta.path
+    )
+    return [
+        Caso(f"GET {ruta}", pedir(ruta, PARAMETROS_ANALITICAS.get(ruta, {})))
+        for ruta in rutas
+    ]
+
+
+def casos_cotizacion(contexto: Contexto) -> List[Caso]:
+    """`ServicioMensajeria.generar_cotizacion_completa` entre dos sedes reales."""
+    origen, destino = contexto.sede_origen, contexto.sede_destino
+    coord_origen = Coordenada(origen.latitud, origen.longitud, origen.altitud or 0.0)
+    coord_destino = Coordenada(destino.latitud, destino.longitud, destino.altitud or 0.0)
+    parametros = ParametrosEnvio(
+        peso_kg=3.5,
+        tamaño=TamañoPaquete.MEDIANO,
+        tipo_envio=TipoEnvio.EXPRESS,
+        es_fragil=True,
+        valor_declarado=250000.0,
+    )
+
+    def cotizar() -> Dict[str, Any]:
+        return ServicioMensajeria.generar_cotizacion_completa(
+            coord_origen,
+            coord_destino,
+            parametros,
+            id_sede_origen=origen.id_sede,
+            id_sede_destino=destino.id_sede,
+        )
+
+    return [Caso("cotizacion.generar_cotizacion_completa", cotizar)]
+
+
+def casos_login(cliente) -> List[Caso]:
+    """`POST /auth/login` con el usuario administrador."""
+
+    def login() -> None:
+        respuesta = cliente.post(
+            "/auth/login",
+            json={"nombre_usuario": USUARIO_LOGIN, "contraseña": CONTRASEÑA_LOGIN},
+        )
+        if respuesta.status_code != 200:
+            raise RuntimeError(f"{respuesta.status_code}: {respuesta.text[:200]}")
+
+    return [Caso("POST /auth/login", login)]
+
+
+def todos_los_casos(contexto: Contexto, cliente) -> List[Caso]:
+    """Casos de la suite en el orden en que se ejecutan."""
+    return (
+        casos_paquetes(contexto)
+        + casos_detalles(contexto)
+        + casos_analiticas(cliente)
+        + casos_cotizacion(contexto)
+        + casos_login(cliente)
+    )
@@ -0,0 +1,122 @@
+"""
+Compara una corrida de benchmarks con una línea base.
+
+Un caso tiene una regresión si su mediana empeora más que la tolerancia
+(y más que un mínimo absoluto, para no marcar el ruido de los casos de
+microsegundos), si ahora ejecuta más consultas SQL que antes o si falla y
+antes no fallaba. Solo se comparan las escalas presentes en los dos
+archivos.
+
+Uso:
+    python -m benchmarks.comparar resultados/actual.json resultados/base.json --tolerancia 0.2
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List
+
+TOLERANCIA = 0.25
+MINIMO_MS = 0.1
+
+
+def cargar(ruta: str) -> Dict[str, Any]:
+    with open(ruta, encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+def comparar(
+    actual: Dict[str, Any],
+    base: Dict[str, Any],
+    tolerancia: float = TOLERANCIA,
+    minimo_ms: float = MINIMO_MS,
+) -> List[Dict[str, Any]]:
+    """
+    Compara caso por caso las corridas de la misma escala.
+
+    Args:
+        actual: Resultados de la corrida nueva
+        base: Resultados de la línea base
+        tolerancia: Empeoramiento relativo de la mediana que se acepta
+        minimo_ms: Empeoramiento absoluto por debajo del cual no hay regresión
+
+    Returns:
+        List[Dict]: Una fila por caso comparado, con `regression` en True si empeoró
+    """
+    escalas_base = {corrida["scale"]: corrida for corrida in base.get("runs", [])}
+    filas = []
+    for corrida in actual.get("runs", []):
+        corrida_base = escalas_base.get(corrida["scale"])
+        if corrida_base is None:
+            continue
+        for nombre, resultado in corrida["cases"].items():
+            anterior = corrida_base["cases"].get(nombre)
+            if anterior is None:
+                continue
+            motivos = []
+            if resultado.get("error") and not anterior.get("error"):
+                motivos.append("error")
+            p50, p50_base = resultado.get("p50_ms"), anterior.get("p50_ms")
+            if p50 is not None and p50_base:
+                if p50 > p50_base * (1 + tolerancia) and p50 - p50_base > minimo_ms:
+                    motivos.append("latency")
+            consultas, consultas_base = resultado.get("queries"), anterior.get("queries")
+            if consultas is not None and consultas_base is not None:
+                if consultas > consultas_base:
+                    motivos.append("queries")
+            filas.append(
+                {
+                    "scale": corrida["scale"],
+                    "case": nombre,
+                    "p50_ms": p50,
+                    "base_p50_ms": p50_base,
+                    "change": round(p50 / p50_base - 1, 3) if p50 and p50_base else None,
+                    "queries": consultas,
+                    "base_queries": consultas_base,
+                    "regression": bool(motivos),
+                    "reasons": motivos,
+                }
+            )
+    return filas
+
+
+def imprimir(filas: List[Dict[str, Any]]) -> None:
+    for fila in filas:
+        cambio = f"{fila['change']:+.0%}" if fila["change"] is not None else "-"
+        marca = "REGRESIÓN " + ",".join(fila["reasons"]) if fila["regression"] else ""
+        print(
+            f"{fila['scale']:>10,}  {fila['case']:<45} "
+            f"{fila['base_p50_ms'] or 0:>10.2f} -> {fila['p50_ms'] or 0:>10.2f} ms "
+            f"{cambio:>6}  {marca}"
+        )
+    regresiones = sum(fila["regression"] for fila in filas)
+    print(f"{len(filas)} casos comparados, {regresiones} con regresión")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("actual", help="JSON de la corrida a revisar")
+    parser.add_argument("base", help="JSON de la línea base")
+    parser.add_argument(
+        "--tolerancia",
+        type=float,
+        default=TOLERANCIA,
+        help="Empeoramiento relativo aceptado de la mediana (0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--minimo-ms",
+        type=float,
+        default=MINIMO_MS,
+        help="Empeoramiento absoluto mínimo para marcar una regresión",
+    )
+    args = parser.parse_args()
+
+    filas = comparar(
+        cargar(args.actual), cargar(args.base), args.tolerancia, args.minimo_ms
+    )
+    imprimir(filas)
+    sys.exit(1 if any(fila["regression"] for fila in filas) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+Ejecuta la suite de benchmarks y guarda los resultados en JSON.
+
+Con `--escalas` la base se siembra con `scripts/generar_datos.py` hasta
+tener esa cantidad de paquetes antes de medir cada escala (de menor a
+mayor, así cada siembra solo agrega la diferencia); sin `--escalas` se mide
+la base tal como está. Cada caso se calienta, se repite hasta
+`--repeticiones` muestras o `--max-segundos` y se guardan la mediana, el p95,
+el mínimo, el máximo y las consultas SQL por ejecución. Los casos muy
+rápidos se agrupan en lotes para que cada muestra dure al menos un
+milisegundo.
+
+Uso:
+    python -m benchmarks.ejecutar --escalas 10000,100000,1000000 --procesos 8
+    python -m benchmarks.ejecutar --base benchmarks/resultados/base.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.config import create_tables, get_engine
+
+RAIZ_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIRECTORIO_RESULTADOS = os.path.join(RAIZ_BACKEND, "benchmarks", "resultados")
+TABLAS = (
+    "usuarios",
+    "clientes",
+    "sedes",
+    "empleados",
+    "transportes",
+    "paquetes",
+    "detalles_entrega",
+)
+""" Duración mínima de una muestra; los casos más rápidos se repiten en lote """
+MUESTRA_MINIMA_SEGUNDOS = 0.001
+LOTE_MAXIMO = 1000
+
+
+class ContadorConsultas:
+    """Cuenta las sentencias SQL que pasan por los hooks del engine."""
+
+    def __init__(self):
+        self.total = 0
+
+    def __call__(self, conn, sql, parametros, executemany, duracion_ms) -> None:
+        self.total += 1
+
+
+def contar_filas() -> Dict[str, int]:
+    with get_engine().connect() as conexion:
+        return {
+            tabla: conexion.exec_driver_sql(f"SELECT count(*) FROM {tabla}").scalar()
+            for tabla in TABLAS
+        }
+
+
+def sembrar(escala: int, procesos: int) -> None:
+    """Agrega paquetes con el generador de datos hasta llegar a `escala`."""
+    faltantes = escala - contar_filas()["paquetes"]
+    if faltantes <= 0:
+        return
+    print(f"Sembrando {faltantes:,} paquetes para la escala {escala:,}...")
+    argumentos = ["--paquetes", str(faltantes), "--procesos", str(procesos)]
+    if get_engine().dialect.name != "postgresql":
+        """ SQLite carga en un solo proceso, y una base en memoria solo existe en este """
+        from scripts import generar_datos
+
+        generar_datos.main(argumentos)
+        return
+    subprocess.run(
+        [sys.executable, os.path.join(RAIZ_BACKEND, "scripts", "generar_datos.py"), *argumentos],
+        cwd=RAIZ_BACKEND,
+        check=True,
+    )
+
+
+def _percentil(valores: List[float], percentil: float) -> float:
+    ordenados = sorted(valores)
+    posicion = (len(ordenados) - 1) * percentil
+    inferior = int(posicion)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (
+        posicion - inferior
+    )
+
+
+def medir(
+    caso, contador: ContadorConsultas, repeticiones: int, calentamiento: int, max_segundos: float
+) -> Dict[str, Any]:
+    """
+    Mide un caso.
+
+    Returns:
+        Dict: Estadísticas en milisegundos por ejecución, o el error si el caso falla
+    """
+    try:
+        for _ in range(calentamiento):
+            caso.funcion()
+
+        inicio = time.perf_counter()
+        caso.funcion()
+        una = time.perf_counter() - inicio
+        lote = max(1, min(LOTE_MAXIMO, int(MUESTRA_MINIMA_SEGUNDOS / max(una, 1e-9))))
+
+        muestras: List[float] = []
+        ejecuciones = 0
+        consultas_inicio = contador.total
+        limite = time.perf_counter() + max_segundos
+        while len(muestras) < repeticiones:
+            inicio = time.perf_counter()
+            for _ in range(lote):
+                caso.funcion()
+            muestras.append((time.perf_counter() - inicio) * 1000 / lote)
+            ejecuciones += lote
+            if len(muestras) >= 3 and time.perf_counter() > limite:
+                break
+        consultas = (contador.total - consultas_inicio) / ejecuciones
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"[:300]}
+    finally:
+        if caso.limpiar is not None:
+            caso.limpiar()
+
+    return {
+        "samples": len(muestras),
+        "batch": lote,
+        "min_ms": round(min(muestras), 4),
+        "p50_ms": round(statistics.median(muestras), 4),
+        "p95_ms": round(_percentil(muestras, 0.95), 4),
+        "max_ms": round(max(muestras), 4),
+        "mean_ms": round(statistics.fmean(muestras), 4),
+        "queries": round(consultas, 2),
+        "error": None,
+    }
+
+
+def _commit_actual() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=RAIZ_BACKEND,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--escalas",
+        default="",
+        help="Cantidades de paquetes separadas por coma; se siembra hasta cada una",
+    )
+    parser.add_argument(
+        "--procesos",
+        type=int,
+        default=os.cpu_count() or 4,
+        help="Procesos del generador de datos al sembrar",
+    )
+    parser.add_argument("--repeticiones", type=int, default=20, help="Muestras por caso")
+    parser.add_argument(
+        "--calentamiento", type=int, default=2, help="Ejecuciones previas que no se miden"
+    )
+    parser.add_argument(
+        "--max-segundos",
+        type=float,
+        default=15.0,
+        help="Tiempo máximo de medición por caso (se toman al menos 3 muestras)",
+    )
+    parser.add_argument(
+        "--filtro", default="", help="Solo los casos cuyo nombre contiene este texto"
+    )
+    parser.add_argument("--salida", default=None, help="Archivo JSON de resultados")
+    parser.add_argument(
+        "--base", default=None, help="JSON de una corrida anterior para comparar"
+    )
+    parser.add_argument(
+        "--tolerancia",
+        type=float,
+        default=None,
+        help="Empeoramiento relativo aceptado al comparar con --base",
+    )
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+
+    from benchmarks import comparar
+    from benchmarks.casos import preparar_contexto, todos_los_casos
+    from main import app
+    from observabilidad import observar_sentencias
+
+    """ httpx registra cada request del TestClient """
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    contador = ContadorConsultas()
+    observar_sentencias(contador)
+    """ El TestClient no dispara el startup de la app; una base nueva no tiene tablas """
+    create_tables()
+    cliente = TestClient(app)
+
+    escalas = sorted(int(valor) for valor in args.escalas.split(",") if valor.strip())
+    corridas = []
+    for escala in escalas or [None]:
+        if escala is not None:
+            sembrar(escala, args.procesos)
+        filas = contar_filas()
+        etiqueta = escala if escala is not None else filas["paquetes"]
+        print(f"\nEscala {etiqueta:,} ({', '.join(f'{t}: {n:,}' for t, n in filas.items())})")
+
+        contexto = preparar_contexto()
+        resultados = {}
+        for caso in todos_los_casos(contexto, cliente):
+            if args.filtro and args.filtro not in caso.nombre:
+                continue
+            resultado = medir(
+                caso, contador, args.repeticiones, args.calentamiento, args.max_segundos
+            )
+            resultados[caso.nombre] = resultado
+            if resultado["error"]:
+                print(f"  {caso.nombre:<45} ERROR {resultado['error']}")
+            else:
+                print(
+                    f"  {caso.nombre:<45} p50 {resultado['p50_ms']:>10.3f} ms  "
+                    f"p95 {resultado['p95_ms']:>10.3f} ms  {resultado['queries']:g} consultas"
+                )
+        corridas.append({"scale": etiqueta, "rows": filas, "cases": resultados})
+
+    engine = get_engine()
+    with engine.connect():
+        version_base = ".".join(str(parte) for parte in engine.dialect.server_version_info)
+    salida = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_actual(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": {"dialect": engine.dialect.name, "version": version_base},
+        "settings": {
+            "repetitions": args.repeticiones,
+            "warmup": args.calentamiento,
+            "max_seconds": args.max_segundos,
+        },
+        "runs": corridas,
+    }
+
+    ruta_salida = args.salida or os.path.join(
+        DIRECTORIO_RESULTADOS, f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    directorio = os.path.dirname(ruta_salida)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    with open(ruta_salida, "w", encoding="utf-8") as archivo:
+        json.dump(salida, archivo, indent=2, ensure_ascii=False)
+    print(f"\nResultados guardados en {ruta_salida}")
+
+    if args.base:
+        filas = comparar.comparar(
+            salida,
+            comparar.cargar(args.base),
+            args.tolerancia if args.tolerancia is not None else comparar.TOLERANCIA,
+        )
+        print()
+        comparar.imprimir(filas)
+        if any(fila["regression"] for fila in filas):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
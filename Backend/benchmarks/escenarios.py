@@ -0,0 +1,192 @@
+"""
+Escenarios de carga que repiten las llamadas del frontend.
+
+Cada escenario es la carga de una pantalla de Angular con las mismas
+peticiones, parámetros y paralelismo que hacen los servicios de
+`Frontend/src/app/core/services/` al abrirla: el dashboard lanza sus siete
+peticiones juntas (`forkJoin`), la lista de paquetes y la de entregas piden
+sus datos al iniciar el componente y el login es el POST de `AuthService`.
+Los filtros se eligen al azar entre los que ofrece cada pantalla.
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+ESTADOS_PAQUETE = ["todos", "registrado", "en_transito", "entregado"]
+FRAGILIDADES = ["todos", "baja", "normal", "alta"]
+ESTADOS_ENTREGA = ["todos", "Pendiente", "En transito", "Entregado"]
+BUSQUEDAS = ["", "", "", "Ropa", "Docu", "Electr", "Libros"]
+""" Valores por defecto del dashboard (dashboard.component.ts) """
+DIAS_LINEA = 30
+DIAS_ESTADOS = 90
+DIAS_TOP = 90
+LIMITE_TOP = 5
+
+
+class Registro:
+    """Latencias y errores por endpoint, con la marca de tiempo de cada petición."""
+
+    def __init__(self):
+        self.latencias: Dict[str, List[float]] = {}
+        self.marcas: Dict[str, List[float]] = {}
+        self.errores: Dict[str, Dict[str, int]] = {}
+
+    def agregar(self, nombre: str, inicio: float, duracion_ms: float, error: Optional[str]) -> None:
+        if error is None:
+            self.latencias.setdefault(nombre, []).append(duracion_ms)
+            self.marcas.setdefault(nombre, []).append(inicio)
+        else:
+            errores = self.errores.setdefault(nombre, {})
+            errores[error] = errores.get(error, 0) + 1
+
+
+class Sesion:
+    """Un usuario virtual: su cliente HTTP, sus encabezados y su azar."""
+
+    def __init__(
+        self,
+        cliente: httpx.AsyncClient,
+        registro: Registro,
+        semilla: int,
+        usuario: str,
+        clave: str,
+    ):
+        self.cliente = cliente
+        self.registro = registro
+        self.azar = random.Random(semilla)
+        self.usuario = usuario
+        self.clave = clave
+        self.encabezados: Dict[str, str] = {"Accept": "application/json"}
+
+    async def pedir(
+        self,
+        nombre: str,
+        metodo: str,
+        ruta: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+    ) -> Optional[httpx.Response]:
+        """
+        Hace una petición y registra su latencia con el nombre del endpoint.
+
+        Args:
+            nombre: Endpoint con que se agrupa en el reporte, p. ej. "GET /paquetes/"
+        """
+        inicio = time.perf_counter()
+        error = None
+        respuesta = None
+        try:
+            respuesta = await self.cliente.request(
+                metodo, ruta, params=params, json=json, headers=self.encabezados
+            )
+            if respuesta.status_code >= 400:
+                error = str(respuesta.status_code)
+        except httpx.HTTPError as e:
+            error = type(e).__name__
+        self.registro.agregar(nombre, inicio, (time.perf_counter() - inicio) * 1000, error)
+        return respuesta
+
+
+async def login(sesion: Sesion) -> bool:
+    """AuthService.login: guarda el id del usuario como hace el interceptor."""
+    respuesta = await sesion.pedir(
+        "POST /auth/login",
+        "POST",
+        "/auth/login",
+        json={"nombre_usuario": sesion.usuario, "contraseña": sesion.clave},
+    )
+    if respuesta is None or respuesta.status_code != 200:
+        return False
+    id_usuario = respuesta.json()["id_usuario"]
+    sesion.encabezados["Authorization"] = f"Bearer {id_usuario}"
+    sesion.encabezados["X-User-ID"] = id_usuario
+    return True
+
+
+async def dashboard(sesion: Sesion) -> None:
+    """DashboardComponent.cargarEstadisticas: un forkJoin de siete peticiones."""
+    await asyncio.gather(
+        sesion.pedir("GET /paquetes/", "GET", "/paquetes/", {"skip": 0, "limit": 1000}),
+        sesion.pedir("GET /clientes/", "GET", "/clientes/", {"skip": 0, "limit": 1000}),
+        sesion.pedir("GET /empleados/", "GET", "/empleados/", {"skip": 0, "limit": 1000}),
+        sesion.pedir(
+            "GET /analytics/paquetes-ultimos-30-dias",
+            "GET",
+            "/analytics/paquetes-ultimos-30-dias",
+            {"days": DIAS_LINEA},
+        ),
+        sesion.pedir(
+            "GET /analytics/sedes-mas-activas",
+            "GET",
+            "/analytics/sedes-mas-activas",
+            {"limit": LIMITE_TOP, "days": DIAS_TOP},
+        ),
+        sesion.pedir(
+            "GET /analytics/estados-paquetes",
+            "GET",
+            "/analytics/estados-paquetes",
+            {"days": DIAS_ESTADOS},
+        ),
+        sesion.pedir("GET /analytics/resumen", "GET", "/analytics/resumen"),
+    )
+
+
+async def lista_paquetes(sesion: Sesion) -> None:
+    """PaqueteListComponent.ngOnInit: paquetes con los filtros de la pantalla y clientes."""
+    params: Dict[str, Any] = {"skip": 0, "limit": 50}
+    estado = sesion.azar.choice(ESTADOS_PAQUETE)
+    fragilidad = sesion.azar.choice(FRAGILIDADES)
+    busqueda = sesion.azar.choice(BUSQUEDAS)
+    if estado != "todos":
+        params["estado"] = estado
+    if fragilidad != "todos":
+        params["fragilidad"] = fragilidad
+    if busqueda:
+        params["search"] = busqueda
+    await asyncio.gather(
+        sesion.pedir("GET /paquetes/", "GET", "/paquetes/", params),
+        sesion.pedir("GET /clientes/", "GET", "/clientes/", {"skip": 0, "limit": 100}),
+    )
+
+
+async def entregas(sesion: Sesion) -> None:
+    """EntregasComponent.ngOnInit: entregas, sedes, clientes activos y paquetes registrados."""
+    estado = sesion.azar.choice(ESTADOS_ENTREGA)
+    if estado != "todos":
+        peticion_entregas = sesion.pedir(
+            "GET /detalles-entrega/estado/{estado}",
+            "GET",
+            f"/detalles-entrega/estado/{estado}",
+            {"skip": 0, "limit": 100},
+        )
+    else:
+        peticion_entregas = sesion.pedir(
+            "GET /detalles-entrega", "GET", "/detalles-entrega", {"skip": 0, "limit": 100}
+        )
+    await asyncio.gather(
+        peticion_entregas,
+        sesion.pedir("GET /sedes/", "GET", "/sedes/", {"skip": 0, "limit": 1000}),
+        sesion.pedir(
+            "GET /clientes/activos", "GET", "/clientes/activos", {"skip": 0, "limit": 100}
+        ),
+        sesion.pedir(
+            "GET /paquetes/",
+            "GET",
+            "/paquetes/",
+            {"skip": 0, "limit": 100, "estado": "registrado"},
+        ),
+    )
+
+
+""" Escenarios disponibles y su peso por defecto en la mezcla """
+ESCENARIOS: Dict[str, Callable[[Sesion], Awaitable[Any]]] = {
+    "login": login,
+    "dashboard": dashboard,
+    "paquetes": lista_paquetes,
+    "entregas": entregas,
+}
+MEZCLA_POR_DEFECTO = {"dashboard": 3, "paquetes": 4, "entregas": 3, "login": 1}
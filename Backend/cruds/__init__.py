@@ -3,22 +3,32 @@ Paquete que contiene los módulos CRUD para interactuar con las entidades de la
 """
 
 from .cliente_crud import ClienteCRUD
+from .cotizacion_crud import CotizacionCRUD
 from .empleado_crud import EmpleadoCRUD
+from .escaneo_crud import EscaneoCRUD
 from .paquete_crud import PaqueteCRUD
+from .posicion_transporte_crud import PosicionTransporteCRUD
 from .detalle_entrega_crud import DetalleEntregaCRUD
 from .rol_crud import RolCRUD
+from .ruta_crud import RutaSedeCRUD
 from .sede_crud import SedeCRUD
+from .tarifa_crud import TarifaCRUD
 from .tipo_documento_crud import TipoDocumentoCRUD
 from .transporte_crud import TransporteCRUD
 from .usuario_crud import UsuarioCRUD
 
 __all__ = [
     "ClienteCRUD",
+    "CotizacionCRUD",
     "EmpleadoCRUD",
+    "EscaneoCRUD",
     "PaqueteCRUD",
+    "PosicionTransporteCRUD",
     "DetalleEntregaCRUD",
     "RolCRUD",
+    "RutaSedeCRUD",
     "SedeCRUD",
+    "TarifaCRUD",
     "TipoDocumentoCRUD",
     "TransporteCRUD",
     "UsuarioCRUD",
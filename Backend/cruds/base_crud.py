@@ -5,6 +5,7 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, validator, EmailStr
 from database.database import Base
+from observabilidad.trazas import trazar_metodos
 
 TipoModelo = TypeVar("TipoModelo", bound=Base)
 TipoCreacion = TypeVar("TipoCreacion", bound=BaseModel)
@@ -24,6 +25,11 @@ class CRUDBase(Generic[TipoModelo, TipoCreacion, TipoActualizacion]):
         self.formato_documento = r"^[0-9]{8,15}$"
         self.db = db
 
+    def __init_subclass__(cls, **kwargs):
+        """Cada método público de un CRUD se mide como un span de la traza del request."""
+        super().__init_subclass__(**kwargs)
+        trazar_metodos(cls)
+
     def _validar_longitud_texto(self, campo: str, valor: str) -> bool:
         """Valida que el texto cumpla con la longitud requerida."""
         if not valor or not isinstance(valor, str):
@@ -156,3 +162,6 @@ class CRUDBase(Generic[TipoModelo, TipoCreacion, TipoActualizacion]):
         return (
             self.db.query(self.modelo).filter(self.modelo.id == id).first() is not None
         )
+
+
+trazar_metodos(CRUDBase)
@@ -0,0 +1,197 @@
+from typing import Any, Dict, Optional
+from uuid import UUID
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from entities.cotizacion import Cotizacion
+from entities.paquete import Paquete
+from entities.sede import Sede
+from schemas.cotizacion_schema import CotizacionCreate
+from services.enrutador_sedes import enrutador_sedes
+from services.servicio_mensajeria import (
+    Coordenada,
+    ParametrosEnvio,
+    ServicioMensajeria,
+)
+from .base_crud import CRUDBase
+
+
+class CotizacionCRUD(CRUDBase[Cotizacion, CotizacionCreate, CotizacionCreate]):
+    """Operaciones CRUD para las cotizaciones guardadas."""
+
+    def __init__(self, db: Session):
+        super().__init__(Cotizacion, db)
+        self.db = db
+
+    def obtener_por_id(self, id_cotizacion: UUID) -> Optional[Cotizacion]:
+        """Obtiene una cotización por su ID."""
+        if not id_cotizacion:
+            return None
+        return (
+            self.db.query(Cotizacion)
+            .filter(Cotizacion.id_cotizacion == id_cotizacion)
+            .first()
+        )
+
+    def cotizar(self, datos_entrada: CotizacionCreate) -> Optional[Dict[str, Any]]:
+        """
+        Calcula la cotización de un envío entre dos sedes sin guardarla.
+        Usa el camino por la red de sedes y, si no están conectadas, la
+        distancia en línea recta.
+        Args:
+            datos_entrada: Sedes y parámetros del envío
+        Returns:
+            Optional[Dict]: La cotización, o None si alguna sede no existe
+        """
+        sedes = {
+            sede.id_sede: sede
+            for sede in self.db.query(Sede)
+            .filter(
+                Sede.id_sede.in_(
+                    [datos_entrada.id_sede_origen, datos_entrada.id_sede_destino]
+                )
+            )
+            .all()
+        }
+        origen = sedes.get(datos_entrada.id_sede_origen)
+        destino = sedes.get(datos_entrada.id_sede_destino)
+        if not origen or not destino:
+            return None
+
+        ruta = enrutador_sedes.ruta(origen.id_sede, destino.id_sede)
+        if not ruta and None in (
+            origen.latitud,
+            origen.longitud,
+            destino.latitud,
+            destino.longitud,
+        ):
+            raise ValueError("Las sedes no están conectadas y no tienen coordenadas")
+
+        cotizacion = ServicioMensajeria.generar_cotizacion_completa(
+            Coordenada(
+                latitud=origen.latitud or 0,
+                longitud=origen.longitud or 0,
+                altitud=origen.altitud or 0,
+            ),
+            Coordenada(
+                latitud=destino.latitud or 0,
+                longitud=destino.longitud or 0,
+                altitud=destino.altitud or 0,
+            ),
+            ParametrosEnvio(
+                peso_kg=datos_entrada.peso_kg,
+                tamaño=datos_entrada.tamaño,
+                tipo_envio=datos_entrada.tipo_envio,
+                es_fragil=datos_entrada.es_fragil,
+                valor_declarado=datos_entrada.valor_declarado,
+            ),
+            distancia_km=ruta.distancia_km if ruta else None,
+            transbordos=ruta.transbordos if ruta else 0,
+            id_sede_origen=origen.id_sede,
+            id_sede_destino=destino.id_sede,
+        )
+        cotizacion["ruta"] = [str(id_sede) for id_sede in ruta.sedes] if ruta else []
+        return cotizacion
+
+    def guardar(
+        self,
+        *,
+        cotizacion: Dict[str, Any],
+        id_sede_origen: UUID,
+        id_sede_destino: UUID,
+        creado_por: Optional[UUID] = None,
+    ) -> Cotizacion:
+        """
+        Guarda una cotización calculada con su fecha de expiración.
+        Args:
+            cotizacion: Resultado de generar_cotizacion_completa
+            id_sede_origen: ID de la sede de origen
+            id_sede_destino: ID de la sede de destino
+            creado_por: ID del usuario que pidió la cotización
+        Returns:
+            Cotizacion: La cotización guardada
+        """
+        fecha_cotizacion = datetime.fromisoformat(cotizacion["fecha_cotizacion"])
+        try:
+            registro = Cotizacion(
+                id_sede_origen=id_sede_origen,
+                id_sede_destino=id_sede_destino,
+                peso_kg=cotizacion["peso_kg"],
+                tamaño=cotizacion["tamaño"],
+                tipo_envio=cotizacion["tipo_envio"],
+                es_fragil=cotizacion["es_fragil"],
+                valor_declarado=cotizacion["valor_declarado"],
+                distancia_km=cotizacion["distancia_km"],
+                transbordos=cotizacion.get("transbordos", 0),
+                costo_total=cotizacion["costo_total"],
+                tiempo_promedio_horas=cotizacion["tiempo_promedio_horas"],
+                desglose=cotizacion,
+                fecha_cotizacion=fecha_cotizacion,
+                fecha_expiracion=fecha_cotizacion
+                + timedelta(hours=cotizacion["valida_hasta_horas"]),
+                creado_por=str(creado_por) if creado_por else None,
+            )
+            self.db.add(registro)
+            self.db.commit()
+            self.db.refresh(registro)
+            return registro
+        except Exception as e:
+            self.db.rollback()
+            print(f"Error al guardar cotización: {e}")
+            raise
+
+    def obtener_para_paquete(self, id_cotizacion: UUID) -> Cotizacion:
+        """
+        Bloquea la cotización que se va a usar para registrar un paquete.
+        El bloqueo se mantiene hasta el commit del paquete, así dos registros
+        simultáneos con la misma cotización no pasan ambos la validación.
+        Args:
+            id_cotizacion: ID de la cotización
+        Returns:
+            Cotizacion: La cotización vigente y sin usar
+        """
+        cotizacion = (
+            self.db.query(Cotizacion)
+            .filter(Cotizacion.id_cotizacion == id_cotizacion)
+            .with_for_update()
+            .first()
+        )
+        if not cotizacion:
+            raise ValueError("La cotización no existe")
+        if cotizacion.fecha_expiracion <= datetime.now():
+            raise ValueError("La cotización expiró; solicite una nueva")
+        usada = (
+            self.db.query(Paquete.id_paquete)
+            .filter(Paquete.id_cotizacion == id_cotizacion)
+            .first()
+        )
+        if usada:
+            raise ValueError("La cotización ya se usó para otro paquete")
+        return cotizacion
+
+    def purgar_expiradas(self, antes_de: Optional[datetime] = None) -> int:
+        """
+        Elimina las cotizaciones expiradas que no se usaron para un paquete.
+        Args:
+            antes_de: Fecha límite de expiración; por defecto ahora
+        Returns:
+            int: Número de cotizaciones eliminadas
+        """
+        antes_de = antes_de or datetime.now()
+        try:
+            usadas = self.db.query(Paquete.id_cotizacion).filter(
+                Paquete.id_cotizacion.isnot(None)
+            )
+            eliminadas = (
+                self.db.query(Cotizacion)
+                .filter(
+                    Cotizacion.fecha_expiracion < antes_de,
+                    Cotizacion.id_cotizacion.notin_(usadas),
+                )
+                .delete(synchronize_session=False)
+            )
+            self.db.commit()
+            return eliminadas
+        except Exception as e:
+            self.db.rollback()
+            print(f"Error al purgar cotizaciones: {e}")
+            raise
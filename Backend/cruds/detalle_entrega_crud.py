@@ -1,13 +1,17 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple, Union
 from uuid import UUID
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from entities.detalle_entrega import (
     DetalleEntrega,
     DetalleEntregaCreate,
     DetalleEntregaUpdate,
 )
+from entities.empleado import Empleado
+from services.reportes import limpiar_cache_flota
 from .base_crud import CRUDBase
+from .transporte_crud import TransporteCRUD
 
 
 class DetalleEntregaCRUD(
@@ -183,6 +187,8 @@ class DetalleEntregaCRUD(
                     raise ValueError(f"Paquete no encontrado: {id_paquete}")
                 if not paquete.activo:
                     raise ValueError(f"El paquete no está activo: {id_paquete}")
+                if paquete.id_cotizacion:
+                    self._validar_ruta_cotizada(paquete, id_sede_remitente, id_sede_receptora)
 
             detalle = DetalleEntrega(
                 **datos,
@@ -206,6 +212,35 @@ class DetalleEntregaCRUD(
             traceback.print_exc()
             raise
 
+    def _validar_ruta_cotizada(
+        self, paquete, id_sede_remitente: Optional[UUID], id_sede_receptora: Optional[UUID]
+    ) -> None:
+        """
+        Verifica que un paquete con precio cotizado viaje por la ruta que se cotizó.
+        Args:
+            paquete: Paquete con id_cotizacion
+            id_sede_remitente: Sede de origen del envío
+            id_sede_receptora: Sede de destino del envío
+        Raises:
+            ValueError: Si las sedes del envío no son las de la cotización
+        """
+        from entities.cotizacion import Cotizacion
+
+        cotizacion = (
+            self.db.query(Cotizacion)
+            .filter(Cotizacion.id_cotizacion == paquete.id_cotizacion)
+            .first()
+        )
+        if cotizacion is None:
+            raise ValueError(f"Cotización del paquete no encontrada: {paquete.id_cotizacion}")
+        if (
+            str(cotizacion.id_sede_origen) != str(id_sede_remitente)
+            or str(cotizacion.id_sede_destino) != str(id_sede_receptora)
+        ):
+            raise ValueError(
+                "Las sedes del envío no coinciden con la ruta de la cotización del paquete"
+            )
+
     def actualizar(
         self,
         *,
@@ -240,7 +275,10 @@ class DetalleEntregaCRUD(
             objeto_db.fecha_actualizacion = datetime.now()
 
             self.db.add(objeto_db)
+            liberados = self._liberar_transporte(objeto_db, actualizado_por)
             self.db.commit()
+            if liberados:
+                limpiar_cache_flota()
             self.db.refresh(objeto_db)
             return objeto_db
         except Exception as e:
@@ -316,7 +354,10 @@ class DetalleEntregaCRUD(
                 detalle.fecha_entrega = datetime.now()
 
             self.db.add(detalle)
+            liberados = self._liberar_transporte(detalle, actualizado_por)
             self.db.commit()
+            if liberados:
+                limpiar_cache_flota()
             self.db.refresh(detalle)
             return detalle
         except Exception as e:
@@ -346,9 +387,121 @@ class DetalleEntregaCRUD(
             detalle.actualizado_por = actualizado_por
             detalle.fecha_actualizacion = datetime.now()
 
+            liberados = self._liberar_transporte(detalle, actualizado_por)
             self.db.commit()
+            if liberados:
+                limpiar_cache_flota()
             return True
         except Exception as e:
             self.db.rollback()
             print(f"Error al desactivar detalle: {e}")
             return False
+
+    def _liberar_transporte(
+        self, detalle: DetalleEntrega, actualizado_por: Optional[UUID]
+    ) -> int:
+        """
+        Libera el vehículo del despacho si este era su último envío en tránsito.
+        No hace commit: se guarda junto con el cambio del detalle.
+        Args:
+            detalle: Detalle que se entregó, cambió de estado o se desactivó
+            actualizado_por: ID del usuario que hace el cambio
+        Returns:
+            int: Número de vehículos liberados (0 o 1)
+        """
+        if not detalle.id_transporte:
+            return 0
+        return TransporteCRUD(self.db).liberar_sin_envios(
+            [detalle.id_transporte], actualizado_por=actualizado_por
+        )
+
+    def reclamar_pendientes(
+        self, *, id_mensajero: UUID, cantidad: int = 1, duracion_minutos: int = 30
+    ) -> List[DetalleEntrega]:
+        """
+        Reclama entregas pendientes de la sede del mensajero.
+        Las filas se bloquean con FOR UPDATE SKIP LOCKED, así varios mensajeros
+        pueden reclamar a la vez sin esperar entre ellos ni recibir la misma
+        entrega. Un reclamo vencido vuelve a estar disponible.
+        Args:
+            id_mensajero: ID del empleado mensajero
+            cantidad: Número máximo de entregas a reclamar
+            duracion_minutos: Minutos que dura el reclamo antes de vencer
+        Returns:
+            Lista de entregas reclamadas (puede estar vacía)
+        """
+        mensajero = (
+            self.db.query(Empleado)
+            .filter(
+                Empleado.id_empleado == id_mensajero,
+                Empleado.tipo_empleado == "mensajero",
+                Empleado.activo == True,
+            )
+            .first()
+        )
+        if not mensajero:
+            raise ValueError("El empleado no existe o no es un mensajero activo")
+        if not mensajero.id_sede:
+            raise ValueError("El mensajero no tiene una sede asignada")
+
+        ahora = datetime.now()
+        try:
+            detalles = (
+                self.db.query(DetalleEntrega)
+                .filter(
+                    DetalleEntrega.id_sede_remitente == mensajero.id_sede,
+                    DetalleEntrega.estado_envio == "Pendiente",
+                    DetalleEntrega.activo == True,
+                    or_(
+                        DetalleEntrega.id_mensajero.is_(None),
+                        DetalleEntrega.reclamo_expira < ahora,
+                    ),
+                )
+                .order_by(DetalleEntrega.fecha_envio)
+                .limit(cantidad)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+
+            expira = ahora + timedelta(minutes=duracion_minutos)
+            for detalle in detalles:
+                detalle.id_mensajero = id_mensajero
+                detalle.reclamo_expira = expira
+
+            self.db.commit()
+            return detalles
+        except Exception as e:
+            self.db.rollback()
+            print(f"Error al reclamar entregas: {e}")
+            raise
+
+    def liberar(self, *, id_detalle: UUID, id_mensajero: UUID) -> bool:
+        """
+        Libera una entrega reclamada para que otro mensajero pueda tomarla.
+        Args:
+            id_detalle: ID del detalle de entrega
+            id_mensajero: ID del mensajero que tiene el reclamo
+        Returns:
+            True si se liberó, False si la entrega no está reclamada por ese mensajero
+        """
+        try:
+            liberados = (
+                self.db.query(DetalleEntrega)
+                .filter(
+                    DetalleEntrega.id_detalle == id_detalle,
+                    DetalleEntrega.id_mensajero == id_mensajero,
+                )
+                .update(
+                    {
+                        DetalleEntrega.id_mensajero: None,
+                        DetalleEntrega.reclamo_expira: None,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            self.db.commit()
+            return liberados > 0
+        except Exception as e:
+            self.db.rollback()
+            print(f"Error al liberar entrega: {e}")
+            return False
@@ -0,0 +1,41 @@
+from typing import List
+from uuid import UUID
+from sqlalchemy.orm import Session
+from entities.escaneo import Escaneo
+from schemas.escaneo_schema import EscaneoCreate
+from .base_crud import CRUDBase
+
+
+class EscaneoCRUD(CRUDBase[Escaneo, EscaneoCreate, EscaneoCreate]):
+    """Operaciones de consulta sobre el historial de escaneos."""
+
+    def __init__(self, db: Session):
+        super().__init__(Escaneo, db)
+        self.db = db
+
+    def obtener_por_paquete(
+        self, id_paquete: UUID, skip: int = 0, limit: int = 100
+    ) -> List[Escaneo]:
+        """
+        Obtiene el historial de escaneos de un paquete, del más reciente al más antiguo.
+        Args:
+            id_paquete: ID del paquete
+            skip: Número de registros a omitir (para paginación)
+            limit: Número máximo de registros a devolver
+        Returns:
+            Lista de escaneos del paquete
+        """
+        if not id_paquete:
+            return []
+        try:
+            return (
+                self.db.query(Escaneo)
+                .filter(Escaneo.id_paquete == id_paquete)
+                .order_by(Escaneo.fecha_escaneo.desc())
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        except Exception as e:
+            print(f"Error al obtener escaneos del paquete: {e}")
+            return []
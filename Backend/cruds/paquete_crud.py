@@ -1,9 +1,13 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple, Union
 from uuid import UUID
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from entities.paquete import Paquete, PaqueteCreate, PaqueteUpdate
+from entities.cotizacion import Cotizacion
+from entities.detalle_entrega import DetalleEntrega
 from .base_crud import CRUDBase
+from .cotizacion_crud import CotizacionCRUD
 
 
 class PaqueteCRUD(CRUDBase[Paquete, PaqueteCreate, PaqueteUpdate]):
@@ -216,6 +220,86 @@ class PaqueteCRUD(CRUDBase[Paquete, PaqueteCreate, PaqueteUpdate]):
         resultados = consulta.offset(skip).limit(limit).all()
         return resultados
 
+    def obtener_pendientes_despacho(
+        self, id_sede: UUID, limit: int = 10000
+    ) -> List[Tuple[UUID, float, str]]:
+        """
+        Obtiene los paquetes pendientes de despacho en una sede.
+        Solo lee las columnas que necesita el planificador.
+        Args:
+            id_sede: ID de la sede remitente
+            limit: Número máximo de paquetes a devolver
+        Returns:
+            Lista de tuplas (id_paquete, peso, tamaño), los más antiguos primero
+        """
+        return (
+            self.db.query(Paquete.id_paquete, Paquete.peso, Paquete.tamaño)
+            .join(DetalleEntrega, DetalleEntrega.id_paquete == Paquete.id_paquete)
+            .filter(
+                DetalleEntrega.id_sede_remitente == id_sede,
+                DetalleEntrega.estado_envio == "Pendiente",
+                DetalleEntrega.activo == True,
+                Paquete.activo == True,
+            )
+            .order_by(DetalleEntrega.fecha_envio)
+            .limit(limit)
+            .all()
+        )
+
+    def obtener_ingresos(
+        self, fecha_inicio: datetime, fecha_fin: datetime
+    ) -> List[Tuple[str, int, float]]:
+        """
+        Suma lo cobrado por los paquetes registrados en un período.
+        Solo cuentan los paquetes con costo_envio, es decir, los que se
+        registraron a partir de una cotización.
+        Args:
+            fecha_inicio: Inicio del período (incluido)
+            fecha_fin: Fin del período (excluido)
+        Returns:
+            Lista de tuplas (tipo, paquetes, ingresos) ordenada por ingresos
+        """
+        ingresos = func.sum(Paquete.costo_envio)
+        return (
+            self.db.query(
+                func.lower(Paquete.tipo),
+                func.count(Paquete.id_paquete),
+                ingresos,
+            )
+            .filter(
+                Paquete.costo_envio.isnot(None),
+                Paquete.fecha_creacion >= fecha_inicio,
+                Paquete.fecha_creacion < fecha_fin,
+                Paquete.activo == True,
+            )
+            .group_by(func.lower(Paquete.tipo))
+            .order_by(ingresos.desc())
+            .all()
+        )
+
+    def _validar_cotizacion(
+        self, cotizacion: Cotizacion, datos: Dict[str, Any]
+    ) -> None:
+        """Verifica que el paquete coincida con lo que se cotizó."""
+        diferencias = []
+        if abs(float(datos.get("peso", 0)) - cotizacion.peso_kg) > 1e-6:
+            diferencias.append("peso")
+        if str(datos.get("tamaño", "")).lower() != cotizacion.tamaño:
+            diferencias.append("tamaño")
+        if str(datos.get("tipo", "")).lower() != cotizacion.tipo_envio:
+            diferencias.append("tipo")
+        if (str(datos.get("fragilidad", "")).lower() == "alta") != cotizacion.es_fragil:
+            diferencias.append("fragilidad")
+        if (
+            abs(float(datos.get("valor_declarado") or 0) - cotizacion.valor_declarado)
+            > 1e-6
+        ):
+            diferencias.append("valor_declarado")
+        if diferencias:
+            raise ValueError(
+                f"El paquete no coincide con la cotización en: {', '.join(diferencias)}"
+            )
+
     def crear_paquete(
         self,
         *,
@@ -225,6 +309,8 @@ class PaqueteCRUD(CRUDBase[Paquete, PaqueteCreate, PaqueteUpdate]):
     ) -> Optional[Paquete]:
         """
         Crea un paquete. id_cliente y creado_por pueden ser uuid.UUID o strings convertibles.
+        Si se indica id_cotizacion, el paquete toma el precio de esa cotización y
+        la cotización queda usada; lanza ValueError si no es válida para el paquete.
         Retorna Paquete o None en caso de error (imprime el motivo).
         """
         from uuid import UUID as StdUUID
@@ -279,6 +365,21 @@ class PaqueteCRUD(CRUDBase[Paquete, PaqueteCreate, PaqueteUpdate]):
         datos_filtrados.setdefault("fecha_creacion", datetime.now())
         datos_filtrados.setdefault("activo", True)
 
+        id_cotizacion = datos_filtrados.pop("id_cotizacion", None)
+        if id_cotizacion:
+            try:
+                cotizacion = CotizacionCRUD(self.db).obtener_para_paquete(
+                    id_cotizacion
+                    if isinstance(id_cotizacion, StdUUID)
+                    else StdUUID(str(id_cotizacion))
+                )
+                self._validar_cotizacion(cotizacion, datos_filtrados)
+            except ValueError:
+                self.db.rollback()
+                raise
+            datos_filtrados["id_cotizacion"] = cotizacion.id_cotizacion
+            datos_filtrados["costo_envio"] = cotizacion.costo_total
+
         try:
             paquete = Paquete(**datos_filtrados)
             self.db.add(paquete)
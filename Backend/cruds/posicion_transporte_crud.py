@@ -0,0 +1,180 @@
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Set
+from uuid import UUID
+from sqlalchemy import and_, func, insert, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from entities.posicion_transporte import PosicionTransporte
+from schemas.telemetria_schema import PuntoGPS, TelemetriaLoteCreate
+from .base_crud import CRUDBase
+
+_particiones_creadas: Set[str] = set()
+
+
+class PosicionTransporteCRUD(
+    CRUDBase[PosicionTransporte, TelemetriaLoteCreate, TelemetriaLoteCreate]
+):
+    """Operaciones sobre el historial GPS de los vehículos."""
+
+    def __init__(self, db: Session):
+        super().__init__(PosicionTransporte, db)
+        self.db = db
+
+    def _dialecto(self) -> str:
+        """Devuelve el nombre del dialecto de la base de datos de la sesión."""
+        return self.db.get_bind().dialect.name
+
+    def asegurar_particiones(self, fechas: Iterable[datetime]) -> None:
+        """
+        Crea las particiones mensuales que falten para las fechas recibidas.
+        Solo aplica en PostgreSQL; el resto de motores usa una tabla normal.
+        Args:
+            fechas: Fechas de registro que se van a insertar
+        """
+        if self._dialecto() != "postgresql":
+            return
+
+        nuevas = []
+        for año, mes in sorted({(f.year, f.month) for f in fechas}):
+            nombre = f"posiciones_transporte_{año:04d}_{mes:02d}"
+            if nombre in _particiones_creadas:
+                continue
+            inicio = date(año, mes, 1)
+            fin = date(año + 1, 1, 1) if mes == 12 else date(año, mes + 1, 1)
+            self.db.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {nombre} PARTITION OF posiciones_transporte "
+                    f"FOR VALUES FROM ('{inicio.isoformat()}') TO ('{fin.isoformat()}')"
+                )
+            )
+            nuevas.append(nombre)
+
+        if nuevas:
+            self.db.commit()
+            _particiones_creadas.update(nuevas)
+
+    def registrar_lote(self, id_transporte: UUID, puntos: List[PuntoGPS]) -> int:
+        """
+        Inserta un lote de pings GPS con una sola sentencia.
+        Los pings repetidos (mismo vehículo y misma fecha) se ignoran.
+        Args:
+            id_transporte: ID del vehículo
+            puntos: Pings GPS recibidos
+        Returns:
+            int: Número de pings nuevos guardados
+        """
+        filas: Dict[datetime, Dict[str, Any]] = {}
+        for punto in puntos:
+            filas[punto.fecha_registro] = {
+                "id_transporte": id_transporte,
+                "fecha_registro": punto.fecha_registro,
+                "latitud": punto.latitud,
+                "longitud": punto.longitud,
+                "velocidad_kmh": punto.velocidad_kmh,
+                "rumbo": punto.rumbo,
+            }
+        if not filas:
+            return 0
+
+        try:
+            self.asegurar_particiones(filas.keys())
+
+            dialecto = self._dialecto()
+            if dialecto == "postgresql":
+                sentencia = postgresql.insert(PosicionTransporte.__table__).on_conflict_do_nothing()
+            elif dialecto == "sqlite":
+                sentencia = sqlite.insert(PosicionTransporte.__table__).on_conflict_do_nothing()
+            else:
+                sentencia = insert(PosicionTransporte.__table__)
+
+            resultado = self.db.execute(sentencia, list(filas.values()))
+            self.db.commit()
+            """ ON CONFLICT DO NOTHING omite los pings que ya estaban guardados """
+            if resultado.rowcount is not None and resultado.rowcount >= 0:
+                return resultado.rowcount
+            return len(filas)
+        except Exception as e:
+            self.db.rollback()
+            print(f"Error al registrar telemetría: {e}")
+            raise
+
+    def obtener_ultimas_posiciones(self, dias: int = 2) -> List[PosicionTransporte]:
+        """
+        Obtiene la última posición conocida de cada vehículo.
+        Args:
+            dias: Solo se consideran pings de los últimos N días
+        Returns:
+            Lista con la posición más reciente por vehículo
+        """
+        desde = datetime.now() - timedelta(days=dias)
+        ultimas = (
+            select(
+                PosicionTransporte.id_transporte,
+                func.max(PosicionTransporte.fecha_registro).label("fecha_registro"),
+            )
+            .where(PosicionTransporte.fecha_registro >= desde)
+            .group_by(PosicionTransporte.id_transporte)
+            .subquery()
+        )
+        return (
+            self.db.query(PosicionTransporte)
+            .join(
+                ultimas,
+                and_(
+                    PosicionTransporte.id_transporte == ultimas.c.id_transporte,
+                    PosicionTransporte.fecha_registro == ultimas.c.fecha_registro,
+                ),
+            )
+            .all()
+        )
+
+    def reducir_resolucion(
+        self, *, antiguedad_dias: int = 30, intervalo_minutos: int = 10
+    ) -> int:
+        """
+        Reduce la resolución de los pings antiguos: de cada vehículo conserva
+        solo el primer ping de cada intervalo y elimina el resto.
+        Args:
+            antiguedad_dias: Solo se reducen pings con más de N días
+            intervalo_minutos: Tamaño del intervalo que se conserva
+        Returns:
+            int: Número de pings eliminados
+        """
+        if self._dialecto() != "postgresql":
+            raise ValueError("La reducción de telemetría solo está disponible en PostgreSQL")
+
+        limite = datetime.now() - timedelta(days=antiguedad_dias)
+        try:
+            resultado = self.db.execute(
+                text(
+                    """
+                    DELETE FROM posiciones_transporte p
+                    USING (
+                        SELECT id_transporte, fecha_registro
+                        FROM (
+                            SELECT
+                                id_transporte,
+                                fecha_registro,
+                                row_number() OVER (
+                                    PARTITION BY
+                                        id_transporte,
+                                        floor(extract(epoch FROM fecha_registro) / :segundos)
+                                    ORDER BY fecha_registro
+                                ) AS orden
+                            FROM posiciones_transporte
+                            WHERE fecha_registro < :limite
+                        ) numerados
+                        WHERE orden > 1
+                    ) sobrantes
+                    WHERE p.id_transporte = sobrantes.id_transporte
+                      AND p.fecha_registro = sobrantes.fecha_registro
+                    """
+                ),
+                {"segundos": intervalo_minutos * 60, "limite": limite},
+            )
+            self.db.commit()
+            return resultado.rowcount or 0
+        except Exception as e:
+            self.db.rollback()
+            print(f"Error al reducir la resolución de la telemetría: {e}")
+            raise
@@ -0,0 +1,205 @@
+from typing import Any, Dict, List, Optional, Union
+from uuid import UUID
+from datetime import datetime
+from sqlalchemy.orm import Session
+from entities.ruta_sede import RutaSede
+from entities.sede import Sede
+from entities.tiempo_ruta import TiempoRuta
+from schemas.ruta_schema import RutaSedeCreate, RutaSedeUpdate
+from services.enrutador_sedes import enrutador_sedes
+from services.servicio_mensajeria import Coordenada, ServicioMensajeria
+from .base_crud import CRUDBase
+
+
+class RutaSedeCRUD(CRUDBase[RutaSede, RutaSedeCreate, RutaSedeUpdate]):
+    """Operaciones CRUD para los tramos entre sedes."""
+
+    def __init__(self, db: Session):
+        super().__init__(RutaSede, db)
+        self.db = db
+
+    def obtener_por_id(self, id_ruta: UUID) -> Optional[RutaSede]:
+        """Obtiene un tramo por su ID."""
+        if not id_ruta:
+            return None
+        return self.db.query(RutaSede).filter(RutaSede.id_ruta == id_ruta).first()
+
+    def obtener_activas(self, skip: int = 0, limit: int = 100) -> List[RutaSede]:
+        """
+        Obtiene los tramos activos con paginación.
+        Args:
+            skip: Número de registros a omitir (paginación)
+            limit: Número máximo de registros a devolver
+        Returns:
+            List[RutaSede]: Lista de tramos activos
+        """
+        return (
+            self.db.query(RutaSede)
+            .filter(RutaSede.activo == True)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    def obtener_tiempos(
+        self,
+        id_sede_origen: Optional[UUID] = None,
+        id_sede_destino: Optional[UUID] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[TiempoRuta]:
+        """
+        Obtiene los tiempos de entrega históricos por ruta.
+        Args:
+            id_sede_origen: Filtrar por sede de origen (opcional)
+            id_sede_destino: Filtrar por sede de destino (opcional)
+            skip: Número de registros a omitir (paginación)
+            limit: Número máximo de registros a devolver
+        Returns:
+            List[TiempoRuta]: Tiempos por ruta y tipo de envío
+        """
+        consulta = self.db.query(TiempoRuta)
+        if id_sede_origen:
+            consulta = consulta.filter(TiempoRuta.id_sede_origen == id_sede_origen)
+        if id_sede_destino:
+            consulta = consulta.filter(TiempoRuta.id_sede_destino == id_sede_destino)
+        return (
+            consulta.order_by(TiempoRuta.envios.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    def crear_ruta(
+        self, *, datos_entrada: RutaSedeCreate, creado_por: UUID
+    ) -> RutaSede:
+        """
+        Crea un tramo entre dos sedes.
+        Si no se indica la distancia se usa la distancia en línea recta.
+        Args:
+            datos_entrada: Datos del tramo
+            creado_por: ID del usuario que crea el tramo
+        Returns:
+            RutaSede: El tramo creado
+        """
+        sedes = {
+            sede.id_sede: sede
+            for sede in self.db.query(Sede)
+            .filter(
+                Sede.id_sede.in_(
+                    [datos_entrada.id_sede_origen, datos_entrada.id_sede_destino]
+                ),
+                Sede.activo == True,
+            )
+            .all()
+        }
+        origen = sedes.get(datos_entrada.id_sede_origen)
+        destino = sedes.get(datos_entrada.id_sede_destino)
+        if not origen or not destino:
+            raise ValueError("La sede de origen o destino no existe o está inactiva")
+
+        existente = (
+            self.db.query(RutaSede)
+            .filter(
+                RutaSede.id_sede_origen == datos_entrada.id_sede_origen,
+                RutaSede.id_sede_destino == datos_entrada.id_sede_destino,
+            )
+            .first()
+        )
+        if existente:
+            raise ValueError("Ya existe un tramo entre estas sedes")
+
+        distancia_km = datos_entrada.distancia_km
+        if distancia_km is None:
+            if None in (origen.latitud, origen.longitud, destino.latitud, destino.longitud):
+                raise ValueError(
+                    "Las sedes no tienen coordenadas; indique la distancia del tramo"
+                )
+            distancia_km = ServicioMensajeria.calcular_distancia_haversine(
+                Coordenada(origen.latitud, origen.longitud, origen.altitud or 0),
+                Coordenada(destino.latitud, destino.longitud, destino.altitud or 0),
+            )
+
+        try:
+            ruta = RutaSede(
+                id_sede_origen=datos_entrada.id_sede_origen,
+                id_sede_destino=datos_entrada.id_sede_destino,
+                distancia_km=round(distancia_km, 2),
+                bidireccional=datos_entrada.bidireccional,
+                activo=True,
+                creado_por=str(creado_por),
+                fecha_creacion=datetime.now(),
+            )
+            self.db.add(ruta)
+            self.db.commit()
+            self.db.refresh(ruta)
+            enrutador_sedes.invalidar()
+            return ruta
+        except Exception as e:
+            self.db.rollback()
+            print(f"Error al crear tramo: {e}")
+            raise
+
+    def actualizar_ruta(
+        self,
+        *,
+        objeto_db: RutaSede,
+        datos_entrada: Union[RutaSedeUpdate, Dict[str, Any]],
+        actualizado_por: UUID,
+    ) -> Optional[RutaSede]:
+        """
+        Actualiza un tramo existente.
+        Args:
+            objeto_db: Tramo a actualizar
+            datos_entrada: Datos para actualizar
+            actualizado_por: ID del usuario que actualiza
+        Returns:
+            Optional[RutaSede]: El tramo actualizado o None si hay error
+        """
+        try:
+            if isinstance(datos_entrada, dict):
+                datos_actualizados = datos_entrada
+            else:
+                datos_actualizados = datos_entrada.model_dump(exclude_unset=True)
+
+            for campo, valor in datos_actualizados.items():
+                if hasattr(objeto_db, campo) and valor is not None:
+                    setattr(objeto_db, campo, valor)
+
+            objeto_db.actualizado_por = str(actualizado_por)
+            objeto_db.fecha_actualizacion = datetime.now()
+
+            self.db.commit()
+            self.db.refresh(objeto_db)
+            enrutador_sedes.invalidar()
+            return objeto_db
+        except Exception as e:
+            self.db.rollback()
+            print(f"Error al actualizar tramo: {e}")
+            return None
+
+    def desactivar_ruta(self, *, id_ruta: UUID, actualizado_por: UUID) -> bool:
+        """
+        Desactiva un tramo (soft delete).
+        Args:
+            id_ruta: ID del tramo
+            actualizado_por: ID del usuario que desactiva
+        Returns:
+            bool: True si se desactivó, False en caso contrario
+        """
+        try:
+            ruta = self.obtener_por_id(id_ruta)
+            if not ruta or not ruta.activo:
+                return False
+
+            ruta.activo = False
+            ruta.actualizado_por = str(actualizado_por)
+            ruta.fecha_actualizacion = datetime.now()
+
+            self.db.commit()
+            enrutador_sedes.invalidar()
+            return True
+        except Exception as e:
+            self.db.rollback()
+            print(f"Error al desactivar tramo: {e}")
+            return False
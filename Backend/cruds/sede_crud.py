@@ -4,6 +4,8 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from entities.sede import Sede, SedeCreate, SedeUpdate
+from services.enrutador_sedes import enrutador_sedes
+from services.indice_sedes import indice_sedes
 from .base_crud import CRUDBase
 
 
@@ -166,6 +168,8 @@ class SedeCRUD(CRUDBase[Sede, SedeCreate, SedeUpdate]):
             self.db.add(sede)
             self.db.commit()
             self.db.refresh(sede)
+            indice_sedes.invalidar()
+            enrutador_sedes.invalidar()
             return sede
 
         except ValueError as e:
@@ -238,6 +242,8 @@ class SedeCRUD(CRUDBase[Sede, SedeCreate, SedeUpdate]):
 
             self.db.commit()
             self.db.refresh(objeto_db)
+            indice_sedes.invalidar()
+            enrutador_sedes.invalidar()
             return objeto_db
 
         except ValueError as e:
@@ -287,6 +293,8 @@ class SedeCRUD(CRUDBase[Sede, SedeCreate, SedeUpdate]):
 
             self.db.commit()
             self.db.refresh(sede)
+            indice_sedes.invalidar()
+            enrutador_sedes.invalidar()
             return True
 
         except Exception as e:
@@ -0,0 +1,107 @@
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime
+from sqlalchemy.orm import Session
+from entities.tarifa import Tarifa
+from schemas.tarifa_schema import TarifaCreate
+from services.tarifas import gestor_tarifas
+from .base_crud import CRUDBase
+
+
+class TarifaCRUD(CRUDBase[Tarifa, TarifaCreate, TarifaCreate]):
+    """Operaciones CRUD para las tarifas con vigencia."""
+
+    def __init__(self, db: Session):
+        super().__init__(Tarifa, db)
+        self.db = db
+
+    def obtener_por_id(self, id_tarifa: UUID) -> Optional[Tarifa]:
+        """Obtiene una tarifa por su ID."""
+        if not id_tarifa:
+            return None
+        return self.db.query(Tarifa).filter(Tarifa.id_tarifa == id_tarifa).first()
+
+    def obtener_historial(
+        self, concepto: Optional[str] = None, skip: int = 0, limit: int = 100
+    ) -> List[Tarifa]:
+        """
+        Obtiene las tarifas activas, las más recientes primero.
+        Args:
+            concepto: Filtrar por concepto (opcional)
+            skip: Número de registros a omitir (paginación)
+            limit: Número máximo de registros a devolver
+        Returns:
+            List[Tarifa]: Lista de tarifas
+        """
+        consulta = self.db.query(Tarifa).filter(Tarifa.activo == True)
+        if concepto:
+            consulta = consulta.filter(Tarifa.concepto == concepto)
+        return (
+            consulta.order_by(Tarifa.vigente_desde.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    def _publicar(self) -> None:
+        """Vuelve a publicar la tabla vigente después de un cambio."""
+        try:
+            gestor_tarifas.recargar()
+        except Exception as e:
+            print(f"Error al recargar tarifas: {e}")
+
+    def crear_tarifa(self, *, datos_entrada: TarifaCreate, creado_por: UUID) -> Tarifa:
+        """
+        Registra una tarifa nueva y publica la tabla vigente.
+        Args:
+            datos_entrada: Datos de la tarifa
+            creado_por: ID del usuario que crea la tarifa
+        Returns:
+            Tarifa: La tarifa creada
+        """
+        try:
+            tarifa = Tarifa(
+                concepto=datos_entrada.concepto,
+                clave=datos_entrada.clave or "",
+                valor=datos_entrada.valor,
+                vigente_desde=datos_entrada.vigente_desde or datetime.now(),
+                activo=True,
+                creado_por=str(creado_por),
+                fecha_creacion=datetime.now(),
+            )
+            self.db.add(tarifa)
+            self.db.commit()
+            self.db.refresh(tarifa)
+        except Exception as e:
+            self.db.rollback()
+            print(f"Error al crear tarifa: {e}")
+            raise
+
+        self._publicar()
+        return tarifa
+
+    def desactivar_tarifa(self, *, id_tarifa: UUID, actualizado_por: UUID) -> bool:
+        """
+        Desactiva una tarifa y publica la tabla vigente.
+        Args:
+            id_tarifa: ID de la tarifa
+            actualizado_por: ID del usuario que desactiva
+        Returns:
+            bool: True si se desactivó, False en caso contrario
+        """
+        try:
+            tarifa = self.obtener_por_id(id_tarifa)
+            if not tarifa or not tarifa.activo:
+                return False
+
+            tarifa.activo = False
+            tarifa.actualizado_por = str(actualizado_por)
+            tarifa.fecha_actualizacion = datetime.now()
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            print(f"Error al desactivar tarifa: {e}")
+            return False
+
+        self._publicar()
+        return True
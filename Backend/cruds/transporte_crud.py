@@ -1,8 +1,13 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
 from uuid import UUID
 from datetime import datetime
+from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
+from entities.detalle_entrega import DetalleEntrega
+from entities.historial_estado_transporte import HistorialEstadoTransporte
+from entities.paquete import Paquete
 from entities.transporte import Transporte, TransporteCreate, TransporteUpdate
+from services.reportes import limpiar_cache_flota
 from .base_crud import CRUDBase
 
 
@@ -67,6 +72,24 @@ class TransporteCRUD(CRUDBase[Transporte, TransporteCreate, TransporteUpdate]):
             .all()
         )
 
+    def obtener_disponibles_por_sede(self, id_sede: UUID) -> List[Transporte]:
+        """
+        Obtiene los vehículos activos y disponibles de una sede.
+        Args:
+            id_sede: ID de la sede
+        Returns:
+            List[Transporte]: Vehículos listos para ser despachados
+        """
+        return (
+            self.db.query(Transporte)
+            .filter(
+                Transporte.id_sede == id_sede,
+                Transporte.estado == "disponible",
+                Transporte.activo == True,
+            )
+            .all()
+        )
+
     def obtener_por_tipo(
         self, tipo: str, skip: int = 0, limit: int = 100
     ) -> List[Transporte]:
@@ -152,6 +175,8 @@ class TransporteCRUD(CRUDBase[Transporte, TransporteCreate, TransporteUpdate]):
         """
         db_obj = Transporte(**obj_in.model_dump(), creado_por=creado_por)
         self.db.add(db_obj)
+        self.db.flush()
+        self._registrar_estado(db_obj, db_obj.estado)
         self.db.commit()
         self.db.refresh(db_obj)
         return db_obj
@@ -168,6 +193,7 @@ class TransporteCRUD(CRUDBase[Transporte, TransporteCreate, TransporteUpdate]):
         Returns:
             Transporte: El transporte actualizado
         """
+        self._registrar_estado(db_obj, nuevo_estado)
         db_obj.estado = nuevo_estado
         db_obj.actualizado_por = actualizado_por
         self.db.add(db_obj)
@@ -202,6 +228,9 @@ class TransporteCRUD(CRUDBase[Transporte, TransporteCreate, TransporteUpdate]):
             if "placa" in update_data:
                 del update_data["placa"]
 
+            if update_data.get("estado") and update_data["estado"] != db_obj.estado:
+                self._registrar_estado(db_obj, update_data["estado"])
+
             for campo, valor in update_data.items():
                 if hasattr(db_obj, campo):
                     setattr(db_obj, campo, valor)
@@ -263,3 +292,147 @@ class TransporteCRUD(CRUDBase[Transporte, TransporteCreate, TransporteUpdate]):
 
             traceback.print_exc()
             return False
+
+    def _registrar_estado(
+        self, transporte: Transporte, estado: str, fecha: Optional[datetime] = None
+    ) -> None:
+        """
+        Cierra el intervalo abierto del vehículo y abre uno con el nuevo estado.
+        No hace commit: se guarda junto con el cambio de estado.
+        Args:
+            transporte: Vehículo que cambia de estado
+            estado: Nuevo estado
+            fecha: Momento del cambio (por defecto, ahora)
+        """
+        fecha = fecha or datetime.now()
+        self.db.query(HistorialEstadoTransporte).filter(
+            HistorialEstadoTransporte.id_transporte == transporte.id_transporte,
+            HistorialEstadoTransporte.hasta.is_(None),
+        ).update({HistorialEstadoTransporte.hasta: fecha}, synchronize_session=False)
+        self.db.add(
+            HistorialEstadoTransporte(
+                id_transporte=transporte.id_transporte, estado=estado, desde=fecha
+            )
+        )
+
+    def liberar_sin_envios(
+        self,
+        ids_transporte: Iterable[Optional[UUID]],
+        actualizado_por: Optional[UUID] = None,
+        fecha: Optional[datetime] = None,
+    ) -> int:
+        """
+        Devuelve a 'disponible' los vehículos en uso que ya no llevan envíos
+        en tránsito (se entregó o desactivó el último que tenían asignado).
+        No hace commit: se guarda junto con el cambio que lo provoca.
+        Args:
+            ids_transporte: Vehículos de los envíos que cambiaron (se ignoran los None)
+            actualizado_por: ID del usuario que provoca el cambio (opcional)
+            fecha: Momento del cambio (por defecto, ahora)
+        Returns:
+            int: Número de vehículos liberados
+        """
+        ids = {id_transporte for id_transporte in ids_transporte if id_transporte}
+        if not ids:
+            return 0
+        fecha = fecha or datetime.now()
+        self.db.flush()
+
+        con_envios = select(DetalleEntrega.id_transporte).where(
+            DetalleEntrega.id_transporte.in_(ids),
+            DetalleEntrega.estado_envio == "En transito",
+            DetalleEntrega.activo == True,
+        )
+        transportes = (
+            self.db.query(Transporte)
+            .filter(
+                Transporte.id_transporte.in_(ids),
+                Transporte.estado == "en_uso",
+                Transporte.id_transporte.not_in(con_envios),
+            )
+            .all()
+        )
+        for transporte in transportes:
+            self._registrar_estado(transporte, "disponible", fecha)
+            transporte.estado = "disponible"
+            transporte.fecha_actualizacion = fecha
+            if actualizado_por:
+                transporte.actualizado_por = str(actualizado_por)
+        return len(transportes)
+
+    def confirmar_despacho(
+        self, *, asignaciones: Sequence[Dict[str, Any]], actualizado_por: UUID
+    ) -> int:
+        """
+        Guarda un plan de despacho: cada envío pendiente queda asignado a su
+        vehículo y en tránsito (el detalle y el paquete, en la misma
+        transacción), y los vehículos usados pasan a 'en_uso'.
+        Los envíos que otro proceso ya despachó o reclamó se dejan como están.
+        Args:
+            asignaciones: Asignaciones del planificador (id_transporte y paquetes)
+            actualizado_por: ID del usuario que confirma
+        Returns:
+            int: Número de envíos despachados
+        """
+        ahora = datetime.now()
+        despachados = 0
+        try:
+            for asignacion in asignaciones:
+                if not asignacion["paquetes"]:
+                    continue
+                actualizados = (
+                    self.db.query(DetalleEntrega)
+                    .filter(
+                        DetalleEntrega.id_paquete.in_(asignacion["paquetes"]),
+                        DetalleEntrega.estado_envio == "Pendiente",
+                        or_(
+                            DetalleEntrega.id_mensajero.is_(None),
+                            DetalleEntrega.reclamo_expira < ahora,
+                        ),
+                        DetalleEntrega.activo == True,
+                    )
+                    .update(
+                        {
+                            DetalleEntrega.id_transporte: asignacion["id_transporte"],
+                            DetalleEntrega.fecha_despacho: ahora,
+                            DetalleEntrega.estado_envio: "En transito",
+                            DetalleEntrega.actualizado_por: actualizado_por,
+                            DetalleEntrega.fecha_actualizacion: ahora,
+                        },
+                        synchronize_session=False,
+                    )
+                )
+                despachados += actualizados
+
+                if actualizados:
+                    """ Solo los paquetes cuyo detalle se despachó en esta misma sentencia """
+                    despachados_ahora = select(DetalleEntrega.id_paquete).where(
+                        DetalleEntrega.id_paquete.in_(asignacion["paquetes"]),
+                        DetalleEntrega.id_transporte == asignacion["id_transporte"],
+                        DetalleEntrega.fecha_despacho == ahora,
+                    )
+                    self.db.query(Paquete).filter(
+                        Paquete.id_paquete.in_(despachados_ahora)
+                    ).update(
+                        {
+                            Paquete.estado: "en_transito",
+                            Paquete.actualizado_por: str(actualizado_por),
+                            Paquete.fecha_actualizacion: ahora,
+                        },
+                        synchronize_session=False,
+                    )
+
+                transporte = self.obtener_por_id(asignacion["id_transporte"])
+                if actualizados and transporte and transporte.estado != "en_uso":
+                    self._registrar_estado(transporte, "en_uso", ahora)
+                    transporte.estado = "en_uso"
+                    transporte.actualizado_por = str(actualizado_por)
+                    transporte.fecha_actualizacion = ahora
+
+            self.db.commit()
+            limpiar_cache_flota()
+            return despachados
+        except Exception as e:
+            self.db.rollback()
+            print(f"Error al confirmar despacho: {e}")
+            raise
@@ -2,9 +2,24 @@
 Paquete de configuración de la base de datos.
 
 Este paquete contiene toda la configuración necesaria para la conexión
-y operación con la base de datos PostgreSQL en Neon.
+y operación con la base de datos PostgreSQL en Neon (o SQLite en local).
 """
 
-from .config import DATABASE_URL, engine, Base, SessionLocal, get_db, create_tables
+from . import config
+from .config import Base, SessionLocal, al_crear_engine, create_tables, get_db, get_engine
 
-__all__ = ["DATABASE_URL", "engine", "Base", "SessionLocal", "get_db", "create_tables"]
+__all__ = [
+    "DATABASE_URL",
+    "engine",
+    "get_engine",
+    "al_crear_engine",
+    "Base",
+    "SessionLocal",
+    "get_db",
+    "create_tables",
+]
+
+
+def __getattr__(nombre: str):
+    """`engine` y `DATABASE_URL` se crean en el primer uso (ver database.config)"""
+    return getattr(config, nombre)
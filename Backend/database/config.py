@@ -1,61 +1,142 @@
 """
 Configuración de la base de datos PostgreSQL con Neon
+
+También acepta una URL de SQLite (`sqlite:///swiftpost.db` o `sqlite://` en
+memoria) para desarrollo local, pruebas y benchmarks sin servidor.
 """
 
 import os
+import threading
+from typing import Callable, List
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 load_dotenv()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
-
-if not DATABASE_URL:
-    DB_HOST = os.getenv("DB_HOST", "localhost")
-    DB_PORT = os.getenv("DB_PORT", "5432")
-    DB_NAME = os.getenv("DB_NAME", "neondb")
-    DB_USERNAME = os.getenv("DB_USERNAME", "")
-    DB_PASSWORD = os.getenv("DB_PASSWORD", "")
-
-    if DB_USERNAME and DB_PASSWORD:
-        DATABASE_URL = (
-            f"postgresql://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-        )
-    else:
-        raise ValueError(
-            "Se requiere DATABASE_URL o las credenciales individuales de la base de datos"
-        )
-
-
-def get_engine():
-    """Create and configure the SQLAlchemy engine with UUID support"""
-    engine = create_engine(
-        DATABASE_URL,
+""" El engine se crea en el primer uso, no al importar: importar la API no abre conexiones """
+_engine = None
+_lock_engine = threading.RLock()
+_al_crear_engine: List[Callable[[Engine], None]] = []
+
+
+def obtener_url() -> str:
+    """URL de la base de datos desde DATABASE_URL o las credenciales individuales"""
+    url = os.getenv("DATABASE_URL")
+    if url:
+        return url
+
+    host = os.getenv("DB_HOST", "localhost")
+    puerto = os.getenv("DB_PORT", "5432")
+    nombre = os.getenv("DB_NAME", "neondb")
+    usuario = os.getenv("DB_USERNAME", "")
+    clave = os.getenv("DB_PASSWORD", "")
+
+    if usuario and clave:
+        return f"postgresql://{usuario}:{clave}@{host}:{puerto}/{nombre}"
+    raise ValueError(
+        "Se requiere DATABASE_URL o las credenciales individuales de la base de datos"
+    )
+
+
+def get_engine() -> Engine:
+    """Devuelve el engine compartido; la primera llamada lo crea y lo configura"""
+    global _engine
+    if _engine is None:
+        with _lock_engine:
+            if _engine is None:
+                engine = _crear_engine(obtener_url())
+                for funcion in _al_crear_engine:
+                    funcion(engine)
+                SessionLocal.configure(bind=engine)
+                _engine = engine
+    return _engine
+
+
+def al_crear_engine(funcion: Callable[[Engine], None]) -> Callable[[Engine], None]:
+    """
+    Registra una función que recibe el engine cuando se crea, o en el momento
+    si ya existe. Sirve para instalar hooks y métricas sin crearlo al importar.
+    """
+    with _lock_engine:
+        if _engine is None:
+            _al_crear_engine.append(funcion)
+            return funcion
+    funcion(_engine)
+    return funcion
+
+
+def _crear_engine(url: str) -> Engine:
+    if url.startswith("sqlite"):
+        return _engine_sqlite(url)
+
+    return create_engine(
+        url,
         echo=False,
         pool_pre_ping=True,
         pool_recycle=300,
     )
 
-    try:
-        with engine.connect() as conn:
-            conn.execute(text('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"'))
-            conn.commit()
-    except Exception:
-        pass
+
+def _engine_sqlite(url: str):
+    """
+    Engine de SQLite. En memoria todas las sesiones comparten una sola
+    conexión (si no, cada una vería una base vacía); en archivo se usa WAL
+    para que las lecturas no esperen a las escrituras.
+    """
+    en_memoria = url in ("sqlite://", "sqlite:///") or ":memory:" in url
+    opciones = {"connect_args": {"check_same_thread": False}}
+    if en_memoria:
+        opciones["poolclass"] = StaticPool
+    engine = create_engine(url, echo=False, **opciones)
+
+    @event.listens_for(engine, "connect")
+    def _configurar_conexion(conexion_dbapi, _registro):
+        cursor = conexion_dbapi.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        if not en_memoria:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
 
     return engine
 
 
-engine = get_engine()
+class _SesionesPerezosas(sessionmaker):
+    """sessionmaker que crea el engine la primera vez que se abre una sesión"""
+
+    def __call__(self, **local_kw):
+        get_engine()
+        return super().__call__(**local_kw)
+
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = _SesionesPerezosas(autocommit=False, autoflush=False)
 
 Base = declarative_base()
 
-__all__ = ["DATABASE_URL", "engine", "Base", "SessionLocal", "get_db", "create_tables"]
+__all__ = [
+    "DATABASE_URL",
+    "engine",
+    "get_engine",
+    "al_crear_engine",
+    "Base",
+    "SessionLocal",
+    "get_db",
+    "create_tables",
+]
+
+
+def __getattr__(nombre: str):
+    """`engine` y `DATABASE_URL` se resuelven al usarlos por primera vez"""
+    if nombre == "engine":
+        return get_engine()
+    if nombre == "DATABASE_URL":
+        return obtener_url()
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
 
 
 def get_db():
@@ -71,7 +152,9 @@ def get_db():
 
 def create_tables():
     """
-    Crear todas las tablas definidas en los modelos
+    Crear todas las tablas definidas en los modelos (y la extensión uuid-ossp
+    en PostgreSQL). Es el paso de migración de scripts/migrar.py; la API ya
+    no lo ejecuta al arrancar.
     """
     from entities import (
         usuario,
@@ -83,6 +166,22 @@ def create_tables():
         paquete,
         detalle_entrega,
         transporte,
+        historial_estado_transporte,
+        escaneo,
+        posicion_transporte,
+        ruta_sede,
+        tarifa,
+        cotizacion,
+        tiempo_ruta,
     )
 
+    engine = get_engine()
+    if engine.dialect.name == "postgresql":
+        try:
+            with engine.connect() as conn:
+                conn.execute(text('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"'))
+                conn.commit()
+        except Exception:
+            pass
+
     Base.metadata.create_all(bind=engine)
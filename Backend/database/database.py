@@ -1,45 +1,19 @@
-import os
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.exc import SQLAlchemyError
-from dotenv import load_dotenv
+from sqlalchemy import text
 import logging
 
+""" Mismo engine, Base y sesiones que database.config: un solo pool y un solo metadata """
+from database import config
+from database.config import Base, SessionLocal, get_engine
+
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
-load_dotenv()
-
-DATABASE_URL = os.getenv("DATABASE_URL")
-
-if not DATABASE_URL:
-    DB_HOST = os.getenv("DB_HOST", "localhost")
-    DB_PORT = os.getenv("DB_PORT", "5432")
-    DB_NAME = os.getenv("DB_NAME", "swiftpost")
-    DB_USER = os.getenv("DB_USER", "postgres")
-    DB_PASSWORD = os.getenv("DB_PASSWORD", "")
-
-    if DB_USER and DB_PASSWORD:
-        DATABASE_URL = (
-            f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-        )
-    else:
-        raise ValueError(
-            "Se requiere configurar las variables de entorno para la conexión a la base de datos"
-        )
-
-engine = create_engine(
-    DATABASE_URL,
-    echo=False,
-    pool_pre_ping=True,
-    pool_recycle=300,
-)
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
+def __getattr__(nombre: str):
+    """`engine` y `DATABASE_URL` se crean en el primer uso (ver database.config)"""
+    return getattr(config, nombre)
 
 
 def get_db():
@@ -78,10 +52,10 @@ def init_db():
             transporte,
         )
 
-        Base.metadata.create_all(bind=engine)
+        Base.metadata.create_all(bind=get_engine())
         logger.info("Tablas creadas exitosamente")
 
-        with engine.connect() as conn:
+        with get_engine().connect() as conn:
             result = conn.execute(text("SELECT 1"))
             logger.info(f"Conexión a la base de datos exitosa: {result.scalar() == 1}")
 
@@ -0,0 +1,51 @@
+"""
+Funciones SQL que se compilan distinto según el motor de base de datos
+"""
+
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import Date, Float
+
+
+class segundos_entre(FunctionElement):
+    """Segundos transcurridos entre dos fechas: segundos_entre(fin, inicio)."""
+
+    type = Float()
+    name = "segundos_entre"
+    inherit_cache = True
+
+
+@compiles(segundos_entre)
+def _segundos_entre(elemento, compilador, **kw):
+    fin, inicio = list(elemento.clauses)
+    return (
+        f"EXTRACT(EPOCH FROM ({compilador.process(fin, **kw)} - "
+        f"{compilador.process(inicio, **kw)}))"
+    )
+
+
+@compiles(segundos_entre, "sqlite")
+def _segundos_entre_sqlite(elemento, compilador, **kw):
+    fin, inicio = list(elemento.clauses)
+    return (
+        f"((julianday({compilador.process(fin, **kw)}) - "
+        f"julianday({compilador.process(inicio, **kw)})) * 86400.0)"
+    )
+
+
+class solo_fecha(FunctionElement):
+    """Parte de fecha de un DateTime, para agrupar por día."""
+
+    type = Date()
+    name = "solo_fecha"
+    inherit_cache = True
+
+
+@compiles(solo_fecha)
+def _solo_fecha(elemento, compilador, **kw):
+    return f"CAST({compilador.process(elemento.clauses, **kw)} AS DATE)"
+
+
+@compiles(solo_fecha, "sqlite")
+def _solo_fecha_sqlite(elemento, compilador, **kw):
+    return f"date({compilador.process(elemento.clauses, **kw)})"
@@ -0,0 +1,40 @@
+"""
+Tipos de columna independientes del motor de base de datos
+"""
+
+import uuid
+
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.types import CHAR, TypeDecorator
+
+
+class GUID(TypeDecorator):
+    """
+    UUID que funciona en PostgreSQL y en SQLite.
+
+    En PostgreSQL usa el tipo nativo UUID (mismo esquema e índices que antes);
+    en los demás motores se guarda como texto de 36 caracteres. En ambos casos
+    se aceptan UUID o cadenas al filtrar y se devuelven objetos uuid.UUID.
+    """
+
+    impl = CHAR(36)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(PG_UUID(as_uuid=True))
+        return dialect.type_descriptor(CHAR(36))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        if dialect.name == "postgresql":
+            return value
+        return str(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+        return uuid.UUID(str(value))
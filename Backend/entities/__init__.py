@@ -7,3 +7,5 @@ from .sede import Sede
 from .tipo_documento import TipoDocumento
 from .detalle_entrega import DetalleEntrega
 from .transporte import Transporte
+from .historial_estado_transporte import HistorialEstadoTransporte
+from .cotizacion import Cotizacion
@@ -1,6 +1,6 @@
 from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from database.tipos import GUID
 from pydantic import BaseModel, Field, validator
 from typing import Optional, List
 from database.config import Base
@@ -34,7 +34,7 @@ class Cliente(Base):
 
     __tablename__ = "clientes"
     id_cliente = Column(
-        PG_UUID(as_uuid=True),
+        GUID(),
         primary_key=True,
         default=uuid.uuid4,
         comment="ID único del cliente",
@@ -49,7 +49,7 @@ class Cliente(Base):
     )
 
     id_tipo_documento = Column(
-        PG_UUID(as_uuid=True),
+        GUID(),
         ForeignKey("tipos_documentos.id_tipo_documento"),
         nullable=False,
     )
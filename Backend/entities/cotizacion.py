@@ -0,0 +1,76 @@
+from sqlalchemy import (
+    Column,
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    JSON,
+    String,
+)
+from sqlalchemy.orm import relationship
+from database.config import Base
+from datetime import datetime
+from database.tipos import GUID
+import uuid
+
+
+class Cotizacion(Base):
+    """
+    Modelo de Cotizacion que representa la tabla 'cotizaciones'
+    Guarda el precio calculado para un envío para que el paquete pueda
+    registrarse con ese mismo precio mientras la cotización esté vigente.
+
+    Atributos:
+        id_cotizacion: Identificador único de la cotización
+        id_sede_origen: ID de la sede de origen
+        id_sede_destino: ID de la sede de destino
+        peso_kg: Peso cotizado en kilogramos
+        tamaño: Tamaño cotizado
+        tipo_envio: Tipo de envío cotizado
+        es_fragil: Si el paquete cotizado es frágil
+        valor_declarado: Valor declarado cotizado
+        distancia_km: Distancia usada para el precio
+        transbordos: Sedes intermedias de la ruta
+        costo_total: Precio final cotizado
+        tiempo_promedio_horas: Tiempo estimado de entrega
+        desglose: Cotización completa tal como se calculó
+        fecha_cotizacion: Fecha y hora de la cotización
+        fecha_expiracion: Fecha y hora en que la cotización deja de ser válida
+        creado_por: Usuario que pidió la cotización (opcional)
+    """
+
+    __tablename__ = "cotizaciones"
+
+    id_cotizacion = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    id_sede_origen = Column(
+        GUID(), ForeignKey("sedes.id_sede"), nullable=False
+    )
+    id_sede_destino = Column(
+        GUID(), ForeignKey("sedes.id_sede"), nullable=False
+    )
+    peso_kg = Column(Float, nullable=False)
+    tamaño = Column(String(10), nullable=False)
+    tipo_envio = Column(String(10), nullable=False)
+    es_fragil = Column(Boolean, default=False, nullable=False)
+    valor_declarado = Column(Float, default=0.0, nullable=False)
+    distancia_km = Column(Float, nullable=False)
+    transbordos = Column(Integer, default=0, nullable=False)
+    costo_total = Column(Float, nullable=False)
+    tiempo_promedio_horas = Column(Integer, nullable=False)
+    desglose = Column(JSON, nullable=False)
+    fecha_cotizacion = Column(DateTime, default=datetime.now, nullable=False)
+    fecha_expiracion = Column(DateTime, nullable=False, index=True)
+    creado_por = Column(String(36), ForeignKey("usuarios.id_usuario"), nullable=True)
+
+    sede_origen = relationship("Sede", foreign_keys=[id_sede_origen])
+    sede_destino = relationship("Sede", foreign_keys=[id_sede_destino])
+    paquete = relationship("Paquete", back_populates="cotizacion", uselist=False)
+
+    @property
+    def id_paquete(self):
+        """Paquete registrado con esta cotización; None si aún no se usa."""
+        return self.paquete.id_paquete if self.paquete else None
+
+    def __repr__(self):
+        return f"<Cotizacion(id_cotizacion={self.id_cotizacion}, costo_total={self.costo_total}, fecha_expiracion={self.fecha_expiracion})>"
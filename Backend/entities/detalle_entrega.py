@@ -1,10 +1,10 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel, Field, validator
 from typing import Optional, List
 from database.config import Base
 from datetime import datetime
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from database.tipos import GUID
 import uuid
 
 
@@ -22,40 +22,61 @@ class DetalleEntrega(Base):
         fecha_envio: Fecha de envío
         fecha_entrega: Fecha de entrega
         observaciones: Observaciones adicionales
+        id_mensajero: Mensajero que reclamó la entrega (opcional)
+        reclamo_expira: Fecha en que vence el reclamo del mensajero
+        id_transporte: Vehículo al que se asignó el envío en un despacho (opcional)
+        fecha_despacho: Fecha en que se despachó en ese vehículo
         activo: Estado del registro (activo/inactivo)
         fecha_creacion: Fecha y hora de creación
         fecha_actualizacion: Fecha y hora de última actualización
     """
 
     __tablename__ = "detalles_entrega"
-    id_detalle = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    __table_args__ = (
+        Index(
+            "ix_detalles_entrega_sede_estado",
+            "id_sede_remitente",
+            "estado_envio",
+            "fecha_envio",
+        ),
+        Index("ix_detalles_entrega_transporte_despacho", "id_transporte", "fecha_despacho"),
+    )
+    id_detalle = Column(GUID(), primary_key=True, default=uuid.uuid4)
     id_sede_remitente = Column(
-        PG_UUID(as_uuid=True), ForeignKey("sedes.id_sede"), nullable=False
+        GUID(), ForeignKey("sedes.id_sede"), nullable=False
     )
     id_sede_receptora = Column(
-        PG_UUID(as_uuid=True), ForeignKey("sedes.id_sede"), nullable=False
+        GUID(), ForeignKey("sedes.id_sede"), nullable=False
     )
     id_paquete = Column(
-        PG_UUID(as_uuid=True), ForeignKey("paquetes.id_paquete"), nullable=False
+        GUID(), ForeignKey("paquetes.id_paquete"), nullable=False
     )
     id_cliente_remitente = Column(
-        PG_UUID(as_uuid=True), ForeignKey("clientes.id_cliente"), nullable=False
+        GUID(), ForeignKey("clientes.id_cliente"), nullable=False
     )
     id_cliente_receptor = Column(
-        PG_UUID(as_uuid=True), ForeignKey("clientes.id_cliente"), nullable=False
+        GUID(), ForeignKey("clientes.id_cliente"), nullable=False
     )
     estado_envio = Column(String(20), default="Pendiente", nullable=False)
     fecha_envio = Column(DateTime, nullable=False)
     fecha_entrega = Column(DateTime, nullable=True)
     observaciones = Column(String(500), nullable=True)
+    id_mensajero = Column(
+        GUID(), ForeignKey("empleados.id_empleado"), nullable=True
+    )
+    reclamo_expira = Column(DateTime, nullable=True)
+    id_transporte = Column(
+        GUID(), ForeignKey("transportes.id_transporte"), nullable=True
+    )
+    fecha_despacho = Column(DateTime, nullable=True)
     activo = Column(Boolean, default=True, nullable=False)
     fecha_creacion = Column(DateTime, default=datetime.now, nullable=False)
     fecha_actualizacion = Column(DateTime, default=None, onupdate=datetime.now)
     creado_por = Column(
-        PG_UUID(as_uuid=True), ForeignKey("usuarios.id_usuario"), nullable=False
+        GUID(), ForeignKey("usuarios.id_usuario"), nullable=False
     )
     actualizado_por = Column(
-        PG_UUID(as_uuid=True), ForeignKey("usuarios.id_usuario"), nullable=False
+        GUID(), ForeignKey("usuarios.id_usuario"), nullable=False
     )
 
     sede_remitente_rel = relationship("Sede", foreign_keys=[id_sede_remitente])
@@ -69,6 +90,8 @@ class DetalleEntrega(Base):
 
     cliente_remitente = relationship("Cliente", foreign_keys=[id_cliente_remitente])
     cliente_receptor = relationship("Cliente", foreign_keys=[id_cliente_receptor])
+    mensajero = relationship("Empleado", foreign_keys=[id_mensajero])
+    transporte = relationship("Transporte", foreign_keys=[id_transporte])
 
     creador = relationship("Usuario", foreign_keys=[creado_por])
     actualizador = relationship("Usuario", foreign_keys=[actualizado_por])
@@ -13,7 +13,7 @@ from pydantic import BaseModel, Field, validator
 from typing import Optional, List
 from database.config import Base
 from datetime import datetime, date
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from database.tipos import GUID
 import uuid
 import re
 
@@ -44,7 +44,7 @@ class Empleado(Base):
 
     __tablename__ = "empleados"
     id_empleado = Column(
-        PG_UUID(as_uuid=True),
+        GUID(),
         primary_key=True,
         default=uuid.uuid4,
         comment="ID único del empleado",
@@ -72,13 +72,13 @@ class Empleado(Base):
         foreign_keys=[creado_por],
         overlaps="empleado,usuario,empleados_actualizados",
     )
-    id_sede = Column(PG_UUID(as_uuid=True), ForeignKey("sedes.id_sede"), nullable=True)
+    id_sede = Column(GUID(), ForeignKey("sedes.id_sede"), nullable=True)
     primer_nombre = Column(String(50), nullable=False)
     segundo_nombre = Column(String(50), nullable=True)
     primer_apellido = Column(String(50), nullable=False)
     segundo_apellido = Column(String(50), nullable=True)
     id_tipo_documento = Column(
-        PG_UUID(as_uuid=True),
+        GUID(),
         ForeignKey("tipos_documentos.id_tipo_documento"),
         nullable=False,
     )
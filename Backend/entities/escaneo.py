@@ -0,0 +1,42 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from database.config import Base
+from datetime import datetime
+from database.tipos import GUID
+import uuid
+
+
+class Escaneo(Base):
+    """
+    Modelo de Escaneo que representa la tabla 'escaneos'
+    Historial de lecturas de los escáneres de mano de cada sede.
+
+    Atributos:
+        id_escaneo: Identificador único del escaneo
+        id_paquete: ID del paquete escaneado
+        id_sede: ID de la sede donde se realizó el escaneo
+        estado: Estado del paquete reportado por el escaneo (opcional)
+        fecha_escaneo: Fecha y hora en que el escáner leyó el paquete
+        fecha_creacion: Fecha y hora en que el escaneo se guardó en la base de datos
+    """
+
+    __tablename__ = "escaneos"
+    __table_args__ = (
+        Index("ix_escaneos_paquete_fecha", "id_paquete", "fecha_escaneo"),
+        Index("ix_escaneos_sede_fecha", "id_sede", "fecha_escaneo"),
+    )
+
+    id_escaneo = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    id_paquete = Column(
+        GUID(), ForeignKey("paquetes.id_paquete"), nullable=False
+    )
+    id_sede = Column(GUID(), ForeignKey("sedes.id_sede"), nullable=False)
+    estado = Column(String(20), nullable=True)
+    fecha_escaneo = Column(DateTime, nullable=False)
+    fecha_creacion = Column(DateTime, default=datetime.now, nullable=False)
+
+    paquete = relationship("Paquete", foreign_keys=[id_paquete])
+    sede = relationship("Sede", foreign_keys=[id_sede])
+
+    def __repr__(self):
+        return f"<Escaneo(id_escaneo={self.id_escaneo}, paquete={self.id_paquete}, sede={self.id_sede}, estado={self.estado}, fecha_escaneo={self.fecha_escaneo})>"
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from database.config import Base
+from database.tipos import GUID
+import uuid
+
+
+class HistorialEstadoTransporte(Base):
+    """
+    Modelo de HistorialEstadoTransporte que representa la tabla 'historial_estados_transporte'
+    Cada fila es un intervalo en el que un vehículo estuvo en un estado; el
+    intervalo actual tiene `hasta` en None.
+
+    Atributos:
+        id_historial: Identificador único del intervalo
+        id_transporte: ID del vehículo
+        estado: Estado del vehículo en el intervalo
+        desde: Inicio del intervalo
+        hasta: Fin del intervalo (None si es el estado actual)
+    """
+
+    __tablename__ = "historial_estados_transporte"
+    __table_args__ = (
+        Index("ix_historial_estados_transporte_desde", "id_transporte", "desde"),
+    )
+
+    id_historial = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    id_transporte = Column(
+        GUID(), ForeignKey("transportes.id_transporte"), nullable=False
+    )
+    estado = Column(String(20), nullable=False)
+    desde = Column(DateTime, nullable=False)
+    hasta = Column(DateTime, nullable=True)
+
+    transporte = relationship("Transporte", foreign_keys=[id_transporte])
+
+    def __repr__(self):
+        return f"<HistorialEstadoTransporte(transporte={self.id_transporte}, estado={self.estado}, desde={self.desde}, hasta={self.hasta})>"
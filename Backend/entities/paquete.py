@@ -4,7 +4,7 @@ from pydantic import BaseModel, Field, validator
 from typing import Optional, List
 from database.config import Base
 from datetime import datetime
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from database.tipos import GUID
 import uuid
 
 
@@ -21,6 +21,8 @@ class Paquete(Base):
         tipo: Tipo de paquete (Normal, Express)
         valor_declarado: Valor declarado del paquete para fines de seguro
         estado: Estado del paquete (registrado, en_transito, entregado, etc.)
+        costo_envio: Precio cobrado por el envío, tomado de la cotización
+        id_cotizacion: Cotización con la que se registró el paquete (opcional)
         activo: Estado del paquete (activo/inactivo)
         fecha_creacion: Fecha y hora de creación
         fecha_actualizacion: Fecha y hora de última actualización
@@ -29,9 +31,9 @@ class Paquete(Base):
     """
 
     __tablename__ = "paquetes"
-    id_paquete = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id_paquete = Column(GUID(), primary_key=True, default=uuid.uuid4)
     id_cliente = Column(
-        PG_UUID(as_uuid=True), ForeignKey("clientes.id_cliente"), nullable=False
+        GUID(), ForeignKey("clientes.id_cliente"), nullable=False
     )
     peso = Column(Float, nullable=False)
     tamaño = Column(String(10), nullable=False)
@@ -40,11 +42,19 @@ class Paquete(Base):
     tipo = Column(String(10), nullable=False)
     valor_declarado = Column(Float, nullable=False, default=0.0)
     estado = Column(String(20), nullable=False, default="registrado")
+    costo_envio = Column(Float, nullable=True)
+    """ Única: una cotización solo puede usarse para un paquete """
+    id_cotizacion = Column(
+        GUID(),
+        ForeignKey("cotizaciones.id_cotizacion"),
+        nullable=True,
+        unique=True,
+    )
     activo = Column(Boolean, default=True, nullable=False)
     fecha_creacion = Column(DateTime, default=datetime.now, nullable=False)
     fecha_actualizacion = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     creado_por = Column(
-        PG_UUID(as_uuid=True), ForeignKey("usuarios.id_usuario"), nullable=False
+        GUID(), ForeignKey("usuarios.id_usuario"), nullable=False
     )
     actualizado_por = Column(
         String(36), ForeignKey("usuarios.id_usuario"), nullable=True
@@ -57,6 +67,9 @@ class Paquete(Base):
     detalle_entrega = relationship(
         "DetalleEntrega", back_populates="paquete", uselist=False
     )
+    cotizacion = relationship(
+        "Cotizacion", back_populates="paquete", foreign_keys=[id_cotizacion]
+    )
     creador = relationship("Usuario", foreign_keys=[creado_por])
     actualizador = relationship("Usuario", foreign_keys=[actualizado_por])
 
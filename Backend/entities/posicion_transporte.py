@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Float, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from database.config import Base
+from database.tipos import GUID
+
+
+class PosicionTransporte(Base):
+    """
+    Modelo de PosicionTransporte que representa la tabla 'posiciones_transporte'
+    Historial de solo inserción de los pings GPS de cada vehículo. En PostgreSQL
+    la tabla se particiona por rango mensual sobre fecha_registro.
+
+    Atributos:
+        id_transporte: ID del vehículo que reportó la posición
+        fecha_registro: Fecha y hora en que el GPS tomó la lectura
+        latitud: Latitud en grados decimales
+        longitud: Longitud en grados decimales
+        velocidad_kmh: Velocidad reportada en km/h (opcional)
+        rumbo: Rumbo en grados 0-360 (opcional)
+    """
+
+    __tablename__ = "posiciones_transporte"
+    __table_args__ = {"postgresql_partition_by": "RANGE (fecha_registro)"}
+
+    id_transporte = Column(
+        GUID(),
+        ForeignKey("transportes.id_transporte"),
+        primary_key=True,
+    )
+    fecha_registro = Column(DateTime, primary_key=True)
+    latitud = Column(Float, nullable=False)
+    longitud = Column(Float, nullable=False)
+    velocidad_kmh = Column(Float, nullable=True)
+    rumbo = Column(Float, nullable=True)
+
+    transporte = relationship("Transporte", foreign_keys=[id_transporte])
+
+    def __repr__(self):
+        return f"<PosicionTransporte(id_transporte={self.id_transporte}, fecha_registro={self.fecha_registro}, latitud={self.latitud}, longitud={self.longitud})>"
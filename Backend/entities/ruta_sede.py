@@ -0,0 +1,63 @@
+from sqlalchemy import (
+    Column,
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import relationship
+from database.config import Base
+from datetime import datetime
+from database.tipos import GUID
+import uuid
+
+
+class RutaSede(Base):
+    """
+    Modelo de RutaSede que representa la tabla 'rutas_sede'
+    Tramo de transporte configurado entre dos sedes de la red.
+
+    Atributos:
+        id_ruta: Identificador único del tramo
+        id_sede_origen: ID de la sede donde empieza el tramo
+        id_sede_destino: ID de la sede donde termina el tramo
+        distancia_km: Distancia real del tramo en kilómetros
+        bidireccional: Si el tramo se puede recorrer en ambos sentidos
+        activo: Estado del tramo (activo/inactivo)
+        fecha_creacion: Fecha y hora de creación
+        fecha_actualizacion: Fecha y hora de última actualización
+        creado_por: Usuario que creó el tramo
+        actualizado_por: Usuario que actualizó el tramo
+    """
+
+    __tablename__ = "rutas_sede"
+    __table_args__ = (
+        UniqueConstraint(
+            "id_sede_origen", "id_sede_destino", name="uq_rutas_sede_origen_destino"
+        ),
+    )
+
+    id_ruta = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    id_sede_origen = Column(
+        GUID(), ForeignKey("sedes.id_sede"), nullable=False
+    )
+    id_sede_destino = Column(
+        GUID(), ForeignKey("sedes.id_sede"), nullable=False
+    )
+    distancia_km = Column(Float, nullable=False)
+    bidireccional = Column(Boolean, default=True, nullable=False)
+    activo = Column(Boolean, default=True, nullable=False)
+    fecha_creacion = Column(DateTime, default=datetime.now, nullable=False)
+    fecha_actualizacion = Column(DateTime, default=None, onupdate=datetime.now)
+    creado_por = Column(String(36), ForeignKey("usuarios.id_usuario"), nullable=False)
+    actualizado_por = Column(
+        String(36), ForeignKey("usuarios.id_usuario"), nullable=True
+    )
+
+    sede_origen = relationship("Sede", foreign_keys=[id_sede_origen])
+    sede_destino = relationship("Sede", foreign_keys=[id_sede_destino])
+
+    def __repr__(self):
+        return f"<RutaSede(id_ruta={self.id_ruta}, origen={self.id_sede_origen}, destino={self.id_sede_destino}, distancia_km={self.distancia_km})>"
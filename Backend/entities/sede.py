@@ -4,7 +4,7 @@ from pydantic import BaseModel, Field, validator
 from typing import Optional, List
 from database.config import Base
 from datetime import datetime
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from database.tipos import GUID
 import uuid
 import re
 
@@ -26,7 +26,7 @@ class Sede(Base):
     """
 
     __tablename__ = "sedes"
-    id_sede = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id_sede = Column(GUID(), primary_key=True, default=uuid.uuid4)
     nombre = Column(String(100), nullable=False)
     ciudad = Column(String(50), nullable=False)
     direccion = Column(String(200), nullable=False)
@@ -0,0 +1,46 @@
+from sqlalchemy import Column, String, Boolean, DateTime, Float, ForeignKey, Index
+from database.config import Base
+from datetime import datetime
+from database.tipos import GUID
+import uuid
+
+
+class Tarifa(Base):
+    """
+    Modelo de Tarifa que representa la tabla 'tarifas'
+    Cada fila fija el valor de un concepto de tarifa a partir de una fecha.
+    El valor vigente de un concepto es el de la fila activa más reciente cuya
+    fecha de vigencia ya pasó.
+
+    Atributos:
+        id_tarifa: Identificador único de la tarifa
+        concepto: Concepto tarifado (tarifa_km, costo_minimo, velocidad_kmh, ...)
+        clave: Tipo de envío o tamaño al que aplica; vacío para valores únicos
+        valor: Valor de la tarifa
+        vigente_desde: Fecha desde la que aplica la tarifa
+        activo: Estado del registro (activo/inactivo)
+        fecha_creacion: Fecha y hora de creación
+        creado_por: Usuario que creó la tarifa
+        actualizado_por: Usuario que desactivó la tarifa
+    """
+
+    __tablename__ = "tarifas"
+    __table_args__ = (
+        Index("ix_tarifas_concepto_clave_vigencia", "concepto", "clave", "vigente_desde"),
+    )
+
+    id_tarifa = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    concepto = Column(String(40), nullable=False)
+    clave = Column(String(20), nullable=False, default="")
+    valor = Column(Float, nullable=False)
+    vigente_desde = Column(DateTime, nullable=False, default=datetime.now)
+    activo = Column(Boolean, default=True, nullable=False)
+    fecha_creacion = Column(DateTime, default=datetime.now, nullable=False)
+    fecha_actualizacion = Column(DateTime, default=None, onupdate=datetime.now)
+    creado_por = Column(String(36), ForeignKey("usuarios.id_usuario"), nullable=False)
+    actualizado_por = Column(
+        String(36), ForeignKey("usuarios.id_usuario"), nullable=True
+    )
+
+    def __repr__(self):
+        return f"<Tarifa(concepto={self.concepto}, clave={self.clave}, valor={self.valor}, vigente_desde={self.vigente_desde})>"
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, String, DateTime, Float, ForeignKey, Integer
+from database.config import Base
+from datetime import datetime
+from database.tipos import GUID
+
+
+class TiempoRuta(Base):
+    """
+    Modelo de TiempoRuta que representa la tabla 'tiempos_ruta'
+    Percentiles del tiempo de entrega observado entre dos sedes para un tipo
+    de envío. La tabla se recalcula completa con scripts/calcular_tiempos_ruta.py.
+
+    Atributos:
+        id_sede_origen: ID de la sede remitente
+        id_sede_destino: ID de la sede receptora
+        tipo_envio: Tipo de envío (normal, express, premium)
+        envios: Número de entregas usadas para el cálculo
+        horas_p10: Percentil 10 del tiempo de entrega en horas
+        horas_p50: Mediana del tiempo de entrega en horas
+        horas_p90: Percentil 90 del tiempo de entrega en horas
+        fecha_calculo: Fecha y hora del cálculo
+    """
+
+    __tablename__ = "tiempos_ruta"
+
+    id_sede_origen = Column(
+        GUID(), ForeignKey("sedes.id_sede"), primary_key=True
+    )
+    id_sede_destino = Column(
+        GUID(), ForeignKey("sedes.id_sede"), primary_key=True
+    )
+    tipo_envio = Column(String(10), primary_key=True)
+    envios = Column(Integer, nullable=False)
+    horas_p10 = Column(Float, nullable=False)
+    horas_p50 = Column(Float, nullable=False)
+    horas_p90 = Column(Float, nullable=False)
+    fecha_calculo = Column(DateTime, default=datetime.now, nullable=False)
+
+    def __repr__(self):
+        return f"<TiempoRuta(origen={self.id_sede_origen}, destino={self.id_sede_destino}, tipo={self.tipo_envio}, p50={self.horas_p50}, p90={self.horas_p90})>"
@@ -1,6 +1,6 @@
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from database.tipos import GUID
 from database.config import Base
 from datetime import datetime
 import uuid
@@ -23,7 +23,7 @@ class TipoDocumento(Base):
 
     __tablename__ = "tipos_documentos"
     id_tipo_documento = Column(
-        PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        GUID(), primary_key=True, default=uuid.uuid4
     )
     nombre = Column(String(50), nullable=False, unique=True)
     codigo = Column(String(5), nullable=False, unique=True)
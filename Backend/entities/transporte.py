@@ -1,6 +1,6 @@
 from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from database.tipos import GUID
 from pydantic import BaseModel, Field, validator
 from typing import Optional, List
 from database.config import Base
@@ -30,10 +30,10 @@ class Transporte(Base):
     """
 
     __tablename__ = "transportes"
-    id_transporte = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id_transporte = Column(GUID(), primary_key=True, default=uuid.uuid4)
     tipo_vehiculo = Column(String(50), nullable=False)
     capacidad_carga = Column(Float, nullable=False)
-    id_sede = Column(PG_UUID(as_uuid=True), ForeignKey("sedes.id_sede"), nullable=False)
+    id_sede = Column(GUID(), ForeignKey("sedes.id_sede"), nullable=False)
     placa = Column(String(10), nullable=False, unique=True)
     modelo = Column(String(50), nullable=False)
     marca = Column(String(50), nullable=False)
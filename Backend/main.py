@@ -3,7 +3,9 @@ SWIFTPOST - Sistema de Mensajería con ORM SQLAlchemy y Neon PostgreSQL
 API REST con FastAPI - Sin interfaz de consola
 """
 
-import uvicorn
+import os
+import time
+
 from apis import (
     auth,
     usuario,
@@ -16,9 +18,34 @@ from apis import (
     rol,
     tipo_documento,
     analytics,
+    escaneo,
+    ruta,
+    tarifa,
+    cotizacion,
+    simulacion,
+    debug,
+)
+from database.config import al_crear_engine, create_tables, get_engine
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
+from observabilidad import (
+    TIPO_CONTENIDO_METRICAS,
+    MiddlewareInstrumentacionSQL,
+    MiddlewareMetricas,
+    MiddlewarePerfilador,
+    MiddlewareTrazas,
+    instalar_explain,
+    instalar_hooks_sql,
+    instalar_trazas,
+    metricas,
+    perfilador,
+    registrar_medidores_pool,
 )
-from database.config import create_tables
-from fastapi import FastAPI
+from services.buffer_escaneos import buffer_escaneos
+from services.indice_posiciones import indice_posiciones
+from services.tarifas import gestor_tarifas
+from services.tiempos_ruta import cargar_tiempos_ruta
+from services.vigilante_caches import registrar_caches_api, vigilante_caches
 from fastapi.middleware.cors import CORSMiddleware
 
 app = FastAPI(
@@ -29,6 +56,16 @@ app = FastAPI(
     redoc_url="/redoc",
 )
 
+""" Se instalan cuando se crea el engine, en la primera consulta """
+al_crear_engine(instalar_hooks_sql)
+al_crear_engine(instalar_explain)
+al_crear_engine(registrar_medidores_pool)
+instalar_trazas()
+app.add_middleware(MiddlewareInstrumentacionSQL)
+app.add_middleware(MiddlewareMetricas)
+app.add_middleware(MiddlewarePerfilador)
+app.add_middleware(MiddlewareTrazas)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -48,15 +85,42 @@ app.include_router(detalle_entrega.router)
 app.include_router(rol.router)
 app.include_router(tipo_documento.router)
 app.include_router(analytics.router)
+app.include_router(escaneo.router)
+app.include_router(ruta.router)
+app.include_router(tarifa.router)
+app.include_router(cotizacion.router)
+app.include_router(simulacion.router)
+app.include_router(debug.router)
+
+""" Las tablas se crean con scripts/migrar.py; 1 las crea también al arrancar (p. ej. SQLite en memoria) """
+CREAR_TABLAS_AL_INICIAR = os.getenv("CREAR_TABLAS_AL_INICIAR", "0") in ("1", "true")
+_arranque = {"listo": False, "duracion_ms": None}
 
 
 @app.on_event("startup")
 async def startup_event():
     """Evento de inicio de la aplicación"""
     print("Iniciando SWIFTPOST Sistema de Mensajería...")
-    print("Configurando base de datos...")
-    create_tables()
-    print("Sistema SWIFTPOST listo para usar.")
+    inicio = time.perf_counter()
+    if CREAR_TABLAS_AL_INICIAR:
+        print("Configurando base de datos...")
+        create_tables()
+    buffer_escaneos.iniciar()
+    gestor_tarifas.iniciar()
+    registrar_caches_api(vigilante_caches)
+    vigilante_caches.iniciar()
+    perfilador.iniciar()
+    try:
+        print(f"Posiciones de vehículos cargadas: {indice_posiciones.cargar()}")
+    except Exception as e:
+        print(f"No se pudo cargar el índice de posiciones: {e}")
+    try:
+        print(f"Tiempos de entrega por ruta cargados: {cargar_tiempos_ruta()}")
+    except Exception as e:
+        print(f"No se pudieron cargar los tiempos por ruta, se usa la fórmula: {e}")
+    _arranque["duracion_ms"] = round((time.perf_counter() - inicio) * 1000, 1)
+    _arranque["listo"] = True
+    print(f"Sistema SWIFTPOST listo para usar ({_arranque['duracion_ms']:.0f} ms).")
     print("Documentación disponible en: http://localhost:8000/docs")
 
 
@@ -64,6 +128,11 @@ async def startup_event():
 async def shutdown_event():
     """Evento de cierre de la aplicación"""
     print("Cerrando SWIFTPOST Sistema de Mensajería...")
+    _arranque["listo"] = False
+    buffer_escaneos.detener()
+    gestor_tarifas.detener()
+    vigilante_caches.detener()
+    perfilador.detener()
     print("Sistema SWIFTPOST cerrado.")
 
 
@@ -82,8 +151,35 @@ async def root():
     }
 
 
+@app.get("/salud", tags=["raíz"])
+async def salud():
+    """Liveness: el proceso está vivo y atiende requests."""
+    return {"estado": "ok"}
+
+
+@app.get("/salud/listo", tags=["raíz"])
+def salud_listo():
+    """Readiness: terminó el arranque y la base de datos responde."""
+    if not _arranque["listo"]:
+        raise HTTPException(status_code=503, detail="La API todavía está arrancando")
+    try:
+        with get_engine().connect() as conexion:
+            conexion.exec_driver_sql("SELECT 1")
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Base de datos no disponible: {e}")
+    return {"estado": "listo", "arranque_ms": _arranque["duracion_ms"]}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Métricas de la API en formato de texto de Prometheus."""
+    return PlainTextResponse(metricas.exportar(), media_type=TIPO_CONTENIDO_METRICAS)
+
+
 def main():
     """Función principal para ejecutar el servidor"""
+    import uvicorn
+
     print("Iniciando servidor FastAPI...")
     uvicorn.run(
         "main:app",
@@ -14,6 +14,9 @@ from services.servicio_mensajeria import (
     TipoEnvio,
     TamañoPaquete,
 )
+from cruds.cotizacion_crud import CotizacionCRUD
+from services.enrutador_sedes import enrutador_sedes
+from services.tarifas import gestor_tarifas
 
 
 def mostrar_encabezado(titulo: str = ""):
@@ -205,13 +208,16 @@ def mostrar_cotizacion(cotizacion: Dict[str, Any], sede_origen: Any, sede_destin
         print(f"   Valor declarado: ${cotizacion['valor_declarado']:,.0f}")
 
     print(f"\n DISTANCIA: {cotizacion['distancia_km']} km")
+    if cotizacion.get("transbordos"):
+        print(f"   Transbordos en sedes intermedias: {cotizacion['transbordos']}")
 
     print(f"\n DESGLOSE DE COSTOS:")
     print(f"   Costo por distancia: ${cotizacion['costo_distancia']:,.0f}")
     print(f"   Costo por peso: ${cotizacion['costo_peso']:,.0f}")
     print(f"   Multiplicador tamaño: x{cotizacion['multiplicador_tamaño']}")
     if cotizacion["es_fragil"]:
-        print(f"   Recargo por fragilidad: +15%")
+        recargo = (ServicioMensajeria.tabla_vigente().multiplicador_fragil - 1) * 100
+        print(f"   Recargo por fragilidad: +{recargo:.0f}%")
     if cotizacion["costo_seguro"] > 0:
         print(f"   Seguro: ${cotizacion['costo_seguro']:,.0f}")
 
@@ -271,12 +277,31 @@ def cotizar_envio(db: Session) -> None:
             altitud=sede_destino.altitud or 0,
         )
 
+        ruta = enrutador_sedes.ruta(sede_origen.id_sede, sede_destino.id_sede)
         cotizacion = ServicioMensajeria.generar_cotizacion_completa(
-            coord_origen, coord_destino, parametros
+            coord_origen,
+            coord_destino,
+            parametros,
+            distancia_km=ruta.distancia_km if ruta else None,
+            transbordos=ruta.transbordos if ruta else 0,
+            id_sede_origen=sede_origen.id_sede,
+            id_sede_destino=sede_destino.id_sede,
         )
 
         mostrar_cotizacion(cotizacion, sede_origen, sede_destino)
 
+        guardar = input("\n¿Desea guardar la cotización? (s/n): ").strip().lower()
+        if guardar in ["s", "si", "sí"]:
+            registro = CotizacionCRUD(db).guardar(
+                cotizacion=cotizacion,
+                id_sede_origen=sede_origen.id_sede,
+                id_sede_destino=sede_destino.id_sede,
+            )
+            print(f"\n Código de cotización: {registro.id_cotizacion}")
+            print(
+                f"   Úselo al registrar el paquete antes de {registro.fecha_expiracion:%Y-%m-%d %H:%M}"
+            )
+
         generar = (
             input("\n¿Desea generar el detalle de entrega? (s/n): ").strip().lower()
         )
@@ -299,6 +324,11 @@ def menu_cotizacion(db: Session) -> None:
     Args:
         db: Sesión de base de datos
     """
+    try:
+        gestor_tarifas.recargar()
+    except Exception as e:
+        print(f"No se pudieron cargar las tarifas, se usan las tarifas por defecto: {e}")
+
     while True:
         mostrar_encabezado("SERVICIO DE COTIZACIÓN")
         print("1. Cotizar envío")
@@ -320,31 +350,36 @@ def menu_cotizacion(db: Session) -> None:
 
 
 def mostrar_tarifas():
-    """Muestra las tarifas del servicio."""
+    """Muestra las tarifas vigentes del servicio."""
     mostrar_encabezado("TARIFAS DEL SERVICIO")
+    tabla = ServicioMensajeria.tabla_vigente()
 
     print(" TARIFAS BASE POR KILÓMETRO:")
-    print(f"   Normal: $150 COP/km")
-    print(f"   Express: $250 COP/km")
-    print(f"   Premium: $400 COP/km")
+    for tipo, tarifa in tabla.tarifa_km.items():
+        print(f"   {tipo.value.title()}: ${tarifa:,.0f} COP/km")
 
     print("\n MULTIPLICADORES POR TAMAÑO:")
-    print(f"   Pequeño: x1.0")
-    print(f"   MFediano: x1.3")
-    print(f"   Grande: x1.7")
-    print(f"   Gigante: x2.2")
+    for tamaño, multiplicador in tabla.multiplicador_tamaño.items():
+        print(f"   {tamaño.value.title()}: x{multiplicador}")
 
     print("\n RECARGOS ADICIONALES:")
-    print(f"   Paquete frágil: +15%")
-    print(f"   Seguro por valor declarado: 0.5% del valor")
+    print(f"   Paquete frágil: +{(tabla.multiplicador_fragil - 1) * 100:.0f}%")
+    print(f"   Seguro por valor declarado: {tabla.porcentaje_seguro * 100:g}% del valor")
 
     print("\n OTROS COSTOS:")
-    print(f"   Costo base por peso: $2,000 COP/kg")
-    print(f"   Costo mínimo por envío: $5,000 COP")
+    print(f"   Costo base por peso: ${tabla.costo_base_peso:,.0f} COP/kg")
+    print(f"   Costo mínimo por envío: ${tabla.costo_minimo:,.0f} COP")
 
     print("\n VELOCIDADES PROMEDIO:")
-    print(f"   Normal: 25 km/h + 4h procesamiento")
-    print(f"   Express: 40 km/h + 2h procesamiento")
-    print(f"   Premium: 60 km/h + 1h procesamiento")
+    for tipo, velocidad in tabla.velocidad_kmh.items():
+        print(
+            f"   {tipo.value.title()}: {velocidad:g} km/h + "
+            f"{tabla.horas_procesamiento[tipo]:g}h procesamiento"
+        )
+
+    if tabla.vigente_desde:
+        print(f"\n Vigentes desde: {tabla.vigente_desde:%Y-%m-%d %H:%M}")
+    if tabla.siguiente_vigencia:
+        print(f" Próximo cambio de tarifas: {tabla.siguiente_vigencia:%Y-%m-%d %H:%M}")
 
     input("\nPresione Enter para continuar...")
@@ -18,6 +18,7 @@ from services.servicio_mensajeria import (
     TipoEnvio,
     TamañoPaquete,
 )
+from services.enrutador_sedes import enrutador_sedes
 from entities.paquete import PaqueteCreate
 from entities.cliente import ClienteCreate
 
@@ -566,8 +567,15 @@ def registrar_envio_completo(db: Session, empleado_data: Dict[str, Any]) -> None
             valor_declarado=datos_paquete["valor_declarado"],
         )
 
+        ruta = enrutador_sedes.ruta(sede_origen.id_sede, sede_destino.id_sede)
         cotizacion = ServicioMensajeria.generar_cotizacion_completa(
-            coord_origen, coord_destino, parametros
+            coord_origen,
+            coord_destino,
+            parametros,
+            distancia_km=ruta.distancia_km if ruta else None,
+            transbordos=ruta.transbordos if ruta else 0,
+            id_sede_origen=sede_origen.id_sede,
+            id_sede_destino=sede_destino.id_sede,
         )
 
         print("\nPASO 6: CONFIRMACIÓN")
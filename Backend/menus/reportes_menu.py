@@ -3,7 +3,16 @@ Módulo para las funciones del menú de reportes.
 """
 
 from sqlalchemy.orm import Session
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
+
+from cruds.paquete_crud import PaqueteCRUD
+from schemas.tarifa_schema import TarifaCreate
+from services.reportes import (
+    ESTADOS_TRANSPORTE,
+    clientes_frecuentes,
+    eficiencia_flota,
+)
+from services.servicio_mensajeria import CONCEPTOS_TARIFA
 
 
 def mostrar_encabezado(titulo: str = ""):
@@ -31,8 +40,37 @@ def reporte_envios_por_periodo(db: Session) -> None:
 
 
 def reporte_ingresos(db: Session) -> None:
-    """Genera un reporte de ingresos."""
-    print("Función de reporte de ingresos en desarrollo...")
+    """Genera un reporte de ingresos por tipo de envío."""
+    mostrar_encabezado("REPORTE DE INGRESOS")
+    try:
+        fecha_inicio_str = input("Fecha de inicio (YYYY-MM-DD): ").strip()
+        fecha_fin_str = input("Fecha de fin (YYYY-MM-DD): ").strip()
+        fecha_inicio = datetime.strptime(fecha_inicio_str, "%Y-%m-%d")
+        fecha_fin = datetime.strptime(fecha_fin_str, "%Y-%m-%d") + timedelta(days=1)
+
+        filas = PaqueteCRUD(db).obtener_ingresos(fecha_inicio, fecha_fin)
+        if not filas:
+            print("\nNo hay paquetes cotizados en el período.")
+        else:
+            print(f"\n{'Tipo':<12}{'Paquetes':>10}{'Ingresos':>20}{'Promedio':>18}")
+            print("-" * 60)
+            for tipo, paquetes, ingresos in filas:
+                print(
+                    f"{tipo.title():<12}{paquetes:>10}"
+                    f"{'$' + format(ingresos, ',.0f'):>20}"
+                    f"{'$' + format(ingresos / paquetes, ',.0f'):>18}"
+                )
+            print("-" * 60)
+            total_paquetes = sum(fila[1] for fila in filas)
+            total_ingresos = sum(fila[2] for fila in filas)
+            print(
+                f"{'Total':<12}{total_paquetes:>10}"
+                f"{'$' + format(total_ingresos, ',.0f'):>20}"
+            )
+    except ValueError:
+        print("Formato de fecha incorrecto.")
+    except Exception as e:
+        print(f"Error: {e}")
     input("\nPresione Enter para continuar...")
 
 
@@ -43,14 +81,155 @@ def reporte_paquetes_por_estado(db: Session) -> None:
 
 
 def reporte_clientes_frecuentes(db: Session) -> None:
-    """Genera un reporte de clientes frecuentes."""
-    print("Función de reporte de clientes frecuentes en desarrollo...")
+    """Genera un reporte de clientes frecuentes, por páginas."""
+    mostrar_encabezado("REPORTE DE CLIENTES FRECUENTES")
+    try:
+        dias = int(input("Días hacia atrás a considerar [365]: ").strip() or 365)
+        cursor = None
+        while True:
+            pagina = clientes_frecuentes(db, dias=dias, limite=20, cursor=cursor)
+            if not pagina["clientes"]:
+                print("\nNo hay envíos en el período.")
+                break
+            if cursor is None:
+                print(f"\nClientes con envíos en el período: {pagina['total_clientes']:,}")
+            print(
+                f"\n{'#':>5}  {'Cliente':<28}{'Enviados':>10}{'Recibidos':>11}"
+                f"{'Valor declarado':>18}{'Último envío':>14}"
+            )
+            print("-" * 86)
+            for cliente in pagina["clientes"]:
+                print(
+                    f"{cliente['puesto']:>5}  {cliente['nombre'][:27]:<28}"
+                    f"{cliente['enviados']:>10,}{cliente['recibidos']:>11,}"
+                    f"{'$' + format(cliente['valor_declarado'], ',.0f'):>18}"
+                    f"{cliente['ultimo_envio'].strftime('%Y-%m-%d'):>14}"
+                )
+            cursor = pagina["siguiente_cursor"]
+            if not cursor:
+                break
+            if input("\n¿Ver la página siguiente? (s/n): ").strip().lower() != "s":
+                break
+    except ValueError:
+        print("Valor no válido.")
+    except Exception as e:
+        print(f"Error: {e}")
     input("\nPresione Enter para continuar...")
 
 
 def reporte_eficiencia_transportes(db: Session) -> None:
-    """Genera un reporte de eficiencia de transportes."""
-    print("Función de reporte de eficiencia de transportes en desarrollo...")
+    """Genera un reporte de utilización y estados de la flota por sede y vehículo."""
+    mostrar_encabezado("REPORTE DE EFICIENCIA DE TRANSPORTES")
+    try:
+        fecha_inicio_str = input("Fecha de inicio (YYYY-MM-DD): ").strip()
+        fecha_fin_str = input("Fecha de fin (YYYY-MM-DD): ").strip()
+        fecha_inicio = datetime.strptime(fecha_inicio_str, "%Y-%m-%d").date()
+        fecha_fin = datetime.strptime(fecha_fin_str, "%Y-%m-%d").date()
+
+        reporte = eficiencia_flota(db, fecha_inicio, fecha_fin)
+        if not reporte["vehiculos"]:
+            print("\nNo hay vehículos activos.")
+        else:
+            print(f"\nHoras del período: {reporte['horas_periodo']:,.0f}")
+            print(
+                f"\n{'Sede':<25}{'Vehículos':>10}{'Envíos':>10}"
+                f"{'Carga (kg)':>14}{'Utilización':>13}{'En uso':>9}"
+            )
+            print("-" * 81)
+            for sede in reporte["sedes"]:
+                utilizacion = (
+                    "-" if sede["utilizacion"] is None else f"{sede['utilizacion']:.0%}"
+                )
+                print(
+                    f"{(sede['sede'] or '-')[:24]:<25}{sede['vehiculos']:>10}"
+                    f"{sede['envios']:>10,}{sede['carga_kg']:>14,.0f}"
+                    f"{utilizacion:>13}{sede['porcentaje_en_uso']:>8.0f}%"
+                )
+
+            print(
+                f"\n{'Placa':<10}{'Sede':<20}{'Envíos':>8}{'Util. prom.':>13}"
+                + "".join(f"{estado:>16}" for estado in ESTADOS_TRANSPORTE)
+            )
+            print("-" * (51 + 16 * len(ESTADOS_TRANSPORTE)))
+            for vehiculo in reporte["vehiculos"]:
+                utilizacion = (
+                    "-"
+                    if vehiculo["utilizacion_promedio"] is None
+                    else f"{vehiculo['utilizacion_promedio']:.0%}"
+                )
+                horas = vehiculo["horas_por_estado"]
+                print(
+                    f"{vehiculo['placa']:<10}{(vehiculo['sede'] or '-')[:19]:<20}"
+                    f"{vehiculo['envios']:>8,}{utilizacion:>13}"
+                    + "".join(
+                        f"{horas.get(estado, 0.0):>15,.0f}h" for estado in ESTADOS_TRANSPORTE
+                    )
+                )
+    except ValueError:
+        print("Formato de fecha incorrecto.")
+    except Exception as e:
+        print(f"Error: {e}")
+    input("\nPresione Enter para continuar...")
+
+
+def simulacion_tarifas(db: Session) -> None:
+    """Simula el efecto de cambiar tarifas sobre los envíos del último período."""
+    from services.simulador_tarifas import simular_tarifas
+
+    mostrar_encabezado("SIMULACIÓN DE CAMBIO DE TARIFAS")
+    try:
+        dias = input("Días hacia atrás a simular [365]: ").strip()
+        fecha_fin = datetime.now()
+        fecha_inicio = fecha_fin - timedelta(days=int(dias or 365))
+
+        print(f"\nConceptos: {', '.join(CONCEPTOS_TARIFA)}")
+        print("Ingrese las tarifas candidatas (concepto vacío para terminar).")
+        cambios = []
+        while True:
+            concepto = input("\nConcepto: ").strip()
+            if not concepto:
+                break
+            try:
+                tarifa = TarifaCreate(
+                    concepto=concepto,
+                    clave=input("Clave (tipo de envío o tamaño, vacío si no aplica): ").strip(),
+                    valor=float(input("Valor: ").strip()),
+                )
+            except ValueError as e:
+                print(f"Tarifa no válida: {e}")
+                continue
+            cambios.append((tarifa.concepto, tarifa.clave, tarifa.valor))
+
+        if not cambios:
+            print("No se ingresaron tarifas.")
+            input("\nPresione Enter para continuar...")
+            return
+
+        print(f"\nSimulando envíos desde {fecha_inicio:%Y-%m-%d} hasta {fecha_fin:%Y-%m-%d}...")
+        resultado = simular_tarifas(db, cambios, fecha_inicio, fecha_fin)
+
+        print(f"\nEnvíos simulados: {resultado['envios']:,}")
+        if resultado["envios_omitidos"]:
+            print(f"Envíos omitidos (sin distancia o datos): {resultado['envios_omitidos']:,}")
+        print(f"Ingresos actuales:  ${resultado['ingresos_actuales']:,.0f}")
+        print(f"Ingresos simulados: ${resultado['ingresos_simulados']:,.0f}")
+        print(
+            f"Diferencia:         ${resultado['diferencia']:,.0f} ({resultado['porcentaje']:+.2f}%)"
+        )
+
+        if resultado["por_sede_tipo"]:
+            print(f"\n{'Sede':<25}{'Tipo':<10}{'Envíos':>10}{'Diferencia':>20}")
+            print("-" * 65)
+            for fila in resultado["por_sede_tipo"][:20]:
+                print(
+                    f"{fila['sede'][:24]:<25}{fila['tipo_envio'].title():<10}"
+                    f"{fila['envios']:>10,}{'$' + format(fila['diferencia'], ',.0f'):>20}"
+                )
+        print(f"\nTiempo de simulación: {resultado['tiempo_simulacion_ms']:,.0f} ms")
+    except ValueError:
+        print("Valor no válido.")
+    except Exception as e:
+        print(f"Error: {e}")
     input("\nPresione Enter para continuar...")
 
 
@@ -63,6 +242,7 @@ def manejar_menu_reportes_admin(db: Session) -> None:
         print("3. Reporte de paquetes por estado")
         print("4. Reporte de clientes frecuentes")
         print("5. Reporte de eficiencia de transportes")
+        print("6. Simulación de cambio de tarifas")
         print("0. Volver al menú principal")
 
         opcion = input("\nSeleccione una opción: ")
@@ -76,6 +256,8 @@ def manejar_menu_reportes_admin(db: Session) -> None:
             reporte_clientes_frecuentes(db)
         elif opcion == "5":
             reporte_eficiencia_transportes(db)
+        elif opcion == "6":
+            simulacion_tarifas(db)
         elif opcion == "0":
             break
         else:
@@ -0,0 +1,31 @@
+"""
+Paquete de observabilidad de la API: instrumentación de SQL por request,
+métricas en formato Prometheus, perfilador por muestreo, captura de planes
+de las consultas lentas y trazas internas.
+"""
+
+from .instrumentacion_sql import (
+    MiddlewareInstrumentacionSQL,
+    consultas_actuales,
+    instalar_hooks_sql,
+    normalizar_sql,
+    observar_sentencias,
+)
+from .metricas import (
+    TIPO_CONTENIDO as TIPO_CONTENIDO_METRICAS,
+    MiddlewareMetricas,
+    metricas,
+    registrar_cache,
+    registrar_medidores_pool,
+)
+from .perfilador import MiddlewarePerfilador, perfilador, token_valido
+from .planes import huella_sql, instalar_explain, registro_planes
+from .trazas import (
+    MiddlewareTrazas,
+    exportador as exportador_trazas,
+    instalar_trazas,
+    span,
+    span_raiz,
+    trazado,
+    trazar_metodos,
+)
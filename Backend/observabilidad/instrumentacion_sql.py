@@ -0,0 +1,212 @@
+"""
+Instrumentación de las consultas SQL por request.
+
+Los eventos `before_cursor_execute` y `after_cursor_execute` del engine
+compartido miden cada sentencia y la suman a las estadísticas del request en
+curso, que viven en una variable de contexto: así cada request ve solo sus
+consultas aunque las rutas síncronas corran en el pool de hilos. Un
+middleware ASGI abre esas estadísticas al empezar el request y al enviar la
+respuesta agrega el encabezado `Server-Timing` con el número de consultas, el
+tiempo en la base de datos y el tiempo total.
+
+Las sentencias que superan el umbral se escriben en un log rotativo, igual
+que los requests cuyo tiempo total en la base de datos lo supera (con su
+sentencia más lenta). En el log nunca van los valores de los parámetros,
+solo sus nombres y tipos, y los literales escritos en el SQL se reemplazan
+por `?`.
+"""
+
+import logging
+import os
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from logging.handlers import RotatingFileHandler
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+""" Sentencias más lentas que esto (ms) van al log de consultas lentas """
+UMBRAL_LENTO_MS = float(os.getenv("SQL_UMBRAL_LENTO_MS", "200"))
+RUTA_LOG_LENTO = os.getenv("SQL_LOG_LENTO", "logs/consultas_lentas.log")
+LOG_LENTO_MAX_BYTES = 5 * 1024 * 1024
+LOG_LENTO_RESPALDOS = 5
+
+_LITERAL_TEXTO = re.compile(r"'(?:[^']|'')*'")
+_LITERAL_NUMERO = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?\b")
+_LISTA_VALORES = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ESPACIOS = re.compile(r"\s+")
+
+log_lento = logging.getLogger("swiftpost.consultas_lentas")
+
+""" Reciben cada sentencia medida: (conn, sql, parametros, executemany, duracion_ms) """
+ObservadorSentencias = Callable[[Any, str, Any, bool, float], None]
+_observadores: List[ObservadorSentencias] = []
+
+
+@dataclass
+class ConsultasRequest:
+    """Consultas ejecutadas durante un request."""
+
+    consultas: int = 0
+    tiempo_db_ms: float = 0.0
+    mas_lenta_ms: float = 0.0
+    mas_lenta_sql: Optional[str] = None
+
+    def registrar(self, sql: str, duracion_ms: float) -> None:
+        self.consultas += 1
+        self.tiempo_db_ms += duracion_ms
+        if duracion_ms > self.mas_lenta_ms:
+            self.mas_lenta_ms = duracion_ms
+            self.mas_lenta_sql = sql
+
+
+_consultas_request: ContextVar[Optional[ConsultasRequest]] = ContextVar(
+    "consultas_request", default=None
+)
+
+
+def consultas_actuales() -> Optional[ConsultasRequest]:
+    """Estadísticas de SQL del request en curso, o None fuera de un request."""
+    return _consultas_request.get()
+
+
+def normalizar_sql(sql: str) -> str:
+    """
+    Quita de una sentencia los literales y los espacios sobrantes.
+    Dos sentencias que solo cambian en sus valores quedan iguales.
+    """
+    sql = _LITERAL_TEXTO.sub("?", sql)
+    sql = _LITERAL_NUMERO.sub("?", sql)
+    sql = _LISTA_VALORES.sub("(?)", sql)
+    return _ESPACIOS.sub(" ", sql).strip()
+
+
+def redactar_parametros(parametros: Any) -> Any:
+    """Reemplaza cada parámetro por el nombre de su tipo."""
+    if isinstance(parametros, dict):
+        return {nombre: type(valor).__name__ for nombre, valor in parametros.items()}
+    if isinstance(parametros, (list, tuple)):
+        if parametros and isinstance(parametros[0], (dict, list, tuple)):
+            """ executemany: basta con la forma de la primera fila """
+            return {
+                "filas": len(parametros),
+                "primera": redactar_parametros(parametros[0]),
+            }
+        return [type(valor).__name__ for valor in parametros]
+    return type(parametros).__name__
+
+
+def observar_sentencias(observador: ObservadorSentencias) -> None:
+    """Agrega una función que se llama después de cada sentencia medida."""
+    if observador not in _observadores:
+        _observadores.append(observador)
+
+
+def configurar_log_lento(ruta: str = RUTA_LOG_LENTO) -> None:
+    """Envía el log de consultas lentas a un archivo rotativo."""
+    if log_lento.handlers:
+        return
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    manejador = RotatingFileHandler(
+        ruta,
+        maxBytes=LOG_LENTO_MAX_BYTES,
+        backupCount=LOG_LENTO_RESPALDOS,
+        encoding="utf-8",
+    )
+    manejador.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    log_lento.addHandler(manejador)
+    log_lento.setLevel(logging.INFO)
+    log_lento.propagate = False
+
+
+def _antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("inicio_consulta", []).append(time.perf_counter())
+
+
+def _despues_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    duracion_ms = (time.perf_counter() - conn.info["inicio_consulta"].pop()) * 1000
+    consultas = _consultas_request.get()
+    if consultas is not None:
+        consultas.registrar(statement, duracion_ms)
+    if duracion_ms >= UMBRAL_LENTO_MS:
+        log_lento.warning(
+            "%.1f ms | %s | parametros=%s",
+            duracion_ms,
+            normalizar_sql(statement),
+            redactar_parametros(parameters),
+        )
+    for observador in _observadores:
+        try:
+            observador(conn, statement, parameters, executemany, duracion_ms)
+        except Exception as e:
+            print(f"Error en un observador de sentencias SQL: {e}")
+
+
+def _error_al_ejecutar(contexto):
+    """Una sentencia que falla no llega a after_cursor_execute: se descarta su inicio."""
+    conn = contexto.connection
+    if contexto.statement is not None and conn is not None:
+        inicios = conn.info.get("inicio_consulta")
+        if inicios:
+            inicios.pop()
+
+
+def instalar_hooks_sql(engine: Engine) -> None:
+    """Mide todas las sentencias que ejecuta el engine."""
+    if event.contains(engine, "before_cursor_execute", _antes_de_ejecutar):
+        return
+    configurar_log_lento()
+    event.listen(engine, "before_cursor_execute", _antes_de_ejecutar)
+    event.listen(engine, "after_cursor_execute", _despues_de_ejecutar)
+    event.listen(engine, "handle_error", _error_al_ejecutar)
+
+
+def _server_timing(consultas: ConsultasRequest, total_ms: float) -> bytes:
+    return (
+        f'db;dur={consultas.tiempo_db_ms:.1f};desc="{consultas.consultas} consultas", '
+        f"total;dur={total_ms:.1f}"
+    ).encode("latin-1")
+
+
+class MiddlewareInstrumentacionSQL:
+    """Abre las estadísticas de SQL de cada request y agrega Server-Timing."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        consultas = ConsultasRequest()
+        token = _consultas_request.set(consultas)
+        inicio = time.perf_counter()
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - inicio) * 1000
+                mensaje["headers"] = list(mensaje.get("headers", [])) + [
+                    (b"server-timing", _server_timing(consultas, total_ms))
+                ]
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _consultas_request.reset(token)
+            if consultas.tiempo_db_ms >= UMBRAL_LENTO_MS:
+                log_lento.warning(
+                    "request %s %s | %d consultas | db %.1f ms | más lenta %.1f ms | %s",
+                    scope["method"],
+                    scope["path"],
+                    consultas.consultas,
+                    consultas.tiempo_db_ms,
+                    consultas.mas_lenta_ms,
+                    normalizar_sql(consultas.mas_lenta_sql or ""),
+                )
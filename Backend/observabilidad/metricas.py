@@ -0,0 +1,274 @@
+"""
+Métricas de la API en formato de texto de Prometheus.
+
+Cada hilo escribe en su propio fragmento de contadores (un `threading.local`),
+así registrar un request o una consulta a una caché no toma ningún lock: el
+lock solo se usa la primera vez que un hilo crea su fragmento. Al leer
+`/metrics` se suman los fragmentos de todos los hilos; las copias de
+diccionarios y listas son atómicas en CPython, de modo que la lectura ve
+cada contador completo aunque un hilo siga escribiendo.
+
+Los requests se agrupan por la plantilla de su ruta (`/paquetes/{id}`) y no
+por la URL, para que el número de series no crezca con los identificadores.
+Los medidores del pool de conexiones se leen del engine al momento del
+scrape.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+""" Límites superiores (segundos) de los buckets del histograma de latencia """
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+""" Requests que no coinciden con ninguna ruta comparten una sola etiqueta """
+RUTA_DESCONOCIDA = "sin_ruta"
+
+""" Starlette agrega el charset a los tipos text/* """
+TIPO_CONTENIDO = "text/plain; version=0.0.4"
+
+
+class _Fragmento:
+    """Contadores escritos por un solo hilo."""
+
+    __slots__ = ("solicitudes", "latencias", "cache")
+
+    def __init__(self):
+        """ (metodo, ruta, estado) -> requests """
+        self.solicitudes: Dict[Tuple[str, str, int], int] = {}
+        """ (metodo, ruta) -> [conteo por bucket..., +Inf, suma en segundos] """
+        self.latencias: Dict[Tuple[str, str], List[float]] = {}
+        """ (cache, acierto) -> consultas """
+        self.cache: Dict[Tuple[str, bool], int] = {}
+
+
+class RegistroMetricas:
+    """
+    Contadores de requests, latencias y cachés de la API.
+
+    Args:
+        buckets: Límites superiores del histograma de latencia, en segundos
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS_LATENCIA):
+        self.buckets = tuple(sorted(buckets))
+        self._local = threading.local()
+        self._fragmentos: List[_Fragmento] = []
+        self._lock = threading.Lock()
+        self._medidores: Dict[str, Tuple[str, Callable[[], Optional[float]]]] = {}
+
+    def _fragmento(self) -> _Fragmento:
+        try:
+            return self._local.fragmento
+        except AttributeError:
+            fragmento = _Fragmento()
+            with self._lock:
+                self._fragmentos.append(fragmento)
+            self._local.fragmento = fragmento
+            return fragmento
+
+    def registrar_solicitud(
+        self, metodo: str, ruta: str, estado: int, duracion_s: float
+    ) -> None:
+        """Suma un request terminado a los contadores del hilo actual."""
+        fragmento = self._fragmento()
+        clave = (metodo, ruta, estado)
+        fragmento.solicitudes[clave] = fragmento.solicitudes.get(clave, 0) + 1
+
+        fila = fragmento.latencias.get((metodo, ruta))
+        if fila is None:
+            fila = [0] * (len(self.buckets) + 1) + [0.0]
+            fragmento.latencias[(metodo, ruta)] = fila
+        fila[bisect_left(self.buckets, duracion_s)] += 1
+        fila[-1] += duracion_s
+
+    def registrar_cache(self, nombre: str, acierto: bool) -> None:
+        """Cuenta una consulta a una caché en memoria."""
+        fragmento = self._fragmento()
+        clave = (nombre, acierto)
+        fragmento.cache[clave] = fragmento.cache.get(clave, 0) + 1
+
+    def registrar_medidor(
+        self, nombre: str, ayuda: str, leer: Callable[[], Optional[float]]
+    ) -> None:
+        """
+        Registra un medidor que se lee al momento del scrape.
+        Si `leer` devuelve None el medidor se omite.
+        """
+        self._medidores[nombre] = (ayuda, leer)
+
+    def reiniciar(self) -> None:
+        """Descarta todos los contadores (los medidores se conservan)."""
+        with self._lock:
+            self._fragmentos = []
+        self._local = threading.local()
+
+    def _sumar(self):
+        with self._lock:
+            fragmentos = list(self._fragmentos)
+
+        solicitudes: Dict[Tuple[str, str, int], int] = {}
+        latencias: Dict[Tuple[str, str], List[float]] = {}
+        cache: Dict[Tuple[str, bool], int] = {}
+        for fragmento in fragmentos:
+            for clave, valor in fragmento.solicitudes.copy().items():
+                solicitudes[clave] = solicitudes.get(clave, 0) + valor
+            for clave, fila in fragmento.latencias.copy().items():
+                fila = list(fila)
+                total = latencias.get(clave)
+                latencias[clave] = (
+                    fila if total is None else [a + b for a, b in zip(total, fila)]
+                )
+            for clave, valor in fragmento.cache.copy().items():
+                cache[clave] = cache.get(clave, 0) + valor
+        return solicitudes, latencias, cache
+
+    def exportar(self) -> str:
+        """
+        Todas las métricas en formato de texto de Prometheus.
+
+        Returns:
+            str: Cuerpo de la respuesta de /metrics
+        """
+        solicitudes, latencias, cache = self._sumar()
+        lineas: List[str] = []
+
+        lineas.append("# HELP swiftpost_http_requests_total Requests HTTP atendidos")
+        lineas.append("# TYPE swiftpost_http_requests_total counter")
+        for (metodo, ruta, estado), valor in sorted(solicitudes.items()):
+            etiquetas = _etiquetas(method=metodo, route=ruta, status=str(estado))
+            lineas.append(f"swiftpost_http_requests_total{{{etiquetas}}} {valor}")
+
+        lineas.append(
+            "# HELP swiftpost_http_request_duration_seconds Latencia de los requests HTTP"
+        )
+        lineas.append("# TYPE swiftpost_http_request_duration_seconds histogram")
+        for (metodo, ruta), fila in sorted(latencias.items()):
+            acumulado = 0
+            for limite, conteo in zip(self.buckets, fila):
+                acumulado += conteo
+                etiquetas = _etiquetas(method=metodo, route=ruta, le=_numero(limite))
+                lineas.append(
+                    f"swiftpost_http_request_duration_seconds_bucket{{{etiquetas}}} {acumulado}"
+                )
+            acumulado += fila[len(self.buckets)]
+            etiquetas = _etiquetas(method=metodo, route=ruta, le="+Inf")
+            lineas.append(
+                f"swiftpost_http_request_duration_seconds_bucket{{{etiquetas}}} {acumulado}"
+            )
+            etiquetas = _etiquetas(method=metodo, route=ruta)
+            lineas.append(
+                f"swiftpost_http_request_duration_seconds_sum{{{etiquetas}}} {_numero(fila[-1])}"
+            )
+            lineas.append(
+                f"swiftpost_http_request_duration_seconds_count{{{etiquetas}}} {acumulado}"
+            )
+
+        lineas.append("# HELP swiftpost_cache_requests_total Consultas a cachés en memoria")
+        lineas.append("# TYPE swiftpost_cache_requests_total counter")
+        for (nombre, acierto), valor in sorted(cache.items()):
+            etiquetas = _etiquetas(cache=nombre, result="hit" if acierto else "miss")
+            lineas.append(f"swiftpost_cache_requests_total{{{etiquetas}}} {valor}")
+
+        lineas.append("# HELP swiftpost_cache_hit_ratio Fracción de aciertos de cada caché")
+        lineas.append("# TYPE swiftpost_cache_hit_ratio gauge")
+        for nombre in sorted({nombre for nombre, _ in cache}):
+            aciertos = cache.get((nombre, True), 0)
+            total = aciertos + cache.get((nombre, False), 0)
+            lineas.append(
+                f'swiftpost_cache_hit_ratio{{cache="{_escapar(nombre)}"}} {_numero(aciertos / total)}'
+            )
+
+        for nombre, (ayuda, leer) in sorted(self._medidores.items()):
+            try:
+                valor = leer()
+            except Exception as e:
+                print(f"Error al leer el medidor {nombre}: {e}")
+                continue
+            if valor is None:
+                continue
+            lineas.append(f"# HELP {nombre} {ayuda}")
+            lineas.append(f"# TYPE {nombre} gauge")
+            lineas.append(f"{nombre} {_numero(valor)}")
+
+        return "\n".join(lineas) + "\n"
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _etiquetas(**etiquetas: str) -> str:
+    return ",".join(f'{nombre}="{_escapar(valor)}"' for nombre, valor in etiquetas.items())
+
+
+def _numero(valor: float) -> str:
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+metricas = RegistroMetricas()
+
+
+def registrar_cache(nombre: str, acierto: bool) -> None:
+    """Cuenta una consulta a una caché en el registro de la API."""
+    metricas.registrar_cache(nombre, acierto)
+
+
+def registrar_medidores_pool(engine) -> None:
+    """
+    Publica el estado del pool de conexiones del engine como medidores.
+    Los pools que no llevan estas cuentas (p. ej. StaticPool) no publican nada.
+    """
+    pool = engine.pool
+    medidores = (
+        ("swiftpost_db_pool_size", "Conexiones que mantiene el pool", "size"),
+        ("swiftpost_db_pool_checked_out", "Conexiones prestadas a una sesión", "checkedout"),
+        ("swiftpost_db_pool_checked_in", "Conexiones libres en el pool", "checkedin"),
+    )
+    for nombre, ayuda, metodo in medidores:
+        leer = getattr(pool, metodo, None)
+        if callable(leer):
+            metricas.registrar_medidor(nombre, ayuda, leer)
+
+    """ QueuePool cuenta el desborde desde -pool_size mientras el pool se llena """
+    if callable(getattr(pool, "overflow", None)):
+        metricas.registrar_medidor(
+            "swiftpost_db_pool_overflow",
+            "Conexiones abiertas por encima del tamaño",
+            lambda: max(pool.overflow(), 0),
+        )
+
+
+class MiddlewareMetricas:
+    """Mide la latencia y el código de estado de cada request HTTP."""
+
+    def __init__(self, app, registro: RegistroMetricas = metricas):
+        self.app = app
+        self.registro = registro
+
+    async def __call__(self, scope: Dict[str, Any], receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        estado = 500
+        inicio = time.perf_counter()
+
+        async def enviar(mensaje):
+            nonlocal estado
+            if mensaje["type"] == "http.response.start":
+                estado = mensaje["status"]
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            """ El router deja la ruta encontrada en el mismo scope """
+            ruta = scope.get("route")
+            self.registro.registrar_solicitud(
+                scope["method"],
+                getattr(ruta, "path", RUTA_DESCONOCIDA),
+                estado,
+                time.perf_counter() - inicio,
+            )
@@ -0,0 +1,287 @@
+"""
+Perfilador por muestreo de la API.
+
+Un perfil se arma mirando cada cierto intervalo la pila de todos los hilos
+con `sys._current_frames()`; no hace falta instrumentar el código ni
+instalar nada, y el costo lo paga solo el hilo que muestrea. Las pilas se
+guardan en formato "folded" (`a;b;c 12`), el que leen flamegraph.pl,
+speedscope e inferno.
+
+Hay dos usos:
+
+- Un request puntual: con el encabezado `X-Perfilar: 1` (o `?perfilar=1`) y
+  el token de administración en `X-Admin-Token`, se muestrea cada
+  milisegundo (o lo que permita el GIL) mientras dura ese request. De cada pila se conserva solo la
+  parte que cuelga de la función de la ruta (las rutas síncronas corren en
+  el pool de hilos y así se encuentran sin saber en qué hilo cayeron); si
+  llegan a la vez otros requests a la misma ruta, sus muestras también
+  cuentan. El perfil queda en memoria y su id vuelve en `X-Perfil-Id`.
+- Un muestreo de fondo a baja frecuencia sobre todos los hilos, que acumula
+  las pilas más calientes de todo el tráfico. Los hilos que esperan
+  (pool sin trabajo, bucle de eventos en `select`) no se cuentan.
+
+Las dos funciones quedan apagadas si no está definida la variable
+OBSERVABILIDAD_TOKEN.
+"""
+
+import hmac
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs
+
+TOKEN_ADMIN = os.getenv("OBSERVABILIDAD_TOKEN", "")
+INTERVALO_REQUEST_SEGUNDOS = float(os.getenv("PERFILADOR_INTERVALO_REQUEST_MS", "1")) / 1000
+INTERVALO_FONDO_SEGUNDOS = float(os.getenv("PERFILADOR_INTERVALO_FONDO_SEGUNDOS", "0.1"))
+""" Perfiles de requests que se conservan en memoria """
+PERFILES_MAXIMO = 20
+""" Pilas distintas que acumula el muestreo de fondo; el resto va a una sola """
+PILAS_FONDO_MAXIMO = 5000
+PILA_OTRAS = "[otras pilas]"
+
+""" Archivos donde un hilo sin trabajo se queda esperando """
+_ARCHIVOS_EN_ESPERA = {"threading.py", "selectors.py", "queue.py"}
+_RAIZ_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+_RAIZ_STDLIB = os.path.dirname(os.__file__) + os.sep
+
+
+def token_valido(token: Optional[str]) -> bool:
+    """Verifica el token de administración; sin token configurado, nada pasa."""
+    if not TOKEN_ADMIN or not token:
+        return False
+    return hmac.compare_digest(token.encode(), TOKEN_ADMIN.encode())
+
+
+def _nombre_marco(codigo) -> str:
+    archivo = codigo.co_filename
+    if archivo.startswith(_RAIZ_BACKEND):
+        archivo = archivo[len(_RAIZ_BACKEND):]
+    elif archivo.startswith(_RAIZ_STDLIB) and "site-packages" not in archivo:
+        archivo = archivo[len(_RAIZ_STDLIB):]
+    elif "site-packages" + os.sep in archivo:
+        archivo = archivo.split("site-packages" + os.sep, 1)[1]
+    nombre = f"{codigo.co_qualname} ({archivo}:{codigo.co_firstlineno})"
+    return nombre.replace(";", ",")
+
+
+def _pila(marco, hasta=None) -> List[str]:
+    """
+    Nombres de la pila de un hilo de la raíz a la hoja.
+    Con `hasta`, solo desde el marco que ejecuta ese código; si ninguno lo
+    ejecuta devuelve una lista vacía.
+    """
+    codigos = []
+    while marco is not None:
+        codigos.append(marco.f_code)
+        if marco.f_code is hasta:
+            break
+        marco = marco.f_back
+    else:
+        if hasta is not None:
+            return []
+    return [_nombre_marco(codigo) for codigo in reversed(codigos)]
+
+
+def a_folded(pilas: Counter) -> str:
+    """Convierte un conteo de pilas al formato folded, de la más frecuente a la menos."""
+    return "".join(f"{pila} {conteo}\n" for pila, conteo in pilas.most_common())
+
+
+class PerfilRequest:
+    """Muestrea en un hilo propio las pilas de una ruta mientras dura un request."""
+
+    def __init__(self, scope: Dict[str, Any], intervalo: float = INTERVALO_REQUEST_SEGUNDOS):
+        self.id = uuid.uuid4().hex[:12]
+        self.scope = scope
+        self.metodo = scope["method"]
+        self.ruta = scope["path"]
+        self.intervalo = max(0.0005, intervalo)
+        self.inicio = datetime.now()
+        self.duracion_ms = 0.0
+        self.muestras = 0
+        self.pilas: Counter = Counter()
+        self.codigo_ruta = None
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._ejecutar, name="perfil-request", daemon=True)
+
+    def iniciar(self) -> None:
+        self._inicio = time.perf_counter()
+        self._hilo.start()
+
+    def detener(self) -> None:
+        self._detener.set()
+        self._hilo.join(timeout=5)
+        self.duracion_ms = (time.perf_counter() - self._inicio) * 1000
+        """ El scope trae los encabezados del request, token incluido """
+        self.scope = None
+
+    def _ejecutar(self) -> None:
+        propio = threading.get_ident()
+        raiz = f"{self.metodo} {self.ruta}"
+        while not self._detener.wait(self.intervalo):
+            """ El router deja la ruta en el scope al resolver el request """
+            if self.codigo_ruta is None:
+                ruta = self.scope.get("route")
+                self.codigo_ruta = getattr(getattr(ruta, "endpoint", None), "__code__", None)
+                if self.codigo_ruta is None:
+                    continue
+            self.muestras += 1
+            for id_hilo, marco in sys._current_frames().items():
+                if id_hilo == propio:
+                    continue
+                pila = _pila(marco, hasta=self.codigo_ruta)
+                if pila:
+                    self.pilas[";".join([raiz] + pila)] += 1
+
+    def resumen(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.metodo,
+            "path": self.ruta,
+            "started_at": self.inicio.isoformat(),
+            "duration_ms": round(self.duracion_ms, 1),
+            "samples": self.muestras,
+            "stacks": len(self.pilas),
+        }
+
+
+class Perfilador:
+    """Guarda los perfiles de requests y mantiene el muestreo de fondo."""
+
+    def __init__(self, intervalo_fondo_segundos: float = INTERVALO_FONDO_SEGUNDOS):
+        """
+        Args:
+            intervalo_fondo_segundos: Cada cuánto muestrea el hilo de fondo (0 lo apaga)
+        """
+        self.intervalo_fondo_segundos = intervalo_fondo_segundos
+        self.muestras_fondo = 0
+        self.fondo_desde: Optional[datetime] = None
+        self._perfiles: "OrderedDict[str, PerfilRequest]" = OrderedDict()
+        self._pilas_fondo: Counter = Counter()
+        self._lock = threading.Lock()
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+    def guardar(self, perfil: PerfilRequest) -> None:
+        with self._lock:
+            self._perfiles[perfil.id] = perfil
+            while len(self._perfiles) > PERFILES_MAXIMO:
+                self._perfiles.popitem(last=False)
+
+    def perfiles(self) -> List[Dict[str, Any]]:
+        """Resumen de los perfiles guardados, del más reciente al más antiguo."""
+        with self._lock:
+            return [perfil.resumen() for perfil in reversed(self._perfiles.values())]
+
+    def perfil(self, id_perfil: str) -> Optional[PerfilRequest]:
+        with self._lock:
+            return self._perfiles.get(id_perfil)
+
+    def pilas_fondo(self, reiniciar: bool = False) -> Counter:
+        """Pilas acumuladas por el muestreo de fondo."""
+        with self._lock:
+            pilas = Counter(self._pilas_fondo)
+            if reiniciar:
+                self._pilas_fondo.clear()
+                self.muestras_fondo = 0
+                self.fondo_desde = datetime.now()
+        return pilas
+
+    def muestrear_fondo(self) -> None:
+        """Toma una muestra de todos los hilos ocupados."""
+        propio = threading.get_ident()
+        pilas = []
+        for id_hilo, marco in sys._current_frames().items():
+            if id_hilo == propio:
+                continue
+            if os.path.basename(marco.f_code.co_filename) in _ARCHIVOS_EN_ESPERA:
+                continue
+            pilas.append(";".join(_pila(marco)))
+
+        with self._lock:
+            self.muestras_fondo += 1
+            for pila in pilas:
+                if pila not in self._pilas_fondo and len(self._pilas_fondo) >= PILAS_FONDO_MAXIMO:
+                    pila = PILA_OTRAS
+                self._pilas_fondo[pila] += 1
+
+    def iniciar(self) -> None:
+        """Arranca el muestreo de fondo si está habilitado."""
+        if not TOKEN_ADMIN or self.intervalo_fondo_segundos <= 0:
+            return
+        if self._hilo and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self.fondo_desde = datetime.now()
+        self._hilo = threading.Thread(
+            target=self._ejecutar, name="perfilador-fondo", daemon=True
+        )
+        self._hilo.start()
+
+    def detener(self) -> None:
+        """Detiene el muestreo de fondo."""
+        self._detener.set()
+        if self._hilo:
+            self._hilo.join(timeout=5)
+            self._hilo = None
+
+    def _ejecutar(self) -> None:
+        while not self._detener.wait(self.intervalo_fondo_segundos):
+            try:
+                self.muestrear_fondo()
+            except Exception as e:
+                print(f"Error en el muestreo de fondo: {e}")
+
+
+perfilador = Perfilador()
+
+
+def _encabezado(scope: Dict[str, Any], nombre: bytes) -> Optional[str]:
+    for clave, valor in scope.get("headers", []):
+        if clave == nombre:
+            return valor.decode("latin-1")
+    return None
+
+
+def _pide_perfil(scope: Dict[str, Any]) -> bool:
+    bandera = _encabezado(scope, b"x-perfilar")
+    if bandera is None and scope.get("query_string"):
+        valores = parse_qs(scope["query_string"].decode("latin-1")).get("perfilar")
+        bandera = valores[0] if valores else None
+    if bandera not in ("1", "true"):
+        return False
+    return token_valido(_encabezado(scope, b"x-admin-token"))
+
+
+class MiddlewarePerfilador:
+    """Perfila los requests que lo piden con el token de administración."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive, send):
+        if scope["type"] != "http" or not TOKEN_ADMIN or not _pide_perfil(scope):
+            await self.app(scope, receive, send)
+            return
+
+        perfil = PerfilRequest(scope)
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                mensaje["headers"] = list(mensaje.get("headers", [])) + [
+                    (b"x-perfil-id", perfil.id.encode())
+                ]
+            await send(mensaje)
+
+        perfil.iniciar()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            perfil.detener()
+            perfilador.guardar(perfil)
+
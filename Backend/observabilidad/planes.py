@@ -0,0 +1,301 @@
+"""
+Captura de planes de ejecución de las consultas lentas.
+
+Cuando una sentencia SELECT que sale de un CRUD (`cruds.*`) o de las
+analíticas supera el umbral, se la encola, con una probabilidad dada, para
+correr `EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)` con los mismos parámetros.
+Un hilo propio la ejecuta en otra conexión del pool, dentro de una
+transacción que se revierte y con un `statement_timeout`, así el request
+que la originó no espera y ningún EXPLAIN queda corriendo sin límite. Cada
+sentencia se vuelve a analizar a lo sumo una vez por intervalo.
+
+Los planes se guardan en memoria por huella: el hash de la sentencia
+normalizada (sin literales), igual para todas las ejecuciones que solo
+cambian de valores. Si una tabla que el plan anterior leía por índice pasa
+a leerse con un Seq Scan, se registra una regresión y se avisa en el log de
+consultas lentas.
+"""
+
+import hashlib
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .instrumentacion_sql import (
+    UMBRAL_LENTO_MS,
+    log_lento,
+    normalizar_sql,
+    observar_sentencias,
+)
+
+EXPLAIN_HABILITADO = os.getenv("SQL_EXPLAIN", "0") in ("1", "true")
+UMBRAL_EXPLAIN_MS = float(os.getenv("SQL_EXPLAIN_UMBRAL_MS", str(UMBRAL_LENTO_MS)))
+""" Fracción de las sentencias lentas que se analizan """
+MUESTREO_EXPLAIN = float(os.getenv("SQL_EXPLAIN_MUESTREO", "0.2"))
+""" Segundos mínimos entre dos EXPLAIN de la misma sentencia """
+INTERVALO_EXPLAIN_SEGUNDOS = float(os.getenv("SQL_EXPLAIN_INTERVALO_SEGUNDOS", "300"))
+TIMEOUT_EXPLAIN_MS = int(os.getenv("SQL_EXPLAIN_TIMEOUT_MS", "30000"))
+
+""" Módulos cuyas consultas se analizan """
+ORIGENES_EXPLAIN = ("cruds.", "apis.analytics", "services.reportes")
+HUELLAS_MAXIMO = 500
+PLANES_POR_HUELLA = 5
+REGRESIONES_MAXIMO = 200
+COLA_MAXIMA = 50
+
+ESCANEOS_INDICE = {"Index Scan", "Index Only Scan", "Bitmap Heap Scan"}
+ESCANEO_SECUENCIAL = "Seq Scan"
+
+
+def huella_sql(sql: str) -> str:
+    """Huella de una sentencia: hash corto de su forma normalizada."""
+    return hashlib.sha1(normalizar_sql(sql).encode("utf-8")).hexdigest()[:16]
+
+
+def _nodos(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for hijo in plan.get("Plans", []):
+        yield from _nodos(hijo)
+
+
+def escaneos_por_tabla(plan: Dict[str, Any]) -> Dict[str, Set[str]]:
+    """Tipos de escaneo con que el plan lee cada tabla."""
+    escaneos: Dict[str, Set[str]] = {}
+    for nodo in _nodos(plan):
+        tabla = nodo.get("Relation Name")
+        if tabla and nodo.get("Node Type", "").endswith("Scan"):
+            escaneos.setdefault(tabla, set()).add(nodo["Node Type"])
+    return escaneos
+
+
+def comparar_escaneos(
+    anteriores: Dict[str, Set[str]], actuales: Dict[str, Set[str]]
+) -> List[str]:
+    """Tablas que se leían por índice y ahora solo con un Seq Scan."""
+    return sorted(
+        tabla
+        for tabla, tipos in actuales.items()
+        if ESCANEO_SECUENCIAL in tipos
+        and not tipos & ESCANEOS_INDICE
+        and anteriores.get(tabla, set()) & ESCANEOS_INDICE
+    )
+
+
+def _origen_sentencia() -> Optional[str]:
+    """Primer módulo de ORIGENES_EXPLAIN en la pila del hilo actual."""
+    marco = sys._getframe(2)
+    while marco is not None:
+        modulo = marco.f_globals.get("__name__", "")
+        if modulo.startswith(ORIGENES_EXPLAIN):
+            return f"{modulo}.{marco.f_code.co_name}"
+        marco = marco.f_back
+    return None
+
+
+def _es_lectura(sql: str) -> bool:
+    """Solo las lecturas se pueden ejecutar de nuevo sin efectos."""
+    inicio = sql.lstrip()[:6].upper()
+    if inicio == "SELECT":
+        return " FOR UPDATE" not in sql.upper()
+    if inicio.startswith("WITH"):
+        mayusculas = sql.upper()
+        return not any(
+            palabra in mayusculas for palabra in ("INSERT ", "UPDATE ", "DELETE ")
+        )
+    return False
+
+
+class RegistroPlanes:
+    """Planes capturados por huella y regresiones detectadas."""
+
+    def __init__(self):
+        self._planes: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._regresiones: deque = deque(maxlen=REGRESIONES_MAXIMO)
+        self._ultimo_explain: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._cola: "queue.Queue[Tuple[Any, str, str, Any, float, Optional[str]]]" = queue.Queue(
+            maxsize=COLA_MAXIMA
+        )
+        self._hilo: Optional[threading.Thread] = None
+
+    def observar(self, conn, sql: str, parametros, executemany: bool, duracion_ms: float) -> None:
+        """Decide si una sentencia medida se analiza y la encola."""
+        if duracion_ms < UMBRAL_EXPLAIN_MS or executemany or conn.info.get("explain"):
+            return
+        if random.random() >= MUESTREO_EXPLAIN or not _es_lectura(sql):
+            return
+        origen = _origen_sentencia()
+        if origen is None:
+            return
+
+        huella = huella_sql(sql)
+        ahora = time.monotonic()
+        with self._lock:
+            if ahora - self._ultimo_explain.get(huella, -INTERVALO_EXPLAIN_SEGUNDOS) < INTERVALO_EXPLAIN_SEGUNDOS:
+                return
+            self._ultimo_explain[huella] = ahora
+
+        try:
+            self._cola.put_nowait((conn.engine, huella, sql, parametros, duracion_ms, origen))
+        except queue.Full:
+            return
+        self._asegurar_hilo()
+
+    def _asegurar_hilo(self) -> None:
+        if self._hilo and self._hilo.is_alive():
+            return
+        with self._lock:
+            if self._hilo and self._hilo.is_alive():
+                return
+            self._hilo = threading.Thread(
+                target=self._ejecutar, name="explain-consultas", daemon=True
+            )
+            self._hilo.start()
+
+    def _ejecutar(self) -> None:
+        while True:
+            engine, huella, sql, parametros, duracion_ms, origen = self._cola.get()
+            try:
+                plan = self.explicar(engine, sql, parametros)
+                self.guardar(huella, sql, origen, duracion_ms, plan)
+            except Exception as e:
+                print(f"Error al capturar el plan de {huella}: {e}")
+
+    def explicar(self, engine, sql: str, parametros) -> Dict[str, Any]:
+        """
+        Ejecuta EXPLAIN (ANALYZE, BUFFERS) de una sentencia en otra conexión.
+
+        Returns:
+            Dict: Plan en el formato JSON de PostgreSQL
+        """
+        with engine.connect() as conexion:
+            conexion.info["explain"] = True
+            try:
+                conexion.exec_driver_sql(
+                    f"SET LOCAL statement_timeout = {TIMEOUT_EXPLAIN_MS}"
+                )
+                resultado = conexion.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}", parametros or ()
+                ).scalar()
+            finally:
+                conexion.rollback()
+                conexion.info.pop("explain", None)
+        return resultado[0]
+
+    def guardar(
+        self,
+        huella: str,
+        sql: str,
+        origen: Optional[str],
+        duracion_ms: float,
+        plan: Dict[str, Any],
+    ) -> List[str]:
+        """
+        Guarda un plan y lo compara con el anterior de la misma huella.
+
+        Returns:
+            List[str]: Tablas que pasaron de índice a Seq Scan
+        """
+        escaneos = escaneos_por_tabla(plan["Plan"])
+        captura = {
+            "captured_at": datetime.now().isoformat(),
+            "query_ms": round(duracion_ms, 1),
+            "execution_ms": plan.get("Execution Time"),
+            "planning_ms": plan.get("Planning Time"),
+            "scans": {tabla: sorted(tipos) for tabla, tipos in escaneos.items()},
+            "plan": plan,
+        }
+
+        with self._lock:
+            entrada = self._planes.pop(huella, None)
+            if entrada is None:
+                entrada = {
+                    "fingerprint": huella,
+                    "sql": normalizar_sql(sql),
+                    "origin": origen,
+                    "plans": deque(maxlen=PLANES_POR_HUELLA),
+                }
+            anteriores = (
+                {tabla: set(tipos) for tabla, tipos in entrada["plans"][-1]["scans"].items()}
+                if entrada["plans"]
+                else {}
+            )
+            entrada["plans"].append(captura)
+            self._planes[huella] = entrada
+            while len(self._planes) > HUELLAS_MAXIMO:
+                viejo, _ = self._planes.popitem(last=False)
+                self._ultimo_explain.pop(viejo, None)
+
+            tablas = comparar_escaneos(anteriores, escaneos)
+            if tablas:
+                self._regresiones.append(
+                    {
+                        "fingerprint": huella,
+                        "origin": origen,
+                        "tables": tablas,
+                        "detected_at": captura["captured_at"],
+                        "sql": entrada["sql"],
+                    }
+                )
+
+        if tablas:
+            log_lento.warning(
+                "regresión de plan %s (%s) | Seq Scan en lugar de índice: %s | %s",
+                huella,
+                origen,
+                ", ".join(tablas),
+                entrada["sql"],
+            )
+        return tablas
+
+    def resumen(self) -> List[Dict[str, Any]]:
+        """Huellas capturadas con su último plan, sin el árbol completo."""
+        with self._lock:
+            return [
+                {
+                    "fingerprint": entrada["fingerprint"],
+                    "origin": entrada["origin"],
+                    "sql": entrada["sql"],
+                    "captures": len(entrada["plans"]),
+                    "last_captured_at": entrada["plans"][-1]["captured_at"],
+                    "last_execution_ms": entrada["plans"][-1]["execution_ms"],
+                    "last_scans": entrada["plans"][-1]["scans"],
+                }
+                for entrada in reversed(self._planes.values())
+            ]
+
+    def planes(self, huella: str) -> Optional[Dict[str, Any]]:
+        """Todos los planes guardados de una huella."""
+        with self._lock:
+            entrada = self._planes.get(huella)
+            if entrada is None:
+                return None
+            return {**entrada, "plans": list(entrada["plans"])}
+
+    def regresiones(self) -> List[Dict[str, Any]]:
+        """Regresiones de índice a Seq Scan, de la más reciente a la más antigua."""
+        with self._lock:
+            return list(reversed(self._regresiones))
+
+
+registro_planes = RegistroPlanes()
+
+
+def instalar_explain(engine) -> bool:
+    """
+    Activa la captura de planes si SQL_EXPLAIN está encendido y la base es
+    PostgreSQL. Requiere los hooks de `instalar_hooks_sql`.
+
+    Returns:
+        bool: Si la captura quedó activa
+    """
+    if not EXPLAIN_HABILITADO or engine.dialect.name != "postgresql":
+        return False
+    observar_sentencias(registro_planes.observar)
+    return True
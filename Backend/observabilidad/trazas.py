@@ -0,0 +1,308 @@
+"""
+Trazas internas de la API.
+
+Un span mide un tramo del trabajo de un request (un método de un CRUD, una
+cotización, el armado de un PDF) y cuelga del span que estaba abierto
+cuando empezó. El span abierto vive en una variable de contexto, así que el
+árbol se arma solo: las rutas síncronas corren en el pool de hilos con una
+copia del contexto del request y sus spans quedan bajo el span raíz que abre
+el middleware. Cada span cuenta además las sentencias SQL que se ejecutaron
+mientras era el span abierto.
+
+Solo el middleware abre trazas nuevas (`span_raiz`). Fuera de un request
+(scripts, hilos en segundo plano, benchmarks) no hay span abierto y `span()`
+no registra nada, así los métodos trazados no llenan el buffer con trazas
+sueltas.
+
+Cuando termina el span raíz la traza completa se guarda en un buffer
+circular en memoria (visible en `/debug/trazas`) y, si TRAZAS_ARCHIVO está
+definida, se agrega como una línea JSON a ese archivo. No hace falta ningún
+colector externo.
+"""
+
+import functools
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .instrumentacion_sql import observar_sentencias
+
+TRAZAS_HABILITADAS = os.getenv("TRAZAS_HABILITADAS", "1") in ("1", "true")
+""" Trazas que se conservan en memoria """
+TRAZAS_MAXIMO = int(os.getenv("TRAZAS_BUFFER", "200"))
+RUTA_ARCHIVO_TRAZAS = os.getenv("TRAZAS_ARCHIVO", "")
+""" Spans por traza; los siguientes se cuentan pero no se guardan """
+SPANS_POR_TRAZA = 500
+
+
+class Traza:
+    """Spans terminados de una misma traza."""
+
+    __slots__ = ("id", "spans", "descartados")
+
+    def __init__(self):
+        self.id = f"{random.getrandbits(64):016x}"
+        self.spans: List["Span"] = []
+        self.descartados = 0
+
+
+class Span:
+    """Tramo medido de una traza."""
+
+    __slots__ = (
+        "traza",
+        "id",
+        "id_padre",
+        "nombre",
+        "atributos",
+        "inicio",
+        "_inicio_perf",
+        "duracion_ms",
+        "consultas",
+        "tiempo_db_ms",
+        "error",
+    )
+
+    def __init__(self, nombre: str, padre: Optional["Span"], atributos: Dict[str, Any]):
+        self.traza = padre.traza if padre is not None else Traza()
+        self.id = f"{random.getrandbits(64):016x}"
+        self.id_padre = padre.id if padre is not None else None
+        self.nombre = nombre
+        self.atributos = atributos
+        self.inicio = time.time()
+        self._inicio_perf = time.perf_counter()
+        self.duracion_ms = 0.0
+        self.consultas = 0
+        self.tiempo_db_ms = 0.0
+        self.error: Optional[str] = None
+
+    def terminar(self) -> None:
+        self.duracion_ms = (time.perf_counter() - self._inicio_perf) * 1000
+        if len(self.traza.spans) < SPANS_POR_TRAZA:
+            self.traza.spans.append(self)
+        else:
+            self.traza.descartados += 1
+
+    def a_dict(self) -> Dict[str, Any]:
+        return {
+            "span_id": self.id,
+            "parent_id": self.id_padre,
+            "name": self.nombre,
+            "start": round(self.inicio, 6),
+            "duration_ms": round(self.duracion_ms, 3),
+            "queries": self.consultas,
+            "db_ms": round(self.tiempo_db_ms, 3),
+            "attributes": self.atributos,
+            "error": self.error,
+        }
+
+
+_span_actual: ContextVar[Optional[Span]] = ContextVar("span_actual", default=None)
+
+
+def span_actual() -> Optional[Span]:
+    """Span abierto en el contexto actual, o None."""
+    return _span_actual.get()
+
+
+@contextmanager
+def _abrir_span(
+    nombre: str, padre: Optional[Span], atributos: Dict[str, Any]
+) -> Iterator[Span]:
+    actual = Span(nombre, padre, atributos)
+    token = _span_actual.set(actual)
+    try:
+        yield actual
+    except BaseException as e:
+        actual.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _span_actual.reset(token)
+        actual.terminar()
+        if padre is None:
+            exportador.exportar(actual.traza, actual)
+
+
+@contextmanager
+def span(nombre: str, **atributos: Any) -> Iterator[Optional[Span]]:
+    """
+    Abre un span hijo del span actual. Sin span abierto no hace nada y
+    entrega None.
+
+    Args:
+        nombre: Nombre del tramo, p. ej. "PaqueteCRUD.crear"
+        **atributos: Datos adicionales que se guardan con el span
+    """
+    padre = _span_actual.get()
+    if not TRAZAS_HABILITADAS or padre is None:
+        yield None
+        return
+    with _abrir_span(nombre, padre, atributos) as actual:
+        yield actual
+
+
+@contextmanager
+def span_raiz(nombre: str, **atributos: Any) -> Iterator[Optional[Span]]:
+    """
+    Abre el span raíz de una traza nueva; al cerrarse la traza se exporta.
+
+    Args:
+        nombre: Nombre de la traza, p. ej. "GET /paquetes/"
+        **atributos: Datos adicionales que se guardan con el span
+    """
+    if not TRAZAS_HABILITADAS:
+        yield None
+        return
+    with _abrir_span(nombre, None, atributos) as actual:
+        yield actual
+
+
+def trazado(nombre: Optional[str] = None) -> Callable:
+    """
+    Decorador que ejecuta la función dentro de un span.
+
+    Args:
+        nombre: Nombre del span; por defecto el nombre calificado de la función
+    """
+
+    def decorar(funcion: Callable) -> Callable:
+        nombre_span = nombre or funcion.__qualname__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if _span_actual.get() is None:
+                return funcion(*args, **kwargs)
+            with span(nombre_span):
+                return funcion(*args, **kwargs)
+
+        envoltura.__trazado__ = True
+        return envoltura
+
+    return decorar
+
+
+def trazar_metodos(clase: type) -> None:
+    """
+    Envuelve en un span cada método público definido en la clase. El span
+    se nombra con la clase de la instancia, así los métodos heredados
+    aparecen con el nombre de la subclase que los usa.
+    """
+    for nombre, valor in list(vars(clase).items()):
+        if nombre.startswith("_") or not callable(valor):
+            continue
+        if isinstance(valor, (type, staticmethod, classmethod)):
+            continue
+        if getattr(valor, "__trazado__", False):
+            continue
+        setattr(clase, nombre, _envolver_metodo(valor, nombre))
+
+
+def _envolver_metodo(metodo: Callable, nombre: str) -> Callable:
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        if _span_actual.get() is None:
+            return metodo(self, *args, **kwargs)
+        with span(f"{type(self).__name__}.{nombre}"):
+            return metodo(self, *args, **kwargs)
+
+    envoltura.__trazado__ = True
+    return envoltura
+
+
+def _contar_sentencia(conn, sql, parametros, executemany, duracion_ms) -> None:
+    actual = _span_actual.get()
+    if actual is not None:
+        actual.consultas += 1
+        actual.tiempo_db_ms += duracion_ms
+
+
+class ExportadorTrazas:
+    """Guarda las trazas terminadas en memoria y, si se pide, en un archivo JSONL."""
+
+    def __init__(self, maximo: int = TRAZAS_MAXIMO, ruta_archivo: str = RUTA_ARCHIVO_TRAZAS):
+        self._trazas: deque = deque(maxlen=maximo)
+        self.ruta_archivo = ruta_archivo
+        self._lock = threading.Lock()
+
+    def exportar(self, traza: Traza, raiz: Span) -> None:
+        registro = {
+            "trace_id": traza.id,
+            "name": raiz.nombre,
+            "start": round(raiz.inicio, 6),
+            "duration_ms": round(raiz.duracion_ms, 3),
+            "queries": sum(s.consultas for s in traza.spans),
+            "error": raiz.error,
+            "dropped_spans": traza.descartados,
+            "spans": [s.a_dict() for s in traza.spans],
+        }
+        self._trazas.append(registro)
+        if self.ruta_archivo:
+            try:
+                linea = json.dumps(registro, ensure_ascii=False, default=str)
+                with self._lock:
+                    with open(self.ruta_archivo, "a", encoding="utf-8") as archivo:
+                        archivo.write(linea + "\n")
+            except Exception as e:
+                print(f"Error al escribir la traza {traza.id}: {e}")
+
+    def recientes(self, limite: int = 50, minimo_ms: float = 0.0) -> List[Dict[str, Any]]:
+        """Resumen de las trazas más recientes, sin sus spans."""
+        resultado = []
+        for registro in reversed(list(self._trazas)):
+            if registro["duration_ms"] < minimo_ms:
+                continue
+            resultado.append({k: v for k, v in registro.items() if k != "spans"})
+            if len(resultado) >= limite:
+                break
+        return resultado
+
+    def traza(self, id_traza: str) -> Optional[Dict[str, Any]]:
+        for registro in list(self._trazas):
+            if registro["trace_id"] == id_traza:
+                return registro
+        return None
+
+
+exportador = ExportadorTrazas()
+
+
+def instalar_trazas() -> None:
+    """Cuenta en cada span las sentencias SQL que se ejecutan dentro de él."""
+    if RUTA_ARCHIVO_TRAZAS:
+        directorio = os.path.dirname(RUTA_ARCHIVO_TRAZAS)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+    observar_sentencias(_contar_sentencia)
+
+
+class MiddlewareTrazas:
+    """Abre el span raíz de cada request HTTP."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive, send):
+        if scope["type"] != "http" or not TRAZAS_HABILITADAS:
+            await self.app(scope, receive, send)
+            return
+
+        with span_raiz(f"{scope['method']} {scope['path']}") as raiz:
+
+            async def enviar(mensaje):
+                if mensaje["type"] == "http.response.start":
+                    raiz.atributos["status"] = mensaje["status"]
+                await send(mensaje)
+
+            try:
+                await self.app(scope, receive, enviar)
+            finally:
+                ruta = scope.get("route")
+                if ruta is not None:
+                    raiz.nombre = f"{scope['method']} {ruta.path}"
+                    raiz.atributos["path"] = scope["path"]
@@ -0,0 +1,52 @@
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from datetime import datetime
+from uuid import UUID
+from pydantic import Field, validator
+from services.servicio_mensajeria import TamañoPaquete, TipoEnvio
+
+
+class CotizacionCreate(BaseModel):
+    id_sede_origen: UUID = Field(..., description="ID de la sede de origen")
+    id_sede_destino: UUID = Field(..., description="ID de la sede de destino")
+    peso_kg: float = Field(..., gt=0, le=100, description="Peso del paquete en kg")
+    tamaño: TamañoPaquete = Field(
+        TamañoPaquete.MEDIANO, description="Tamaño del paquete"
+    )
+    tipo_envio: TipoEnvio = Field(TipoEnvio.NORMAL, description="Tipo de envío")
+    es_fragil: bool = Field(False, description="Si el paquete es frágil")
+    valor_declarado: float = Field(0.0, ge=0, description="Valor declarado")
+
+    @validator("id_sede_destino")
+    def validar_sedes_distintas(cls, v, values):
+        if values.get("id_sede_origen") == v:
+            raise ValueError("La sede de origen y destino no pueden ser la misma")
+        return v
+
+
+class CotizacionResponse(BaseModel):
+    id_cotizacion: UUID
+    id_sede_origen: UUID
+    id_sede_destino: UUID
+    peso_kg: float
+    tamaño: str
+    tipo_envio: str
+    es_fragil: bool
+    valor_declarado: float
+    distancia_km: float
+    transbordos: int
+    costo_total: float
+    tiempo_promedio_horas: int
+    desglose: Dict[str, Any]
+    fecha_cotizacion: datetime
+    fecha_expiracion: datetime
+    id_paquete: Optional[UUID] = None
+
+    class Config:
+        from_attributes = True
+        json_encoders = {datetime: lambda v: v.isoformat()}
+
+
+class PurgaCotizacionesResponse(BaseModel):
+    eliminadas: int
+    antes_de: datetime
@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import List
+from uuid import UUID
+
+
+class AsignacionVehiculoResponse(BaseModel):
+    id_transporte: UUID
+    placa: str
+    capacidad_carga: float
+    carga_asignada: float
+    utilizacion: float
+    paquetes: List[UUID]
+
+
+class PlanDespachoResponse(BaseModel):
+    id_sede: UUID
+    total_paquetes: int
+    paquetes_asignados: int
+    paquetes_sin_asignar: int
+    vehiculos_disponibles: int
+    vehiculos_usados: int
+    asignaciones: List[AsignacionVehiculoResponse]
+    sin_asignar: List[UUID]
+    tiempo_planificacion_ms: float
+    confirmado: bool = False
+    envios_despachados: int = 0
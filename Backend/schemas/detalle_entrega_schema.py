@@ -87,6 +87,10 @@ class DetalleEntregaResponse(BaseModel):
     fecha_envio: datetime
     fecha_entrega: Optional[datetime] = None
     observaciones: Optional[str] = None
+    id_mensajero: Optional[UUID] = None
+    reclamo_expira: Optional[datetime] = None
+    id_transporte: Optional[UUID] = None
+    fecha_despacho: Optional[datetime] = None
     activo: bool
     fecha_creacion: datetime
     fecha_actualizacion: Optional[datetime] = None
@@ -105,3 +109,17 @@ class DetalleEntregaListResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ReclamoEntregaCreate(BaseModel):
+    id_mensajero: UUID = Field(..., description="ID del mensajero que reclama")
+    cantidad: int = Field(
+        default=1, ge=1, le=50, description="Número de entregas a reclamar"
+    )
+    duracion_minutos: int = Field(
+        default=30, ge=1, le=480, description="Duración del reclamo en minutos"
+    )
+
+
+class LiberarEntregaRequest(BaseModel):
+    id_mensajero: UUID = Field(..., description="ID del mensajero que libera")
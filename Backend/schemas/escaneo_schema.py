@@ -0,0 +1,69 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+from uuid import UUID
+from pydantic import Field, validator
+import uuid
+
+
+class EscaneoCreate(BaseModel):
+    id_paquete: UUID = Field(..., description="ID del paquete escaneado")
+    id_sede: UUID = Field(..., description="ID de la sede donde se escaneó el paquete")
+    fecha_escaneo: Optional[datetime] = Field(
+        None, description="Fecha y hora del escaneo (por defecto, la de recepción)"
+    )
+    estado: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=20,
+        description="Nuevo estado del paquete (registrado, en_transito, en_reparto, etc.)",
+    )
+
+    @validator("fecha_escaneo")
+    def validar_fecha_escaneo(cls, v):
+        """ Con zona horaria se pasa a la hora local sin zona, como el resto de fechas """
+        if v is not None and v.tzinfo is not None:
+            return v.astimezone().replace(tzinfo=None)
+        return v
+
+    @validator("estado")
+    def validar_estado(cls, v):
+        estados_validos = [
+            "registrado",
+            "en_transito",
+            "en_reparto",
+            "entregado",
+            "no_entregado",
+            "devuelto",
+        ]
+        if v is not None:
+            if v.strip().lower() not in estados_validos:
+                raise ValueError(
+                    f'El estado debe ser uno de: {", ".join(estados_validos)}'
+                )
+            return v.strip().lower()
+        return v
+
+
+class EscaneoLoteCreate(BaseModel):
+    escaneos: List[EscaneoCreate] = Field(
+        ..., min_length=1, max_length=5000, description="Escaneos a registrar"
+    )
+
+
+class EscaneoAceptadoResponse(BaseModel):
+    aceptados: int
+    pendientes_en_buffer: int
+
+
+class EscaneoResponse(BaseModel):
+    id_escaneo: uuid.UUID
+    id_paquete: UUID
+    id_sede: UUID
+    estado: Optional[str] = None
+    fecha_escaneo: datetime
+    fecha_creacion: datetime
+
+    class Config:
+        from_attributes = True
+        json_encoders = {datetime: lambda v: v.isoformat()}
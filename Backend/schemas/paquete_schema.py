@@ -82,7 +82,9 @@ class PaqueteBase(BaseModel):
 
 
 class PaqueteCreate(PaqueteBase):
-    pass
+    id_cotizacion: Optional[UUID] = Field(
+        None, description="Cotización vigente cuyo precio se usa para el envío"
+    )
 
 
 class PaqueteUpdate(BaseModel):
@@ -132,6 +134,8 @@ class PaqueteUpdate(BaseModel):
 
 class PaqueteResponse(PaqueteBase):
     id_paquete: uuid.UUID
+    costo_envio: Optional[float] = None
+    id_cotizacion: Optional[uuid.UUID] = None
     fecha_creacion: datetime
     fecha_actualizacion: Optional[datetime] = None
     creado_por: str
@@ -0,0 +1,80 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+from uuid import UUID
+from pydantic import Field, validator
+
+
+class RutaSedeBase(BaseModel):
+    id_sede_origen: UUID = Field(..., description="ID de la sede donde empieza el tramo")
+    id_sede_destino: UUID = Field(..., description="ID de la sede donde termina el tramo")
+    distancia_km: Optional[float] = Field(
+        None,
+        gt=0,
+        le=20000,
+        description="Distancia real del tramo; si se omite se usa la distancia en línea recta",
+    )
+    bidireccional: bool = Field(
+        default=True, description="Si el tramo se puede recorrer en ambos sentidos"
+    )
+
+    @validator("id_sede_destino")
+    def validar_destino(cls, v, values):
+        if "id_sede_origen" in values and v == values["id_sede_origen"]:
+            raise ValueError("La sede de origen y destino no pueden ser la misma")
+        return v
+
+
+class RutaSedeCreate(RutaSedeBase):
+    pass
+
+
+class RutaSedeUpdate(BaseModel):
+    distancia_km: Optional[float] = Field(None, gt=0, le=20000)
+    bidireccional: Optional[bool] = None
+    activo: Optional[bool] = None
+
+
+class RutaSedeResponse(BaseModel):
+    id_ruta: UUID
+    id_sede_origen: UUID
+    id_sede_destino: UUID
+    distancia_km: float
+    bidireccional: bool
+    activo: bool
+    fecha_creacion: datetime
+    fecha_actualizacion: Optional[datetime] = None
+    creado_por: str
+    actualizado_por: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+        json_encoders = {datetime: lambda v: v.isoformat()}
+
+
+class CaminoResponse(BaseModel):
+    id_sede_origen: UUID
+    id_sede_destino: UUID
+    sedes: List[UUID]
+    distancia_km: float
+    transbordos: int
+
+
+class TiempoRutaResponse(BaseModel):
+    id_sede_origen: UUID
+    id_sede_destino: UUID
+    tipo_envio: str
+    envios: int
+    horas_p10: float
+    horas_p50: float
+    horas_p90: float
+    fecha_calculo: datetime
+
+    class Config:
+        from_attributes = True
+        json_encoders = {datetime: lambda v: v.isoformat()}
+
+
+class TiemposRutaPublicadosResponse(BaseModel):
+    rutas_calculadas: Optional[int] = None
+    rutas_publicadas: int
@@ -148,3 +148,13 @@ class SedeListResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class SedeCercanaResponse(BaseModel):
+    id_sede: UUID
+    nombre: str
+    ciudad: str
+    direccion: str
+    latitud: float
+    longitud: float
+    distancia_km: float
@@ -0,0 +1,48 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+from uuid import UUID
+from pydantic import Field, validator
+from schemas.tarifa_schema import TarifaCreate
+
+
+class SimulacionTarifasRequest(BaseModel):
+    tarifas: List[TarifaCreate] = Field(
+        ..., min_length=1, description="Tarifas candidatas; vigente_desde se ignora"
+    )
+    fecha_inicio: Optional[datetime] = Field(
+        None, description="Inicio del período; por defecto un año atrás"
+    )
+    fecha_fin: Optional[datetime] = Field(
+        None, description="Fin del período; por defecto ahora"
+    )
+
+    @validator("fecha_fin")
+    def validar_periodo(cls, v, values):
+        inicio = values.get("fecha_inicio")
+        if v is not None and inicio is not None and v <= inicio:
+            raise ValueError("La fecha de fin debe ser posterior a la de inicio")
+        return v
+
+
+class SimulacionSedeTipoResponse(BaseModel):
+    id_sede: UUID
+    sede: str
+    tipo_envio: str
+    envios: int
+    ingresos_actuales: float
+    ingresos_simulados: float
+    diferencia: float
+
+
+class SimulacionTarifasResponse(BaseModel):
+    fecha_inicio: datetime
+    fecha_fin: datetime
+    envios: int
+    envios_omitidos: int
+    ingresos_actuales: float
+    ingresos_simulados: float
+    diferencia: float
+    porcentaje: float
+    por_sede_tipo: List[SimulacionSedeTipoResponse]
+    tiempo_simulacion_ms: float
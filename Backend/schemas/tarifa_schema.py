@@ -0,0 +1,65 @@
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from datetime import datetime
+from uuid import UUID
+from pydantic import Field, validator
+from services.servicio_mensajeria import CONCEPTOS_TARIFA
+
+
+class TarifaCreate(BaseModel):
+    concepto: str = Field(..., description="Concepto tarifado")
+    clave: Optional[str] = Field(
+        None, description="Tipo de envío o tamaño; vacío para valores únicos"
+    )
+    valor: float = Field(..., gt=0, description="Valor de la tarifa")
+    vigente_desde: Optional[datetime] = Field(
+        None, description="Fecha desde la que aplica; por defecto ahora"
+    )
+
+    @validator("concepto")
+    def validar_concepto(cls, v):
+        v = v.strip().lower()
+        if v not in CONCEPTOS_TARIFA:
+            raise ValueError(
+                f'El concepto debe ser uno de: {", ".join(CONCEPTOS_TARIFA)}'
+            )
+        return v
+
+    @validator("clave", always=True)
+    def validar_clave(cls, v, values):
+        concepto = values.get("concepto")
+        if concepto is None:
+            return v
+        tipo_clave = CONCEPTOS_TARIFA[concepto]
+        clave = (v or "").strip().lower()
+        if tipo_clave is None:
+            if clave:
+                raise ValueError(f"El concepto {concepto} no usa clave")
+            return ""
+        validas = [miembro.value for miembro in tipo_clave]
+        if clave not in validas:
+            raise ValueError(
+                f'La clave de {concepto} debe ser una de: {", ".join(validas)}'
+            )
+        return clave
+
+
+class TarifaResponse(BaseModel):
+    id_tarifa: UUID
+    concepto: str
+    clave: str
+    valor: float
+    vigente_desde: datetime
+    activo: bool
+    fecha_creacion: datetime
+    creado_por: str
+
+    class Config:
+        from_attributes = True
+        json_encoders = {datetime: lambda v: v.isoformat()}
+
+
+class TablaTarifasResponse(BaseModel):
+    tarifas: Dict[str, Any]
+    vigente_desde: Optional[datetime] = None
+    siguiente_vigencia: Optional[datetime] = None
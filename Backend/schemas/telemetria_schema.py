@@ -0,0 +1,56 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+from uuid import UUID
+from pydantic import Field, validator
+
+
+class PuntoGPS(BaseModel):
+    latitud: float = Field(..., ge=-90, le=90, description="Latitud en grados decimales")
+    longitud: float = Field(
+        ..., ge=-180, le=180, description="Longitud en grados decimales"
+    )
+    fecha_registro: datetime = Field(..., description="Fecha y hora de la lectura GPS")
+    velocidad_kmh: Optional[float] = Field(
+        None, ge=0, le=300, description="Velocidad en km/h"
+    )
+    rumbo: Optional[float] = Field(None, ge=0, le=360, description="Rumbo en grados")
+
+    @validator("fecha_registro")
+    def validar_fecha_registro(cls, v):
+        """ Con zona horaria se pasa a la hora local sin zona, como el resto de fechas """
+        if v.tzinfo is not None:
+            return v.astimezone().replace(tzinfo=None)
+        return v
+
+
+class TelemetriaLoteCreate(BaseModel):
+    id_transporte: UUID = Field(..., description="ID del vehículo que reporta")
+    puntos: List[PuntoGPS] = Field(
+        ..., min_length=1, max_length=10000, description="Pings GPS del vehículo"
+    )
+
+
+class TelemetriaAceptadaResponse(BaseModel):
+    id_transporte: UUID
+    recibidos: int
+    aceptados: int
+
+
+class PosicionResponse(BaseModel):
+    id_transporte: UUID
+    latitud: float
+    longitud: float
+    fecha_registro: datetime
+    velocidad_kmh: Optional[float] = None
+    distancia_km: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+        json_encoders = {datetime: lambda v: v.isoformat()}
+
+
+class ReduccionTelemetriaResponse(BaseModel):
+    eliminados: int
+    antiguedad_dias: int
+    intervalo_minutos: int
@@ -0,0 +1,53 @@
+"""
+Recalcula la tabla de tiempos de entrega por ruta.
+
+Toma las entregas completadas del período, calcula en la base de datos los
+percentiles 10, 50 y 90 de las horas de entrega por sede remitente, sede
+receptora y tipo de envío, y reemplaza la tabla 'tiempos_ruta'. Pensado para
+ejecutarse de forma periódica (por ejemplo una vez al día con cron); la API
+toma los nuevos tiempos al reiniciar o con POST /rutas/tiempos/recargar.
+
+Uso:
+    python scripts/calcular_tiempos_ruta.py --dias 365 --minimo-envios 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.config import SessionLocal, create_tables
+from services.tiempos_ruta import MINIMO_ENVIOS, calcular_tiempos_ruta
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--dias", type=int, default=365, help="Días hacia atrás de entregas a considerar"
+    )
+    parser.add_argument(
+        "--minimo-envios",
+        type=int,
+        default=MINIMO_ENVIOS,
+        help="Entregas mínimas para guardar una ruta",
+    )
+    args = parser.parse_args()
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        inicio = time.perf_counter()
+        rutas = calcular_tiempos_ruta(
+            db, dias=args.dias, minimo_envios=args.minimo_envios
+        )
+        duracion = time.perf_counter() - inicio
+    finally:
+        db.close()
+
+    print(f"Rutas con tiempos calculados: {rutas} en {duracion:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,760 @@
+"""
+Genera datos sintéticos a escala de producción para pruebas de rendimiento.
+
+Crea usuarios, clientes, empleados, sedes con coordenadas, transportes (con
+su intervalo de estado abierto), paquetes y detalles de entrega coherentes
+entre sí: cada cliente y empleado tiene su usuario, los vehículos pertenecen
+a una sede, cada paquete tiene su detalle de entrega, el costo sale de la
+tabla de tarifas por defecto con la distancia real entre sedes y las fechas
+de despacho y entrega respetan el estado del envío.
+
+La carga es sesgada como en producción: unas pocas sedes concentran la mayor
+parte de los envíos y unos pocos clientes envían mucho más que el resto
+(distribución de Zipf, `--sesgo-sedes` y `--sesgo-clientes`; 0 la vuelve
+uniforme).
+
+Cada tabla se parte en bloques que generan procesos en paralelo con NumPy y
+cargan con COPY (`copy_expert`) en su propia conexión. Los IDs se derivan
+del número de fila, así los procesos no necesitan compartir nada y una misma
+semilla produce siempre los mismos datos. Los nombres de usuario, documentos,
+correos y placas llevan el número de corrida para no chocar con los datos de
+corridas anteriores.
+
+En SQLite no hay COPY y la base admite un solo escritor: los mismos bloques
+se insertan con `executemany` uno tras otro en este proceso.
+
+Uso:
+    python scripts/generar_datos.py --paquetes 1000000 --clientes 100000 --procesos 8
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import repeat
+from contextlib import nullcontext
+from multiprocessing import Pool
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import Boolean, DateTime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.config import Base, SessionLocal, create_tables, get_engine
+from entities.rol import Rol
+from entities.tipo_documento import TipoDocumento
+from scripts.inicializar_admin_y_documentos import (
+    crear_tipos_documento_por_defecto,
+    crear_usuario_administrador,
+)
+from scripts.init_roles import init_roles
+from services.servicio_mensajeria import ServicioMensajeria
+from services.simulador_tarifas import (
+    TAMAÑOS,
+    TIPOS,
+    matriz_haversine,
+    precios_vectorizados,
+)
+
+""" (ciudad, latitud, longitud, altitud) """
+CIUDADES = [
+    ("Bogotá", 4.711, -74.0721, 2640.0),
+    ("Medellín", 6.2442, -75.5812, 1495.0),
+    ("Cali", 3.4516, -76.532, 1018.0),
+    ("Barranquilla", 10.9685, -74.7813, 18.0),
+    ("Cartagena", 10.391, -75.4794, 2.0),
+    ("Bucaramanga", 7.1193, -73.1227, 959.0),
+    ("Pereira", 4.8133, -75.6961, 1411.0),
+    ("Manizales", 5.0703, -75.5138, 2160.0),
+    ("Cúcuta", 7.8939, -72.5078, 320.0),
+    ("Ibagué", 4.4389, -75.2322, 1285.0),
+    ("Santa Marta", 11.2408, -74.199, 6.0),
+    ("Villavicencio", 4.142, -73.6266, 467.0),
+    ("Pasto", 1.2136, -77.2811, 2527.0),
+    ("Neiva", 2.9273, -75.2819, 442.0),
+    ("Armenia", 4.5339, -75.6811, 1551.0),
+    ("Popayán", 2.4448, -76.6147, 1737.0),
+    ("Montería", 8.7479, -75.8814, 18.0),
+    ("Tunja", 5.5353, -73.3678, 2820.0),
+]
+NOMBRES = [
+    'Ana',
+    'Luis',
+    'María',
+    'Carlos',
+    'Laura',
+    'Andrés',
+    'Sofía',
+    'Juan',
+    'Valentina',
+    'Diego',
+]
+APELLIDOS = [
+    'García',
+    'Rodríguez',
+    'Martínez',
+    'López',
+    'Gómez',
+    'Pérez',
+    'Díaz',
+    'Torres',
+    'Ramírez',
+    'Moreno',
+]
+CONTENIDOS = [
+    'Documentos',
+    'Ropa',
+    'Electrónicos',
+    'Libros',
+    'Repuestos',
+    'Medicamentos',
+    'Alimentos no perecederos',
+    'Juguetes',
+]
+""" (tipo, capacidad en kg, participación en la flota) """
+VEHICULOS = [
+    ('Moto', 150.0, 0.45),
+    ('Furgoneta', 1200.0, 0.25),
+    ('Camioneta', 800.0, 0.15),
+    ('Camión', 8000.0, 0.1),
+    ('Bicicleta', 40.0, 0.05),
+]
+MARCAS = ["Chevrolet", "Renault", "Yamaha", "Honda", "Foton", "Hyundai"]
+TIPOS_EMPLEADO = ["mensajero", "logistico", "atencion_cliente", "coordinador"]
+ESTADOS_TRANSPORTE = ["disponible", "en_uso", "mantenimiento", "fuera_servicio"]
+
+""" Columnas que carga el COPY de cada tabla, en el orden de sus valores """
+COLUMNAS = {
+    "usuarios": [
+        "id_usuario", "id_rol", "nombre_usuario", "password", "activo",
+        "fecha_creacion",
+    ],
+    "sedes": [
+        "id_sede", "nombre", "ciudad", "direccion", "telefono", "latitud", "longitud",
+        "altitud", "activo", "fecha_creacion", "fecha_actualizacion", "creado_por",
+    ],
+    "clientes": [
+        "id_cliente", "usuario_id", "id_tipo_documento", "numero_documento",
+        "primer_nombre", "primer_apellido", "direccion", "telefono", "correo", "tipo",
+        "activo", "fecha_creacion", "creado_por",
+    ],
+    "empleados": [
+        "id_empleado", "usuario_id", "creado_por", "id_sede", "primer_nombre",
+        "primer_apellido", "id_tipo_documento", "documento", "fecha_nacimiento",
+        "telefono", "correo", "direccion", "tipo_empleado", "salario", "fecha_ingreso",
+        "activo", "fecha_creacion",
+    ],
+    "transportes": [
+        "id_transporte", "tipo_vehiculo", "capacidad_carga", "id_sede", "placa",
+        "modelo", "marca", "año", "estado", "activo", "fecha_creacion", "creado_por",
+    ],
+    "historial_estados_transporte": [
+        "id_historial", "id_transporte", "estado", "desde",
+    ],
+    "paquetes": [
+        "id_paquete", "id_cliente", "peso", "tamaño", "fragilidad", "contenido", "tipo",
+        "valor_declarado", "estado", "costo_envio", "activo", "fecha_creacion",
+        "fecha_actualizacion", "creado_por",
+    ],
+    "detalles_entrega": [
+        "id_detalle", "id_sede_remitente", "id_sede_receptora", "id_paquete",
+        "id_cliente_remitente", "id_cliente_receptor", "estado_envio", "fecha_envio",
+        "fecha_entrega", "id_transporte", "fecha_despacho", "activo", "fecha_creacion",
+        "fecha_actualizacion", "creado_por", "actualizado_por",
+    ],
+}
+
+FILAS_POR_BLOQUE = 100_000
+""" Código de cada tabla en la semilla de su generador """
+_CODIGO_TABLA = {
+    "usuarios": 1,
+    "sedes": 2,
+    "clientes": 3,
+    "empleados": 4,
+    "transportes": 5,
+    "historial_estados_transporte": 6,
+    "envios": 7,
+}
+
+
+@dataclass(frozen=True)
+class PlanDatos:
+    """Todo lo que un proceso necesita para generar su bloque."""
+
+    corrida: int
+    semilla: int
+    sedes: int
+    clientes: int
+    empleados: int
+    transportes_por_sede: int
+    paquetes: int
+    dias: int
+    sesgo_sedes: float
+    sesgo_clientes: float
+    id_rol_cliente: str
+    id_rol_empleado: str
+    id_tipo_documento: str
+    creado_por: str
+    """ Inicio y fin del período en ISO; todo lo demás se crea en el inicio """
+    inicio: str
+    fin: str
+    """ Prefijo de 24 caracteres del UUID de cada tabla """
+    prefijos: Tuple[Tuple[str, str], ...]
+
+    def uuid(self, tabla: str, indices) -> List[str]:
+        prefijo = dict(self.prefijos)[tabla]
+        return [f"{prefijo}{int(i):012x}" for i in indices]
+
+
+def _texto(valores) -> List[str]:
+    return np.asarray(valores).astype(str).tolist()
+
+
+def _fechas(valores: np.ndarray) -> List[str]:
+    return np.datetime_as_string(valores.astype("datetime64[s]"), unit="s").tolist()
+
+
+def _nulos(valores: List[str], mascara: np.ndarray) -> List[str]:
+    return [r"\N" if nulo else valor for valor, nulo in zip(valores, mascara.tolist())]
+
+
+def _copy_texto(columnas: List[List[str]]) -> io.StringIO:
+    buffer = io.StringIO()
+    buffer.writelines("\t".join(fila) + "\n" for fila in zip(*columnas))
+    buffer.seek(0)
+    return buffer
+
+
+_cdf_cache: Dict[Tuple[int, float, int], Tuple[np.ndarray, np.ndarray]] = {}
+
+
+def _zipf(rng: np.random.Generator, n: int, sesgo: float, semilla: int, tamaño: int) -> np.ndarray:
+    """
+    Índices entre 0 y n-1 con distribución de Zipf: el k-ésimo más popular
+    aparece con peso 1/k^sesgo. Qué índices son los populares lo decide una
+    permutación fija por semilla, igual en todos los procesos.
+    """
+    if sesgo <= 0:
+        return rng.integers(0, n, tamaño)
+    clave = (n, sesgo, semilla)
+    if clave not in _cdf_cache:
+        pesos = 1.0 / np.arange(1, n + 1) ** sesgo
+        cdf = np.cumsum(pesos)
+        cdf /= cdf[-1]
+        permutacion = np.random.default_rng(semilla).permutation(n)
+        _cdf_cache[clave] = (cdf, permutacion)
+    cdf, permutacion = _cdf_cache[clave]
+    rangos = np.minimum(np.searchsorted(cdf, rng.random(tamaño)), n - 1)
+    return permutacion[rangos]
+
+
+def _coordenadas_sedes(plan: PlanDatos) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Ciudad y coordenadas de cada sede (las sedes de una ciudad se reparten alrededor del centro)."""
+    rng = np.random.default_rng([plan.semilla, _CODIGO_TABLA["sedes"]])
+    ciudad = np.arange(plan.sedes) % len(CIUDADES)
+    base = np.array([c[1:] for c in CIUDADES])[ciudad]
+    latitud = base[:, 0] + rng.uniform(-0.05, 0.05, plan.sedes)
+    longitud = base[:, 1] + rng.uniform(-0.05, 0.05, plan.sedes)
+    return ciudad, latitud.round(6), longitud.round(6), base[:, 2]
+
+
+def _usuarios(plan: PlanDatos, inicio: int, fin: int, rng) -> Tuple[str, List[str], List[List[str]]]:
+    """Los primeros `clientes` usuarios son de clientes y el resto de empleados."""
+    indices = np.arange(inicio, fin)
+    es_cliente = indices < plan.clientes
+    columnas = [
+        plan.uuid("usuarios", indices),
+        np.where(es_cliente, plan.id_rol_cliente, plan.id_rol_empleado).tolist(),
+        [f"gen{plan.corrida}_{i}" for i in indices],
+        list(repeat("generado123", len(indices))),
+        list(repeat("t", len(indices))),
+        list(repeat(plan.inicio, len(indices))),
+    ]
+    return "usuarios", COLUMNAS["usuarios"], columnas
+
+
+def _sedes(plan: PlanDatos, inicio: int, fin: int, rng):
+    indices = np.arange(inicio, fin)
+    ciudad, latitud, longitud, altitud = _coordenadas_sedes(plan)
+    n = len(indices)
+    columnas = [
+        plan.uuid("sedes", indices),
+        [f"Sede {CIUDADES[ciudad[i]][0]} {i // len(CIUDADES) + 1}" for i in indices],
+        [CIUDADES[ciudad[i]][0] for i in indices],
+        [f"Calle {10 + i % 90} # {i % 50}-{i % 99}" for i in indices],
+        [f"60{1000000 + i:07d}" for i in indices],
+        _texto(latitud[inicio:fin]),
+        _texto(longitud[inicio:fin]),
+        _texto(altitud[inicio:fin]),
+        list(repeat("t", n)),
+        list(repeat(plan.inicio, n)),
+        list(repeat(plan.inicio, n)),
+        list(repeat(plan.creado_por, n)),
+    ]
+    return "sedes", COLUMNAS["sedes"], columnas
+
+
+def _clientes(plan: PlanDatos, inicio: int, fin: int, rng):
+    indices = np.arange(inicio, fin)
+    n = len(indices)
+    nombres = rng.integers(0, len(NOMBRES), n)
+    apellidos = rng.integers(0, len(APELLIDOS), n)
+    columnas = [
+        plan.uuid("clientes", indices),
+        plan.uuid("usuarios", indices),
+        list(repeat(plan.id_tipo_documento, n)),
+        [f"{plan.corrida:04d}{i:011d}" for i in indices],
+        [NOMBRES[k] for k in nombres],
+        [APELLIDOS[k] for k in apellidos],
+        [f"Carrera {1 + i % 120} # {i % 80}-{i % 97}" for i in indices],
+        [f"3{i % 1000000000:09d}" for i in indices],
+        [f"cliente{i}.r{plan.corrida}@swiftpost.test" for i in indices],
+        np.where(rng.random(n) < 0.5, "remitente", "receptor").tolist(),
+        list(repeat("t", n)),
+        list(repeat(plan.inicio, n)),
+        list(repeat(plan.creado_por, n)),
+    ]
+    return "clientes", COLUMNAS["clientes"], columnas
+
+
+def _empleados(plan: PlanDatos, inicio: int, fin: int, rng):
+    indices = np.arange(inicio, fin)
+    n = len(indices)
+    fin_plan = np.datetime64(plan.fin, "D")
+    nacimiento = fin_plan - rng.integers(20 * 365, 60 * 365, n).astype("timedelta64[D]")
+    ingreso = fin_plan - rng.integers(30, 10 * 365, n).astype("timedelta64[D]")
+    tipo = rng.choice(len(TIPOS_EMPLEADO), n, p=[0.7, 0.15, 0.1, 0.05])
+    columnas = [
+        plan.uuid("empleados", indices),
+        plan.uuid("usuarios", indices + plan.clientes),
+        list(repeat(plan.creado_por, n)),
+        plan.uuid("sedes", indices % plan.sedes),
+        [NOMBRES[k] for k in rng.integers(0, len(NOMBRES), n)],
+        [APELLIDOS[k] for k in rng.integers(0, len(APELLIDOS), n)],
+        list(repeat(plan.id_tipo_documento, n)),
+        [f"{plan.corrida:04d}9{i:010d}" for i in indices],
+        _texto(nacimiento),
+        [f"31{i % 100000000:08d}" for i in indices],
+        [f"empleado{i}.r{plan.corrida}@swiftpost.test" for i in indices],
+        [f"Avenida {1 + i % 70} # {i % 60}-{i % 90}" for i in indices],
+        [TIPOS_EMPLEADO[k] for k in tipo],
+        _texto(rng.integers(1_300_000, 6_000_000, n)),
+        _texto(ingreso),
+        list(repeat("t", n)),
+        list(repeat(plan.inicio, n)),
+    ]
+    return "empleados", COLUMNAS["empleados"], columnas
+
+
+def _vehiculos(plan: PlanDatos, indices: np.ndarray) -> np.ndarray:
+    """Tipo de vehículo de cada transporte, fijo por índice."""
+    rng = np.random.default_rng([plan.semilla, _CODIGO_TABLA["transportes"], 0])
+    tipos = rng.choice(
+        len(VEHICULOS), plan.sedes * plan.transportes_por_sede, p=[v[2] for v in VEHICULOS]
+    )
+    return tipos[indices]
+
+
+def _estados_transporte(plan: PlanDatos, indices: np.ndarray) -> np.ndarray:
+    """Estado actual de cada transporte, fijo por índice (lo comparten vehículo e historial)."""
+    rng = np.random.default_rng([plan.semilla, _CODIGO_TABLA["historial_estados_transporte"], 0])
+    estados = rng.choice(
+        len(ESTADOS_TRANSPORTE),
+        plan.sedes * plan.transportes_por_sede,
+        p=[0.8, 0.1, 0.07, 0.03],
+    )
+    return estados[indices]
+
+
+def _transportes(plan: PlanDatos, inicio: int, fin: int, rng):
+    indices = np.arange(inicio, fin)
+    n = len(indices)
+    tipos = _vehiculos(plan, indices)
+    columnas = [
+        plan.uuid("transportes", indices),
+        [VEHICULOS[k][0] for k in tipos],
+        [str(VEHICULOS[k][1]) for k in tipos],
+        plan.uuid("sedes", indices // plan.transportes_por_sede),
+        [f"G{plan.corrida % 1000:03d}{i:06d}" for i in indices],
+        [f"Modelo {k % 7 + 1}" for k in indices],
+        [MARCAS[k] for k in rng.integers(0, len(MARCAS), n)],
+        _texto(rng.integers(2010, datetime.now().year + 1, n)),
+        [ESTADOS_TRANSPORTE[k] for k in _estados_transporte(plan, indices)],
+        list(repeat("t", n)),
+        list(repeat(plan.inicio, n)),
+        list(repeat(plan.creado_por, n)),
+    ]
+    return "transportes", COLUMNAS["transportes"], columnas
+
+
+def _historial_transportes(plan: PlanDatos, inicio: int, fin: int, rng):
+    """Un intervalo abierto por vehículo con su estado actual, para el reporte de flota."""
+    indices = np.arange(inicio, fin)
+    n = len(indices)
+    columnas = [
+        plan.uuid("historial_estados_transporte", indices),
+        plan.uuid("transportes", indices),
+        [ESTADOS_TRANSPORTE[k] for k in _estados_transporte(plan, indices)],
+        list(repeat(plan.inicio, n)),
+    ]
+    tabla = "historial_estados_transporte"
+    return tabla, COLUMNAS[tabla], columnas
+
+
+def _envios(plan: PlanDatos, inicio: int, fin: int, rng):
+    """Paquetes y sus detalles de entrega; cada paquete tiene exactamente un detalle."""
+    indices = np.arange(inicio, fin)
+    n = len(indices)
+    fin_plan = np.datetime64(plan.fin, "s")
+
+    remitente = _zipf(rng, plan.clientes, plan.sesgo_clientes, plan.semilla + 1, n)
+    receptor = rng.integers(0, plan.clientes, n)
+    sede_origen = _zipf(rng, plan.sedes, plan.sesgo_sedes, plan.semilla + 2, n)
+    sede_destino = _zipf(rng, plan.sedes, plan.sesgo_sedes / 2, plan.semilla + 3, n)
+    sede_destino = np.where(sede_destino == sede_origen, (sede_destino + 1) % plan.sedes, sede_destino)
+
+    peso = np.clip(rng.lognormal(0.7, 0.9, n), 0.1, 50.0).round(2)
+    tamaño = np.digitize(peso, [2.0, 8.0, 25.0])
+    tipo = (rng.random(n) < 0.3).astype(int)
+    fragilidad = rng.choice(3, n, p=[0.6, 0.3, 0.1])
+    valor = (np.clip(rng.lognormal(11.0, 1.0, n), 0, 20_000_000) // 1000 * 1000).astype(int)
+
+    _, latitud, longitud, _ = _coordenadas_sedes(plan)
+    distancias = matriz_haversine(latitud, longitud)[sede_origen, sede_destino]
+    costo = precios_vectorizados(
+        ServicioMensajeria.tabla_por_defecto(),
+        distancias,
+        peso,
+        tipo,
+        tamaño,
+        fragilidad == 2,
+        valor.astype(float),
+    )
+
+    """ Más envíos en los días recientes y en horario laboral """
+    dia = (plan.dias * np.sqrt(rng.random(n))).astype(int)
+    segundos = (np.clip(rng.normal(13, 3.5, n), 6, 21) * 3600).astype(int)
+    envio = fin_plan - (plan.dias - dia).astype("timedelta64[D]") + segundos.astype("timedelta64[s]")
+    envio = np.minimum(envio, fin_plan - np.timedelta64(60, "s"))
+
+    horas_entrega = rng.lognormal(np.where(tipo == 1, np.log(18), np.log(40)) + distancias / 2000, 0.5)
+    despacho = envio + (np.minimum(rng.uniform(1, 12, n), horas_entrega * 0.5) * 3600).astype("timedelta64[s]")
+    entrega = envio + (horas_entrega * 3600).astype("timedelta64[s]")
+    entregado = entrega <= fin_plan
+    despachado = despacho <= fin_plan
+    estado_envio = np.where(entregado, "Entregado", np.where(despachado, "En transito", "Pendiente"))
+    estado_paquete = np.where(entregado, "entregado", np.where(despachado, "en_transito", "registrado"))
+    transporte = sede_origen * plan.transportes_por_sede + rng.integers(0, plan.transportes_por_sede, n)
+    actualizado = np.where(entregado, entrega, np.where(despachado, despacho, envio))
+
+    ids_paquete = plan.uuid("paquetes", indices)
+    textos_envio = _fechas(envio)
+    textos_actualizado = _fechas(actualizado)
+    paquetes = [
+        ids_paquete,
+        plan.uuid("clientes", remitente),
+        _texto(peso),
+        [TAMAÑOS[k].value for k in tamaño],
+        [("baja", "normal", "alta")[k] for k in fragilidad],
+        [CONTENIDOS[k] for k in rng.integers(0, len(CONTENIDOS), n)],
+        [TIPOS[k].value for k in tipo],
+        _texto(valor),
+        estado_paquete.tolist(),
+        _texto(costo),
+        list(repeat("t", n)),
+        textos_envio,
+        textos_actualizado,
+        list(repeat(plan.creado_por, n)),
+    ]
+    detalles = [
+        plan.uuid("detalles_entrega", indices),
+        plan.uuid("sedes", sede_origen),
+        plan.uuid("sedes", sede_destino),
+        ids_paquete,
+        plan.uuid("clientes", remitente),
+        plan.uuid("clientes", receptor),
+        estado_envio.tolist(),
+        textos_envio,
+        _nulos(_fechas(entrega), ~entregado),
+        _nulos(plan.uuid("transportes", transporte), ~despachado),
+        _nulos(_fechas(despacho), ~despachado),
+        list(repeat("t", n)),
+        textos_envio,
+        textos_actualizado,
+        list(repeat(plan.creado_por, n)),
+        list(repeat(plan.creado_por, n)),
+    ]
+    return [
+        ("paquetes", COLUMNAS["paquetes"], paquetes),
+        ("detalles_entrega", COLUMNAS["detalles_entrega"], detalles),
+    ]
+
+
+_GENERADORES = {
+    "usuarios": _usuarios,
+    "sedes": _sedes,
+    "clientes": _clientes,
+    "empleados": _empleados,
+    "transportes": _transportes,
+    "historial_estados_transporte": _historial_transportes,
+    "envios": _envios,
+}
+
+
+def _iniciar_proceso() -> None:
+    """Las conexiones heredadas del proceso padre no se pueden usar en el hijo."""
+    get_engine().dispose(close=False)
+
+
+def _conversion_sqlite(tipo) -> Optional[Callable[[str], object]]:
+    """Cómo guardar en SQLite un valor en el formato de texto de COPY."""
+    if isinstance(tipo, Boolean):
+        return lambda valor: 1 if valor == "t" else 0
+    if isinstance(tipo, DateTime):
+        """ Mismo formato que escribe SQLAlchemy (con microsegundos), para que las comparaciones de texto sirvan """
+        return _fecha_sqlite
+    return None
+
+
+def _fecha_sqlite(valor: str) -> str:
+    fecha = valor.replace("T", " ")
+    return fecha if "." in fecha else f"{fecha}.000000"
+
+
+def _insertar_sqlite(cursor, nombre_tabla: str, columnas: List[str], valores: List[List[str]]) -> None:
+    tabla = Base.metadata.tables[nombre_tabla]
+    conversiones = [_conversion_sqlite(tabla.c[columna].type) for columna in columnas]
+    for i, conversion in enumerate(conversiones):
+        valores[i] = [
+            None if valor == r"\N" else conversion(valor) if conversion else valor
+            for valor in valores[i]
+        ]
+    lista = ", ".join(f'"{columna}"' for columna in columnas)
+    marcas = ", ".join("?" for _ in columnas)
+    cursor.executemany(
+        f"INSERT INTO {nombre_tabla} ({lista}) VALUES ({marcas})", list(zip(*valores))
+    )
+
+
+def _cargar_bloque(tarea: Tuple[PlanDatos, str, int, int]) -> Tuple[str, int]:
+    """Genera un bloque de filas y lo carga en una transacción (COPY en PostgreSQL)."""
+    plan, tabla, inicio, fin = tarea
+    rng = np.random.default_rng([plan.semilla, _CODIGO_TABLA[tabla], inicio])
+    resultado = _GENERADORES[tabla](plan, inicio, fin, rng)
+    cargas = resultado if isinstance(resultado, list) else [resultado]
+
+    engine = get_engine()
+    conexion = engine.raw_connection()
+    try:
+        cursor = conexion.cursor()
+        for nombre_tabla, columnas, valores in cargas:
+            if engine.dialect.name != "postgresql":
+                _insertar_sqlite(cursor, nombre_tabla, columnas, valores)
+                continue
+            lista = ", ".join(f'"{columna}"' for columna in columnas)
+            cursor.copy_expert(
+                f"COPY {nombre_tabla} ({lista}) FROM STDIN", _copy_texto(valores)
+            )
+        conexion.commit()
+    except Exception:
+        conexion.rollback()
+        raise
+    finally:
+        conexion.close()
+    return tabla, (fin - inicio) * len(cargas)
+
+
+def _tareas(plan: PlanDatos, tabla: str, total: int, filas_por_bloque: int):
+    return [
+        (plan, tabla, inicio, min(inicio + filas_por_bloque, total))
+        for inicio in range(0, total, filas_por_bloque)
+    ]
+
+
+def preparar_plan(args) -> PlanDatos:
+    """Asegura roles, tipos de documento y el usuario administrador, y arma el plan."""
+    db = SessionLocal()
+    try:
+        init_roles(db)
+        administrador = crear_usuario_administrador(db)
+        if administrador is None:
+            raise RuntimeError("No se pudo obtener el usuario administrador")
+        crear_tipos_documento_por_defecto(db, administrador.id_usuario)
+        roles = {rol.nombre_rol: rol.id_rol for rol in db.query(Rol).all()}
+        tipo_documento = (
+            db.query(TipoDocumento).filter(TipoDocumento.codigo == "CC").first()
+        )
+        if tipo_documento is None or "cliente" not in roles or "empleado" not in roles:
+            raise RuntimeError("Faltan roles o tipos de documento por defecto")
+        creado_por = str(administrador.id_usuario)
+    finally:
+        db.close()
+
+    corrida = args.corrida if args.corrida is not None else int(time.time()) % 10000
+    tablas = [tabla for tabla in _CODIGO_TABLA if tabla != "envios"]
+    tablas += ["paquetes", "detalles_entrega"]
+    fin = datetime.now().replace(microsecond=0)
+    prefijos = tuple((tabla, str(uuid.uuid4())[:24]) for tabla in tablas)
+    return PlanDatos(
+        corrida=corrida,
+        semilla=args.semilla,
+        sedes=args.sedes,
+        clientes=args.clientes,
+        empleados=args.empleados,
+        transportes_por_sede=args.transportes_por_sede,
+        paquetes=args.paquetes,
+        dias=args.dias,
+        sesgo_sedes=args.sesgo_sedes,
+        sesgo_clientes=args.sesgo_clientes,
+        id_rol_cliente=str(roles["cliente"]),
+        id_rol_empleado=str(roles["empleado"]),
+        id_tipo_documento=str(tipo_documento.id_tipo_documento),
+        creado_por=creado_por,
+        inicio=(fin - timedelta(days=args.dias + 1)).isoformat(),
+        fin=fin.isoformat(),
+        prefijos=prefijos,
+    )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--paquetes",
+        type=int,
+        default=100_000,
+        help="Paquetes (y detalles de entrega) a generar",
+    )
+    parser.add_argument(
+        "--clientes",
+        type=int,
+        default=None,
+        help="Clientes; por defecto uno por cada 10 paquetes",
+    )
+    parser.add_argument("--sedes", type=int, default=50, help="Sedes")
+    parser.add_argument(
+        "--empleados",
+        type=int,
+        default=None,
+        help="Empleados; por defecto 20 por sede",
+    )
+    parser.add_argument(
+        "--transportes-por-sede",
+        type=int,
+        default=10,
+        help="Vehículos de cada sede",
+    )
+    parser.add_argument(
+        "--dias",
+        type=int,
+        default=365,
+        help="Días hacia atrás que cubren los envíos",
+    )
+    parser.add_argument(
+        "--sesgo-sedes",
+        type=float,
+        default=1.1,
+        help="Exponente de Zipf de las sedes de origen (0 = uniforme)",
+    )
+    parser.add_argument(
+        "--sesgo-clientes",
+        type=float,
+        default=1.2,
+        help="Exponente de Zipf de los clientes remitentes (0 = uniforme)",
+    )
+    parser.add_argument(
+        "--procesos",
+        type=int,
+        default=os.cpu_count() or 4,
+        help="Procesos que generan y cargan en paralelo",
+    )
+    parser.add_argument(
+        "--filas-por-bloque",
+        type=int,
+        default=FILAS_POR_BLOQUE,
+        help="Filas que carga cada COPY",
+    )
+    parser.add_argument(
+        "--semilla",
+        type=int,
+        default=42,
+        help="Semilla de los generadores aleatorios",
+    )
+    parser.add_argument(
+        "--corrida",
+        type=int,
+        default=None,
+        help="Número de corrida para los valores únicos; por defecto se deriva de la hora",
+    )
+    args = parser.parse_args(argv)
+    args.clientes = args.clientes or max(10, args.paquetes // 10)
+    args.empleados = args.empleados or args.sedes * 20
+    if args.sedes < 2 or args.transportes_por_sede < 1:
+        parser.error("Se necesitan al menos 2 sedes y 1 vehículo por sede")
+
+    create_tables()
+    plan = preparar_plan(args)
+    print(f"Corrida {plan.corrida}: generando con {args.procesos} procesos...")
+
+    """ Cada etapa depende de las claves foráneas de la anterior """
+    transportes = plan.sedes * plan.transportes_por_sede
+    etapas = [
+        [("usuarios", plan.clientes + plan.empleados), ("sedes", plan.sedes)],
+        [
+            ("clientes", plan.clientes),
+            ("empleados", plan.empleados),
+            ("transportes", transportes),
+        ],
+        [("historial_estados_transporte", transportes), ("envios", plan.paquetes)],
+    ]
+
+    engine = get_engine()
+    postgresql = engine.dialect.name == "postgresql"
+    if not postgresql:
+        print("SQLite: los bloques se cargan en este proceso, sin paralelismo")
+    inicio_total = time.perf_counter()
+    filas_total = 0
+    with (
+        Pool(processes=max(1, args.procesos), initializer=_iniciar_proceso)
+        if postgresql
+        else nullcontext()
+    ) as pool:
+        mapear = pool.imap_unordered if pool is not None else map
+        for etapa in etapas:
+            tareas = [
+                tarea
+                for tabla, total in etapa
+                for tarea in _tareas(plan, tabla, total, args.filas_por_bloque)
+            ]
+            inicio = time.perf_counter()
+            filas: Dict[str, int] = {}
+            for tabla, cantidad in mapear(_cargar_bloque, tareas):
+                filas[tabla] = filas.get(tabla, 0) + cantidad
+            duracion = time.perf_counter() - inicio
+            filas_total += sum(filas.values())
+            detalle = ", ".join(f"{tabla}: {cantidad:,}" for tabla, cantidad in filas.items())
+            print(f"  {detalle} en {duracion:.1f}s")
+
+    with engine.connect() as conexion:
+        if postgresql:
+            conexion.exec_driver_sql(
+                "ANALYZE usuarios, sedes, clientes, empleados, transportes, "
+                "historial_estados_transporte, paquetes, detalles_entrega"
+            )
+        else:
+            conexion.exec_driver_sql("ANALYZE")
+        conexion.commit()
+
+    duracion = time.perf_counter() - inicio_total
+    print(
+        f"{filas_total:,} filas cargadas en {duracion:.1f}s "
+        f"({filas_total / duracion:,.0f} filas/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
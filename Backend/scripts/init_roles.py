@@ -7,7 +7,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.declarative import declarative_base
-from database.config import SessionLocal, engine, create_tables
+from database.config import SessionLocal, create_tables
 from entities.rol import Rol
 
 
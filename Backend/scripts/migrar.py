@@ -0,0 +1,197 @@
+"""
+Aplica el esquema de la base de datos.
+
+Crea la extensión uuid-ossp (en PostgreSQL) y las tablas que falten con
+`Base.metadata.create_all`, que es la herramienta de esquema del proyecto. La
+API ya no lo hace al arrancar para que cada worker quede listo sin recorrer el
+metadata ni ejecutar DDL: este script se corre una vez antes de iniciar la
+API, en cada despliegue que agregue modelos.
+
+create_all no altera tablas existentes, así que el script completa las bases
+creadas con versiones anteriores de los modelos:
+- agrega las columnas nulables que falten (con su llave foránea y unicidad),
+- crea los índices de los modelos que falten,
+- abre el historial de estados de los vehículos que no tienen ninguno.
+
+Las columnas obligatorias sin valor por defecto no se pueden agregar a una
+tabla con filas: se listan al final y el script sale con código 1.
+
+Uso:
+    python scripts/migrar.py
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import Column, Table, inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateColumn
+
+from database.config import Base, create_tables, get_engine
+
+
+def columnas_faltantes(engine: Optional[Engine] = None) -> List[Tuple[Table, Column]]:
+    """
+    Columnas definidas en los modelos que no existen en la base de datos.
+
+    Args:
+        engine: Engine a revisar (por defecto el de la aplicación)
+
+    Returns:
+        List[Tuple[Table, Column]]: Pares (tabla, columna)
+    """
+    inspector = inspect(engine or get_engine())
+    tablas = set(inspector.get_table_names())
+    faltantes = []
+    for tabla in Base.metadata.sorted_tables:
+        if tabla.name not in tablas:
+            continue
+        existentes = {columna["name"] for columna in inspector.get_columns(tabla.name)}
+        faltantes.extend(
+            (tabla, columna) for columna in tabla.columns if columna.name not in existentes
+        )
+    return faltantes
+
+
+def _sentencias_columna(engine: Engine, tabla: Table, columna: Column) -> List[str]:
+    """
+    DDL para agregar una columna nulable a una tabla existente.
+
+    La llave foránea va en la misma sentencia (SQLite no admite agregarla
+    después) y la unicidad se crea como índice único.
+    """
+    preparador = engine.dialect.identifier_preparer
+    nombre_tabla = preparador.format_table(tabla)
+    definicion = str(CreateColumn(columna).compile(dialect=engine.dialect))
+    for llave in columna.foreign_keys:
+        destino = llave.column
+        definicion += (
+            f" REFERENCES {preparador.format_table(destino.table)}"
+            f" ({preparador.format_column(destino)})"
+        )
+
+    sentencias = [f"ALTER TABLE {nombre_tabla} ADD COLUMN {definicion}"]
+    if columna.unique:
+        indice = preparador.quote(f"uq_{tabla.name}_{columna.name}")
+        sentencias.append(
+            f"CREATE UNIQUE INDEX {indice} ON {nombre_tabla} ({preparador.format_column(columna)})"
+        )
+    return sentencias
+
+
+def agregar_columnas(
+    faltantes: List[Tuple[Table, Column]], engine: Optional[Engine] = None
+) -> List[Tuple[Table, Column]]:
+    """
+    Agrega a las tablas existentes las columnas nulables que les falten.
+
+    Args:
+        faltantes: Columnas que faltan, como las devuelve columnas_faltantes
+        engine: Engine sobre el que se aplica (por defecto el de la aplicación)
+
+    Returns:
+        List[Tuple[Table, Column]]: Columnas obligatorias que no se agregaron
+    """
+    engine = engine or get_engine()
+    pendientes = []
+    with engine.begin() as conn:
+        for tabla, columna in faltantes:
+            if not columna.nullable and columna.server_default is None:
+                pendientes.append((tabla, columna))
+                continue
+            for sentencia in _sentencias_columna(engine, tabla, columna):
+                conn.execute(text(sentencia))
+            print(f"  + {tabla.name}.{columna.name}")
+    return pendientes
+
+
+def crear_indices(engine: Optional[Engine] = None) -> None:
+    """
+    Crea los índices de los modelos que no existan en la base de datos.
+
+    Args:
+        engine: Engine sobre el que se aplica (por defecto el de la aplicación)
+    """
+    engine = engine or get_engine()
+    for tabla in Base.metadata.sorted_tables:
+        for indice in tabla.indexes:
+            indice.create(bind=engine, checkfirst=True)
+
+
+def completar_historial_transportes(engine: Optional[Engine] = None) -> int:
+    """
+    Abre un intervalo con el estado actual de los vehículos sin historial.
+
+    Args:
+        engine: Engine sobre el que se aplica (por defecto el de la aplicación)
+
+    Returns:
+        int: Número de vehículos a los que se les abrió el historial
+    """
+    from entities.historial_estado_transporte import HistorialEstadoTransporte
+    from entities.transporte import Transporte
+
+    engine = engine or get_engine()
+    historial = HistorialEstadoTransporte.__table__
+    transportes = Transporte.__table__
+    sin_historial = select(
+        transportes.c.id_transporte,
+        transportes.c.estado,
+        transportes.c.fecha_actualizacion,
+        transportes.c.fecha_creacion,
+    ).where(
+        ~select(historial.c.id_historial)
+        .where(historial.c.id_transporte == transportes.c.id_transporte)
+        .exists()
+    )
+
+    with engine.begin() as conn:
+        filas = [
+            {
+                "id_historial": uuid.uuid4(),
+                "id_transporte": fila.id_transporte,
+                "estado": fila.estado,
+                "desde": fila.fecha_actualizacion or fila.fecha_creacion or datetime.now(),
+            }
+            for fila in conn.execute(sin_historial)
+        ]
+        if filas:
+            conn.execute(historial.insert(), filas)
+    return len(filas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.parse_args()
+
+    inicio = time.perf_counter()
+    create_tables()
+
+    faltantes = columnas_faltantes()
+    if faltantes:
+        print("Columnas agregadas a tablas existentes:")
+    pendientes = agregar_columnas(faltantes)
+    crear_indices()
+    abiertos = completar_historial_transportes()
+    if abiertos:
+        print(f"Historial de estados abierto para {abiertos} vehículos")
+
+    duracion = time.perf_counter() - inicio
+    print(f"Esquema aplicado en {get_engine().dialect.name} en {duracion:.2f}s")
+
+    if pendientes:
+        print("\nColumnas obligatorias sin valor por defecto (agregar a mano):")
+        for tabla, columna in pendientes:
+            print(f"  {tabla.name}.{columna.name}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
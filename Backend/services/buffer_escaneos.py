@@ -0,0 +1,350 @@
+"""
+Buffer en memoria para la ingesta de escaneos de paquetes.
+
+Los escáneres de las sedes publican lecturas a gran velocidad; en lugar de
+abrir una transacción por escaneo, el endpoint solo encola la lectura y un
+hilo en segundo plano la escribe en micro-lotes (por tamaño o por tiempo).
+Cada lote cuesta un INSERT múltiple en 'escaneos' y un UPDATE por tabla
+('paquetes' y 'detalles_entrega'), sin importar cuántos escaneos contenga.
+"""
+
+import os
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from cruds.transporte_crud import TransporteCRUD
+from database.config import SessionLocal
+from entities.detalle_entrega import DetalleEntrega
+from entities.escaneo import Escaneo
+from entities.paquete import Paquete
+from entities.sede import Sede
+from services.reportes import limpiar_cache_flota
+
+ESTADO_ENVIO_POR_ESTADO_PAQUETE = {
+    "registrado": "Pendiente",
+    "en_transito": "En transito",
+    "en_reparto": "En transito",
+    "entregado": "Entregado",
+}
+
+
+class BufferLlenoError(Exception):
+    """El buffer alcanzó su capacidad máxima y no acepta más escaneos."""
+
+
+class BufferEscaneos:
+    """Cola en memoria que agrupa escaneos y los escribe en micro-lotes."""
+
+    def __init__(
+        self,
+        tamaño_lote: int = 500,
+        intervalo_segundos: float = 0.5,
+        capacidad_maxima: int = 100000,
+        max_reintentos: int = 20,
+    ):
+        """
+        Inicializa el buffer.
+
+        Args:
+            tamaño_lote: Número de escaneos que dispara una escritura inmediata
+            intervalo_segundos: Tiempo máximo que un escaneo espera en memoria
+            capacidad_maxima: Escaneos pendientes a partir de los cuales se rechazan nuevos
+            max_reintentos: Veces que se reencola un lote que falló por un error
+                distinto de una referencia inválida antes de descartarlo
+        """
+        self.tamaño_lote = max(1, tamaño_lote)
+        self.intervalo_segundos = max(0.01, intervalo_segundos)
+        self.capacidad_maxima = max(self.tamaño_lote, capacidad_maxima)
+        self.max_reintentos = max(0, max_reintentos)
+        self._pendientes: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._lock_escritura = threading.Lock()
+        self._evento_lote = threading.Event()
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+        self.escaneos_escritos = 0
+        self.escaneos_descartados = 0
+        self.lotes_escritos = 0
+        self.lotes_reintentados = 0
+
+    def agregar(self, escaneos: List[Dict[str, Any]]) -> int:
+        """
+        Encola escaneos para su escritura diferida.
+
+        Args:
+            escaneos: Diccionarios con id_paquete, id_sede, fecha_escaneo y estado
+
+        Returns:
+            int: Número de escaneos pendientes en el buffer tras encolar
+
+        Raises:
+            BufferLlenoError: Si el buffer no tiene espacio suficiente
+        """
+        with self._lock:
+            if len(self._pendientes) + len(escaneos) > self.capacidad_maxima:
+                raise BufferLlenoError(
+                    "El buffer de escaneos está lleno, intente nuevamente en unos segundos"
+                )
+            self._pendientes.extend(escaneos)
+            pendientes = len(self._pendientes)
+
+        if pendientes >= self.tamaño_lote:
+            self._evento_lote.set()
+        return pendientes
+
+    def pendientes(self) -> int:
+        """Devuelve el número de escaneos que aún no se han escrito."""
+        with self._lock:
+            return len(self._pendientes)
+
+    def iniciar(self) -> None:
+        """Inicia el hilo de escritura en segundo plano."""
+        if self._hilo and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(
+            target=self._ejecutar, name="buffer-escaneos", daemon=True
+        )
+        self._hilo.start()
+
+    def detener(self) -> None:
+        """Detiene el hilo de escritura y vacía lo que quede en el buffer."""
+        self._detener.set()
+        self._evento_lote.set()
+        if self._hilo:
+            self._hilo.join(timeout=10)
+            self._hilo = None
+        self.vaciar()
+
+    def _ejecutar(self) -> None:
+        """Bucle del hilo: escribe cuando se llena un lote o vence el intervalo."""
+        while not self._detener.is_set():
+            self._evento_lote.wait(self.intervalo_segundos)
+            self._evento_lote.clear()
+            try:
+                self.vaciar()
+            except Exception as e:
+                print(f"Error al vaciar el buffer de escaneos: {e}")
+
+    def vaciar(self) -> int:
+        """
+        Escribe en la base de datos todos los escaneos pendientes.
+
+        Returns:
+            int: Número de escaneos escritos
+        """
+        with self._lock_escritura:
+            with self._lock:
+                lote_completo = self._pendientes
+                self._pendientes = []
+
+            if not lote_completo:
+                return 0
+
+            escritos = 0
+            db = SessionLocal()
+            try:
+                for inicio in range(0, len(lote_completo), self.tamaño_lote):
+                    lote = lote_completo[inicio : inicio + self.tamaño_lote]
+                    escritos += self._escribir_lote_seguro(db, lote)
+            finally:
+                db.close()
+            return escritos
+
+    def _escribir_lote_seguro(self, db: Session, lote: List[Dict[str, Any]]) -> int:
+        """
+        Escribe un lote. Si falla por referencias inválidas las descarta y
+        reintenta; si falla por otro motivo (p. ej. la base de datos no
+        responde) lo vuelve a encolar para el siguiente ciclo.
+        """
+        try:
+            self._escribir_lote(db, lote)
+            return len(lote)
+        except IntegrityError:
+            db.rollback()
+            validos = self._filtrar_referencias_validas(db, lote)
+            self.escaneos_descartados += len(lote) - len(validos)
+            if not validos:
+                return 0
+            try:
+                self._escribir_lote(db, validos)
+                return len(validos)
+            except Exception as e:
+                db.rollback()
+                print(f"Error al escribir lote de escaneos: {e}")
+                self._reencolar(validos)
+                return 0
+        except Exception as e:
+            db.rollback()
+            print(f"Error al escribir lote de escaneos: {e}")
+            self._reencolar(lote)
+            return 0
+
+    def _reencolar(self, lote: List[Dict[str, Any]]) -> None:
+        """Devuelve un lote al inicio del buffer; tras max_reintentos se descarta."""
+        reintentables = []
+        for escaneo in lote:
+            intentos = escaneo.get("_intentos", 0) + 1
+            if intentos > self.max_reintentos:
+                self.escaneos_descartados += 1
+                continue
+            reintentables.append({**escaneo, "_intentos": intentos})
+        if not reintentables:
+            return
+        with self._lock:
+            self._pendientes[:0] = reintentables
+        self.lotes_reintentados += 1
+
+    def _escribir_lote(self, db: Session, lote: List[Dict[str, Any]]) -> None:
+        """
+        Inserta el historial y actualiza los estados con una sentencia por tabla.
+
+        Args:
+            db: Sesión de base de datos
+            lote: Escaneos a escribir
+        """
+        ahora = datetime.now()
+        filas = [
+            {
+                "id_escaneo": uuid.uuid4(),
+                "id_paquete": escaneo["id_paquete"],
+                "id_sede": escaneo["id_sede"],
+                "estado": escaneo.get("estado"),
+                "fecha_escaneo": escaneo.get("fecha_escaneo") or ahora,
+                "fecha_creacion": ahora,
+            }
+            for escaneo in lote
+        ]
+        db.execute(insert(Escaneo), filas)
+
+        """ Solo el escaneo más reciente de cada paquete define su estado """
+        liberados = 0
+        ultimos: Dict[Any, Dict[str, Any]] = {}
+        for fila in filas:
+            if not fila["estado"]:
+                continue
+            previo = ultimos.get(fila["id_paquete"])
+            if previo is None or fila["fecha_escaneo"] >= previo["fecha_escaneo"]:
+                ultimos[fila["id_paquete"]] = fila
+
+        if ultimos:
+            """ Cada WHEN compara con la columna para que el id pase por su tipo (GUID) """
+            estados_paquete = {
+                id_paquete: fila["estado"] for id_paquete, fila in ultimos.items()
+            }
+            db.execute(
+                update(Paquete)
+                .where(Paquete.id_paquete.in_(list(estados_paquete)))
+                .values(
+                    estado=case(
+                        *[
+                            (Paquete.id_paquete == id_paquete, estado)
+                            for id_paquete, estado in estados_paquete.items()
+                        ]
+                    ),
+                    fecha_actualizacion=ahora,
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+            estados_envio = {
+                id_paquete: ESTADO_ENVIO_POR_ESTADO_PAQUETE[fila["estado"]]
+                for id_paquete, fila in ultimos.items()
+                if fila["estado"] in ESTADO_ENVIO_POR_ESTADO_PAQUETE
+            }
+            if estados_envio:
+                entregas = {
+                    id_paquete: ultimos[id_paquete]["fecha_escaneo"]
+                    for id_paquete, estado in estados_envio.items()
+                    if estado == "Entregado"
+                }
+                valores = {
+                    "estado_envio": case(
+                        *[
+                            (DetalleEntrega.id_paquete == id_paquete, estado)
+                            for id_paquete, estado in estados_envio.items()
+                        ]
+                    ),
+                    "fecha_actualizacion": ahora,
+                }
+                if entregas:
+                    valores["fecha_entrega"] = func.coalesce(
+                        DetalleEntrega.fecha_entrega,
+                        case(
+                            *[
+                                (DetalleEntrega.id_paquete == id_paquete, fecha)
+                                for id_paquete, fecha in entregas.items()
+                            ]
+                        ),
+                    )
+                db.execute(
+                    update(DetalleEntrega)
+                    .where(
+                        DetalleEntrega.id_paquete.in_(list(estados_envio)),
+                        DetalleEntrega.activo == True,
+                    )
+                    .values(**valores)
+                    .execution_options(synchronize_session=False)
+                )
+
+                if entregas:
+                    """ Los vehículos cuyo último envío en tránsito se entregó quedan disponibles """
+                    vehiculos = db.execute(
+                        select(DetalleEntrega.id_transporte)
+                        .where(DetalleEntrega.id_paquete.in_(list(entregas)))
+                        .distinct()
+                    ).scalars()
+                    liberados = TransporteCRUD(db).liberar_sin_envios(vehiculos, fecha=ahora)
+
+        db.commit()
+        if liberados:
+            limpiar_cache_flota()
+        self.escaneos_escritos += len(filas)
+        self.lotes_escritos += 1
+
+    def _filtrar_referencias_validas(
+        self, db: Session, lote: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Descarta los escaneos cuyo paquete o sede no existen."""
+        ids_paquete = {escaneo["id_paquete"] for escaneo in lote}
+        ids_sede = {escaneo["id_sede"] for escaneo in lote}
+        paquetes_validos = set(
+            db.execute(
+                select(Paquete.id_paquete).where(Paquete.id_paquete.in_(ids_paquete))
+            ).scalars()
+        )
+        sedes_validas = set(
+            db.execute(select(Sede.id_sede).where(Sede.id_sede.in_(ids_sede))).scalars()
+        )
+        return [
+            escaneo
+            for escaneo in lote
+            if escaneo["id_paquete"] in paquetes_validos
+            and escaneo["id_sede"] in sedes_validas
+        ]
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Devuelve contadores del buffer para monitoreo."""
+        return {
+            "pendientes": self.pendientes(),
+            "escaneos_escritos": self.escaneos_escritos,
+            "escaneos_descartados": self.escaneos_descartados,
+            "lotes_escritos": self.lotes_escritos,
+            "lotes_reintentados": self.lotes_reintentados,
+            "tamaño_lote": self.tamaño_lote,
+            "intervalo_segundos": self.intervalo_segundos,
+        }
+
+
+buffer_escaneos = BufferEscaneos(
+    tamaño_lote=int(os.getenv("ESCANEOS_TAMANO_LOTE", "500")),
+    intervalo_segundos=float(os.getenv("ESCANEOS_INTERVALO_SEGUNDOS", "0.5")),
+    capacidad_maxima=int(os.getenv("ESCANEOS_CAPACIDAD_MAXIMA", "100000")),
+    max_reintentos=int(os.getenv("ESCANEOS_MAX_REINTENTOS", "20")),
+)
@@ -0,0 +1,216 @@
+"""
+Enrutador de la red de sedes.
+
+Las sedes activas son los nodos del grafo y los tramos configurados en
+`rutas_sede` son las aristas, con la distancia real como peso. Al cargar la
+red se ejecuta Dijkstra desde cada sede y se guardan dos matrices planas
+(distancia y siguiente salto), de modo que la distancia entre dos sedes se
+consulta en O(1) y la ruta completa se reconstruye siguiendo los saltos.
+
+Igual que el índice de sedes, la red se recarga de forma perezosa después de
+`invalidar()`, y los cambios de sedes o tramos hechos desde otro worker se
+detectan con la versión de ambas tablas en `services.vigilante_caches`.
+"""
+
+import heapq
+import math
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from database.config import SessionLocal
+from services.indice_sedes import version_sedes
+
+""" (id_sede_origen, id_sede_destino, distancia_km, bidireccional) """
+Tramo = Tuple[UUID, UUID, float, bool]
+
+
+@dataclass(frozen=True)
+class RutaCalculada:
+    """Camino más corto entre dos sedes por la red de tramos."""
+
+    sedes: Tuple[UUID, ...]
+    distancia_km: float
+
+    @property
+    def transbordos(self) -> int:
+        """Número de sedes intermedias donde el paquete cambia de vehículo."""
+        return max(0, len(self.sedes) - 2)
+
+
+class EnrutadorSedes:
+    """Caminos más cortos entre todas las sedes, seguro para varios hilos."""
+
+    def __init__(self):
+        """ (ids, indices, distancias, siguiente) se reemplazan juntos en una sola asignación """
+        self._red: Tuple[List[UUID], Dict[UUID, int], array, array] = (
+            [],
+            {},
+            array("d"),
+            array("i"),
+        )
+        self._vigente = False
+        self._lock = threading.Lock()
+
+    def invalidar(self) -> None:
+        """Marca la red como desactualizada; se recarga en la próxima consulta."""
+        self._vigente = False
+
+    def construir(self, sedes: Sequence[UUID], tramos: Sequence[Tramo]) -> None:
+        """
+        Calcula los caminos más cortos entre todas las sedes.
+
+        Args:
+            sedes: IDs de las sedes de la red
+            tramos: Tramos entre sedes; los que tocan sedes desconocidas se ignoran
+        """
+        ids = list(sedes)
+        indices = {id_sede: i for i, id_sede in enumerate(ids)}
+        n = len(ids)
+
+        adyacencia: List[List[Tuple[int, float]]] = [[] for _ in range(n)]
+        for origen, destino, distancia, bidireccional in tramos:
+            if origen not in indices or destino not in indices:
+                continue
+            u, v = indices[origen], indices[destino]
+            adyacencia[u].append((v, distancia))
+            if bidireccional:
+                adyacencia[v].append((u, distancia))
+
+        distancias = array("d", [math.inf]) * (n * n)
+        siguiente = array("i", [-1]) * (n * n)
+        for fuente in range(n):
+            base = fuente * n
+            distancias[base + fuente] = 0.0
+            siguiente[base + fuente] = fuente
+            """ primer_salto[v]: primer nodo después de la fuente en el camino hacia v """
+            primer_salto = [-1] * n
+            pendientes = [(0.0, fuente)]
+            while pendientes:
+                distancia_u, u = heapq.heappop(pendientes)
+                if distancia_u > distancias[base + u]:
+                    continue
+                for v, peso in adyacencia[u]:
+                    candidata = distancia_u + peso
+                    if candidata < distancias[base + v]:
+                        distancias[base + v] = candidata
+                        primer_salto[v] = v if u == fuente else primer_salto[u]
+                        heapq.heappush(pendientes, (candidata, v))
+            for destino in range(n):
+                if primer_salto[destino] >= 0:
+                    siguiente[base + destino] = primer_salto[destino]
+
+        self._red = (ids, indices, distancias, siguiente)
+
+    def cargar(self) -> int:
+        """
+        Reconstruye la red con las sedes y tramos activos.
+
+        Returns:
+            int: Número de sedes en la red
+        """
+        from entities.ruta_sede import RutaSede
+        from entities.sede import Sede
+
+        db = SessionLocal()
+        try:
+            sedes = [
+                fila.id_sede
+                for fila in db.query(Sede.id_sede).filter(Sede.activo == True).all()
+            ]
+            tramos = [
+                (
+                    fila.id_sede_origen,
+                    fila.id_sede_destino,
+                    fila.distancia_km,
+                    fila.bidireccional,
+                )
+                for fila in db.query(
+                    RutaSede.id_sede_origen,
+                    RutaSede.id_sede_destino,
+                    RutaSede.distancia_km,
+                    RutaSede.bidireccional,
+                )
+                .filter(RutaSede.activo == True)
+                .all()
+            ]
+        finally:
+            db.close()
+
+        self.construir(sedes, tramos)
+        return len(sedes)
+
+    def _asegurar_vigente(self) -> None:
+        if self._vigente:
+            return
+        with self._lock:
+            if not self._vigente:
+                """ Se marca antes de cargar para no perder una invalidación concurrente """
+                self._vigente = True
+                try:
+                    self.cargar()
+                except Exception:
+                    self._vigente = False
+                    raise
+
+    def distancia(self, origen: UUID, destino: UUID) -> Optional[float]:
+        """
+        Distancia por la red entre dos sedes en O(1).
+
+        Returns:
+            La distancia en kilómetros o None si no hay camino
+        """
+        self._asegurar_vigente()
+        ids, indices, distancias, _ = self._red
+        if origen not in indices or destino not in indices:
+            return None
+        valor = distancias[indices[origen] * len(ids) + indices[destino]]
+        return None if math.isinf(valor) else valor
+
+    def ruta(self, origen: UUID, destino: UUID) -> Optional[RutaCalculada]:
+        """
+        Camino más corto entre dos sedes.
+
+        Args:
+            origen: ID de la sede de origen
+            destino: ID de la sede de destino
+
+        Returns:
+            RutaCalculada o None si las sedes no están conectadas por tramos
+        """
+        self._asegurar_vigente()
+        ids, indices, distancias, siguiente = self._red
+        if origen not in indices or destino not in indices:
+            return None
+
+        n = len(ids)
+        actual, final = indices[origen], indices[destino]
+        distancia = distancias[actual * n + final]
+        if math.isinf(distancia):
+            return None
+
+        camino = [ids[actual]]
+        while actual != final:
+            actual = siguiente[actual * n + final]
+            camino.append(ids[actual])
+        return RutaCalculada(sedes=tuple(camino), distancia_km=distancia)
+
+
+enrutador_sedes = EnrutadorSedes()
+
+
+def version_red(db: Session) -> Tuple[Any, ...]:
+    """Cambia cuando cambia una sede o se crea, modifica o elimina un tramo."""
+    from entities.ruta_sede import RutaSede
+
+    tramos = db.query(
+        func.count(RutaSede.id_ruta),
+        func.max(RutaSede.fecha_creacion),
+        func.max(RutaSede.fecha_actualizacion),
+    ).one()
+    return version_sedes(db) + tuple(tramos)
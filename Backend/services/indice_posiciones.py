@@ -0,0 +1,136 @@
+"""
+Índice en memoria con la última posición conocida de cada vehículo.
+
+Las consultas de posición actual y de vehículos cercanos a una sede se
+responden desde este índice, sin leer el historial de telemetría.
+"""
+
+import math
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from database.config import SessionLocal
+
+RADIO_TIERRA_KM = 6371.0
+
+
+@dataclass(frozen=True)
+class PosicionActual:
+    """Última posición reportada por un vehículo."""
+
+    id_transporte: UUID
+    latitud: float
+    longitud: float
+    fecha_registro: datetime
+    velocidad_kmh: Optional[float] = None
+
+
+def distancia_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distancia de Haversine entre dos puntos en kilómetros."""
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    dlat = lat2_rad - lat1_rad
+    dlon = math.radians(lon2 - lon1)
+    a = (
+        math.sin(dlat / 2) ** 2
+        + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2) ** 2
+    )
+    return 2 * RADIO_TIERRA_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class IndicePosiciones:
+    """Mapa id_transporte -> última posición, seguro para varios hilos."""
+
+    def __init__(self):
+        self._posiciones: Dict[UUID, PosicionActual] = {}
+        self._lock = threading.Lock()
+
+    def actualizar(self, posicion: PosicionActual) -> None:
+        """Guarda la posición si es más reciente que la que ya existe."""
+        with self._lock:
+            actual = self._posiciones.get(posicion.id_transporte)
+            if actual is None or posicion.fecha_registro >= actual.fecha_registro:
+                self._posiciones[posicion.id_transporte] = posicion
+
+    def obtener(self, id_transporte: UUID) -> Optional[PosicionActual]:
+        """Obtiene la última posición de un vehículo."""
+        return self._posiciones.get(id_transporte)
+
+    def obtener_todas(self) -> List[PosicionActual]:
+        """Obtiene la última posición de todos los vehículos conocidos."""
+        with self._lock:
+            return list(self._posiciones.values())
+
+    def cercanos(
+        self, latitud: float, longitud: float, radio_km: float, limite: int = 50
+    ) -> List[Tuple[PosicionActual, float]]:
+        """
+        Busca los vehículos dentro de un radio alrededor de un punto.
+
+        Args:
+            latitud: Latitud del punto de referencia
+            longitud: Longitud del punto de referencia
+            radio_km: Radio de búsqueda en kilómetros
+            limite: Número máximo de vehículos a devolver
+
+        Returns:
+            Lista de (posición, distancia_km) ordenada por distancia
+        """
+        """ Filtro rápido por caja de coordenadas antes de calcular distancias """
+        delta_lat = math.degrees(radio_km / RADIO_TIERRA_KM)
+        cos_lat = max(0.01, math.cos(math.radians(latitud)))
+        delta_lon = min(180.0, delta_lat / cos_lat)
+
+        resultados = []
+        for posicion in self.obtener_todas():
+            if abs(posicion.latitud - latitud) > delta_lat:
+                continue
+            diferencia_lon = abs(posicion.longitud - longitud)
+            if min(diferencia_lon, 360 - diferencia_lon) > delta_lon:
+                continue
+            distancia = distancia_km(
+                latitud, longitud, posicion.latitud, posicion.longitud
+            )
+            if distancia <= radio_km:
+                resultados.append((posicion, distancia))
+
+        resultados.sort(key=lambda item: item[1])
+        return resultados[:limite]
+
+    def cargar(self, dias: int = 2) -> int:
+        """
+        Reconstruye el índice a partir de la base de datos (una sola consulta).
+
+        Args:
+            dias: Antigüedad máxima de las posiciones a cargar
+
+        Returns:
+            int: Número de vehículos cargados
+        """
+        from cruds.posicion_transporte_crud import PosicionTransporteCRUD
+
+        db = SessionLocal()
+        try:
+            ultimas = PosicionTransporteCRUD(db).obtener_ultimas_posiciones(dias=dias)
+        finally:
+            db.close()
+
+        posiciones = {
+            fila.id_transporte: PosicionActual(
+                id_transporte=fila.id_transporte,
+                latitud=fila.latitud,
+                longitud=fila.longitud,
+                fecha_registro=fila.fecha_registro,
+                velocidad_kmh=fila.velocidad_kmh,
+            )
+            for fila in ultimas
+        }
+        with self._lock:
+            self._posiciones = posiciones
+        return len(posiciones)
+
+
+indice_posiciones = IndicePosiciones()
@@ -0,0 +1,215 @@
+"""
+Índice espacial en memoria de las sedes activas.
+
+Las coordenadas se convierten a puntos 3-D sobre la esfera unitaria y se
+guardan en un árbol k-d. La distancia euclidiana (cuerda) entre dos puntos
+crece igual que la distancia sobre la superficie, así que la búsqueda de los
+k vecinos más cercanos no necesita calcular haversine por cada sede.
+
+El índice se reconstruye de forma perezosa: las operaciones que cambian una
+sede llaman a `invalidar()` y la siguiente consulta lo vuelve a cargar. Los
+cambios hechos desde otro worker se detectan con la versión de la tabla
+'sedes', que revisa periódicamente `services.vigilante_caches`.
+"""
+
+import heapq
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from database.config import SessionLocal
+from services.indice_posiciones import RADIO_TIERRA_KM
+
+Punto = Tuple[float, float, float]
+
+
+@dataclass(frozen=True)
+class SedeIndexada:
+    """Datos de una sede guardados en el índice."""
+
+    id_sede: UUID
+    nombre: str
+    ciudad: str
+    direccion: str
+    latitud: float
+    longitud: float
+
+
+@dataclass
+class _Nodo:
+    punto: Punto
+    sede: SedeIndexada
+    eje: int
+    izquierdo: Optional["_Nodo"] = None
+    derecho: Optional["_Nodo"] = None
+
+
+def a_esfera_unitaria(latitud: float, longitud: float) -> Punto:
+    """Convierte latitud/longitud en grados a un punto sobre la esfera unitaria."""
+    lat = math.radians(latitud)
+    lon = math.radians(longitud)
+    cos_lat = math.cos(lat)
+    return (cos_lat * math.cos(lon), cos_lat * math.sin(lon), math.sin(lat))
+
+
+def cuerda_a_km(cuerda: float) -> float:
+    """Convierte la longitud de una cuerda de la esfera unitaria a kilómetros."""
+    return 2 * RADIO_TIERRA_KM * math.asin(min(1.0, cuerda / 2))
+
+
+def _construir(elementos: List[Tuple[Punto, SedeIndexada]]) -> Optional[_Nodo]:
+    """Construye el árbol dividiendo por la mediana del eje de mayor dispersión."""
+    if not elementos:
+        return None
+    eje = max(
+        range(3),
+        key=lambda e: max(p[e] for p, _ in elementos) - min(p[e] for p, _ in elementos),
+    )
+    elementos.sort(key=lambda elemento: elemento[0][eje])
+    medio = len(elementos) // 2
+    punto, sede = elementos[medio]
+    return _Nodo(
+        punto=punto,
+        sede=sede,
+        eje=eje,
+        izquierdo=_construir(elementos[:medio]),
+        derecho=_construir(elementos[medio + 1 :]),
+    )
+
+
+def _distancia2(a: Punto, b: Punto) -> float:
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2
+
+
+class IndiceSedes:
+    """Árbol k-d de las sedes activas con coordenadas, seguro para varios hilos."""
+
+    def __init__(self):
+        self._raiz: Optional[_Nodo] = None
+        self._total = 0
+        self._vigente = False
+        self._lock = threading.Lock()
+
+    def invalidar(self) -> None:
+        """Marca el índice como desactualizado; se recarga en la próxima consulta."""
+        self._vigente = False
+
+    def construir(self, sedes: Sequence[SedeIndexada]) -> None:
+        """Reemplaza el contenido del índice con las sedes recibidas."""
+        raiz = _construir(
+            [(a_esfera_unitaria(s.latitud, s.longitud), s) for s in sedes]
+        )
+        self._raiz, self._total = raiz, len(sedes)
+
+    def cargar(self) -> int:
+        """
+        Reconstruye el índice con las sedes activas que tienen coordenadas.
+
+        Returns:
+            int: Número de sedes indexadas
+        """
+        from entities.sede import Sede
+
+        db = SessionLocal()
+        try:
+            filas = (
+                db.query(
+                    Sede.id_sede,
+                    Sede.nombre,
+                    Sede.ciudad,
+                    Sede.direccion,
+                    Sede.latitud,
+                    Sede.longitud,
+                )
+                .filter(
+                    Sede.activo == True,
+                    Sede.latitud.isnot(None),
+                    Sede.longitud.isnot(None),
+                )
+                .all()
+            )
+        finally:
+            db.close()
+
+        self.construir([SedeIndexada(*fila) for fila in filas])
+        return self._total
+
+    def _asegurar_vigente(self) -> None:
+        if self._vigente:
+            return
+        with self._lock:
+            if not self._vigente:
+                """ Se marca antes de cargar para no perder una invalidación concurrente """
+                self._vigente = True
+                try:
+                    self.cargar()
+                except Exception:
+                    self._vigente = False
+                    raise
+
+    def cercanas(
+        self, latitud: float, longitud: float, k: int = 5
+    ) -> List[Tuple[SedeIndexada, float]]:
+        """
+        Busca las k sedes más cercanas a un punto.
+
+        Args:
+            latitud: Latitud del punto de referencia
+            longitud: Longitud del punto de referencia
+            k: Número de sedes a devolver
+
+        Returns:
+            Lista de (sede, distancia_km) ordenada por distancia
+        """
+        self._asegurar_vigente()
+        raiz = self._raiz
+        if raiz is None or k <= 0:
+            return []
+
+        objetivo = a_esfera_unitaria(latitud, longitud)
+        """ Montículo de máximos (distancias negadas) con los k mejores candidatos """
+        mejores: List[Tuple[float, int, SedeIndexada]] = []
+        """ Pila de (nodo, cota inferior de la distancia² a cualquier punto del subárbol) """
+        pendientes: List[Tuple[_Nodo, float]] = [(raiz, 0.0)]
+        while pendientes:
+            nodo, cota = pendientes.pop()
+            if len(mejores) == k and cota >= -mejores[0][0]:
+                continue
+
+            d2 = _distancia2(objetivo, nodo.punto)
+            if len(mejores) < k:
+                heapq.heappush(mejores, (-d2, id(nodo), nodo.sede))
+            elif d2 < -mejores[0][0]:
+                heapq.heapreplace(mejores, (-d2, id(nodo), nodo.sede))
+
+            diferencia = objetivo[nodo.eje] - nodo.punto[nodo.eje]
+            cercano, lejano = (
+                (nodo.izquierdo, nodo.derecho)
+                if diferencia < 0
+                else (nodo.derecho, nodo.izquierdo)
+            )
+            """ El lado cercano se apila al final para visitarlo primero """
+            if lejano is not None:
+                pendientes.append((lejano, max(cota, diferencia * diferencia)))
+            if cercano is not None:
+                pendientes.append((cercano, cota))
+
+        return [
+            (sede, cuerda_a_km(math.sqrt(-d2)))
+            for d2, _, sede in sorted(mejores, key=lambda item: -item[0])
+        ]
+
+
+indice_sedes = IndiceSedes()
+
+
+def version_sedes(db: Session) -> Tuple[Any, ...]:
+    """Cambia cuando se crea, modifica o elimina una sede."""
+    from entities.sede import Sede
+
+    return tuple(db.query(func.count(Sede.id_sede), func.max(Sede.fecha_actualizacion)).one())
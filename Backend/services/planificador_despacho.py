@@ -0,0 +1,143 @@
+"""
+Planificador de despacho: asigna paquetes pendientes a vehículos disponibles.
+
+Usa la heurística first-fit decreasing: los paquetes se ordenan de mayor a
+menor carga y cada uno va al primer vehículo (ordenado por capacidad) donde
+todavía cabe. La búsqueda del primer vehículo con espacio se hace con un
+árbol de segmentos de máximos, así cada paquete cuesta O(log V) en lugar de
+recorrer todos los vehículos.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+""" Peso volumétrico mínimo (kg) que ocupa un paquete según su tamaño """
+PESO_VOLUMETRICO_TAMAÑO = {
+    "pequeño": 1.0,
+    "mediano": 5.0,
+    "grande": 15.0,
+    "gigante": 30.0,
+}
+
+
+@dataclass
+class AsignacionVehiculo:
+    """Paquetes asignados a un vehículo dentro de un plan."""
+
+    id_transporte: UUID
+    placa: str
+    capacidad_carga: float
+    carga_asignada: float = 0.0
+    paquetes: List[UUID] = field(default_factory=list)
+
+
+def calcular_carga(peso: float, tamaño: Optional[str]) -> float:
+    """
+    Calcula la carga efectiva de un paquete: el mayor entre su peso real y
+    el peso volumétrico de su tamaño.
+    """
+    volumetrico = PESO_VOLUMETRICO_TAMAÑO.get((tamaño or "").strip().lower(), 0.0)
+    return max(float(peso or 0.0), volumetrico)
+
+
+class _ArbolCapacidades:
+    """Árbol de segmentos con la capacidad restante máxima de cada rango de vehículos."""
+
+    def __init__(self, capacidades: Sequence[float]):
+        self.n = len(capacidades)
+        self.tamaño = 1
+        while self.tamaño < max(1, self.n):
+            self.tamaño *= 2
+        self.maximos = [-1.0] * (2 * self.tamaño)
+        for i, capacidad in enumerate(capacidades):
+            self.maximos[self.tamaño + i] = capacidad
+        for i in range(self.tamaño - 1, 0, -1):
+            self.maximos[i] = max(self.maximos[2 * i], self.maximos[2 * i + 1])
+
+    def primero_con_espacio(self, carga: float) -> int:
+        """Devuelve el índice del primer vehículo con capacidad >= carga, o -1."""
+        if self.maximos[1] < carga:
+            return -1
+        i = 1
+        while i < self.tamaño:
+            i = 2 * i if self.maximos[2 * i] >= carga else 2 * i + 1
+        return i - self.tamaño
+
+    def descontar(self, indice: int, carga: float) -> None:
+        """Resta carga a la capacidad restante de un vehículo."""
+        i = self.tamaño + indice
+        self.maximos[i] -= carga
+        i //= 2
+        while i:
+            self.maximos[i] = max(self.maximos[2 * i], self.maximos[2 * i + 1])
+            i //= 2
+
+
+def planificar_first_fit_decreasing(
+    paquetes: Sequence[Tuple[UUID, float, Optional[str]]],
+    vehiculos: Sequence[Tuple[UUID, str, float]],
+) -> Dict[str, Any]:
+    """
+    Asigna paquetes a vehículos con first-fit decreasing.
+
+    Args:
+        paquetes: Tuplas (id_paquete, peso, tamaño)
+        vehiculos: Tuplas (id_transporte, placa, capacidad_carga)
+
+    Returns:
+        Dict con las asignaciones por vehículo y los paquetes sin asignar
+    """
+    asignaciones = [
+        AsignacionVehiculo(
+            id_transporte=id_transporte,
+            placa=placa,
+            capacidad_carga=float(capacidad or 0.0),
+        )
+        for id_transporte, placa, capacidad in sorted(
+            vehiculos, key=lambda vehiculo: vehiculo[2] or 0.0, reverse=True
+        )
+    ]
+    arbol = _ArbolCapacidades([a.capacidad_carga for a in asignaciones])
+
+    items = sorted(
+        ((calcular_carga(peso, tamaño), id_paquete) for id_paquete, peso, tamaño in paquetes),
+        key=lambda item: item[0],
+        reverse=True,
+    )
+
+    sin_asignar: List[UUID] = []
+    for carga, id_paquete in items:
+        indice = arbol.primero_con_espacio(carga)
+        if indice < 0:
+            sin_asignar.append(id_paquete)
+            continue
+        arbol.descontar(indice, carga)
+        asignacion = asignaciones[indice]
+        asignacion.carga_asignada += carga
+        asignacion.paquetes.append(id_paquete)
+
+    usadas = [a for a in asignaciones if a.paquetes]
+    return {
+        "total_paquetes": len(items),
+        "paquetes_asignados": len(items) - len(sin_asignar),
+        "paquetes_sin_asignar": len(sin_asignar),
+        "vehiculos_disponibles": len(asignaciones),
+        "vehiculos_usados": len(usadas),
+        "asignaciones": [
+            {
+                "id_transporte": a.id_transporte,
+                "placa": a.placa,
+                "capacidad_carga": a.capacidad_carga,
+                "carga_asignada": round(a.carga_asignada, 2),
+                "utilizacion": (
+                    round(a.carga_asignada / a.capacidad_carga, 4)
+                    if a.capacidad_carga
+                    else 0.0
+                ),
+                "paquetes": a.paquetes,
+            }
+            for a in usadas
+        ],
+        "sin_asignar": sin_asignar,
+    }
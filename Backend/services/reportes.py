@@ -0,0 +1,454 @@
+"""
+Reportes sobre los envíos que comparten el menú de reportes y la API.
+
+El ranking de clientes frecuentes se arma en la base de datos con una sola
+consulta: une cada envío con su remitente y su receptor, agrega por cliente y
+numera el resultado con funciones de ventana. Las páginas se piden con un
+cursor que guarda la clave de orden de la última fila (keyset), así cada
+página filtra por esa clave en lugar de saltar filas con OFFSET y el puesto
+de cada cliente se mantiene aunque se pidan páginas lejanas.
+
+La eficiencia de la flota también se calcula en una consulta: los envíos
+despachados se agregan por vehículo y día, y el historial de estados se
+recorta al período y se suma por estado. El resultado se guarda en memoria
+por período unos minutos, porque el tablero lo pide una y otra vez.
+"""
+
+import base64
+import json
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import (
+    case,
+    exists,
+    func,
+    literal,
+    null,
+    or_,
+    select,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.orm import Session
+
+from observabilidad.metricas import registrar_cache
+from services.planificador_despacho import PESO_VOLUMETRICO_TAMAÑO
+
+""" (envios_totales, valor_declarado, ultimo_envio, id_cliente) de la última fila """
+CursorClientes = Tuple[int, float, datetime, UUID]
+
+
+def codificar_cursor(clave: CursorClientes) -> str:
+    """Convierte la clave de orden de una fila en un cursor opaco."""
+    total, valor, ultimo, id_cliente = clave
+    datos = [int(total), float(valor), ultimo.isoformat(), str(id_cliente)]
+    return base64.urlsafe_b64encode(json.dumps(datos).encode()).decode()
+
+
+def decodificar_cursor(cursor: str) -> CursorClientes:
+    """
+    Lee un cursor generado por `codificar_cursor`.
+
+    Raises:
+        ValueError: Si el cursor no es válido
+    """
+    try:
+        total, valor, ultimo, id_cliente = json.loads(
+            base64.urlsafe_b64decode(cursor.encode())
+        )
+        return int(total), float(valor), datetime.fromisoformat(ultimo), UUID(id_cliente)
+    except Exception:
+        raise ValueError("Cursor no válido")
+
+
+def clientes_frecuentes(
+    db: Session,
+    dias: int = 365,
+    limite: int = 20,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Ranking de clientes por envíos enviados y recibidos, valor declarado de
+    lo enviado y fecha del último envío, en ese orden de prioridad.
+
+    Args:
+        db: Sesión de base de datos
+        dias: Días hacia atrás de envíos a considerar
+        limite: Clientes por página
+        cursor: Cursor devuelto por la página anterior; None para la primera
+
+    Returns:
+        Dict con los clientes de la página, el total de clientes del ranking
+        y el cursor de la página siguiente (None si es la última)
+
+    Raises:
+        ValueError: Si el cursor no es válido
+    """
+    from entities.cliente import Cliente
+    from entities.detalle_entrega import DetalleEntrega
+    from entities.paquete import Paquete
+
+    desde = datetime.now() - timedelta(days=dias)
+    periodo = (DetalleEntrega.fecha_envio >= desde, DetalleEntrega.activo == True)
+
+    enviados = (
+        select(
+            DetalleEntrega.id_cliente_remitente.label("id_cliente"),
+            literal(1).label("enviado"),
+            literal(0).label("recibido"),
+            func.coalesce(Paquete.valor_declarado, 0.0).label("valor"),
+            DetalleEntrega.fecha_envio,
+        )
+        .join(Paquete, Paquete.id_paquete == DetalleEntrega.id_paquete)
+        .where(*periodo)
+    )
+    recibidos = select(
+        DetalleEntrega.id_cliente_receptor.label("id_cliente"),
+        literal(0).label("enviado"),
+        literal(1).label("recibido"),
+        literal(0.0).label("valor"),
+        DetalleEntrega.fecha_envio,
+    ).where(*periodo)
+    movimientos = union_all(enviados, recibidos).subquery("movimientos")
+
+    total = func.count()
+    valor = func.sum(movimientos.c.valor)
+    ultimo = func.max(movimientos.c.fecha_envio)
+    orden = (total.desc(), valor.desc(), ultimo.desc(), movimientos.c.id_cliente.desc())
+    """ Las ventanas se evalúan sobre todos los clientes, antes de filtrar la página """
+    ranking = (
+        select(
+            movimientos.c.id_cliente,
+            func.sum(movimientos.c.enviado).label("enviados"),
+            func.sum(movimientos.c.recibido).label("recibidos"),
+            total.label("total"),
+            valor.label("valor_declarado"),
+            ultimo.label("ultimo_envio"),
+            func.row_number().over(order_by=orden).label("puesto"),
+            func.count().over().label("total_clientes"),
+        )
+        .group_by(movimientos.c.id_cliente)
+        .subquery("ranking")
+    )
+
+    consulta = (
+        select(
+            ranking,
+            Cliente.primer_nombre,
+            Cliente.primer_apellido,
+            Cliente.numero_documento,
+        )
+        .outerjoin(Cliente, Cliente.id_cliente == ranking.c.id_cliente)
+        .order_by(ranking.c.puesto)
+        .limit(limite + 1)
+    )
+    if cursor:
+        clave = decodificar_cursor(cursor)
+        columnas = (
+            ranking.c.total,
+            ranking.c.valor_declarado,
+            ranking.c.ultimo_envio,
+            ranking.c.id_cliente,
+        )
+        """ La clave se enlaza con el tipo de cada columna (GUID) para que se compare igual que lo guardado """
+        consulta = consulta.where(
+            tuple_(*columnas) < tuple_(*clave, types=[columna.type for columna in columnas])
+        )
+
+    filas = db.execute(consulta).all()
+    hay_mas = len(filas) > limite
+    filas = filas[:limite]
+
+    clientes = [
+        {
+            "puesto": int(fila.puesto),
+            "id_cliente": fila.id_cliente,
+            "nombre": (
+                f"{fila.primer_nombre} {fila.primer_apellido}"
+                if fila.primer_nombre
+                else str(fila.id_cliente)
+            ),
+            "numero_documento": fila.numero_documento,
+            "enviados": int(fila.enviados),
+            "recibidos": int(fila.recibidos),
+            "total": int(fila.total),
+            "valor_declarado": round(float(fila.valor_declarado), 2),
+            "ultimo_envio": fila.ultimo_envio,
+        }
+        for fila in filas
+    ]
+    siguiente = None
+    if hay_mas:
+        ultima = filas[-1]
+        siguiente = codificar_cursor(
+            (ultima.total, ultima.valor_declarado, ultima.ultimo_envio, ultima.id_cliente)
+        )
+    return {
+        "clientes": clientes,
+        "total_clientes": int(filas[0].total_clientes) if filas else 0,
+        "siguiente_cursor": siguiente,
+    }
+
+
+""" Segundos que se reutiliza el reporte de flota de un mismo período """
+FLOTA_CACHE_SEGUNDOS = 300
+FLOTA_CACHE_MAXIMO = 64
+ESTADOS_TRANSPORTE = ("disponible", "en_uso", "mantenimiento", "fuera_servicio")
+
+_cache_flota: Dict[Tuple[date, date, Optional[UUID]], Tuple[float, Dict[str, Any]]] = {}
+_lock_flota = threading.Lock()
+
+
+def limpiar_cache_flota() -> None:
+    """Descarta los reportes de flota guardados."""
+    with _lock_flota:
+        _cache_flota.clear()
+
+
+def eficiencia_flota(
+    db: Session,
+    fecha_inicio: date,
+    fecha_fin: date,
+    id_sede: Optional[UUID] = None,
+    usar_cache: bool = True,
+) -> Dict[str, Any]:
+    """
+    Utilización de capacidad, horas por estado y envíos despachados de cada
+    vehículo activo, y los mismos totales por sede.
+
+    La utilización de un día es la carga despachada (peso real o volumétrico,
+    como en el planificador) sobre la capacidad del vehículo; por vehículo se
+    informa el promedio y el máximo de sus días con despachos.
+
+    Args:
+        db: Sesión de base de datos
+        fecha_inicio: Primer día del período (incluido)
+        fecha_fin: Último día del período (incluido)
+        id_sede: Limitar a los vehículos de una sede (opcional)
+        usar_cache: Reutilizar un cálculo reciente del mismo período
+
+    Returns:
+        Dict con el período, los vehículos y las sedes
+    """
+    clave = (fecha_inicio, fecha_fin, id_sede)
+    if usar_cache:
+        with _lock_flota:
+            guardado = _cache_flota.get(clave)
+        acierto = bool(guardado and guardado[0] > time.monotonic())
+        registrar_cache("flota", acierto)
+        if acierto:
+            return {**guardado[1], "desde_cache": True}
+
+    resultado = _calcular_eficiencia_flota(db, fecha_inicio, fecha_fin, id_sede)
+
+    with _lock_flota:
+        if len(_cache_flota) >= FLOTA_CACHE_MAXIMO:
+            _cache_flota.pop(min(_cache_flota, key=lambda k: _cache_flota[k][0]))
+        _cache_flota[clave] = (time.monotonic() + FLOTA_CACHE_SEGUNDOS, resultado)
+    return {**resultado, "desde_cache": False}
+
+
+def _calcular_eficiencia_flota(
+    db: Session, fecha_inicio: date, fecha_fin: date, id_sede: Optional[UUID]
+) -> Dict[str, Any]:
+    from entities.detalle_entrega import DetalleEntrega
+    from entities.historial_estado_transporte import HistorialEstadoTransporte
+    from entities.paquete import Paquete
+    from entities.sede import Sede
+    from entities.transporte import Transporte
+
+    inicio = datetime.combine(fecha_inicio, datetime.min.time())
+    fin = datetime.combine(fecha_fin + timedelta(days=1), datetime.min.time())
+    """ Un período que incluye hoy solo cuenta las horas transcurridas """
+    corte = min(fin, datetime.now())
+    horas_periodo = max(0.0, (corte - inicio).total_seconds() / 3600)
+
+    carga = func.greatest(
+        Paquete.peso,
+        case(PESO_VOLUMETRICO_TAMAÑO, value=func.lower(Paquete.tamaño), else_=0.0),
+    )
+    dia = func.date_trunc("day", DetalleEntrega.fecha_despacho)
+    diario = (
+        select(
+            DetalleEntrega.id_transporte,
+            func.count().label("envios"),
+            func.sum(carga).label("carga"),
+        )
+        .join(Paquete, Paquete.id_paquete == DetalleEntrega.id_paquete)
+        .where(
+            DetalleEntrega.id_transporte.isnot(None),
+            DetalleEntrega.fecha_despacho >= inicio,
+            DetalleEntrega.fecha_despacho < fin,
+        )
+        .group_by(DetalleEntrega.id_transporte, dia)
+        .cte("despachos_diarios")
+    )
+    utilizacion = diario.c.carga / Transporte.capacidad_carga
+    uso = (
+        select(
+            diario.c.id_transporte,
+            func.sum(diario.c.envios).label("envios"),
+            func.sum(diario.c.carga).label("carga"),
+            func.count().label("dias"),
+            func.avg(utilizacion).label("utilizacion_promedio"),
+            func.max(utilizacion).label("utilizacion_maxima"),
+        )
+        .join(Transporte, Transporte.id_transporte == diario.c.id_transporte)
+        .group_by(diario.c.id_transporte)
+        .cte("uso_vehiculos")
+    )
+
+    """ Los vehículos sin historial cuentan en su estado actual desde su creación """
+    intervalos = union_all(
+        select(
+            HistorialEstadoTransporte.id_transporte,
+            HistorialEstadoTransporte.estado,
+            HistorialEstadoTransporte.desde,
+            HistorialEstadoTransporte.hasta,
+        ).where(
+            HistorialEstadoTransporte.desde < corte,
+            or_(
+                HistorialEstadoTransporte.hasta.is_(None),
+                HistorialEstadoTransporte.hasta > inicio,
+            ),
+        ),
+        select(
+            Transporte.id_transporte,
+            Transporte.estado,
+            Transporte.fecha_creacion,
+            null(),
+        ).where(
+            Transporte.fecha_creacion < corte,
+            ~exists().where(
+                HistorialEstadoTransporte.id_transporte == Transporte.id_transporte
+            ),
+        ),
+    ).subquery("intervalos")
+    segundos = func.extract(
+        "epoch",
+        func.least(func.coalesce(intervalos.c.hasta, corte), corte)
+        - func.greatest(intervalos.c.desde, inicio),
+    )
+    por_estado = (
+        select(
+            intervalos.c.id_transporte,
+            intervalos.c.estado,
+            (func.sum(func.greatest(segundos, 0)) / 3600.0).label("horas"),
+        )
+        .group_by(intervalos.c.id_transporte, intervalos.c.estado)
+        .subquery("horas_estado")
+    )
+    estados = (
+        select(
+            por_estado.c.id_transporte,
+            func.json_object_agg(por_estado.c.estado, por_estado.c.horas).label(
+                "horas"
+            ),
+        )
+        .group_by(por_estado.c.id_transporte)
+        .cte("estados_vehiculos")
+    )
+
+    consulta = (
+        select(
+            Transporte.id_transporte,
+            Transporte.placa,
+            Transporte.tipo_vehiculo,
+            Transporte.capacidad_carga,
+            Transporte.estado,
+            Transporte.id_sede,
+            Sede.nombre.label("sede"),
+            func.coalesce(uso.c.envios, 0).label("envios"),
+            func.coalesce(uso.c.carga, 0.0).label("carga"),
+            func.coalesce(uso.c.dias, 0).label("dias"),
+            uso.c.utilizacion_promedio,
+            uso.c.utilizacion_maxima,
+            estados.c.horas,
+        )
+        .outerjoin(Sede, Sede.id_sede == Transporte.id_sede)
+        .outerjoin(uso, uso.c.id_transporte == Transporte.id_transporte)
+        .outerjoin(estados, estados.c.id_transporte == Transporte.id_transporte)
+        .where(Transporte.activo == True)
+        .order_by(Sede.nombre, Transporte.placa)
+    )
+    if id_sede:
+        consulta = consulta.where(Transporte.id_sede == id_sede)
+
+    vehiculos = []
+    sedes: Dict[Any, Dict[str, Any]] = {}
+    for fila in db.execute(consulta).all():
+        horas = {estado: round(float(h), 2) for estado, h in (fila.horas or {}).items()}
+        vehiculos.append(
+            {
+                "id_transporte": fila.id_transporte,
+                "placa": fila.placa,
+                "tipo_vehiculo": fila.tipo_vehiculo,
+                "id_sede": fila.id_sede,
+                "sede": fila.sede,
+                "estado": fila.estado,
+                "capacidad_carga": float(fila.capacidad_carga),
+                "envios": int(fila.envios),
+                "carga_kg": round(float(fila.carga), 2),
+                "dias_con_despachos": int(fila.dias),
+                "utilizacion_promedio": (
+                    None
+                    if fila.utilizacion_promedio is None
+                    else round(float(fila.utilizacion_promedio), 4)
+                ),
+                "utilizacion_maxima": (
+                    None
+                    if fila.utilizacion_maxima is None
+                    else round(float(fila.utilizacion_maxima), 4)
+                ),
+                "horas_por_estado": horas,
+            }
+        )
+
+        sede = sedes.setdefault(
+            fila.id_sede,
+            {
+                "id_sede": fila.id_sede,
+                "sede": fila.sede,
+                "vehiculos": 0,
+                "capacidad_total": 0.0,
+                "envios": 0,
+                "carga_kg": 0.0,
+                "_capacidad_usada": 0.0,
+                "horas_por_estado": {},
+            },
+        )
+        sede["vehiculos"] += 1
+        sede["capacidad_total"] += float(fila.capacidad_carga)
+        sede["envios"] += int(fila.envios)
+        sede["carga_kg"] += float(fila.carga)
+        sede["_capacidad_usada"] += float(fila.capacidad_carga) * int(fila.dias)
+        for estado, h in horas.items():
+            sede["horas_por_estado"][estado] = round(
+                sede["horas_por_estado"].get(estado, 0.0) + h, 2
+            )
+
+    for sede in sedes.values():
+        capacidad_usada = sede.pop("_capacidad_usada")
+        sede["carga_kg"] = round(sede["carga_kg"], 2)
+        sede["utilizacion"] = (
+            round(sede["carga_kg"] / capacidad_usada, 4) if capacidad_usada else None
+        )
+        horas_totales = horas_periodo * sede["vehiculos"]
+        sede["porcentaje_en_uso"] = (
+            round(sede["horas_por_estado"].get("en_uso", 0.0) / horas_totales * 100, 2)
+            if horas_totales
+            else 0.0
+        )
+
+    return {
+        "fecha_inicio": fecha_inicio,
+        "fecha_fin": fecha_fin,
+        "horas_periodo": round(horas_periodo, 2),
+        "calculado_en": datetime.now(),
+        "vehiculos": vehiculos,
+        "sedes": list(sedes.values()),
+    }
@@ -3,10 +3,16 @@ Servicio de mensajería para cálculo de distancias y costos de envío.
 """
 
 import math
-from typing import Tuple, Dict, Any, Optional
+from datetime import datetime
+from types import MappingProxyType
+from typing import Tuple, Dict, Any, Mapping, Optional
+from uuid import UUID
 from dataclasses import dataclass
 from enum import Enum
 
+from observabilidad.metricas import registrar_cache
+from observabilidad.trazas import trazado
+
 
 class TipoEnvio(Enum):
     """Tipos de envío disponibles."""
@@ -52,8 +58,50 @@ class ParametrosEnvio:
     valor_declarado: float = 0.0
 
 
+""" Conceptos de tarifa configurables y el tipo de clave de cada uno (None = valor único) """
+CONCEPTOS_TARIFA = {
+    "tarifa_km": TipoEnvio,
+    "multiplicador_tamaño": TamañoPaquete,
+    "costo_minimo": None,
+    "costo_base_peso": None,
+    "multiplicador_fragil": None,
+    "porcentaje_seguro": None,
+    "velocidad_kmh": TipoEnvio,
+    "horas_procesamiento": TipoEnvio,
+    "horas_transbordo": TipoEnvio,
+}
+
+
+@dataclass(frozen=True)
+class TablaTarifas:
+    """
+    Foto inmutable de las tarifas vigentes.
+    Se reemplaza completa cuando cambian las tarifas, nunca se modifica.
+    """
+
+    tarifa_km: Mapping[TipoEnvio, float]
+    multiplicador_tamaño: Mapping[TamañoPaquete, float]
+    costo_minimo: float
+    costo_base_peso: float
+    multiplicador_fragil: float
+    porcentaje_seguro: float
+    velocidad_kmh: Mapping[TipoEnvio, float]
+    horas_procesamiento: Mapping[TipoEnvio, float]
+    horas_transbordo: Mapping[TipoEnvio, float]
+    vigente_desde: Optional[datetime] = None
+    siguiente_vigencia: Optional[datetime] = None
+
+
+""" (id_sede_origen, id_sede_destino, tipo_envio) -> (p10, p50, p90) en horas """
+TiemposRuta = Mapping[Tuple[UUID, UUID, str], Tuple[float, float, float]]
+
+
 class ServicioMensajeria:
-    """Servicio principal para cálculos de mensajería."""
+    """
+    Servicio principal para cálculos de mensajería.
+    Las constantes de la clase son las tarifas por defecto; las tarifas
+    vigentes se leen de la tabla publicada con `publicar_tabla`.
+    """
 
     TARIFA_BASE_KM = {
         TipoEnvio.NORMAL: 150,
@@ -76,6 +124,74 @@ class ServicioMensajeria:
 
     PORCENTAJE_SEGURO = 0.005
 
+    """ Horas que agrega cada transbordo en una sede intermedia """
+    HORAS_TRANSBORDO = {
+        TipoEnvio.NORMAL: 6,
+        TipoEnvio.EXPRESS: 3,
+        TipoEnvio.PREMIUM: 2,
+    }
+
+    """ Horas durante las que se respeta el precio de una cotización """
+    VIGENCIA_COTIZACION_HORAS = 24
+
+    VELOCIDAD_KMH = {
+        TipoEnvio.NORMAL: 25,
+        TipoEnvio.EXPRESS: 40,
+        TipoEnvio.PREMIUM: 60,
+    }
+
+    HORAS_PROCESAMIENTO = {
+        TipoEnvio.NORMAL: 4,
+        TipoEnvio.EXPRESS: 2,
+        TipoEnvio.PREMIUM: 1,
+    }
+
+    _tabla: Optional[TablaTarifas] = None
+
+    _tiempos_ruta: TiemposRuta = MappingProxyType({})
+
+    @classmethod
+    def tabla_por_defecto(cls) -> TablaTarifas:
+        """Construye la tabla de tarifas a partir de las constantes de la clase."""
+        return TablaTarifas(
+            tarifa_km=MappingProxyType(dict(cls.TARIFA_BASE_KM)),
+            multiplicador_tamaño=MappingProxyType(dict(cls.MULTIPLICADOR_TAMAÑO)),
+            costo_minimo=cls.COSTO_MINIMO,
+            costo_base_peso=cls.COSTO_BASE_PESO,
+            multiplicador_fragil=cls.MULTIPLICADOR_FRAGIL,
+            porcentaje_seguro=cls.PORCENTAJE_SEGURO,
+            velocidad_kmh=MappingProxyType(dict(cls.VELOCIDAD_KMH)),
+            horas_procesamiento=MappingProxyType(dict(cls.HORAS_PROCESAMIENTO)),
+            horas_transbordo=MappingProxyType(dict(cls.HORAS_TRANSBORDO)),
+        )
+
+    @classmethod
+    def tabla_vigente(cls) -> TablaTarifas:
+        """Devuelve la tabla de tarifas publicada."""
+        tabla = cls._tabla
+        if tabla is None:
+            tabla = cls._tabla = cls.tabla_por_defecto()
+        return tabla
+
+    @classmethod
+    def publicar_tabla(cls, tabla: TablaTarifas) -> None:
+        """
+        Reemplaza la tabla de tarifas vigente.
+        El cambio es una sola asignación: cada cotización lee la tabla una vez
+        y trabaja con esa foto aunque se publique otra a mitad del cálculo.
+        """
+        cls._tabla = tabla
+
+    @classmethod
+    def tiempos_ruta(cls) -> TiemposRuta:
+        """Devuelve los tiempos de entrega históricos publicados."""
+        return cls._tiempos_ruta
+
+    @classmethod
+    def publicar_tiempos_ruta(cls, tiempos: TiemposRuta) -> None:
+        """Reemplaza los tiempos de entrega históricos en una sola asignación."""
+        cls._tiempos_ruta = tiempos
+
     @staticmethod
     def calcular_distancia_haversine(coord1: Coordenada, coord2: Coordenada) -> float:
         """
@@ -113,11 +229,14 @@ class ServicioMensajeria:
         return distancia_total
 
     @classmethod
+    @trazado("ServicioMensajeria.calcular_costo_envio")
     def calcular_costo_envio(
         cls,
         coord_origen: Coordenada,
         coord_destino: Coordenada,
         parametros: ParametrosEnvio,
+        distancia_km: Optional[float] = None,
+        tabla: Optional[TablaTarifas] = None,
     ) -> Dict[str, Any]:
         """
         Calcula el costo total de un envío.
@@ -126,29 +245,34 @@ class ServicioMensajeria:
             coord_origen: Coordenada de la sede de origen
             coord_destino: Coordenada de la sede de destino
             parametros: Parámetros del envío
+            distancia_km: Distancia por la red de sedes; si se omite se usa la
+                distancia en línea recta
+            tabla: Tabla de tarifas a usar; por defecto la vigente
 
         Returns:
             Dict con el desglose de costos
         """
-        distancia_km = cls.calcular_distancia_haversine(coord_origen, coord_destino)
+        tabla = tabla or cls.tabla_vigente()
+        if distancia_km is None:
+            distancia_km = cls.calcular_distancia_haversine(coord_origen, coord_destino)
 
-        tarifa_km = cls.TARIFA_BASE_KM[parametros.tipo_envio]
+        tarifa_km = tabla.tarifa_km[parametros.tipo_envio]
         costo_distancia = distancia_km * tarifa_km
 
-        costo_peso = parametros.peso_kg * cls.COSTO_BASE_PESO
+        costo_peso = parametros.peso_kg * tabla.costo_base_peso
 
-        multiplicador_tamaño = cls.MULTIPLICADOR_TAMAÑO[parametros.tamaño]
+        multiplicador_tamaño = tabla.multiplicador_tamaño[parametros.tamaño]
 
         costo_base = (costo_distancia + costo_peso) * multiplicador_tamaño
 
         if parametros.es_fragil:
-            costo_base *= cls.MULTIPLICADOR_FRAGIL
+            costo_base *= tabla.multiplicador_fragil
 
-        costo_seguro = parametros.valor_declarado * cls.PORCENTAJE_SEGURO
+        costo_seguro = parametros.valor_declarado * tabla.porcentaje_seguro
 
         costo_total = costo_base + costo_seguro
 
-        costo_final = max(costo_total, cls.COSTO_MINIMO)
+        costo_final = max(costo_total, tabla.costo_minimo)
 
         return {
             "distancia_km": round(distancia_km, 2),
@@ -166,48 +290,74 @@ class ServicioMensajeria:
         }
 
     @classmethod
+    @trazado("ServicioMensajeria.obtener_tiempo_estimado")
     def obtener_tiempo_estimado(
-        cls, distancia_km: float, tipo_envio: TipoEnvio
+        cls,
+        distancia_km: float,
+        tipo_envio: TipoEnvio,
+        transbordos: int = 0,
+        tabla: Optional[TablaTarifas] = None,
+        id_sede_origen: Optional[UUID] = None,
+        id_sede_destino: Optional[UUID] = None,
     ) -> Dict[str, int]:
         """
         Calcula el tiempo estimado de entrega.
+        Si hay tiempos históricos para el par de sedes y el tipo de envío se
+        usan sus percentiles (p10, p50, p90); si no, la fórmula por velocidad.
 
         Args:
             distancia_km: Distancia en kilómetros
             tipo_envio: Tipo de envío
+            transbordos: Número de sedes intermedias en la ruta
+            tabla: Tabla de tarifas a usar; por defecto la vigente
+            id_sede_origen: Sede de origen, para buscar tiempos históricos
+            id_sede_destino: Sede de destino, para buscar tiempos históricos
 
         Returns:
             Dict con tiempo mínimo y máximo en horas
         """
-        velocidades = {
-            TipoEnvio.NORMAL: 25,
-            TipoEnvio.EXPRESS: 40,
-            TipoEnvio.PREMIUM: 60,
-        }
-
-        velocidad = velocidades[tipo_envio]
+        percentiles = cls._tiempos_ruta.get(
+            (id_sede_origen, id_sede_destino, tipo_envio.value)
+        )
+        registrar_cache("tiempos_ruta", percentiles is not None)
+        if percentiles is not None:
+            p10, p50, p90 = percentiles
+            return {
+                "tiempo_minimo_horas": math.ceil(p10),
+                "tiempo_maximo_horas": math.ceil(p90),
+                "tiempo_promedio_horas": math.ceil(p50),
+                "tiempo_historico": True,
+            }
+
+        tabla = tabla or cls.tabla_vigente()
+
+        velocidad = tabla.velocidad_kmh[tipo_envio]
         tiempo_base_horas = distancia_km / velocidad
 
-        tiempo_procesamiento = {
-            TipoEnvio.NORMAL: 4,
-            TipoEnvio.EXPRESS: 2,
-            TipoEnvio.PREMIUM: 1,
-        }
-
-        tiempo_total = tiempo_base_horas + tiempo_procesamiento[tipo_envio]
+        tiempo_total = (
+            tiempo_base_horas
+            + tabla.horas_procesamiento[tipo_envio]
+            + transbordos * tabla.horas_transbordo[tipo_envio]
+        )
 
         return {
             "tiempo_minimo_horas": math.ceil(tiempo_total * 0.8),
             "tiempo_maximo_horas": math.ceil(tiempo_total * 1.2),
             "tiempo_promedio_horas": math.ceil(tiempo_total),
+            "tiempo_historico": False,
         }
 
     @classmethod
+    @trazado("ServicioMensajeria.generar_cotizacion_completa")
     def generar_cotizacion_completa(
         cls,
         coord_origen: Coordenada,
         coord_destino: Coordenada,
         parametros: ParametrosEnvio,
+        distancia_km: Optional[float] = None,
+        transbordos: int = 0,
+        id_sede_origen: Optional[UUID] = None,
+        id_sede_destino: Optional[UUID] = None,
     ) -> Dict[str, Any]:
         """
         Genera una cotización completa con costos y tiempos.
@@ -216,19 +366,36 @@ class ServicioMensajeria:
             coord_origen: Coordenada de origen
             coord_destino: Coordenada de destino
             parametros: Parámetros del envío
+            distancia_km: Distancia por la red de sedes (opcional)
+            transbordos: Número de sedes intermedias en la ruta
+            id_sede_origen: Sede de origen, para usar tiempos históricos
+            id_sede_destino: Sede de destino, para usar tiempos históricos
 
         Returns:
             Dict con cotización completa
         """
-        costos = cls.calcular_costo_envio(coord_origen, coord_destino, parametros)
+        tabla = cls.tabla_vigente()
+        costos = cls.calcular_costo_envio(
+            coord_origen,
+            coord_destino,
+            parametros,
+            distancia_km=distancia_km,
+            tabla=tabla,
+        )
 
         tiempos = cls.obtener_tiempo_estimado(
-            costos["distancia_km"], parametros.tipo_envio
+            costos["distancia_km"],
+            parametros.tipo_envio,
+            transbordos=transbordos,
+            tabla=tabla,
+            id_sede_origen=id_sede_origen,
+            id_sede_destino=id_sede_destino,
         )
 
         return {
             **costos,
             **tiempos,
-            "fecha_cotizacion": "2025-09-24",
-            "valida_hasta_horas": 24,
+            "transbordos": transbordos,
+            "fecha_cotizacion": datetime.now().isoformat(timespec="seconds"),
+            "valida_hasta_horas": cls.VIGENCIA_COTIZACION_HORAS,
         }
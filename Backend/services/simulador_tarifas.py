@@ -0,0 +1,320 @@
+"""
+Simulador de cambios de tarifas sobre los envíos históricos.
+
+Lee los envíos de un período por lotes, los vuelve a cotizar con NumPy bajo
+la tabla vigente y bajo una tabla candidata, y acumula por sede de origen y
+tipo de envío cuánto cambiarían los ingresos. La distancia entre cada par de
+sedes se calcula una sola vez (por la red de tramos o en línea recta) y cada
+envío solo busca su par en esa matriz, así el costo por envío es aritmética
+sobre arreglos.
+"""
+
+import time
+from dataclasses import replace
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import String, cast, func, select
+from sqlalchemy.orm import Session
+
+from services.enrutador_sedes import enrutador_sedes
+from services.servicio_mensajeria import (
+    CONCEPTOS_TARIFA,
+    ServicioMensajeria,
+    TablaTarifas,
+    TamañoPaquete,
+    TipoEnvio,
+)
+
+
+class _Indices(dict):
+    """Diccionario de índices que devuelve -1 para las claves desconocidas."""
+
+    def __missing__(self, clave):
+        return -1
+
+
+TIPOS = list(TipoEnvio)
+TAMAÑOS = list(TamañoPaquete)
+_INDICE_TIPO = _Indices((tipo.value, i) for i, tipo in enumerate(TIPOS))
+_INDICE_TAMAÑO = _Indices((tamaño.value, i) for i, tamaño in enumerate(TAMAÑOS))
+
+""" (id_sede, nombre, latitud, longitud) """
+SedeSimulada = Tuple[UUID, str, Optional[float], Optional[float]]
+
+
+def aplicar_cambios(
+    tabla: TablaTarifas, cambios: Iterable[Tuple[str, str, float]]
+) -> TablaTarifas:
+    """
+    Crea una tabla candidata cambiando algunos valores de otra.
+
+    Args:
+        tabla: Tabla de partida
+        cambios: Tuplas (concepto, clave, valor); clave vacía para valores únicos
+
+    Returns:
+        TablaTarifas: Nueva tabla; la original no se modifica
+    """
+    campos: Dict[str, Any] = {}
+    for concepto, clave, valor in cambios:
+        tipo_clave = CONCEPTOS_TARIFA[concepto]
+        if tipo_clave is None:
+            campos[concepto] = valor
+            continue
+        valores = dict(campos.get(concepto, getattr(tabla, concepto)))
+        valores[tipo_clave(clave)] = valor
+        campos[concepto] = MappingProxyType(valores)
+    return replace(tabla, **campos)
+
+
+def matriz_haversine(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Distancia en línea recta (km) entre todos los pares de puntos."""
+    lat = np.radians(latitudes)[:, None]
+    lon = np.radians(longitudes)[:, None]
+    dlat = lat.T - lat
+    dlon = lon.T - lon
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat) * np.cos(lat.T) * np.sin(dlon / 2) ** 2
+    return 2 * 6371.0 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def precios_vectorizados(
+    tabla: TablaTarifas,
+    distancia: np.ndarray,
+    peso: np.ndarray,
+    tipo: np.ndarray,
+    tamaño: np.ndarray,
+    fragil: np.ndarray,
+    valor_declarado: np.ndarray,
+) -> np.ndarray:
+    """
+    Mismo cálculo que `ServicioMensajeria.calcular_costo_envio` sobre arreglos.
+
+    Args:
+        tabla: Tabla de tarifas a aplicar
+        distancia: Distancia en km de cada envío
+        peso: Peso en kg
+        tipo: Índice en TIPOS
+        tamaño: Índice en TAMAÑOS
+        fragil: Si el envío es frágil
+        valor_declarado: Valor declarado
+
+    Returns:
+        np.ndarray: Costo total de cada envío
+    """
+    tarifa_km = np.array([tabla.tarifa_km[t] for t in TIPOS])
+    multiplicador = np.array([tabla.multiplicador_tamaño[t] for t in TAMAÑOS])
+
+    costo_base = (distancia * tarifa_km[tipo] + peso * tabla.costo_base_peso) * (
+        multiplicador[tamaño]
+    )
+    costo_base = np.where(fragil, costo_base * tabla.multiplicador_fragil, costo_base)
+    costo_total = costo_base + valor_declarado * tabla.porcentaje_seguro
+    return np.round(np.maximum(costo_total, tabla.costo_minimo), 2)
+
+
+class SimulacionTarifas:
+    """Acumula por sede de origen y tipo de envío el efecto de una tabla candidata."""
+
+    def __init__(
+        self,
+        sedes: Sequence[SedeSimulada],
+        actual: TablaTarifas,
+        candidata: TablaTarifas,
+        distancias: Optional[np.ndarray] = None,
+    ):
+        """
+        Args:
+            sedes: Sedes que pueden aparecer como origen o destino
+            actual: Tabla de tarifas vigente
+            candidata: Tabla de tarifas a evaluar
+            distancias: Matriz de distancias entre sedes; por defecto se calcula
+        """
+        self.sedes = list(sedes)
+        """ Las filas traen los IDs como texto: el hash de str es mucho más barato que el de UUID """
+        self.indices = _Indices((str(sede[0]), i) for i, sede in enumerate(self.sedes))
+        self.actual = actual
+        self.candidata = candidata
+        self.distancias = (
+            distancias if distancias is not None else self._calcular_distancias()
+        )
+
+        celdas = len(self.sedes) * len(TIPOS)
+        self.envios = np.zeros(celdas, dtype=np.int64)
+        self.ingresos_actuales = np.zeros(celdas)
+        self.ingresos_simulados = np.zeros(celdas)
+        self.omitidos = 0
+
+    def _calcular_distancias(self) -> np.ndarray:
+        """Distancia por la red de tramos; en línea recta si no hay camino."""
+        n = len(self.sedes)
+        latitudes = np.array(
+            [np.nan if s[2] is None else s[2] for s in self.sedes], dtype=float
+        )
+        longitudes = np.array(
+            [np.nan if s[3] is None else s[3] for s in self.sedes], dtype=float
+        )
+        distancias = matriz_haversine(latitudes, longitudes)
+        for i in range(n):
+            for j in range(n):
+                por_red = enrutador_sedes.distancia(self.sedes[i][0], self.sedes[j][0])
+                if por_red is not None:
+                    distancias[i, j] = por_red
+        return distancias
+
+    def agregar(
+        self,
+        origen: np.ndarray,
+        destino: np.ndarray,
+        peso: np.ndarray,
+        tipo: np.ndarray,
+        tamaño: np.ndarray,
+        fragil: np.ndarray,
+        valor_declarado: np.ndarray,
+    ) -> None:
+        """
+        Suma un lote de envíos ya convertidos a arreglos.
+        Los índices negativos marcan valores desconocidos; esos envíos se omiten.
+        """
+        validos = (origen >= 0) & (destino >= 0) & (tipo >= 0) & (tamaño >= 0)
+        distancia = np.full(len(origen), np.nan)
+        distancia[validos] = self.distancias[origen[validos], destino[validos]]
+        validos &= np.isfinite(distancia)
+        self.omitidos += int(len(origen) - validos.sum())
+        if not validos.any():
+            return
+
+        columnas = (distancia, peso, tipo, tamaño, fragil, valor_declarado)
+        distancia, peso, tipo, tamaño, fragil, valor_declarado = (
+            columna[validos] for columna in columnas
+        )
+        celda = origen[validos] * len(TIPOS) + tipo
+        celdas = len(self.envios)
+
+        self.envios += np.bincount(celda, minlength=celdas)
+        for tabla, acumulado in (
+            (self.actual, self.ingresos_actuales),
+            (self.candidata, self.ingresos_simulados),
+        ):
+            precios = precios_vectorizados(
+                tabla, distancia, peso, tipo, tamaño, fragil, valor_declarado
+            )
+            acumulado += np.bincount(celda, weights=precios, minlength=celdas)
+
+    def agregar_filas(self, filas: Sequence[Tuple]) -> None:
+        """
+        Suma un lote de filas de la consulta de envíos.
+
+        Args:
+            filas: Tuplas (sede_origen, sede_destino, peso, tamaño, tipo,
+                fragil, valor_declarado) con los IDs de sede como texto
+        """
+        n = len(filas)
+        if not n:
+            return
+        origen, destino, peso, tamaño, tipo, fragil, valor = zip(*filas)
+        buscar = self.indices.__getitem__
+        self.agregar(
+            np.fromiter(map(buscar, origen), np.intp, n),
+            np.fromiter(map(buscar, destino), np.intp, n),
+            np.array(peso, dtype=float),
+            np.fromiter(map(_INDICE_TIPO.__getitem__, tipo), np.intp, n),
+            np.fromiter(map(_INDICE_TAMAÑO.__getitem__, tamaño), np.intp, n),
+            np.array(fragil, dtype=bool),
+            np.nan_to_num(np.array(valor, dtype=float)),
+        )
+
+    def resultado(self) -> Dict[str, Any]:
+        """Totales y diferencias por sede de origen y tipo de envío."""
+        detalle: List[Dict[str, Any]] = []
+        for celda in np.flatnonzero(self.envios):
+            sede = self.sedes[celda // len(TIPOS)]
+            actual = float(self.ingresos_actuales[celda])
+            simulado = float(self.ingresos_simulados[celda])
+            detalle.append(
+                {
+                    "id_sede": sede[0],
+                    "sede": sede[1],
+                    "tipo_envio": TIPOS[celda % len(TIPOS)].value,
+                    "envios": int(self.envios[celda]),
+                    "ingresos_actuales": round(actual, 2),
+                    "ingresos_simulados": round(simulado, 2),
+                    "diferencia": round(simulado - actual, 2),
+                }
+            )
+        detalle.sort(key=lambda fila: abs(fila["diferencia"]), reverse=True)
+
+        actual = float(self.ingresos_actuales.sum())
+        simulado = float(self.ingresos_simulados.sum())
+        return {
+            "envios": int(self.envios.sum()),
+            "envios_omitidos": self.omitidos,
+            "ingresos_actuales": round(actual, 2),
+            "ingresos_simulados": round(simulado, 2),
+            "diferencia": round(simulado - actual, 2),
+            "porcentaje": round((simulado - actual) / actual * 100, 2) if actual else 0.0,
+            "por_sede_tipo": detalle,
+        }
+
+
+def simular_tarifas(
+    db: Session,
+    cambios: Iterable[Tuple[str, str, float]],
+    fecha_inicio: datetime,
+    fecha_fin: datetime,
+    tamaño_lote: int = 50000,
+) -> Dict[str, Any]:
+    """
+    Vuelve a cotizar los envíos de un período con una tabla candidata.
+
+    Args:
+        db: Sesión de base de datos
+        cambios: Tuplas (concepto, clave, valor) que forman la tabla candidata
+        fecha_inicio: Inicio del período (incluido), por fecha de envío
+        fecha_fin: Fin del período (excluido)
+        tamaño_lote: Filas que se traen de la base de datos por lote
+
+    Returns:
+        Dict con los totales, las diferencias por sede y tipo, y el tiempo empleado
+    """
+    from entities.detalle_entrega import DetalleEntrega
+    from entities.paquete import Paquete
+    from entities.sede import Sede
+
+    inicio = time.perf_counter()
+    actual = ServicioMensajeria.tabla_vigente()
+    simulacion = SimulacionTarifas(
+        sedes=db.query(Sede.id_sede, Sede.nombre, Sede.latitud, Sede.longitud).all(),
+        actual=actual,
+        candidata=aplicar_cambios(actual, cambios),
+    )
+
+    consulta = (
+        select(
+            cast(DetalleEntrega.id_sede_remitente, String),
+            cast(DetalleEntrega.id_sede_receptora, String),
+            Paquete.peso,
+            func.lower(Paquete.tamaño),
+            func.lower(Paquete.tipo),
+            func.lower(Paquete.fragilidad) == "alta",
+            Paquete.valor_declarado,
+        )
+        .join(Paquete, Paquete.id_paquete == DetalleEntrega.id_paquete)
+        .where(
+            DetalleEntrega.fecha_envio >= fecha_inicio,
+            DetalleEntrega.fecha_envio < fecha_fin,
+            DetalleEntrega.activo == True,
+        )
+        .execution_options(yield_per=tamaño_lote)
+    )
+    for lote in db.execute(consulta).partitions():
+        simulacion.agregar_filas(lote)
+
+    resultado = simulacion.resultado()
+    resultado["fecha_inicio"] = fecha_inicio
+    resultado["fecha_fin"] = fecha_fin
+    resultado["tiempo_simulacion_ms"] = round((time.perf_counter() - inicio) * 1000, 2)
+    return resultado
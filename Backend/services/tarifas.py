@@ -0,0 +1,176 @@
+"""
+Carga de las tarifas desde la base de datos.
+
+Las tarifas se guardan en la tabla 'tarifas' con fecha de vigencia. Este
+módulo arma con ellas una `TablaTarifas` inmutable y la publica en
+`ServicioMensajeria`, que cotiza siempre sobre la tabla publicada sin tocar
+la base de datos. Un hilo en segundo plano vuelve a cargar la tabla cada
+cierto intervalo y justo cuando entra en vigencia una tarifa programada, así
+los cambios hechos desde otro proceso se aplican sin reiniciar.
+"""
+
+import os
+import threading
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from database.config import SessionLocal
+from services.servicio_mensajeria import (
+    CONCEPTOS_TARIFA,
+    ServicioMensajeria,
+    TablaTarifas,
+)
+
+""" (concepto, clave, valor, vigente_desde) """
+FilaTarifa = Tuple[str, str, float, datetime]
+
+
+def construir_tabla(
+    filas: Iterable[FilaTarifa], ahora: Optional[datetime] = None
+) -> TablaTarifas:
+    """
+    Arma la tabla vigente a partir de las filas de tarifas.
+    Los conceptos sin fila vigente conservan el valor por defecto.
+
+    Args:
+        filas: Tarifas activas
+        ahora: Momento para el que se calcula la vigencia
+
+    Returns:
+        TablaTarifas: Tabla vigente, con la fecha de la próxima tarifa programada
+    """
+    ahora = ahora or datetime.now()
+    vigentes: Dict[Tuple[str, str], Tuple[datetime, float]] = {}
+    siguiente_vigencia: Optional[datetime] = None
+
+    for concepto, clave, valor, vigente_desde in filas:
+        if concepto not in CONCEPTOS_TARIFA:
+            continue
+        if vigente_desde > ahora:
+            if siguiente_vigencia is None or vigente_desde < siguiente_vigencia:
+                siguiente_vigencia = vigente_desde
+            continue
+        actual = vigentes.get((concepto, clave or ""))
+        if actual is None or vigente_desde >= actual[0]:
+            vigentes[(concepto, clave or "")] = (vigente_desde, valor)
+
+    base = ServicioMensajeria.tabla_por_defecto()
+    campos: Dict[str, Any] = {}
+    for concepto, tipo_clave in CONCEPTOS_TARIFA.items():
+        por_defecto = getattr(base, concepto)
+        if tipo_clave is None:
+            campos[concepto] = vigentes.get((concepto, ""), (None, por_defecto))[1]
+            continue
+        valores = dict(por_defecto)
+        for miembro in tipo_clave:
+            if (concepto, miembro.value) in vigentes:
+                valores[miembro] = vigentes[(concepto, miembro.value)][1]
+        campos[concepto] = MappingProxyType(valores)
+
+    return TablaTarifas(
+        **campos,
+        vigente_desde=max((desde for desde, _ in vigentes.values()), default=None),
+        siguiente_vigencia=siguiente_vigencia,
+    )
+
+
+def tabla_a_dict(tabla: TablaTarifas) -> Dict[str, Any]:
+    """Convierte una tabla de tarifas a un diccionario serializable."""
+    return {
+        concepto: (
+            getattr(tabla, concepto)
+            if tipo_clave is None
+            else {
+                miembro.value: valor
+                for miembro, valor in getattr(tabla, concepto).items()
+            }
+        )
+        for concepto, tipo_clave in CONCEPTOS_TARIFA.items()
+    }
+
+
+class GestorTarifas:
+    """Mantiene publicada en ServicioMensajeria la tabla de tarifas vigente."""
+
+    def __init__(self, intervalo_segundos: float = 60.0):
+        """
+        Args:
+            intervalo_segundos: Cada cuánto se vuelve a leer la tabla de tarifas
+        """
+        self.intervalo_segundos = max(1.0, intervalo_segundos)
+        self.recargas = 0
+        self.ultima_recarga: Optional[datetime] = None
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def recargar(self) -> TablaTarifas:
+        """
+        Lee las tarifas activas y publica la tabla vigente.
+
+        Returns:
+            TablaTarifas: La tabla publicada
+        """
+        from entities.tarifa import Tarifa
+
+        db = SessionLocal()
+        try:
+            filas = (
+                db.query(
+                    Tarifa.concepto, Tarifa.clave, Tarifa.valor, Tarifa.vigente_desde
+                )
+                .filter(Tarifa.activo == True)
+                .all()
+            )
+        finally:
+            db.close()
+
+        with self._lock:
+            tabla = construir_tabla(filas)
+            ServicioMensajeria.publicar_tabla(tabla)
+            self.recargas += 1
+            self.ultima_recarga = datetime.now()
+        return tabla
+
+    def _segundos_hasta_recarga(self) -> float:
+        """Espera hasta el próximo intervalo o hasta la próxima tarifa programada."""
+        espera = self.intervalo_segundos
+        siguiente = ServicioMensajeria.tabla_vigente().siguiente_vigencia
+        if siguiente is not None:
+            espera = min(espera, (siguiente - datetime.now()).total_seconds())
+        """ Un segundo como mínimo para no girar en vacío si la recarga falla """
+        return max(1.0, espera)
+
+    def iniciar(self) -> None:
+        """Carga la tabla y arranca el hilo de recarga en segundo plano."""
+        try:
+            self.recargar()
+        except Exception as e:
+            print(f"Error al cargar tarifas, se usan las tarifas por defecto: {e}")
+        if self._hilo and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(
+            target=self._ejecutar, name="recarga-tarifas", daemon=True
+        )
+        self._hilo.start()
+
+    def detener(self) -> None:
+        """Detiene el hilo de recarga."""
+        self._detener.set()
+        if self._hilo:
+            self._hilo.join(timeout=5)
+            self._hilo = None
+
+    def _ejecutar(self) -> None:
+        while not self._detener.wait(self._segundos_hasta_recarga()):
+            try:
+                self.recargar()
+            except Exception as e:
+                print(f"Error al recargar tarifas: {e}")
+
+
+gestor_tarifas = GestorTarifas(
+    intervalo_segundos=float(os.getenv("TARIFAS_INTERVALO_RECARGA_SEGUNDOS", "60")),
+)
@@ -0,0 +1,138 @@
+"""
+Tiempos de entrega históricos por par de sedes.
+
+Un trabajo periódico (scripts/calcular_tiempos_ruta.py) calcula en la base de
+datos los percentiles 10, 50 y 90 de las horas entre `fecha_envio` y
+`fecha_entrega` de las entregas completadas, por sede remitente, sede
+receptora y tipo de envío, y los guarda en la tabla 'tiempos_ruta'. Al
+arrancar, la API carga esa tabla en un diccionario y lo publica en
+`ServicioMensajeria`, que lo consulta en O(1) al cotizar; las rutas sin
+historial siguen usando la fórmula por velocidad. `services.vigilante_caches`
+revisa `max(fecha_calculo)` y vuelve a cargar el diccionario cuando otro
+proceso recalculó la tabla.
+"""
+
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Any, Tuple
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from database.config import SessionLocal
+from services.servicio_mensajeria import ServicioMensajeria, TiemposRuta
+
+""" Entregas mínimas por ruta para confiar en sus percentiles """
+MINIMO_ENVIOS = 5
+
+
+def calcular_tiempos_ruta(
+    db: Session, dias: int = 365, minimo_envios: int = MINIMO_ENVIOS
+) -> int:
+    """
+    Recalcula la tabla de tiempos por ruta con las entregas del período.
+    El cálculo y el reemplazo de la tabla se hacen en la base de datos, en una
+    sola transacción.
+
+    Args:
+        db: Sesión de base de datos
+        dias: Días hacia atrás de entregas a considerar
+        minimo_envios: Entregas mínimas para guardar una ruta
+
+    Returns:
+        int: Número de rutas guardadas
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        raise ValueError("El cálculo de tiempos por ruta solo está disponible en PostgreSQL")
+
+    from entities.detalle_entrega import DetalleEntrega
+    from entities.paquete import Paquete
+    from entities.tiempo_ruta import TiempoRuta
+
+    horas = (
+        func.extract("epoch", DetalleEntrega.fecha_entrega - DetalleEntrega.fecha_envio)
+        / 3600.0
+    )
+    tipo = func.lower(Paquete.tipo)
+    consulta = (
+        select(
+            DetalleEntrega.id_sede_remitente,
+            DetalleEntrega.id_sede_receptora,
+            tipo,
+            func.count(),
+            func.percentile_cont(0.1).within_group(horas),
+            func.percentile_cont(0.5).within_group(horas),
+            func.percentile_cont(0.9).within_group(horas),
+            literal(datetime.now()),
+        )
+        .join(Paquete, Paquete.id_paquete == DetalleEntrega.id_paquete)
+        .where(
+            DetalleEntrega.estado_envio == "Entregado",
+            DetalleEntrega.fecha_entrega.isnot(None),
+            DetalleEntrega.fecha_entrega >= DetalleEntrega.fecha_envio,
+            DetalleEntrega.fecha_envio >= datetime.now() - timedelta(days=dias),
+            DetalleEntrega.activo == True,
+        )
+        .group_by(DetalleEntrega.id_sede_remitente, DetalleEntrega.id_sede_receptora, tipo)
+        .having(func.count() >= minimo_envios)
+    )
+
+    try:
+        db.execute(delete(TiempoRuta))
+        resultado = db.execute(
+            insert(TiempoRuta).from_select(
+                [
+                    TiempoRuta.id_sede_origen,
+                    TiempoRuta.id_sede_destino,
+                    TiempoRuta.tipo_envio,
+                    TiempoRuta.envios,
+                    TiempoRuta.horas_p10,
+                    TiempoRuta.horas_p50,
+                    TiempoRuta.horas_p90,
+                    TiempoRuta.fecha_calculo,
+                ],
+                consulta,
+            )
+        )
+        db.commit()
+        return resultado.rowcount
+    except Exception as e:
+        db.rollback()
+        print(f"Error al calcular tiempos por ruta: {e}")
+        raise
+
+
+def cargar_tiempos_ruta() -> int:
+    """
+    Lee la tabla de tiempos por ruta y la publica en ServicioMensajeria.
+
+    Returns:
+        int: Número de rutas publicadas
+    """
+    from entities.tiempo_ruta import TiempoRuta
+
+    db = SessionLocal()
+    try:
+        filas = db.query(
+            TiempoRuta.id_sede_origen,
+            TiempoRuta.id_sede_destino,
+            TiempoRuta.tipo_envio,
+            TiempoRuta.horas_p10,
+            TiempoRuta.horas_p50,
+            TiempoRuta.horas_p90,
+        ).all()
+    finally:
+        db.close()
+
+    tiempos: TiemposRuta = MappingProxyType(
+        {(origen, destino, tipo): (p10, p50, p90) for origen, destino, tipo, p10, p50, p90 in filas}
+    )
+    ServicioMensajeria.publicar_tiempos_ruta(tiempos)
+    return len(tiempos)
+
+
+def version_tiempos_ruta(db: Session) -> Tuple[Any, ...]:
+    """Cambia cada vez que se recalcula la tabla de tiempos por ruta."""
+    from entities.tiempo_ruta import TiempoRuta
+
+    return tuple(db.query(func.count(), func.max(TiempoRuta.fecha_calculo)).one())
@@ -0,0 +1,144 @@
+"""
+Vigilancia de las cachés en memoria compartidas entre workers.
+
+Cada worker de la API guarda en memoria estructuras armadas a partir de la
+base de datos (el índice de sedes, la red de tramos, los tiempos por ruta).
+Cuando otro worker modifica esos datos, este no se entera por sí solo. Un
+hilo en segundo plano consulta cada cierto intervalo la versión de cada caché
+registrada (p. ej. la fecha de actualización más reciente) y la avisa cuando
+cambió, para que el cambio llegue también a este worker.
+
+Las cachés de la API se registran con `registrar_caches_api()` al arrancar,
+no al importar sus módulos.
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from database.config import SessionLocal
+
+""" Versión de una caché vigilada que aún no se ha consultado """
+_SIN_VERSION = object()
+
+
+class VigilanteCaches:
+    """Avisa a las cachés registradas cuando cambian sus datos en la base de datos."""
+
+    def __init__(self, intervalo_segundos: float = 60.0):
+        """
+        Args:
+            intervalo_segundos: Cada cuánto se consulta la versión de las cachés
+        """
+        self.intervalo_segundos = max(1.0, intervalo_segundos)
+        self.revisiones = 0
+        self.avisos = 0
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._vigilancias: Dict[str, List[Any]] = {}
+
+    def vigilar(
+        self,
+        nombre: str,
+        consultar_version: Callable[[Session], Any],
+        al_cambiar: Callable[[], Any],
+    ) -> None:
+        """
+        Registra una caché para revisarla en cada ciclo.
+        Registrar otra vez el mismo nombre reemplaza la vigilancia anterior.
+
+        Args:
+            nombre: Nombre de la caché, para los mensajes de error
+            consultar_version: Devuelve un valor que cambia cuando cambian los datos de la caché
+            al_cambiar: Se llama cuando la versión difiere de la última consultada
+        """
+        with self._lock:
+            self._vigilancias[nombre] = [consultar_version, al_cambiar, _SIN_VERSION]
+
+    def revisar(self) -> int:
+        """
+        Consulta la versión de cada caché vigilada y avisa a las que cambiaron.
+        La primera consulta solo guarda la versión de referencia.
+
+        Returns:
+            int: Número de cachés avisadas
+        """
+        with self._lock:
+            vigilancias = list(self._vigilancias.items())
+        if not vigilancias:
+            return 0
+
+        avisadas = 0
+        db = SessionLocal()
+        try:
+            for nombre, vigilancia in vigilancias:
+                consultar_version, al_cambiar, anterior = vigilancia
+                try:
+                    version = consultar_version(db)
+                    if version == anterior:
+                        continue
+                    vigilancia[2] = version
+                    if anterior is not _SIN_VERSION:
+                        al_cambiar()
+                        avisadas += 1
+                except Exception as e:
+                    db.rollback()
+                    print(f"Error al revisar la caché {nombre}: {e}")
+        finally:
+            db.close()
+
+        self.revisiones += 1
+        self.avisos += avisadas
+        return avisadas
+
+    def iniciar(self) -> None:
+        """Guarda la versión de referencia de cada caché y arranca el hilo."""
+        try:
+            self.revisar()
+        except Exception as e:
+            print(f"Error al revisar las cachés vigiladas: {e}")
+        if self._hilo and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(
+            target=self._ejecutar, name="vigilancia-caches", daemon=True
+        )
+        self._hilo.start()
+
+    def detener(self) -> None:
+        """Detiene el hilo de vigilancia."""
+        self._detener.set()
+        if self._hilo:
+            self._hilo.join(timeout=5)
+            self._hilo = None
+
+    def _ejecutar(self) -> None:
+        while not self._detener.wait(self.intervalo_segundos):
+            try:
+                self.revisar()
+            except Exception as e:
+                print(f"Error al revisar las cachés vigiladas: {e}")
+
+
+def registrar_caches_api(vigilante: VigilanteCaches) -> None:
+    """
+    Registra las cachés en memoria de la API que dependen de tablas compartidas.
+
+    Args:
+        vigilante: Vigilante en el que se registran
+    """
+    from services.enrutador_sedes import enrutador_sedes, version_red
+    from services.indice_sedes import indice_sedes, version_sedes
+    from services.tiempos_ruta import cargar_tiempos_ruta, version_tiempos_ruta
+
+    vigilante.vigilar("indice_sedes", version_sedes, indice_sedes.invalidar)
+    vigilante.vigilar("enrutador_sedes", version_red, enrutador_sedes.invalidar)
+    vigilante.vigilar("tiempos_ruta", version_tiempos_ruta, cargar_tiempos_ruta)
+
+
+vigilante_caches = VigilanteCaches(
+    intervalo_segundos=float(os.getenv("CACHES_INTERVALO_REVISION_SEGUNDOS", "60")),
+)
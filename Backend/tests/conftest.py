@@ -0,0 +1,158 @@
+"""
+Fixtures compartidas de las pruebas.
+
+Las pruebas corren sobre SQLite en memoria: DATABASE_URL se fija antes de que
+se cree el engine, así nunca tocan la base configurada en .env. Las pruebas
+que necesitan PostgreSQL leen su URL de TEST_DATABASE_URL y se omiten si no
+está definida.
+"""
+
+import os
+import sys
+import uuid
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATABASE_URL"] = "sqlite://"
+
+from database.config import Base, SessionLocal, create_tables
+from entities.cliente import Cliente
+from entities.detalle_entrega import DetalleEntrega
+from entities.paquete import Paquete
+from entities.rol import Rol
+from entities.sede import Sede
+from entities.tipo_documento import TipoDocumento
+from entities.usuario import Usuario
+
+
+@pytest.fixture(scope="session")
+def esquema():
+    """Crea las tablas una sola vez por ejecución."""
+    create_tables()
+
+
+@pytest.fixture
+def db(esquema):
+    """Sesión de prueba; al terminar borra todas las filas."""
+    sesion = SessionLocal()
+    try:
+        yield sesion
+    finally:
+        sesion.rollback()
+        for tabla in reversed(Base.metadata.sorted_tables):
+            sesion.execute(tabla.delete())
+        sesion.commit()
+        sesion.close()
+
+
+def _cliente(db, admin: Usuario, id_tipo_documento, sufijo: str) -> Cliente:
+    usuario = Usuario(
+        id_usuario=str(uuid.uuid4()),
+        id_rol=admin.id_rol,
+        nombre_usuario=f"cliente_{sufijo}",
+        password="x",
+    )
+    db.add(usuario)
+    cliente = Cliente(
+        usuario_id=usuario.id_usuario,
+        id_tipo_documento=id_tipo_documento,
+        numero_documento=f"10{sufijo}",
+        primer_nombre="Ana",
+        primer_apellido="Pérez",
+        direccion="Calle 1",
+        telefono="3000000000",
+        correo=f"cliente_{sufijo}@swiftpost.test",
+        tipo="remitente",
+        creado_por=admin.id_usuario,
+    )
+    db.add(cliente)
+    return cliente
+
+
+def crear_envios(db, cantidad: int = 3) -> dict:
+    """
+    Crea dos sedes y `cantidad` paquetes registrados, cada uno con su detalle
+    de entrega en estado Pendiente desde la primera sede.
+
+    Args:
+        db: Sesión de base de datos (SQLite o PostgreSQL)
+        cantidad: Número de paquetes a crear
+
+    Returns:
+        dict: ids del usuario administrador, tipo de documento, clientes
+            (remitente y receptor), sedes, paquetes y detalles creados
+    """
+    rol = Rol(id_rol=str(uuid.uuid4()), nombre_rol="administrador")
+    admin = Usuario(
+        id_usuario=str(uuid.uuid4()), id_rol=rol.id_rol, nombre_usuario="admin", password="x"
+    )
+    db.add_all([rol, admin])
+    tipo_documento = TipoDocumento(
+        nombre="Cédula",
+        codigo="CC",
+        numero=1,
+        creado_por=admin.id_usuario,
+        actualizado_por=admin.id_usuario,
+    )
+    db.add(tipo_documento)
+    db.flush()
+
+    remitente = _cliente(db, admin, tipo_documento.id_tipo_documento, "1")
+    receptor = _cliente(db, admin, tipo_documento.id_tipo_documento, "2")
+    sedes = [
+        Sede(
+            nombre=f"Sede {ciudad}",
+            ciudad=ciudad,
+            direccion="Calle 2",
+            telefono="6000000",
+            creado_por=admin.id_usuario,
+        )
+        for ciudad in ("Bogotá", "Medellín")
+    ]
+    db.add_all(sedes)
+    db.flush()
+
+    paquetes, detalles = [], []
+    for _ in range(cantidad):
+        paquete = Paquete(
+            id_cliente=remitente.id_cliente,
+            peso=2.5,
+            tamaño="mediano",
+            fragilidad="normal",
+            contenido="Libros",
+            tipo="normal",
+            creado_por=admin.id_usuario,
+        )
+        db.add(paquete)
+        db.flush()
+        detalle = DetalleEntrega(
+            id_sede_remitente=sedes[0].id_sede,
+            id_sede_receptora=sedes[1].id_sede,
+            id_paquete=paquete.id_paquete,
+            id_cliente_remitente=remitente.id_cliente,
+            id_cliente_receptor=receptor.id_cliente,
+            fecha_envio=datetime.now(),
+            creado_por=admin.id_usuario,
+            actualizado_por=admin.id_usuario,
+        )
+        db.add(detalle)
+        paquetes.append(paquete.id_paquete)
+        detalles.append(detalle)
+    db.commit()
+
+    return {
+        "id_usuario": admin.id_usuario,
+        "id_tipo_documento": tipo_documento.id_tipo_documento,
+        "clientes": [remitente.id_cliente, receptor.id_cliente],
+        "sedes": [sede.id_sede for sede in sedes],
+        "paquetes": paquetes,
+        "detalles": [detalle.id_detalle for detalle in detalles],
+    }
+
+
+@pytest.fixture
+def envios(db):
+    """Dos sedes y tres paquetes pendientes (ver crear_envios)."""
+    return crear_envios(db)
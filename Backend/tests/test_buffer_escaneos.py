@@ -0,0 +1,161 @@
+"""
+Pruebas del buffer de escaneos sobre SQLite.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.exc import OperationalError
+
+from entities.detalle_entrega import DetalleEntrega
+from entities.escaneo import Escaneo
+from entities.paquete import Paquete
+from schemas.escaneo_schema import EscaneoCreate
+from services.buffer_escaneos import BufferEscaneos
+
+
+def test_vaciar_persiste_el_ultimo_estado_de_cada_paquete(db, envios):
+    """Los ids se comparan por su tipo (GUID) aunque lleguen como texto."""
+    en_camino, entregado, sin_estado = envios["paquetes"]
+    origen, destino = envios["sedes"]
+    hace_una_hora = datetime.now() - timedelta(hours=1)
+    ahora = datetime.now()
+
+    buffer = BufferEscaneos(tamaño_lote=10)
+    buffer.agregar(
+        [
+            {
+                "id_paquete": str(en_camino),
+                "id_sede": str(origen),
+                "estado": "en_transito",
+                "fecha_escaneo": hace_una_hora,
+            },
+            {
+                "id_paquete": entregado,
+                "id_sede": origen,
+                "estado": "en_transito",
+                "fecha_escaneo": hace_una_hora,
+            },
+            {
+                "id_paquete": entregado,
+                "id_sede": destino,
+                "estado": "entregado",
+                "fecha_escaneo": ahora,
+            },
+            {
+                "id_paquete": sin_estado,
+                "id_sede": origen,
+                "estado": None,
+                "fecha_escaneo": ahora,
+            },
+        ]
+    )
+
+    assert buffer.vaciar() == 4
+    assert buffer.escaneos_escritos == 4
+    assert buffer.escaneos_descartados == 0
+    assert buffer.lotes_escritos == 1
+
+    db.expire_all()
+    estados = dict(db.query(Paquete.id_paquete, Paquete.estado))
+    assert estados == {
+        en_camino: "en_transito",
+        entregado: "entregado",
+        sin_estado: "registrado",
+    }
+
+    detalles = {
+        detalle.id_paquete: detalle for detalle in db.query(DetalleEntrega).all()
+    }
+    assert detalles[en_camino].estado_envio == "En transito"
+    assert detalles[en_camino].fecha_entrega is None
+    assert detalles[entregado].estado_envio == "Entregado"
+    assert detalles[entregado].fecha_entrega == ahora
+    assert detalles[sin_estado].estado_envio == "Pendiente"
+
+    assert db.query(Escaneo).count() == 4
+
+
+def test_vaciar_descarta_escaneos_de_paquetes_inexistentes(db, envios):
+    buffer = BufferEscaneos(tamaño_lote=10)
+    buffer.agregar(
+        [
+            {
+                "id_paquete": envios["paquetes"][0],
+                "id_sede": envios["sedes"][0],
+                "estado": "en_transito",
+            },
+            {
+                "id_paquete": uuid.uuid4(),
+                "id_sede": envios["sedes"][0],
+                "estado": "en_transito",
+            },
+        ]
+    )
+
+    assert buffer.vaciar() == 1
+    assert buffer.escaneos_descartados == 1
+    db.expire_all()
+    assert db.get(Paquete, envios["paquetes"][0]).estado == "en_transito"
+
+
+def test_vaciar_acepta_fechas_con_y_sin_zona_horaria(db, envios):
+    paquete, _, _ = envios["paquetes"]
+    sede = envios["sedes"][0]
+    escaneos = [
+        EscaneoCreate(
+            id_paquete=paquete,
+            id_sede=sede,
+            estado="en_transito",
+            fecha_escaneo=datetime.now(timezone.utc) - timedelta(minutes=5),
+        ),
+        EscaneoCreate(id_paquete=paquete, id_sede=sede, estado="en_reparto"),
+    ]
+
+    buffer = BufferEscaneos(tamaño_lote=10)
+    buffer.agregar(
+        [
+            {
+                "id_paquete": escaneo.id_paquete,
+                "id_sede": escaneo.id_sede,
+                "estado": escaneo.estado,
+                "fecha_escaneo": escaneo.fecha_escaneo or datetime.now(),
+            }
+            for escaneo in escaneos
+        ]
+    )
+
+    assert buffer.vaciar() == 2
+    assert buffer.escaneos_descartados == 0
+    db.expire_all()
+    assert db.get(Paquete, paquete).estado == "en_reparto"
+
+
+def test_lote_que_falla_por_la_base_de_datos_se_reencola(db, envios, monkeypatch):
+    buffer = BufferEscaneos(tamaño_lote=10)
+    buffer.agregar(
+        [
+            {
+                "id_paquete": envios["paquetes"][0],
+                "id_sede": envios["sedes"][0],
+                "estado": "en_transito",
+            }
+        ]
+    )
+    escribir_lote = buffer._escribir_lote
+
+    def falla_una_vez(db, lote):
+        monkeypatch.setattr(buffer, "_escribir_lote", escribir_lote)
+        raise OperationalError("INSERT", {}, Exception("conexión perdida"))
+
+    monkeypatch.setattr(buffer, "_escribir_lote", falla_una_vez)
+
+    assert buffer.vaciar() == 0
+    assert buffer.pendientes() == 1
+    assert buffer.escaneos_descartados == 0
+    assert buffer.lotes_reintentados == 1
+
+    assert buffer.vaciar() == 1
+    assert buffer.escaneos_escritos == 1
+    db.expire_all()
+    assert db.get(Paquete, envios["paquetes"][0]).estado == "en_transito"
@@ -0,0 +1,19 @@
+"""
+Pruebas de la paginación por cursor del ranking de clientes frecuentes.
+"""
+
+from services import reportes
+
+
+def test_las_paginas_no_repiten_clientes(db, envios):
+    puestos = []
+    cursor = None
+    """ Con un cursor mal comparado la última fila vuelve en cada página """
+    for _ in range(4):
+        pagina = reportes.clientes_frecuentes(db, dias=30, limite=1, cursor=cursor)
+        puestos += [cliente["puesto"] for cliente in pagina["clientes"]]
+        cursor = pagina["siguiente_cursor"]
+        if not cursor:
+            break
+
+    assert puestos == [1, 2]
@@ -0,0 +1,78 @@
+"""
+Pruebas de la ruta de un envío con precio cotizado.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from cruds.detalle_entrega_crud import DetalleEntregaCRUD
+from entities.cotizacion import Cotizacion
+from entities.paquete import Paquete
+from schemas.detalle_entrega_schema import DetalleEntregaCreate
+
+
+@pytest.fixture
+def paquete_cotizado(db, envios):
+    origen, destino = envios["sedes"]
+    cotizacion = Cotizacion(
+        id_sede_origen=origen,
+        id_sede_destino=destino,
+        peso_kg=2.5,
+        tamaño="mediano",
+        tipo_envio="normal",
+        distancia_km=12.0,
+        costo_total=9000.0,
+        tiempo_promedio_horas=24,
+        desglose={},
+        fecha_expiracion=datetime.now() + timedelta(hours=1),
+    )
+    db.add(cotizacion)
+    db.flush()
+    paquete = Paquete(
+        id_cliente=envios["clientes"][0],
+        peso=2.5,
+        tamaño="mediano",
+        fragilidad="normal",
+        contenido="Libros",
+        tipo="normal",
+        costo_envio=cotizacion.costo_total,
+        id_cotizacion=cotizacion.id_cotizacion,
+        creado_por=envios["id_usuario"],
+    )
+    db.add(paquete)
+    db.commit()
+    return paquete.id_paquete
+
+
+def _detalle(envios, id_paquete, origen, destino) -> DetalleEntregaCreate:
+    remitente, receptor = envios["clientes"]
+    return DetalleEntregaCreate(
+        id_sede_remitente=origen,
+        id_sede_receptora=destino,
+        id_paquete=id_paquete,
+        id_cliente_remitente=remitente,
+        id_cliente_receptor=receptor,
+        fecha_envio=datetime.now(),
+    )
+
+
+def test_rechaza_envio_por_una_ruta_distinta_a_la_cotizada(db, envios, paquete_cotizado):
+    origen, destino = envios["sedes"]
+
+    with pytest.raises(ValueError, match="ruta de la cotización"):
+        DetalleEntregaCRUD(db).crear(
+            datos_entrada=_detalle(envios, paquete_cotizado, destino, origen),
+            creado_por=envios["id_usuario"],
+        )
+
+
+def test_acepta_envio_por_la_ruta_cotizada(db, envios, paquete_cotizado):
+    origen, destino = envios["sedes"]
+
+    detalle = DetalleEntregaCRUD(db).crear(
+        datos_entrada=_detalle(envios, paquete_cotizado, origen, destino),
+        creado_por=envios["id_usuario"],
+    )
+
+    assert detalle.id_paquete == paquete_cotizado
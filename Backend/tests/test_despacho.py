@@ -0,0 +1,97 @@
+"""
+Pruebas de la confirmación de un plan de despacho sobre SQLite.
+"""
+
+import uuid
+
+from cruds.detalle_entrega_crud import DetalleEntregaCRUD
+from cruds.transporte_crud import TransporteCRUD
+from entities.detalle_entrega import DetalleEntrega
+from entities.historial_estado_transporte import HistorialEstadoTransporte
+from entities.paquete import Paquete
+from entities.transporte import Transporte
+from services.buffer_escaneos import BufferEscaneos
+
+
+def _vehiculo(db, envios) -> Transporte:
+    transporte = Transporte(
+        tipo_vehiculo="camion",
+        capacidad_carga=1000.0,
+        id_sede=envios["sedes"][0],
+        placa="ABC123",
+        modelo="NPR",
+        marca="Chevrolet",
+        año=2022,
+        creado_por=envios["id_usuario"],
+    )
+    db.add(transporte)
+    db.commit()
+    return transporte
+
+
+def _despachar(db, envios, transporte, paquetes) -> int:
+    return TransporteCRUD(db).confirmar_despacho(
+        asignaciones=[{"id_transporte": transporte.id_transporte, "paquetes": paquetes}],
+        actualizado_por=uuid.UUID(envios["id_usuario"]),
+    )
+
+
+def test_confirmar_despacho_pone_en_transito_detalle_y_paquete(db, envios):
+    transporte = _vehiculo(db, envios)
+    despachado, sin_asignar, _ = envios["paquetes"]
+
+    assert _despachar(db, envios, transporte, [despachado]) == 1
+    db.expire_all()
+    estados = dict(db.query(Paquete.id_paquete, Paquete.estado))
+    assert estados[despachado] == "en_transito"
+    assert estados[sin_asignar] == "registrado"
+    detalle = db.query(DetalleEntrega).filter_by(id_paquete=despachado).one()
+    assert detalle.estado_envio == "En transito"
+    assert detalle.id_transporte == transporte.id_transporte
+    assert db.get(Transporte, transporte.id_transporte).estado == "en_uso"
+
+
+def test_el_vehiculo_vuelve_a_disponible_al_entregar_su_ultimo_envio(db, envios):
+    transporte = _vehiculo(db, envios)
+    primero, segundo, _ = envios["paquetes"]
+    assert _despachar(db, envios, transporte, [primero, segundo]) == 2
+    detalles = {
+        detalle.id_paquete: detalle.id_detalle
+        for detalle in db.query(DetalleEntrega).filter(
+            DetalleEntrega.id_paquete.in_([primero, segundo])
+        )
+    }
+    crud = DetalleEntregaCRUD(db)
+    usuario = uuid.UUID(envios["id_usuario"])
+
+    crud.actualizar_estado(
+        id_detalle=detalles[primero], nuevo_estado="Entregado", actualizado_por=usuario
+    )
+    assert db.get(Transporte, transporte.id_transporte).estado == "en_uso"
+
+    crud.actualizar_estado(
+        id_detalle=detalles[segundo], nuevo_estado="Entregado", actualizado_por=usuario
+    )
+    db.expire_all()
+    assert db.get(Transporte, transporte.id_transporte).estado == "disponible"
+    abierto = (
+        db.query(HistorialEstadoTransporte)
+        .filter_by(id_transporte=transporte.id_transporte, hasta=None)
+        .one()
+    )
+    assert abierto.estado == "disponible"
+
+
+def test_el_escaneo_de_entrega_libera_el_vehiculo(db, envios):
+    transporte = _vehiculo(db, envios)
+    paquete = envios["paquetes"][0]
+    _despachar(db, envios, transporte, [paquete])
+
+    buffer = BufferEscaneos(tamaño_lote=10)
+    buffer.agregar(
+        [{"id_paquete": paquete, "id_sede": envios["sedes"][1], "estado": "entregado"}]
+    )
+    assert buffer.vaciar() == 1
+
+    db.expire_all()
+    assert db.get(Transporte, transporte.id_transporte).estado == "disponible"
@@ -0,0 +1,50 @@
+"""
+Pruebas de scripts/migrar.py sobre una base SQLite creada con modelos anteriores.
+"""
+
+from sqlalchemy import create_engine, inspect, select, text
+
+from database.config import Base
+from entities.historial_estado_transporte import HistorialEstadoTransporte
+from scripts.migrar import (
+    agregar_columnas,
+    columnas_faltantes,
+    completar_historial_transportes,
+    crear_indices,
+)
+
+
+def test_migrar_completa_columnas_indices_e_historial(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'anterior.db'}")
+    Base.metadata.create_all(bind=engine)
+    """ Base creada antes de las cotizaciones y la cola de mensajeros """
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_detalles_entrega_sede_estado"))
+        conn.execute(text("ALTER TABLE paquetes DROP COLUMN costo_envio"))
+        conn.execute(text("ALTER TABLE detalles_entrega DROP COLUMN reclamo_expira"))
+        conn.execute(
+            text(
+                "INSERT INTO transportes (id_transporte, tipo_vehiculo, capacidad_carga, "
+                "id_sede, placa, modelo, marca, año, estado, activo, fecha_creacion, creado_por) "
+                "VALUES ('4b0c1f62-8a55-4b8e-9c1d-2f7e6a9d3c10', 'camion', 1000, "
+                "'9d2a5e11-3b7c-4f08-a6d4-51c8e2b7f093', 'XYZ987', 'NPR', 'Chevrolet', "
+                "2022, 'en_uso', 1, '2026-01-01 00:00:00.000000', 'admin')"
+            )
+        )
+
+    faltantes = columnas_faltantes(engine)
+    assert {(tabla.name, columna.name) for tabla, columna in faltantes} == {
+        ("paquetes", "costo_envio"),
+        ("detalles_entrega", "reclamo_expira"),
+    }
+    assert agregar_columnas(faltantes, engine) == []
+    crear_indices(engine)
+    assert completar_historial_transportes(engine) == 1
+    assert completar_historial_transportes(engine) == 0
+
+    assert columnas_faltantes(engine) == []
+    indices = {indice["name"] for indice in inspect(engine).get_indexes("detalles_entrega")}
+    assert "ix_detalles_entrega_sede_estado" in indices
+    with engine.connect() as conn:
+        estado = conn.execute(select(HistorialEstadoTransporte.__table__.c.estado)).scalar_one()
+    assert estado == "en_uso"
@@ -0,0 +1,65 @@
+"""
+Pruebas del registro de telemetría GPS sobre SQLite.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from cruds.posicion_transporte_crud import PosicionTransporteCRUD
+from entities.transporte import Transporte
+from schemas.telemetria_schema import PuntoGPS
+from services.indice_posiciones import IndicePosiciones, PosicionActual
+
+
+def _transporte(db, envios) -> Transporte:
+    transporte = Transporte(
+        tipo_vehiculo="moto",
+        capacidad_carga=50.0,
+        id_sede=envios["sedes"][0],
+        placa="GPS123",
+        modelo="FZ",
+        marca="Yamaha",
+        año=2023,
+        creado_por=envios["id_usuario"],
+    )
+    db.add(transporte)
+    db.commit()
+    return transporte
+
+
+def test_registrar_lote_cuenta_solo_los_pings_nuevos(db, envios):
+    transporte = _transporte(db, envios)
+    crud = PosicionTransporteCRUD(db)
+    base = datetime.now().replace(microsecond=0)
+    primero = [PuntoGPS(latitud=4.6, longitud=-74.1, fecha_registro=base)]
+    repetido_y_nuevo = [
+        PuntoGPS(latitud=4.6, longitud=-74.1, fecha_registro=base),
+        PuntoGPS(latitud=4.7, longitud=-74.0, fecha_registro=base + timedelta(seconds=5)),
+    ]
+
+    assert crud.registrar_lote(transporte.id_transporte, primero) == 1
+    assert crud.registrar_lote(transporte.id_transporte, repetido_y_nuevo) == 1
+
+
+def test_pings_con_zona_horaria_se_comparan_con_los_locales(db, envios):
+    transporte = _transporte(db, envios)
+    local = PuntoGPS(latitud=4.6, longitud=-74.1, fecha_registro=datetime.now())
+    con_zona = PuntoGPS(
+        latitud=4.7,
+        longitud=-74.0,
+        fecha_registro=datetime.now(timezone.utc) + timedelta(minutes=1),
+    )
+    assert con_zona.fecha_registro.tzinfo is None
+
+    indice = IndicePosiciones()
+    for punto in (local, con_zona):
+        indice.actualizar(
+            PosicionActual(
+                id_transporte=transporte.id_transporte,
+                latitud=punto.latitud,
+                longitud=punto.longitud,
+                fecha_registro=punto.fecha_registro,
+                velocidad_kmh=punto.velocidad_kmh,
+            )
+        )
+
+    assert indice.obtener(transporte.id_transporte).latitud == 4.7
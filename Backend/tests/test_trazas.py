@@ -0,0 +1,40 @@
+"""
+Pruebas de las trazas internas: solo el span raíz abre trazas nuevas.
+"""
+
+from observabilidad import trazas
+from observabilidad.trazas import ExportadorTrazas, span, span_raiz, trazado
+
+
+@trazado()
+def _cotizar(valor: int) -> int:
+    return valor * 2
+
+
+def test_span_sin_padre_no_registra_trazas(monkeypatch):
+    exportador = ExportadorTrazas()
+    monkeypatch.setattr(trazas, "exportador", exportador)
+
+    with span("fuera_de_un_request") as actual:
+        assert actual is None
+    assert _cotizar(2) == 4
+
+    assert exportador.recientes() == []
+
+
+def test_spans_cuelgan_del_span_raiz(monkeypatch):
+    exportador = ExportadorTrazas()
+    monkeypatch.setattr(trazas, "exportador", exportador)
+
+    with span_raiz("GET /cotizar") as raiz:
+        with span("paso") as paso:
+            assert paso.id_padre == raiz.id
+            assert _cotizar(3) == 6
+
+    [registro] = exportador.recientes()
+    assert registro["name"] == "GET /cotizar"
+    completa = exportador.traza(registro["trace_id"])
+    nombres = {s["name"]: s["parent_id"] for s in completa["spans"]}
+    assert nombres["paso"] == raiz.id
+    assert nombres["_cotizar"] == paso.id
+    assert nombres["GET /cotizar"] is None
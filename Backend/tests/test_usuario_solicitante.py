@@ -0,0 +1,32 @@
+"""
+Pruebas de la identificación del usuario que hace la petición.
+"""
+
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from auth.security import obtener_id_usuario_solicitante
+
+
+def test_acepta_usuario_activo_por_parametro_o_header(db, envios):
+    id_usuario = uuid.UUID(envios["id_usuario"])
+
+    assert obtener_id_usuario_solicitante(db, id_usuario, None) == id_usuario
+    assert obtener_id_usuario_solicitante(db, None, str(id_usuario)) == id_usuario
+
+
+@pytest.mark.parametrize(
+    "usuario, x_user_id, codigo",
+    [
+        (None, None, 401),
+        (None, "no-es-un-uuid", 400),
+        (uuid.uuid4(), None, 401),
+        (None, str(uuid.uuid4()), 401),
+    ],
+)
+def test_rechaza_usuario_ausente_invalido_o_inexistente(db, envios, usuario, x_user_id, codigo):
+    with pytest.raises(HTTPException) as error:
+        obtener_id_usuario_solicitante(db, usuario, x_user_id)
+    assert error.value.status_code == codigo
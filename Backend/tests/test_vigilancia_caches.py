@@ -0,0 +1,90 @@
+"""
+Pruebas de la revisión de cachés vigiladas entre workers.
+"""
+
+from types import MappingProxyType
+
+from entities.ruta_sede import RutaSede
+from entities.sede import Sede
+from entities.tiempo_ruta import TiempoRuta
+from services.enrutador_sedes import version_red
+from services.indice_sedes import version_sedes
+from services.servicio_mensajeria import ServicioMensajeria
+from services.tiempos_ruta import cargar_tiempos_ruta, version_tiempos_ruta
+from services.vigilante_caches import VigilanteCaches, registrar_caches_api
+
+
+def test_avisa_solo_cuando_cambia_la_version(db, envios):
+    vigilante = VigilanteCaches()
+    avisos = []
+    vigilante.vigilar("sedes", version_sedes, lambda: avisos.append("sedes"))
+
+    assert vigilante.revisar() == 0
+    assert vigilante.revisar() == 0
+
+    sede = db.get(Sede, envios["sedes"][0])
+    sede.nombre = "Sede renombrada desde otro worker"
+    db.commit()
+
+    assert vigilante.revisar() == 1
+    assert avisos == ["sedes"]
+    assert vigilante.revisar() == 0
+
+
+def test_registra_las_caches_de_la_api_sin_duplicarlas(db, envios):
+    vigilante = VigilanteCaches()
+    registrar_caches_api(vigilante)
+    registrar_caches_api(vigilante)
+    assert vigilante.revisar() == 0
+
+    sede = db.get(Sede, envios["sedes"][0])
+    sede.nombre = "Sede renombrada desde otro worker"
+    db.commit()
+
+    """ El índice de sedes y la red de tramos dependen de la tabla de sedes """
+    assert vigilante.revisar() == 2
+
+
+def test_la_red_cambia_con_los_tramos(db, envios):
+    vigilante = VigilanteCaches()
+    avisos = []
+    vigilante.vigilar("red", version_red, lambda: avisos.append("red"))
+    assert vigilante.revisar() == 0
+
+    origen, destino = envios["sedes"]
+    db.add(
+        RutaSede(
+            id_sede_origen=origen,
+            id_sede_destino=destino,
+            distancia_km=415.0,
+            creado_por=envios["id_usuario"],
+        )
+    )
+    db.commit()
+
+    assert vigilante.revisar() == 1
+    assert avisos == ["red"]
+
+
+def test_tiempos_ruta_se_recargan_cuando_otro_proceso_los_recalcula(db, envios):
+    vigilante = VigilanteCaches()
+    vigilante.vigilar("tiempos_ruta", version_tiempos_ruta, cargar_tiempos_ruta)
+    assert vigilante.revisar() == 0
+
+    origen, destino = envios["sedes"]
+    db.add(
+        TiempoRuta(
+            id_sede_origen=origen,
+            id_sede_destino=destino,
+            tipo_envio="normal",
+            envios=12,
+            horas_p10=20.0,
+            horas_p50=30.0,
+            horas_p90=48.0,
+        )
+    )
+    db.commit()
+
+    assert vigilante.revisar() == 1
+    assert ServicioMensajeria.tiempos_ruta()[(origen, destino, "normal")] == (20.0, 30.0, 48.0)
+    ServicioMensajeria.publicar_tiempos_ruta(MappingProxyType({}))